@@ -788,3 +788,195 @@ class DataHandler(object):
         """Allow user to set a custom directory, also triggering subdirectory initialization."""
         self._directory = directory
         self._initialize_directory()
+
+
+class _StreamingElement(object):
+    """Element being built by the StreamingHandler (PRIVATE)."""
+
+    __slots__ = ("name", "attrs", "path", "keep_all", "children", "repeated",
+                 "text")
+
+    def __init__(self, name, attrs, path, keep_all):
+        self.name = name
+        self.attrs = attrs
+        self.path = path
+        self.keep_all = keep_all
+        self.children = None
+        self.repeated = None
+        self.text = []
+
+    def add(self, name, value, lists):
+        """Store the value of a child element (PRIVATE)."""
+        children = self.children
+        if children is None:
+            children = self.children = {}
+        if name in lists:
+            children.setdefault(name, []).append(value)
+        elif name not in children:
+            children[name] = value
+        elif self.repeated is not None and name in self.repeated:
+            children[name].append(value)
+        else:
+            children[name] = [children[name], value]
+            if self.repeated is None:
+                self.repeated = set()
+            self.repeated.add(name)
+
+    def value(self, attributes):
+        """Return the element as a string or dictionary (PRIVATE)."""
+        text = "".join(self.text)
+        if not self.keep_all:
+            # only some of the child elements were selected
+            value = self.children or {}
+        elif self.children is None and not (attributes and self.attrs):
+            return text
+        else:
+            value = self.children or {}
+            if self.children is None or text.strip():
+                value["#text"] = text
+        if attributes:
+            for key, item in self.attrs.items():
+                value["@" + key] = item
+        return value
+
+
+class StreamingHandler(object):
+    """Fast parser for Entrez XML files, creating plain Python objects.
+
+    Unlike the DataHandler, this does not use the DTD or XML Schema of the
+    file. Each record (by default, each child element of the root element)
+    is returned as a plain dictionary, mapping the tag of each child element
+    to its value:
+
+     - an element without child elements is a string with its text (inline
+       markup such as <i> or <sup> is kept as part of the text, as in the
+       DataHandler),
+     - other elements are dictionaries,
+     - if an element has several child elements with the same tag, their
+       values are stored as a list.
+
+    Arguments:
+     - tag - tag of the records; by default the child elements of the root
+       element are the records
+     - fields - optional list of the fields to keep, as paths relative to the
+       record such as "MedlineCitation/Article/ArticleTitle"; all other
+       elements are skipped without creating any objects for them
+     - lists - tags of elements which are always stored in a list, even
+       when there is only one of them (such as "Author")
+     - attributes - if True, element attributes are stored in dictionaries
+       with an "@" before their name, and the text of an element with
+       attributes or child elements is stored under "#text"
+    """
+
+    # Inline HTML markup, treated as text
+    markup = frozenset(["b", "i", "u", "sub", "sup"])
+
+    def __init__(self, tag=None, fields=None, lists=(), attributes=False):
+        """Initialize the class."""
+        self.tag = tag
+        self.lists = frozenset(lists)
+        self.attributes = attributes
+        if fields is None:
+            self.fields = None
+            self.prefixes = None
+        else:
+            self.fields = set()
+            self.prefixes = set()
+            for field in fields:
+                path = tuple(field.strip("/").split("/"))
+                self.fields.add(path)
+                for i in range(1, len(path)):
+                    self.prefixes.add(path[:i])
+        self.parser = expat.ParserCreate()
+        self.parser.buffer_text = True
+        self.parser.StartElementHandler = self.startElementHandler
+        self.parser.EndElementHandler = self.endElementHandler
+        self.stack = []
+        self.records = []
+        self.depth = 0
+        self.skip = 0
+        self.started = False
+
+    def parse(self, handle):
+        """Parse the XML data from the handle, yielding the records."""
+        BLOCK = 65536
+        while True:
+            text = handle.read(BLOCK)
+            try:
+                self.parser.Parse(text, not text)
+            except expat.ExpatError as e:
+                if self.started:
+                    raise CorruptedXMLError(e)
+                raise NotXMLError(e)
+            records = self.records
+            while records:
+                yield records.pop(0)
+            if not text:
+                if not self.started:
+                    raise NotXMLError("No XML elements found")
+                return
+
+    def startElementHandler(self, name, attrs):
+        self.started = True
+        self.depth += 1
+        stack = self.stack
+        if stack:
+            parent = stack[-1]
+            if name in self.markup:
+                parent.text.append("<%s>" % name)
+                return
+            if parent.keep_all:
+                element = _StreamingElement(name, attrs, None, True)
+            else:
+                path = parent.path + (name,)
+                if path in self.fields:
+                    element = _StreamingElement(name, attrs, path, True)
+                elif path in self.prefixes:
+                    element = _StreamingElement(name, attrs, path, False)
+                else:
+                    # skip this element and everything inside it
+                    self.skip = 1
+                    parser = self.parser
+                    parser.StartElementHandler = self.skipStartElementHandler
+                    parser.EndElementHandler = self.skipEndElementHandler
+                    parser.CharacterDataHandler = None
+                    return
+        elif name == self.tag or (self.tag is None and self.depth == 2):
+            element = _StreamingElement(name, attrs, (), self.fields is None)
+        else:
+            return
+        stack.append(element)
+        # text goes straight into the list of the current element
+        self.parser.CharacterDataHandler = element.text.append
+
+    def endElementHandler(self, name):
+        self.depth -= 1
+        stack = self.stack
+        if not stack:
+            return
+        element = stack[-1]
+        if name in self.markup and name != element.name:
+            element.text.append("</%s>" % name)
+            return
+        stack.pop()
+        value = element.value(self.attributes)
+        if stack:
+            parent = stack[-1]
+            parent.add(name, value, self.lists)
+            self.parser.CharacterDataHandler = parent.text.append
+        else:
+            self.records.append(value)
+            self.parser.CharacterDataHandler = None
+
+    def skipStartElementHandler(self, name, attrs):
+        self.skip += 1
+
+    def skipEndElementHandler(self, name):
+        self.skip -= 1
+        if not self.skip:
+            # end of the skipped element
+            self.depth -= 1
+            parser = self.parser
+            parser.StartElementHandler = self.startElementHandler
+            parser.EndElementHandler = self.endElementHandler
+            parser.CharacterDataHandler = self.stack[-1].text.append
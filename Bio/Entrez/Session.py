@@ -0,0 +1,395 @@
+# Copyright 2018 by Biopython contributors.  All rights reserved.
+#
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Concurrent access to the NCBI Entrez Utilities, for bulk downloads.
+
+The functions in Bio.Entrez open a new connection for each request, and wait
+between requests to stay within the NCBI limit of three requests per second
+(ten with an API key). Downloading many records this way is slow, and a single
+network error stops the download.
+
+The EntrezSession class in this module is meant for bulk downloads:
+
+ - each thread keeps its HTTP connection to NCBI open between requests,
+ - a token bucket shared by all threads using the session limits the rate
+   at which requests are started, so several requests can be in progress
+   at the same time while staying within the NCBI limit,
+ - requests failing with a network error or a transient HTTP error (such
+   as 429 Too Many Requests or 503 Service Unavailable) are retried, with
+   an exponential backoff,
+ - the efetch_batches method splits a long list of identifiers into batches
+   which are uploaded with epost, and downloaded with efetch from the history
+   server using several threads.
+
+Typical usage is::
+
+    from Bio.Entrez.Session import EntrezSession
+    session = EntrezSession(email="Your.Name.Here@example.org")
+    with open("sequences.gb", "w") as output:
+        for handle in session.efetch_batches("nucleotide", ids, rettype="gb",
+                                             retmode="text", threads=4):
+            output.write(handle.read())
+
+The handles are returned in the same order as the identifiers. Each handle
+holds the complete response in memory, so no connection is kept busy while
+the results are being processed.
+"""
+
+import socket
+import sys
+import threading
+import time
+import warnings
+from multiprocessing.pool import ThreadPool
+from xml.etree import ElementTree
+
+from Bio._py3k import StringIO
+from Bio._py3k import HTTPError as _HTTPError
+from Bio._py3k import urlparse as _urlparse
+
+try:
+    from http.client import HTTPConnection, HTTPSConnection, HTTPException
+except ImportError:
+    # Python 2
+    from httplib import HTTPConnection, HTTPSConnection, HTTPException
+
+from Bio import BiopythonWarning
+from Bio import Entrez
+
+
+# HTTP status codes worth retrying
+_TRANSIENT_STATUS = (429, 500, 502, 503, 504)
+
+try:
+    _clock = time.monotonic
+except AttributeError:
+    # Python 2
+    _clock = time.time
+
+
+class TokenBucket(object):
+    """Thread-safe token bucket limiting the rate of requests.
+
+    Tokens are added at the given rate (per second), up to the capacity
+    of the bucket. Each request takes one token, waiting for it if the
+    bucket is empty. The capacity is the largest burst of requests allowed
+    after a period of inactivity; the default of one token spaces the
+    requests evenly.
+    """
+
+    def __init__(self, rate, capacity=1):
+        """Initialize the class."""
+        if rate <= 0:
+            raise ValueError("The rate must be positive")
+        if capacity < 1:
+            raise ValueError("The capacity must be at least one token")
+        self.rate = float(rate)
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = _clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, waiting until one is available."""
+        with self._lock:
+            now = _clock()
+            self._tokens = min(self.capacity,
+                               self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Take the token now, even if it is yet to be added, so that
+            # the threads waiting for tokens queue up in order
+            self._tokens -= 1
+            wait = -self._tokens / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
+
+def _history(handle):
+    """Return the WebEnv and QueryKey from an epost result (PRIVATE)."""
+    root = ElementTree.parse(handle).getroot()
+    error = root.find("ERROR")
+    if error is not None:
+        raise RuntimeError("EPost failed: %s" % error.text)
+    return root.find("WebEnv").text, root.find("QueryKey").text
+
+
+class _PostedBatch(object):
+    """Identifiers to upload with a single epost request (PRIVATE).
+
+    The first thread asking for its history server location does the epost
+    request, the others wait for it.
+    """
+
+    def __init__(self, db, ids):
+        self.db = db
+        self.ids = ids
+        self._lock = threading.Lock()
+        self._history = None
+
+    def history(self, session):
+        """Return the WebEnv and QueryKey of the identifiers (PRIVATE)."""
+        with self._lock:
+            if self._history is None:
+                handle = session.epost(self.db, id=",".join(self.ids))
+                self._history = _history(handle)
+            return self._history
+
+
+class EntrezSession(object):
+    """Session for many requests to the NCBI Entrez Utilities.
+
+    Arguments:
+     - email - email address sent with each request, defaults to Entrez.email
+     - tool - tool name sent with each request, defaults to Entrez.tool
+     - api_key - NCBI API key, defaults to Entrez.api_key
+     - rate - maximum number of requests started per second; defaults to
+       the NCBI limit of 3, or 10 with an API key
+     - burst - capacity of the token bucket (see TokenBucket)
+     - retries - number of times a failing request is retried
+     - backoff - time (seconds) to wait before the first retry; this is
+       doubled for each further retry, unless the server asks for a specific
+       delay with a Retry-After header
+     - timeout - network timeout (seconds) of the connections
+     - base_url - location of the Entrez Utilities, which can be changed to
+       use a mirror or a local test server
+
+    An EntrezSession can be shared by several threads. Each thread has its
+    own connection, but all threads share the rate limit. Call the close
+    method (or use the session in a with statement) to close the connections
+    when done.
+    """
+
+    base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+
+    def __init__(self, email=None, tool=None, api_key=None, rate=None,
+                 burst=1, retries=3, backoff=1.0, timeout=60, base_url=None):
+        """Initialize the class."""
+        self.email = email
+        self.tool = tool
+        self.api_key = api_key
+        if rate is None:
+            rate = 10 if self.api_key or Entrez.api_key else 3
+        self.bucket = TokenBucket(rate, burst)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        if base_url is not None:
+            self.base_url = base_url
+        # HTTP connections by thread, scheme and host
+        self._connections = {}
+        self._lock = threading.Lock()
+
+    def _connection(self, url):
+        """Return the connection of this thread to the URL's server (PRIVATE)."""
+        parts = _urlparse(url)
+        key = (threading.current_thread(), parts.scheme, parts.netloc)
+        with self._lock:
+            try:
+                return self._connections[key]
+            except KeyError:
+                pass
+            if parts.scheme == "https":
+                connection = HTTPSConnection(parts.netloc,
+                                             timeout=self.timeout)
+            else:
+                connection = HTTPConnection(parts.netloc, timeout=self.timeout)
+            self._connections[key] = connection
+        return connection
+
+    def _drop_connection(self, url):
+        """Close the connection of this thread to the URL's server (PRIVATE)."""
+        parts = _urlparse(url)
+        key = (threading.current_thread(), parts.scheme, parts.netloc)
+        with self._lock:
+            connection = self._connections.pop(key, None)
+        if connection is not None:
+            connection.close()
+
+    def _close_finished(self):
+        """Close the connections of threads which have finished (PRIVATE)."""
+        with self._lock:
+            keys = [key for key in self._connections if not key[0].is_alive()]
+            connections = [self._connections.pop(key) for key in keys]
+        for connection in connections:
+            connection.close()
+
+    def close(self):
+        """Close all connections of the session.
+
+        The session can still be used afterwards, opening new connections.
+        """
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for connection in connections:
+            connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _params(self, params):
+        """Add the session's email, tool and API key to the parameters (PRIVATE)."""
+        params = dict(params)
+        for key in ("email", "tool", "api_key"):
+            value = getattr(self, key)
+            if value is not None and key not in params:
+                params[key] = value
+        return Entrez._construct_params(params)
+
+    def open(self, cgi, params=None, post=None, ecitmatch=False):
+        """Send a request and return a handle to the complete response.
+
+        Arguments:
+         - cgi - name of the E-utility, such as "efetch.fcgi"
+         - params - dictionary of parameters for the request
+         - post - use HTTP POST (True) or GET (False); by default POST is
+           used if the URL encoded parameters are over 1000 characters long
+         - ecitmatch - encode the parameters for ecitmatch
+
+        This waits for the rate limit, and retries the request if it fails
+        with a network error or a transient HTTP error. Raises an HTTPError
+        for the other HTTP errors, or if the retries are exhausted.
+        """
+        options = Entrez._encode_options(ecitmatch, self._params(params or {}))
+        if post is None:
+            post = len(options) > 1000
+        url = self.base_url + cgi
+        path = _urlparse(url).path
+        if post:
+            body = options.encode("ascii")
+            headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        else:
+            path += "?" + options
+            body = None
+            headers = {}
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            connection = self._connection(url)
+            delay = self.backoff * 2 ** attempt
+            try:
+                connection.request("POST" if post else "GET", path, body,
+                                   headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (HTTPException, socket.error) as exception:
+                # includes a connection closed by the server while idle
+                self._drop_connection(url)
+                if attempt >= self.retries:
+                    raise
+                error = exception
+            else:
+                if response.getheader("Connection", "").lower() == "close":
+                    self._drop_connection(url)
+                if response.status == 200:
+                    break
+                error = _HTTPError(url, response.status, response.reason,
+                                   response.msg, None)
+                if response.status not in _TRANSIENT_STATUS or \
+                        attempt >= self.retries:
+                    raise error
+                retry_after = response.getheader("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = int(retry_after)
+            warnings.warn("Entrez request failed (%s), retrying in %g seconds"
+                          % (error, delay), BiopythonWarning)
+            time.sleep(delay)
+            attempt += 1
+        if sys.version_info[0] >= 3:
+            charset = response.msg.get_content_charset()
+            handle = StringIO(data.decode(charset or "latin-1"))
+        else:
+            # As in Bio._py3k._binary_to_string_handle, keep the bytes on
+            # Python 2 (cStringIO cannot hold non-ASCII unicode text)
+            handle = StringIO(data)
+        handle.url = url
+        return handle
+
+    def efetch(self, db, **keywords):
+        """Fetch Entrez results, see Entrez.efetch for the parameters."""
+        variables = {"db": db}
+        variables.update(keywords)
+        ids = variables.get("id")
+        post = None
+        if isinstance(ids, list):
+            ids = variables["id"] = ",".join(ids)
+        if isinstance(ids, str) and ids.count(",") >= 200:
+            # NCBI prefers an HTTP POST instead of an HTTP GET if there are
+            # more than about 200 IDs
+            post = True
+        return self.open("efetch.fcgi", variables, post=post)
+
+    def epost(self, db, **keywords):
+        """Post identifiers for future use, see Entrez.epost."""
+        variables = {"db": db}
+        variables.update(keywords)
+        return self.open("epost.fcgi", variables, post=True)
+
+    def esearch(self, db, term, **keywords):
+        """Search an Entrez database, see Entrez.esearch."""
+        variables = {"db": db, "term": term}
+        variables.update(keywords)
+        return self.open("esearch.fcgi", variables)
+
+    def esummary(self, **keywords):
+        """Retrieve document summaries, see Entrez.esummary."""
+        return self.open("esummary.fcgi", keywords)
+
+    def elink(self, **keywords):
+        """Check for linked records, see Entrez.elink."""
+        return self.open("elink.fcgi", keywords)
+
+    def _fetch_batch(self, task):
+        """Fetch a batch of records, in a worker thread (PRIVATE)."""
+        posted, start, size, keywords = task
+        if posted.ids and len(posted.ids) <= size:
+            # not worth an epost request
+            return self.efetch(posted.db, id=posted.ids, **keywords)
+        webenv, query_key = posted.history(self)
+        return self.efetch(posted.db, WebEnv=webenv, query_key=query_key,
+                           retstart=start, retmax=size, **keywords)
+
+    def efetch_batches(self, db, ids, batch_size=500, post_size=10000,
+                       threads=3, **keywords):
+        """Fetch many records in batches, returns an iterator of handles.
+
+        Arguments:
+         - db - the Entrez database
+         - ids - list of identifiers
+         - batch_size - number of records fetched with each efetch request
+         - post_size - number of identifiers uploaded with each epost request
+         - threads - number of requests in progress at the same time
+         - keywords - further efetch parameters, such as rettype and retmode
+
+        The identifiers are uploaded to the NCBI history server with epost
+        in groups of post_size, and the records are then downloaded in
+        batches of batch_size. The handles are returned in the same order
+        as the identifiers.
+        """
+        ids = [str(identifier) for identifier in ids]
+        if batch_size < 1 or post_size < 1:
+            raise ValueError("The batch and post sizes must be positive")
+        tasks = []
+        for post_start in range(0, len(ids), post_size):
+            posted = _PostedBatch(db, ids[post_start:post_start + post_size])
+            for start in range(0, len(posted.ids), batch_size):
+                tasks.append((posted, start, batch_size, keywords))
+        if threads == 1:
+            for task in tasks:
+                yield self._fetch_batch(task)
+            return
+        pool = ThreadPool(threads)
+        try:
+            for handle in pool.imap(self._fetch_batch, tasks):
+                yield handle
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+            self._close_finished()
@@ -92,8 +92,16 @@ Functions:
       This function is appropriate only if the XML file contains
       multiple records, and is particular useful for large files.
 
+    - iterparse    Quickly parses large XML files such as PubMed baseline
+      files into plain dictionaries, lists and strings, optionally keeping
+      only selected fields of each record.
+
     - _open        Internally used function.
 
+For downloading many records, the EntrezSession class in Bio.Entrez.Session
+keeps its connections open, retries failed requests, and fetches batches of
+records with several threads while staying within the NCBI rate limit.
+
 """
 from __future__ import print_function
 
@@ -491,6 +499,57 @@ def parse(handle, validate=True):
     return records
 
 
+def iterparse(handle, tag=None, fields=None, lists=(), attributes=False):
+    """Quickly parse the records of a large XML file into plain Python objects.
+
+    This is a faster alternative to 'parse' for very large files, such as
+    the PubMed baseline files, which does not use the DTD. Each record (by
+    default, each element directly inside the root element of the XML file,
+    such as PubmedArticle or GBSeq) is returned as a plain dictionary, whose
+    values are plain strings, dictionaries and lists:
+
+    >>> from Bio import Entrez
+    >>> with open("Entrez/pubmed1.xml", "rb") as handle:
+    ...     for record in Entrez.iterparse(handle):
+    ...         print(record["MedlineCitation"]["PMID"])
+    ...
+    12091962
+    9997
+
+    Only elements with the same tag occurring several times are stored as
+    a list, unless their tag is in lists. The fields argument selects the
+    elements to keep, by their path in the record; the other elements are
+    skipped without creating any objects for them, which saves both time
+    and memory:
+
+    >>> fields = ["MedlineCitation/PMID",
+    ...           "MedlineCitation/Article/AuthorList/Author/LastName"]
+    >>> with open("Entrez/pubmed1.xml", "rb") as handle:
+    ...     records = Entrez.iterparse(handle, fields=fields, lists=["Author"])
+    ...     record = next(records)
+    >>> record["MedlineCitation"]["PMID"]
+    '12091962'
+    >>> record["MedlineCitation"]["Article"]["AuthorList"]["Author"]
+    [{'LastName': 'Olivero'}]
+
+    Arguments:
+     - handle - handle to the XML data, preferably opened in binary mode
+     - tag - tag of the records, if they are not directly inside the root
+       element of the XML file
+     - fields - list of paths (relative to the record) of the elements to
+       keep, separated by "/"; by default all elements are kept
+     - lists - tags of elements which are always stored in a list
+     - attributes - if True, keep the element attributes, stored with an
+       "@" before their name; the text of such an element is then stored
+       under "#text"
+
+    See Bio.Entrez.Parser.StreamingHandler for more details.
+    """
+    from .Parser import StreamingHandler
+    handler = StreamingHandler(tag, fields, lists, attributes)
+    return handler.parse(handle)
+
+
 def _open(cgi, params=None, post=None, ecitmatch=False):
     """Build the URL and open a handle to it (PRIVATE).
 
@@ -28,6 +28,7 @@ ftp://ftp.ncbi.nih.gov/genbank/docs/
 
 from __future__ import print_function
 
+import sys
 import warnings
 import re
 from collections import OrderedDict
@@ -35,6 +36,29 @@ from Bio.Seq import Seq
 from Bio.SeqRecord import SeqRecord
 from Bio.Alphabet import generic_protein
 from Bio import BiopythonParserWarning
+from Bio._py3k import basestring
+
+
+# Sequence lines which can be handled in bulk by simply removing all the
+# digits, spaces and new lines. Anything else (e.g. blank lines, or bad
+# indentation) is left for the line by line code which issues warnings.
+_bad_genbank_sequence_line = re.compile(
+    r"^(?!(?=[^\n]*\S)(?:[ 0-9]{9} [^0-9\t\n\r\f\v]*|[ 0-9]{0,8}[0-9] *)\n)"
+    r"[^\n]*\n", re.MULTILINE)
+_bad_embl_sequence_line = re.compile(
+    r"^(?! {5}(?:[^0-9\s][^0-9\t\n\r\f\v]* )? *[0-9]+ *\n)[^\n]*\n",
+    re.MULTILINE)
+
+if sys.version_info[0] < 3:
+    def _strip_sequence(text):
+        """Remove digits, spaces and new lines from a block of sequence (PRIVATE)."""
+        return text.translate(None, "0123456789 \n")
+else:
+    _strip_sequence_table = str.maketrans("", "", "0123456789 \n")
+
+    def _strip_sequence(text):
+        """Remove digits, spaces and new lines from a block of sequence (PRIVATE)."""
+        return text.translate(_strip_sequence_table)
 
 
 class InsdcScanner(object):
@@ -139,7 +163,8 @@ class InsdcScanner(object):
         self.line = line
         return header_lines
 
-    def parse_features(self, skip=False):
+    def parse_features(self, skip=False, raw=False, feature_types=None,
+                       feature_qualifiers=None):
         """Return list of tuples for the features (if present).
 
         Each feature is returned as a tuple (key, location, qualifiers)
@@ -147,6 +172,15 @@ class InsdcScanner(object):
         "complement(join(490883..490885,1..879))") while qualifiers
         is a list of two string tuples (feature qualifier keys and values).
 
+        If raw is True, each feature is instead returned as a tuple
+        (key, lines) giving the feature key and the list of strings
+        expected by the parse_feature method, which is not called.
+
+        If feature_types is given (e.g. a set of feature keys), only those
+        features are returned, and the lines of the others are skipped
+        over. Likewise feature_qualifiers is passed to parse_feature to
+        limit the qualifiers returned (unless raw is True).
+
         Assumes you have already read to the start of the features table.
         """
         if self.line.rstrip() not in self.FEATURE_START_MARKERS:
@@ -204,17 +238,27 @@ class InsdcScanner(object):
                     feature_key = line[2:self.FEATURE_QUALIFIER_INDENT].strip()
                     feature_lines = [line[self.FEATURE_QUALIFIER_INDENT:]]
                 line = self.handle.readline()
+                if feature_types is not None and feature_key not in feature_types:
+                    # Not wanted, skip over the rest of the feature
+                    while line[:self.FEATURE_QUALIFIER_INDENT] == self.FEATURE_QUALIFIER_SPACER \
+                            or (line != '' and line.rstrip() == ""):
+                        line = self.handle.readline()
+                    continue
                 while line[:self.FEATURE_QUALIFIER_INDENT] == self.FEATURE_QUALIFIER_SPACER \
                         or (line != '' and line.rstrip() == ""):  # cope with blank lines in the midst of a feature
                     # Use strip to remove any harmless trailing white space AND and leading
                     # white space (e.g. out of spec files with too much indentation)
                     feature_lines.append(line[self.FEATURE_QUALIFIER_INDENT:].strip())
                     line = self.handle.readline()
-                features.append(self.parse_feature(feature_key, feature_lines))
+                if raw:
+                    features.append((feature_key, feature_lines))
+                else:
+                    features.append(self.parse_feature(feature_key, feature_lines,
+                                                       feature_qualifiers))
         self.line = line
         return features
 
-    def parse_feature(self, feature_key, lines):
+    def parse_feature(self, feature_key, lines, feature_qualifiers=None):
         r"""Parse a feature given as a list of strings into a tuple.
 
         Expects a feature as a list of strings, returns a tuple (key, location,
@@ -269,6 +313,10 @@ class InsdcScanner(object):
         transl_table) then the quotes are NOT removed.
 
         Note that no whitespace is removed.
+
+        If feature_qualifiers is given (e.g. a set of qualifier keys), only
+        the qualifiers with those keys are returned. The lines of the others
+        are stepped over without building up their values.
         """
         # Skip any blank lines
         iterator = (x for x in lines if x)
@@ -290,6 +338,7 @@ class InsdcScanner(object):
                     feature_location += line.strip()
 
             qualifiers = []
+            skipping = False
 
             for line_number, line in enumerate(iterator):
                 # check for extra wrapping of the location closing parentheses
@@ -300,6 +349,15 @@ class InsdcScanner(object):
                     i = line.find("=")
                     key = line[1:i]  # does not work if i==-1
                     value = line[i + 1:]  # we ignore 'value' if i==-1
+                    if feature_qualifiers is not None:
+                        skipping = (line[1:] if i == -1 else key) not in feature_qualifiers
+                        if skipping:
+                            # Step over the rest of a quoted value
+                            value = value.lstrip()
+                            if i != -1 and value[:1] == '"' and value != '"':
+                                while line[-1] != '"':
+                                    line = next(iterator)
+                            continue
                     if i and value.startswith(' ') and value.lstrip().startswith('"'):
                         warnings.warn("White space after equals in qualifier", BiopythonParserWarning)
                         value = value.lstrip()
@@ -328,6 +386,9 @@ class InsdcScanner(object):
                         # Unquoted
                         # if debug : print("Unquoted line %s:%s" % (key,value))
                         qualifiers.append((key, value))
+                elif skipping:
+                    # Unquoted continuation of an unwanted qualifier
+                    continue
                 else:
                     # Unquoted continuation
                     assert len(qualifiers) > 0
@@ -399,6 +460,24 @@ class InsdcScanner(object):
                 else:
                     consumer.feature_qualifier(q_key, q_value.replace("\n", " "))
 
+    def _feed_lazy_feature_table(self, consumer, raw_features,
+                                 feature_qualifiers=None):
+        """Handle the raw feature table (list of tuples), passing data to the consumer (PRIVATE).
+
+        Rather than the location and qualifiers, the consumer is given the
+        lines of each feature and a function to break them up later on.
+
+        Used by the parse_records() and parse() methods.
+        """
+        consumer.start_feature_table()
+        if feature_qualifiers is None:
+            parse_feature = self.parse_feature
+        else:
+            def parse_feature(feature_key, lines):
+                return self.parse_feature(feature_key, lines, feature_qualifiers)
+        for feature_key, feature_lines in raw_features:
+            consumer.lazy_feature(feature_key, feature_lines, parse_feature)
+
     def _feed_misc_lines(self, consumer, lines):
         """Handle any lines between features and sequence (list of strings), passing data to the consumer (PRIVATE).
 
@@ -408,7 +487,8 @@ class InsdcScanner(object):
         """
         pass
 
-    def feed(self, handle, consumer, do_features=True):
+    def feed(self, handle, consumer, do_features=True, lazy_features=False,
+             feature_types=None, feature_qualifiers=None):
         """Feed a set of data into the consumer.
 
         This method is intended for use with the "old" code in Bio.GenBank
@@ -418,6 +498,13 @@ class InsdcScanner(object):
          - consumer - The consumer that should be informed of events.
          - do_features - Boolean, should the features be parsed?
            Skipping the features can be much faster.
+         - lazy_features - Boolean, should the interpretation of each
+           feature's location and qualifiers be left until it is used?
+           The consumer must then provide a lazy_feature method.
+         - feature_types - Optional collection of feature keys (e.g. "CDS")
+           to keep, all other features are skipped over in the scanner.
+         - feature_qualifiers - Optional collection of qualifier keys (e.g.
+           "locus_tag") to keep, all other qualifiers are skipped over.
 
         Return values:
          - true  - Passed a record
@@ -441,8 +528,21 @@ class InsdcScanner(object):
         self._feed_header_lines(consumer, self.parse_header())
 
         # Features (common to both EMBL and GenBank):
-        if do_features:
-            self._feed_feature_table(consumer, self.parse_features(skip=False))
+        if isinstance(feature_types, basestring):
+            feature_types = [feature_types]
+        if feature_types is not None:
+            feature_types = frozenset(feature_types)
+        if isinstance(feature_qualifiers, basestring):
+            feature_qualifiers = [feature_qualifiers]
+        if feature_qualifiers is not None:
+            feature_qualifiers = frozenset(feature_qualifiers)
+        if do_features and lazy_features:
+            features = self.parse_features(raw=True, feature_types=feature_types)
+            self._feed_lazy_feature_table(consumer, features, feature_qualifiers)
+        elif do_features:
+            features = self.parse_features(feature_types=feature_types,
+                                           feature_qualifiers=feature_qualifiers)
+            self._feed_feature_table(consumer, features)
         else:
             self.parse_features(skip=True)  # ignore the data
 
@@ -459,9 +559,15 @@ class InsdcScanner(object):
         # And we are done
         return True
 
-    def parse(self, handle, do_features=True):
+    def parse(self, handle, do_features=True, lazy_features=False,
+              feature_types=None, feature_qualifiers=None):
         """Return a SeqRecord (with SeqFeatures if do_features=True).
 
+        With lazy_features=True the location and qualifiers of each
+        SeqFeature are only parsed when first used, while feature_types
+        and feature_qualifiers limit the features and qualifiers parsed
+        (see parse_records).
+
         See also the method parse_records() for use on multi-record files.
         """
         from Bio.GenBank import _FeatureConsumer
@@ -470,23 +576,37 @@ class InsdcScanner(object):
         consumer = _FeatureConsumer(use_fuzziness=1,
                                     feature_cleaner=FeatureValueCleaner())
 
-        if self.feed(handle, consumer, do_features):
+        if self.feed(handle, consumer, do_features, lazy_features,
+                     feature_types, feature_qualifiers):
             return consumer.data
         else:
             return None
 
-    def parse_records(self, handle, do_features=True):
+    def parse_records(self, handle, do_features=True, lazy_features=False,
+                      feature_types=None, feature_qualifiers=None):
         """Parse records, return a SeqRecord object iterator.
 
         Each record (from the ID/LOCUS line to the // line) becomes a SeqRecord
 
         The SeqRecord objects include SeqFeatures if do_features=True
 
+        With lazy_features=True each SeqFeature only holds its type and the
+        raw lines from the feature table until its location or qualifiers
+        are first used, at which point they are parsed (and any warnings or
+        errors about them raised). This is much faster when most of the
+        features of a record are never looked at.
+
+        If you know which features you need, give their keys (e.g. "CDS")
+        as feature_types, and only those features are parsed, the others
+        are skipped over in the file. Similarly feature_qualifiers limits
+        the qualifiers of the features to the given keys.
+
         This method is intended for use in Bio.SeqIO
         """
         # This is a generator function
         while True:
-            record = self.parse(handle, do_features)
+            record = self.parse(handle, do_features, lazy_features,
+                                feature_types, feature_qualifiers)
             if record is None:
                 break
             if record.id is None:
@@ -613,8 +733,25 @@ class EmblScanner(InsdcScanner):
             raise ValueError("Unexpected content after SQ or CO "
                              "line: %r" % self.line)
 
+        # Read in the whole sequence block, and if all the lines are well
+        # formed just remove the coordinates and spaces in one go.
+        seq_lines = []
+        line = self.line + "\n"
+        readline = self.handle.readline
+        while line:
+            if "/" in line and line.strip() == "//":
+                break
+            seq_lines.append(line)
+            line = readline()
+        block = "".join(seq_lines)
+        if line and not _bad_embl_sequence_line.search(block):
+            self.line = "//"
+            return misc_lines, _strip_sequence(block)
+
+        # Otherwise go through the lines one by one, with errors or warnings
+        lines = iter(seq_lines + [line])
+        line = next(lines)
         seq_lines = []
-        line = self.line
         while True:
             if not line:
                 raise ValueError("Premature end of file in sequence data")
@@ -638,7 +775,7 @@ class EmblScanner(InsdcScanner):
                 warnings.warn("EMBL sequence line missing coordinates",
                               BiopythonParserWarning)
                 seq_lines.append(line)
-            line = self.handle.readline()
+            line = next(lines)
         self.line = line
         return misc_lines, "".join(seq_lines).replace(" ", "")
 
@@ -1015,7 +1152,8 @@ class _ImgtScanner(EmblScanner):
         consumer.data_file_division(fields[4])
         self._feed_seq_length(consumer, fields[5])
 
-    def parse_features(self, skip=False):
+    def parse_features(self, skip=False, raw=False, feature_types=None,
+                       feature_qualifiers=None):
         """Return list of tuples for the features (if present).
 
         Each feature is returned as a tuple (key, location, qualifiers)
@@ -1023,8 +1161,14 @@ class _ImgtScanner(EmblScanner):
         "complement(join(490883..490885,1..879))") while qualifiers
         is a list of two string tuples (feature qualifier keys and values).
 
+        The feature_types and feature_qualifiers arguments are as for the
+        InsdcScanner, but raw features are not supported as the locations
+        in IMGT files may need to be fixed.
+
         Assumes you have already read to the start of the features table.
         """
+        if raw:
+            raise ValueError("Raw (lazy) features are not supported for IMGT files")
         if self.line.rstrip() not in self.FEATURE_START_MARKERS:
             if self.debug:
                 print("Didn't find any feature table")
@@ -1074,6 +1218,12 @@ class _ImgtScanner(EmblScanner):
                     location_start = line[25:].strip()
                 feature_lines = [location_start]
                 line = self.handle.readline()
+                if feature_types is not None and feature_key not in feature_types:
+                    # Not wanted, skip over the rest of the feature
+                    while line[:self.FEATURE_QUALIFIER_INDENT] == self.FEATURE_QUALIFIER_SPACER \
+                            or (line != '' and line.rstrip() == ""):
+                        line = self.handle.readline()
+                    continue
                 while line[:self.FEATURE_QUALIFIER_INDENT] == self.FEATURE_QUALIFIER_SPACER \
                         or line.rstrip() == "":  # cope with blank lines in the midst of a feature
                     # Use strip to remove any harmless trailing white space AND and leading
@@ -1082,7 +1232,7 @@ class _ImgtScanner(EmblScanner):
                     feature_lines.append(line[self.FEATURE_QUALIFIER_INDENT:].strip())
                     line = self.handle.readline()
                 feature_key, location, qualifiers = \
-                    self.parse_feature(feature_key, feature_lines)
+                    self.parse_feature(feature_key, feature_lines, feature_qualifiers)
                 # Try to handle known problems with IMGT locations here:
                 if ">" in location:
                     # Nasty hack for common IMGT bug, should be >123 not 123>
@@ -1134,9 +1284,29 @@ class GenBankScanner(InsdcScanner):
             raise ValueError("Eh? '%s'" % self.line)
 
         # Now just consume the sequence lines until reach the // marker
-        # or a CONTIG line
+        # or a CONTIG line, and if all the lines are well formed remove
+        # the coordinates and spaces in one go.
         seq_lines = []
         line = self.line
+        readline = self.handle.readline
+        while line:
+            if line[:6] == "CONTIG" or (line[:2] == "//" and line.rstrip() == "//"):
+                break
+            seq_lines.append(line)
+            line = readline()
+        block = "".join(seq_lines)
+        if not _bad_genbank_sequence_line.search(block):
+            if not line:
+                warnings.warn("Premature end of file in sequence data",
+                              BiopythonParserWarning)
+                line = '//'
+            self.line = line.rstrip()
+            return misc_lines, _strip_sequence(block)
+
+        # Otherwise go through the lines one by one, with warnings
+        lines = iter(seq_lines + [line])
+        line = next(lines)
+        seq_lines = []
         while True:
             if not line:
                 warnings.warn("Premature end of file in sequence data",
@@ -1147,7 +1317,7 @@ class GenBankScanner(InsdcScanner):
             if not line:
                 warnings.warn("Blank line in sequence data",
                               BiopythonParserWarning)
-                line = self.handle.readline()
+                line = next(lines)
                 continue
             if line == '//':
                 break
@@ -1162,7 +1332,7 @@ class GenBankScanner(InsdcScanner):
                 if len(line) > 9 and line[9:10] != ' ':
                     raise ValueError("Sequence line mal-formed, '%s'" % line)
             seq_lines.append(line[10:])  # remove spaces later
-            line = self.handle.readline()
+            line = next(lines)
 
         self.line = line
         # Seq("".join(seq_lines), self.alphabet)
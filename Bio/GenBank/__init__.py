@@ -43,6 +43,7 @@ from __future__ import print_function
 
 import re
 import sys  # for checking if Python 2
+from collections import OrderedDict
 
 # other Biopython stuff
 from Bio import SeqFeature
@@ -482,7 +483,8 @@ class RecordParser(object):
     instead.
     """
 
-    def __init__(self, debug_level=0):
+    def __init__(self, debug_level=0, feature_types=None,
+                 feature_qualifiers=None):
         """Initialize the parser.
 
         Arguments:
@@ -490,15 +492,23 @@ class RecordParser(object):
            debugging information the parser should spit out. By default we have
            no debugging info (the fastest way to do things), but if you want
            you can set this as high as two and see exactly where a parse fails.
+         - feature_types - Optional list of feature keys (e.g. "CDS") to
+           keep, all other features are skipped by the scanner.
+         - feature_qualifiers - Optional list of qualifier keys (e.g.
+           "locus_tag") to keep, all other qualifiers are skipped.
 
         """
         self._scanner = GenBankScanner(debug_level)
+        self._feature_types = feature_types
+        self._feature_qualifiers = feature_qualifiers
 
     def parse(self, handle):
         """Parse the specified handle into a GenBank record."""
         _consumer = _RecordConsumer()
 
-        self._scanner.feed(handle, _consumer)
+        self._scanner.feed(handle, _consumer,
+                           feature_types=self._feature_types,
+                           feature_qualifiers=self._feature_qualifiers)
         return _consumer.data
 
 
@@ -648,6 +658,7 @@ class _FeatureConsumer(_BaseGenBankConsumer):
         self._cur_reference = None
         self._cur_feature = None
         self._expected_size = None
+        self._interpreter = None
 
     def locus(self, locus_name):
         """Set the locus name is set as the name of the Sequence."""
@@ -1010,6 +1021,25 @@ class _FeatureConsumer(_BaseGenBankConsumer):
         self._cur_feature.type = content
         self.data.features.append(self._cur_feature)
 
+    def lazy_feature(self, key, lines, parse_feature):
+        """Add a feature whose location and qualifiers are parsed when used.
+
+        Arguments:
+         - key - the feature key, e.g. "CDS".
+         - lines - list of strings making up the rest of the feature.
+         - parse_feature - function taking the key and lines, returning the
+           key, location string and list of qualifiers (see the scanner's
+           parse_feature method).
+
+        """
+        if self._interpreter is None:
+            self._interpreter = _FeatureInterpreter(self, parse_feature)
+        feature = _LazySeqFeature.__new__(_LazySeqFeature)
+        feature.type = key
+        feature.id = "<unknown id>"
+        feature._raw = (self._interpreter, lines)
+        self.data.features.append(feature)
+
     def location(self, content):
         """Parse out location information from the location string.
 
@@ -1317,6 +1347,88 @@ class _FeatureConsumer(_BaseGenBankConsumer):
             self.data.seq = Seq(sequence, seq_alphabet)
 
 
+class _FeatureInterpreter(_FeatureConsumer):
+    """Parse the location and qualifiers of lazy features (PRIVATE).
+
+    This takes the sequence type and length (needed for the locations) from
+    the _FeatureConsumer of the record, but does not keep the consumer or
+    its SeqRecord.
+    """
+
+    def __init__(self, consumer, parse_feature):
+        _BaseGenBankConsumer.__init__(self)
+        self._use_fuzziness = consumer._use_fuzziness
+        self._feature_cleaner = consumer._feature_cleaner
+        self._seq_type = consumer._seq_type
+        self._expected_size = consumer._expected_size
+        self._cur_feature = None
+        self._parse_feature = parse_feature
+
+    def interpret(self, feature, lines):
+        """Set the location and qualifiers of the feature from its lines."""
+        key, location, qualifiers = self._parse_feature(feature.type, lines)
+        self._cur_feature = feature
+        try:
+            self.location(location)
+            for q_key, q_value in qualifiers:
+                if q_value is not None:
+                    q_value = q_value.replace("\n", " ")
+                self.feature_qualifier(q_key, q_value)
+        finally:
+            self._cur_feature = None
+
+
+class _LazySeqFeature(SeqFeature.SeqFeature):
+    """SeqFeature from a GenBank or EMBL file parsed on first use (PRIVATE).
+
+    Until its location or qualifiers are used, this only holds the feature
+    type and the raw lines from the feature table. These are then parsed
+    and the object becomes a plain SeqFeature.
+    """
+
+    def _interpret(self):
+        """Parse the raw feature table lines, and become a SeqFeature (PRIVATE)."""
+        interpreter, lines = self.__dict__.pop("_raw")
+        self.__class__ = SeqFeature.SeqFeature
+        self.location = None
+        self.qualifiers = OrderedDict()
+        interpreter.interpret(self, lines)
+
+    def _get_location(self):
+        """Get function for the location property (PRIVATE)."""
+        self._interpret()
+        return self.location
+
+    def _set_location(self, value):
+        """Set function for the location property (PRIVATE)."""
+        self._interpret()
+        self.location = value
+
+    location = property(fget=_get_location, fset=_set_location)
+
+    def _get_qualifiers(self):
+        """Get function for the qualifiers property (PRIVATE)."""
+        self._interpret()
+        return self.qualifiers
+
+    def _set_qualifiers(self, value):
+        """Set function for the qualifiers property (PRIVATE)."""
+        self._interpret()
+        self.qualifiers = value
+
+    qualifiers = property(fget=_get_qualifiers, fset=_set_qualifiers)
+
+    def __repr__(self):
+        """Represent the feature as a string for debugging."""
+        self._interpret()
+        return repr(self)
+
+    def __reduce_ex__(self, protocol):
+        """Parse the feature before it is pickled or copied (PRIVATE)."""
+        self._interpret()
+        return self.__reduce_ex__(protocol)
+
+
 class _RecordConsumer(_BaseGenBankConsumer):
     """Create a GenBank Record object from scanner generated information (PRIVATE)."""
 
@@ -1558,7 +1670,7 @@ class _RecordConsumer(_BaseGenBankConsumer):
         self._add_feature()
 
 
-def parse(handle):
+def parse(handle, feature_types=None, feature_qualifiers=None):
     """Iterate over GenBank formatted entries as Record objects.
 
     >>> from Bio import GenBank
@@ -1567,13 +1679,27 @@ def parse(handle):
     ...         print(record.accession)
     ['NC_000932']
 
+    If you only need some of the features, give their keys as feature_types
+    (and optionally the qualifier keys to keep as feature_qualifiers), and
+    the others are skipped over without being parsed:
+
+    >>> with open("GenBank/NC_000932.gb") as handle:
+    ...     for record in GenBank.parse(handle, feature_types=["tRNA"],
+    ...                                 feature_qualifiers=["product"]):
+    ...         feature = record.features[0]
+    ...         print("%i %s %s" % (len(record.features), feature.key, feature.location))
+    ...         print(feature.qualifiers[0].value)
+    37 tRNA complement(4..76)
+    "tRNA-His"
+
     To get SeqRecord objects use Bio.SeqIO.parse(..., format="gb")
     instead.
     """
-    return iter(Iterator(handle, RecordParser()))
+    return iter(Iterator(handle, RecordParser(
+        feature_types=feature_types, feature_qualifiers=feature_qualifiers)))
 
 
-def read(handle):
+def read(handle, feature_types=None, feature_qualifiers=None):
     """Read a handle containing a single GenBank entry as a Record object.
 
     >>> from Bio import GenBank
@@ -1582,10 +1708,13 @@ def read(handle):
     ...     print(record.accession)
     ['NC_000932']
 
+    The optional feature_types and feature_qualifiers arguments are as for
+    the parse function.
+
     To get a SeqRecord object use Bio.SeqIO.read(..., format="gb")
     instead.
     """
-    iterator = parse(handle)
+    iterator = parse(handle, feature_types, feature_qualifiers)
     try:
         first = next(iterator)
     except StopIteration:
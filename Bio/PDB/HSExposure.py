@@ -10,11 +10,56 @@ from __future__ import print_function
 import warnings
 from math import pi
 
+import numpy
+
+from Bio._py3k import basestring
+
 from Bio.PDB.AbstractPropertyMap import AbstractPropertyMap
 from Bio.PDB.Polypeptide import CaPPBuilder, is_aa
 from Bio.PDB.vectors import rotaxis
 
 
+def _ca_neighbors(ppl, radius, offset):
+    """Find the pairs of CA atoms within radius of each other (PRIVATE).
+
+    Returns a dictionary mapping (polypeptide index, residue index) to
+    an index in the array of CA coordinates, the CA coordinates, and two
+    index arrays with each neighbor pair in both orders. As for the
+    exposure, pairs of residues in the same polypeptide less than offset
+    residues apart are not included.
+    """
+    from Bio.PDB.kdtrees import KDTree
+
+    residues = {}
+    position = []
+    coords = []
+    for n, pp in enumerate(ppl):
+        for i, residue in enumerate(pp):
+            if not is_aa(residue) or not residue.has_id('CA'):
+                continue
+            residues[(n, i)] = len(coords)
+            position.append((n, i))
+            coords.append(residue['CA'].coord)
+    coords = numpy.array(coords, "d").reshape((-1, 3))
+    if len(coords) < 2:
+        empty = numpy.zeros(0, int)
+        return residues, coords, empty, empty
+    kdt = KDTree(coords, 10)
+    # Search with a slightly larger radius, the exact distance is tested below
+    neighbors = kdt.neighbor_search(radius * 1.000001)
+    index1 = numpy.array([neighbor.index1 for neighbor in neighbors], int)
+    index2 = numpy.array([neighbor.index2 for neighbor in neighbors], int)
+    index1, index2 = (numpy.concatenate([index1, index2]),
+                      numpy.concatenate([index2, index1]))
+    distance = numpy.sqrt(((coords[index2] - coords[index1]) ** 2).sum(1))
+    position = numpy.array(position, int)
+    # neighboring residues in the chain are ignored
+    flanking = ((position[index1, 0] == position[index2, 0]) &
+                (abs(position[index1, 1] - position[index2, 1]) <= offset))
+    keep = (distance < radius) & ~flanking
+    return residues, coords, index1[keep], index2[keep]
+
+
 class _AbstractHSExposure(AbstractPropertyMap):
     """Abstract class to calculate Half-Sphere Exposure (HSE).
 
@@ -52,10 +97,10 @@ class _AbstractHSExposure(AbstractPropertyMap):
         self.ca_cb_list = []
         ppb = CaPPBuilder()
         ppl = ppb.build_peptides(model)
-        hse_map = {}
-        hse_list = []
-        hse_keys = []
-        for pp1 in ppl:
+        residues, coords, index1, index2 = _ca_neighbors(ppl, radius, offset)
+        pcb_array = numpy.zeros((len(residues), 3))
+        results = []
+        for n, pp1 in enumerate(ppl):
             for i in range(0, len(pp1)):
                 if i == 0:
                     r1 = None
@@ -68,39 +113,37 @@ class _AbstractHSExposure(AbstractPropertyMap):
                     r3 = pp1[i + 1]
                 # This method is provided by the subclasses to calculate HSE
                 result = self._get_cb(r1, r2, r3)
-                if result is None:
+                if result is None or result[0] is None or \
+                        (n, i) not in residues:
                     # Missing atoms, or i==0, or i==len(pp1)-1
                     continue
                 pcb, angle = result
-                hse_u = 0
-                hse_d = 0
-                ca2 = r2['CA'].get_vector()
-                for pp2 in ppl:
-                    for j in range(0, len(pp2)):
-                        if pp1 is pp2 and abs(i - j) <= offset:
-                            # neighboring residues in the chain are ignored
-                            continue
-                        ro = pp2[j]
-                        if not is_aa(ro) or not ro.has_id('CA'):
-                            continue
-                        cao = ro['CA'].get_vector()
-                        d = (cao - ca2)
-                        if d.norm() < radius:
-                            if d.angle(pcb) < (pi / 2):
-                                hse_u += 1
-                            else:
-                                hse_d += 1
-                res_id = r2.get_id()
-                chain_id = r2.get_parent().get_id()
-                # Fill the 3 data structures
-                hse_map[(chain_id, res_id)] = (hse_u, hse_d, angle)
-                hse_list.append((r2, (hse_u, hse_d, angle)))
-                hse_keys.append((chain_id, res_id))
-                # Add to xtra
-                r2.xtra[hse_up_key] = hse_u
-                r2.xtra[hse_down_key] = hse_d
-                if angle_key:
-                    r2.xtra[angle_key] = angle
+                k = residues[(n, i)]
+                pcb_array[k] = pcb.get_array()
+                results.append((r2, k, angle))
+        # Neighbors in the direction of the CA-CB vector are in the upper
+        # half sphere (angle with the CA-CB vector smaller than pi/2)
+        up = numpy.einsum("ij,ij->i", coords[index2] - coords[index1],
+                          pcb_array[index1]) > 0
+        hse_u_array = numpy.bincount(index1[up], minlength=len(residues))
+        hse_d_array = numpy.bincount(index1[~up], minlength=len(residues))
+        hse_map = {}
+        hse_list = []
+        hse_keys = []
+        for r2, k, angle in results:
+            hse_u = int(hse_u_array[k])
+            hse_d = int(hse_d_array[k])
+            res_id = r2.get_id()
+            chain_id = r2.get_parent().get_id()
+            # Fill the 3 data structures
+            hse_map[(chain_id, res_id)] = (hse_u, hse_d, angle)
+            hse_list.append((r2, (hse_u, hse_d, angle)))
+            hse_keys.append((chain_id, res_id))
+            # Add to xtra
+            r2.xtra[hse_up_key] = hse_u
+            r2.xtra[hse_down_key] = hse_d
+            if angle_key:
+                r2.xtra[angle_key] = angle
         AbstractPropertyMap.__init__(self, hse_map, hse_keys, hse_list)
 
     def _get_cb(self, r1, r2, r3):
@@ -288,27 +331,17 @@ class ExposureCN(AbstractPropertyMap):
         assert(offset >= 0)
         ppb = CaPPBuilder()
         ppl = ppb.build_peptides(model)
+        residues, coords, index1, index2 = _ca_neighbors(ppl, radius, offset)
+        counts = numpy.bincount(index1, minlength=len(residues))
         fs_map = {}
         fs_list = []
         fs_keys = []
-        for pp1 in ppl:
+        for n, pp1 in enumerate(ppl):
             for i in range(0, len(pp1)):
-                fs = 0
-                r1 = pp1[i]
-                if not is_aa(r1) or not r1.has_id('CA'):
+                if (n, i) not in residues:
                     continue
-                ca1 = r1['CA']
-                for pp2 in ppl:
-                    for j in range(0, len(pp2)):
-                        if pp1 is pp2 and abs(i - j) <= offset:
-                            continue
-                        r2 = pp2[j]
-                        if not is_aa(r2) or not r2.has_id('CA'):
-                            continue
-                        ca2 = r2['CA']
-                        d = (ca2 - ca1)
-                        if d < radius:
-                            fs += 1
+                r1 = pp1[i]
+                fs = int(counts[residues[(n, i)]])
                 res_id = r1.get_id()
                 chain_id = r1.get_parent().get_id()
                 # Fill the 3 data structures
@@ -318,3 +351,69 @@ class ExposureCN(AbstractPropertyMap):
                 # Add to xtra
                 r1.xtra['EXP_CN'] = fs
         AbstractPropertyMap.__init__(self, fs_map, fs_keys, fs_list)
+
+
+def _exposure_worker(args):
+    """Calculate the exposure of one model or structure file (PRIVATE)."""
+    item, exposure_class, radius, offset = args
+    if isinstance(item, basestring):
+        if item.lower().endswith(".cif"):
+            from Bio.PDB.MMCIFParser import MMCIFParser
+            parser = MMCIFParser(QUIET=True)
+        else:
+            from Bio.PDB.PDBParser import PDBParser
+            parser = PDBParser(QUIET=True)
+        item = parser.get_structure("", item)
+    if item.get_level() == "S":
+        # Use the first model
+        item = item.child_list[0]
+    return exposure_class(item, radius, offset).property_dict
+
+
+def calc_exposure(items, exposure_class=HSExposureCB, radius=12.0, offset=0,
+                  processes=1, chunksize=1):
+    """Calculate the exposure of many models, optionally in a process pool.
+
+    Returns an iterator over dictionaries mapping (chain id, residue id)
+    to the exposure, in the same order as the items. The values are the
+    same as in the property_dict of the given exposure class
+    (HSExposureCA, HSExposureCB or ExposureCN). As with the exposure
+    classes, the xtra attributes of the residues of Model or Structure
+    items are updated when everything is calculated in the current
+    process; worker processes only update their own copies, so with more
+    than one process the residues passed in are left untouched.
+
+    Arguments:
+     - items - iterable of Model or Structure objects (the first model is
+       used), or file names of PDB or mmCIF (ending in .cif) files, which
+       are then parsed by the worker processes.
+     - exposure_class - HSExposureCA, HSExposureCB or ExposureCN.
+     - radius, offset - passed to the exposure class.
+     - processes - number of worker processes. With one process (the
+       default), everything is calculated in the current process, and
+       with None, the number of CPUs is used.
+     - chunksize - number of items sent to a worker process at once.
+
+    >>> from Bio.PDB.HSExposure import calc_exposure, ExposureCN
+    >>> files = ["PDB/1A8O.pdb", "PDB/1LCD.pdb"]
+    >>> cn_1a8o, cn_1lcd = calc_exposure(files, ExposureCN)
+    >>> print(cn_1a8o["A", (" ", 160, " ")])
+    22
+    >>> print(cn_1lcd["A", (" ", 10, " ")])
+    32
+
+    """
+    tasks = ((item, exposure_class, radius, offset) for item in items)
+    if processes == 1:
+        for task in tasks:
+            yield _exposure_worker(task)
+        return
+    import multiprocessing
+    pool = multiprocessing.Pool(processes)
+    try:
+        for result in pool.imap(_exposure_worker, tasks, chunksize):
+            yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
@@ -11,18 +11,19 @@ import numpy
 import warnings
 
 from Bio.File import as_handle
-from Bio._py3k import range
+from Bio._py3k import range, basestring
 
 from Bio.PDB.MMCIF2Dict import MMCIF2Dict
 from Bio.PDB.StructureBuilder import StructureBuilder
 from Bio.PDB.PDBExceptions import PDBConstructionException
 from Bio.PDB.PDBExceptions import PDBConstructionWarning
+from Bio.PDB.StructureCache import _load_cached, _save_cached
 
 
 class MMCIFParser(object):
     """Parse a mmCIF file and return a Structure object."""
 
-    def __init__(self, structure_builder=None, QUIET=False):
+    def __init__(self, structure_builder=None, QUIET=False, cache_dir=None):
         """Create a PDBParser object.
 
         The mmCIF parser calls a number of standard methods in an aggregated
@@ -35,6 +36,10 @@ class MMCIFParser(object):
          - QUIET - Evaluated as a Boolean. If true, warnings issued in constructing
            the SMCRA data will be suppressed. If false (DEFAULT), they will be shown.
            These warnings might be indicative of problems in the mmCIF file!
+         - cache_dir - optional directory name. If given, structures parsed
+           from a file name are stored there in a compact binary format (see
+           Bio.PDB.StructureCache), and loaded from there instead of being
+           parsed again as long as the mmCIF file is unchanged.
 
         """
         if structure_builder is not None:
@@ -46,6 +51,7 @@ class MMCIFParser(object):
         self.line_counter = 0
         self.build_structure = None
         self.QUIET = bool(QUIET)
+        self.cache_dir = cache_dir
 
     # Public methods
 
@@ -57,13 +63,23 @@ class MMCIFParser(object):
          - filename - name of mmCIF file, OR an open text mode file handle
 
         """
+        use_cache = self.cache_dir is not None and isinstance(filename, basestring)
+        if use_cache:
+            cached = _load_cached(self.cache_dir, filename, "MMCIFParser",
+                                  structure_id, self._structure_builder)
+            if cached is not None:
+                return cached[0]
+
         with warnings.catch_warnings():
             if self.QUIET:
                 warnings.filterwarnings("ignore", category=PDBConstructionWarning)
             self._mmcif_dict = MMCIF2Dict(filename)
             self._build_structure(structure_id)
 
-        return self._structure_builder.get_structure()
+        structure = self._structure_builder.get_structure()
+        if use_cache:
+            _save_cached(self.cache_dir, filename, "MMCIFParser", structure)
+        return structure
 
     # Private methods
 
@@ -223,7 +239,7 @@ class MMCIFParser(object):
 class FastMMCIFParser(object):
     """Parse an MMCIF file and return a Structure object."""
 
-    def __init__(self, structure_builder=None, QUIET=False):
+    def __init__(self, structure_builder=None, QUIET=False, cache_dir=None):
         """Create a FastMMCIFParser object.
 
         The mmCIF parser calls a number of standard methods in an aggregated
@@ -240,6 +256,10 @@ class FastMMCIFParser(object):
          - QUIET - Evaluated as a Boolean. If true, warnings issued in constructing
            the SMCRA data will be suppressed. If false (DEFAULT), they will be shown.
            These warnings might be indicative of problems in the mmCIF file!
+         - cache_dir - optional directory name. If given, structures parsed
+           from a file name are stored there in a compact binary format (see
+           Bio.PDB.StructureCache), and loaded from there instead of being
+           parsed again as long as the mmCIF file is unchanged.
 
         """
         if structure_builder is not None:
@@ -250,6 +270,7 @@ class FastMMCIFParser(object):
         self.line_counter = 0
         self.build_structure = None
         self.QUIET = bool(QUIET)
+        self.cache_dir = cache_dir
 
     # Public methods
 
@@ -261,13 +282,24 @@ class FastMMCIFParser(object):
          - filename - name of the mmCIF file OR an open filehandle
 
         """
+        use_cache = self.cache_dir is not None and isinstance(filename, basestring)
+        if use_cache:
+            cached = _load_cached(self.cache_dir, filename, "FastMMCIFParser",
+                                  structure_id, self._structure_builder)
+            if cached is not None:
+                return cached[0]
+
         with warnings.catch_warnings():
             if self.QUIET:
                 warnings.filterwarnings("ignore", category=PDBConstructionWarning)
             with as_handle(filename) as handle:
                 self._build_structure(structure_id, handle)
 
-        return self._structure_builder.get_structure()
+        structure = self._structure_builder.get_structure()
+        if use_cache:
+            _save_cached(self.cache_dir, filename, "FastMMCIFParser",
+                         structure)
+        return structure
 
     # Private methods
 
@@ -17,12 +17,14 @@ except ImportError:
         "Install NumPy if you want to use the PDB parser.")
 
 from Bio.File import as_handle
+from Bio._py3k import basestring
 
 from Bio.PDB.PDBExceptions import PDBConstructionException
 from Bio.PDB.PDBExceptions import PDBConstructionWarning
 
 from Bio.PDB.StructureBuilder import StructureBuilder
 from Bio.PDB.parse_pdb_header import _parse_pdb_header_list
+from Bio.PDB.StructureCache import _load_cached, _save_cached
 
 
 # If PDB spec says "COLUMNS 18-20" this means line[17:20]
@@ -32,7 +34,7 @@ class PDBParser(object):
     """Parse a PDB file and return a Structure object."""
 
     def __init__(self, PERMISSIVE=True, get_header=False,
-                 structure_builder=None, QUIET=False):
+                 structure_builder=None, QUIET=False, cache_dir=None):
         """Create a PDBParser object.
 
         The PDB parser call a number of standard methods in an aggregated
@@ -50,6 +52,10 @@ class PDBParser(object):
          - QUIET - Evaluated as a Boolean. If true, warnings issued in constructing
            the SMCRA data will be suppressed. If false (DEFAULT), they will be shown.
            These warnings might be indicative of problems in the PDB file!
+         - cache_dir - optional directory name. If given, structures parsed
+           from a file name are stored there in a compact binary format (see
+           Bio.PDB.StructureCache), and loaded from there instead of being
+           parsed again as long as the PDB file is unchanged.
 
         """
         # get_header is not used but is left in for API compatibility
@@ -62,6 +68,7 @@ class PDBParser(object):
         self.line_counter = 0
         self.PERMISSIVE = bool(PERMISSIVE)
         self.QUIET = bool(QUIET)
+        self.cache_dir = cache_dir
 
     # Public methods
 
@@ -73,6 +80,16 @@ class PDBParser(object):
          - file - name of the PDB file OR an open filehandle
 
         """
+        use_cache = self.cache_dir is not None and isinstance(file, basestring)
+        if use_cache:
+            cached = _load_cached(self.cache_dir, file, "PDBParser", id,
+                                  self.structure_builder)
+            if cached is not None:
+                structure, meta = cached
+                self.header = structure.header
+                self.trailer = meta["trailer"]
+                return structure
+
         with warnings.catch_warnings():
             if self.QUIET:
                 warnings.filterwarnings("ignore", category=PDBConstructionWarning)
@@ -89,6 +106,9 @@ class PDBParser(object):
             # Return the Structure instance
             structure = self.structure_builder.get_structure()
 
+        if use_cache:
+            _save_cached(self.cache_dir, file, "PDBParser", structure,
+                         self.trailer)
         return structure
 
     def get_header(self):
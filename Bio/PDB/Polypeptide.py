@@ -46,6 +46,24 @@ If you want to, you can include non-standard amino acids in the peptides:
 
 In this case the selenomethionines (the first and also seventh and sixth from
 last residues) have been shown as M (methionine) by the get_sequence method.
+
+The backbone geometry of a polypeptide (or of a whole batch of chains) can be
+calculated in one go from an array of backbone coordinates, rather than by
+calling calc_dihedral on Vector objects residue by residue:
+
+    >>> from Bio.PDB.Polypeptide import get_backbone_coords
+    >>> from Bio.PDB.Polypeptide import calc_backbone_geometry
+    >>> pp = ppb.build_peptides(structure)[0]
+    >>> coords = get_backbone_coords(pp)
+    >>> print(coords.shape)
+    (33, 3, 3)
+    >>> geometry = calc_backbone_geometry(coords)
+    >>> print("%.3f %.3f" % (geometry["phi"][1], geometry["psi"][1]))
+    -1.087 2.134
+    >>> phi, psi = pp.get_phi_psi_list()[1]
+    >>> print("%.3f %.3f" % (phi, psi))
+    -1.087 2.134
+
 """
 
 from __future__ import print_function
@@ -53,11 +71,14 @@ from Bio._py3k import basestring
 
 import warnings
 
+import numpy
+
 from Bio.Alphabet import generic_protein
 from Bio.Data import SCOPData
 from Bio.Seq import Seq
 from Bio.PDB.PDBExceptions import PDBException
 from Bio.PDB.vectors import calc_dihedral, calc_angle
+from Bio.PDB.vectors import calc_dihedrals, calc_angles
 
 
 standard_aa_names = ["ALA", "CYS", "ASP", "GLU", "PHE", "GLY", "HIS", "ILE", "LYS",
@@ -187,6 +208,109 @@ def is_aa(residue, standard=False):
         return residue in SCOPData.protein_letters_3to1
 
 
+_BACKBONE_ATOMS = ("N", "CA", "C")
+
+
+def get_backbone_coords(residues):
+    """Return the backbone coordinates of a list of residues as an array.
+
+    Returns an (L, 3, 3) array of floats with the coordinates of the N, CA
+    and C atoms of each of the L residues (e.g. a Polypeptide or Chain),
+    using NaN for missing atoms. For disordered atoms, the currently
+    selected alternative location is used.
+    """
+    residues = list(residues)
+    coords = numpy.full((len(residues), 3, 3), numpy.nan)
+    for i, residue in enumerate(residues):
+        child_dict = residue.child_dict
+        for j, name in enumerate(_BACKBONE_ATOMS):
+            atom = child_dict.get(name)
+            if atom is not None:
+                coords[i, j] = atom.coord
+    return coords
+
+
+def get_backbone_coords_from_arrays(arrays):
+    """Return the backbone coordinates from structure arrays.
+
+    The argument is a dictionary of arrays as given by the functions
+    structure_to_arrays and load_arrays in Bio.PDB.StructureCache. Returns
+    an (R, 3, 3) array with the N, CA and C coordinates of each of the R
+    rows of the residue table (NaN for missing atoms). Use the res_chain
+    array to split the result by chain. For disordered atoms the first
+    alternative location listed is used.
+    """
+    residue_index = numpy.asarray(arrays["atom_residue"])
+    names = numpy.asarray(arrays["name"])
+    coord = numpy.asarray(arrays["coord"])
+    coords = numpy.full((len(arrays["res_resname"]), 3, 3), numpy.nan)
+    for j, name in enumerate(_BACKBONE_ATOMS):
+        selected = numpy.flatnonzero(names == name)[::-1]
+        # In reverse so that the first atom with this name wins
+        coords[residue_index[selected], j] = coord[selected]
+    return coords
+
+
+def calc_backbone_geometry(coords):
+    """Calculate backbone dihedrals, angles and distances from coordinates.
+
+    The argument is an (..., L, 3, 3) array with the N, CA and C coordinates
+    of L consecutive residues (see get_backbone_coords), optionally with
+    leading dimensions for a batch of chains padded with NaN to the same
+    length. Returns a dictionary of (..., L) arrays, with one value per
+    residue and NaN where the value is undefined (at the chain ends, or
+    due to missing atoms). All angles are in radians:
+
+     - phi - dihedral C(i-1), N(i), CA(i), C(i)
+     - psi - dihedral N(i), CA(i), C(i), N(i+1)
+     - omega - dihedral CA(i-1), C(i-1), N(i), CA(i)
+     - tau - CA pseudo-dihedral CA(i-2), CA(i-1), CA(i), CA(i+1)
+     - theta - CA pseudo-angle CA(i-1), CA(i), CA(i+1)
+     - n_ca_c - angle N(i), CA(i), C(i)
+     - ca_c_n - angle CA(i), C(i), N(i+1)
+     - c_n_ca - angle C(i-1), N(i), CA(i)
+     - ca_ca - distance CA(i-1), CA(i)
+     - c_n - peptide bond length C(i-1), N(i)
+
+    The phi, psi, tau and theta values are placed at the same residues as
+    Polypeptide.get_phi_psi_list, get_tau_list and get_theta_list store
+    them in the residue xtra dictionaries.
+    """
+    coords = numpy.asarray(coords, float)
+    if coords.ndim < 3 or coords.shape[-2:] != (3, 3):
+        raise ValueError("Expected an (..., L, 3, 3) array of N, CA and C "
+                         "coordinates")
+    n = coords[..., 0, :]
+    ca = coords[..., 1, :]
+    c = coords[..., 2, :]
+    shape = coords.shape[:-2]
+    geometry = {}
+    for key in ("phi", "psi", "omega", "tau", "theta", "n_ca_c",
+                "ca_c_n", "c_n_ca", "ca_ca", "c_n"):
+        geometry[key] = numpy.full(shape, numpy.nan)
+    with numpy.errstate(invalid="ignore"):
+        geometry["phi"][..., 1:] = calc_dihedrals(c[..., :-1, :], n[..., 1:, :],
+                                                  ca[..., 1:, :], c[..., 1:, :])
+        geometry["psi"][..., :-1] = calc_dihedrals(n[..., :-1, :], ca[..., :-1, :],
+                                                   c[..., :-1, :], n[..., 1:, :])
+        geometry["omega"][..., 1:] = calc_dihedrals(ca[..., :-1, :], c[..., :-1, :],
+                                                    n[..., 1:, :], ca[..., 1:, :])
+        geometry["tau"][..., 2:-1] = calc_dihedrals(ca[..., :-3, :], ca[..., 1:-2, :],
+                                                    ca[..., 2:-1, :], ca[..., 3:, :])
+        geometry["theta"][..., 1:-1] = calc_angles(ca[..., :-2, :], ca[..., 1:-1, :],
+                                                   ca[..., 2:, :])
+        geometry["n_ca_c"][...] = calc_angles(n, ca, c)
+        geometry["ca_c_n"][..., :-1] = calc_angles(ca[..., :-1, :], c[..., :-1, :],
+                                                   n[..., 1:, :])
+        geometry["c_n_ca"][..., 1:] = calc_angles(c[..., :-1, :], n[..., 1:, :],
+                                                  ca[..., 1:, :])
+        geometry["ca_ca"][..., 1:] = numpy.linalg.norm(ca[..., 1:, :] - ca[..., :-1, :],
+                                                       axis=-1)
+        geometry["c_n"][..., 1:] = numpy.linalg.norm(n[..., 1:, :] - c[..., :-1, :],
+                                                     axis=-1)
+    return geometry
+
+
 class Polypeptide(list):
     """A polypeptide is simply a list of L{Residue} objects."""
 
@@ -275,6 +399,16 @@ class Polypeptide(list):
             res.xtra["THETA"] = theta
         return theta_list
 
+    def get_backbone_geometry(self):
+        """Return all backbone dihedrals, angles and distances as arrays.
+
+        This calculates the same phi, psi, tau and theta angles as the
+        get_phi_psi_list, get_tau_list and get_theta_list methods (without
+        storing them in the xtra dictionaries), and more, using array
+        operations. See calc_backbone_geometry for details.
+        """
+        return calc_backbone_geometry(get_backbone_coords(self))
+
     def get_sequence(self):
         """Return the AA sequence as a Seq object.
 
@@ -8,12 +8,21 @@ QCPSuperimposer finds the best rotation and translation to put
 two point sets on top of each other (minimizing the RMSD). This is
 eg. useful to superimpose crystal structures. QCP stands for
 Quaternion Characteristic Polynomial, which is used in the algorithm.
+
+For ensembles of coordinate sets (e.g. trajectory frames or decoys) the
+functions superimpose_ensemble and rmsd_matrix do the calculation for all
+coordinate sets in a single call to the C code, without holding the GIL,
+optionally divided over several threads.
 """
 
 from __future__ import print_function
 
-from numpy import dot, sqrt, array, matrix, inner, zeros
+import threading
+
+from numpy import dot, sqrt, array, matrix, inner, zeros, empty
+from numpy import ascontiguousarray
 from .qcprotmodule import FastCalcRMSDAndRotation
+from .qcprotmodule import CalcRMSDToReference, CalcRMSDMatrix
 
 
 class QCPSuperimposer(object):
@@ -136,3 +145,139 @@ class QCPSuperimposer(object):
         if self.rms is None:
             raise Exception("Nothing superimposed yet.")
         return self.rms
+
+
+# Batch functions for ensembles of coordinate sets
+
+
+def _center_ensemble(coords):
+    """Return (M, N, 3) coordinates centered on their centroids (PRIVATE)."""
+    coords = ascontiguousarray(coords, dtype=float)
+    if coords.ndim != 3 or coords.shape[2] != 3:
+        raise ValueError("Expected an (M, N, 3) coordinate array.")
+    centroids = coords.mean(axis=1)
+    return ascontiguousarray(coords - centroids[:, None, :]), centroids
+
+
+def _run_threads(target, args_list):
+    """Run target once for each argument tuple, each in its own thread (PRIVATE).
+
+    The C functions release the GIL, so the threads run in parallel.
+    """
+    if len(args_list) == 1:
+        target(*args_list[0])
+        return
+    errors = []
+
+    def run(*args):
+        try:
+            target(*args)
+        except Exception as err:
+            errors.append(err)
+
+    workers = [threading.Thread(target=run, args=args) for args in args_list]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    if errors:
+        raise errors[0]
+
+
+def superimpose_ensemble(coords, reference, threads=1):
+    """Superimpose each coordinate set of an ensemble onto a reference.
+
+    Arguments:
+     - coords - an (M, N, 3) array of M coordinate sets of N points
+     - reference - an (N, 3) array with the reference coordinates
+     - threads - number of threads to divide the calculation over
+
+    Returns a tuple (rms, rot, tran) of an (M,) array of RMSD values after
+    superposition, an (M, 3, 3) array of right-multiplying rotation matrices
+    and an (M, 3) array of translations, such that
+    ``dot(coords[i], rot[i]) + tran[i]`` puts coordinate set i on top of the
+    reference. This is equivalent to running a QCPSuperimposer for each
+    coordinate set, but the loop over coordinate sets is done in C.
+
+    >>> from numpy import array
+    >>> from Bio.PDB.QCPSuperimposer import superimpose_ensemble
+    >>> x = array([[51.65, -1.90, 50.07],
+    ...            [50.40, -1.23, 50.65],
+    ...            [50.68, -0.04, 51.54],
+    ...            [50.22, -0.02, 52.85]])
+    >>> y = array([[51.30, -2.99, 46.54],
+    ...            [51.09, -1.88, 47.58],
+    ...            [52.36, -1.20, 48.03],
+    ...            [52.71, -1.18, 49.38]])
+    >>> rms, rot, tran = superimpose_ensemble(array([y, x]), x)
+    >>> print("%.3f %.3f" % (rms[0], rms[1]))
+    0.003 0.000
+
+    """
+    coords, centroids = _center_ensemble(coords)
+    reference = ascontiguousarray(reference, dtype=float)
+    if reference.shape != coords.shape[1:]:
+        raise ValueError("Coordinate number/dimension mismatch.")
+    ref_centroid = reference.mean(axis=0)
+    reference = ascontiguousarray(reference - ref_centroid)
+    m = coords.shape[0]
+    rms = empty(m)
+    rot = empty((m, 3, 3))
+    threads = max(1, min(threads, m))
+    size = (m + threads - 1) // threads if m else 0
+    chunks = [slice(i, i + size) for i in range(0, m, size)] if m else []
+    _run_threads(CalcRMSDToReference,
+                 [(coords[c], reference, rms[c], rot[c]) for c in chunks])
+    # tran = av2 - dot(av1, rot), as in QCPSuperimposer.run
+    tran = ref_centroid - (centroids[:, :, None] * rot).sum(axis=1)
+    return rms, rot, tran
+
+
+def rmsd_matrix(coords, references=None, threads=1):
+    """Calculate the matrix of optimal RMSD values between coordinate sets.
+
+    Arguments:
+     - coords - an (M, N, 3) array of M coordinate sets of N points
+     - references - an optional (K, N, 3) array of K coordinate sets
+     - threads - number of threads to divide the calculation over
+
+    If references is None, the symmetric all-vs-all (M, M) RMSD matrix
+    of the ensemble is returned, calculating each pair only once.
+    Otherwise, the (M, K) matrix of RMSD values between each coordinate
+    set in coords and each coordinate set in references is returned.
+    Each value is the RMSD after optimal superposition of the pair.
+
+    >>> from numpy import array
+    >>> from Bio.PDB.QCPSuperimposer import rmsd_matrix
+    >>> x = array([[51.65, -1.90, 50.07],
+    ...            [50.40, -1.23, 50.65],
+    ...            [50.68, -0.04, 51.54],
+    ...            [50.22, -0.02, 52.85]])
+    >>> y = array([[51.30, -2.99, 46.54],
+    ...            [51.09, -1.88, 47.58],
+    ...            [52.36, -1.20, 48.03],
+    ...            [52.71, -1.18, 49.38]])
+    >>> rmsds = rmsd_matrix(array([x, y, x]))
+    >>> print(rmsds.shape)
+    (3, 3)
+    >>> print("%.3f %.3f %.3f" % (rmsds[0, 1], rmsds[1, 0], rmsds[0, 2]))
+    0.003 0.003 0.000
+
+    """
+    coords = _center_ensemble(coords)[0]
+    symmetric = references is None
+    if symmetric:
+        references = coords
+    else:
+        references = _center_ensemble(references)[0]
+        if references.shape[1:] != coords.shape[1:]:
+            raise ValueError("Coordinate number/dimension mismatch.")
+    m = coords.shape[0]
+    rmsds = empty((m, references.shape[0]))
+    threads = max(1, min(threads, m))
+    # Interleave the rows over the threads to balance the work of the
+    # (triangular) symmetric case
+    _run_threads(CalcRMSDMatrix,
+                 [(coords, references, rmsds, start, threads, symmetric)
+                  for start in range(threads)])
+    return rmsds
@@ -7,6 +7,8 @@
  * NOTE: following changes have been made to the original (qcprot.c):
  *  - introduced python bindings: change in method signature and return types
  *  - removed methods that are not used by this module (only one method retained)
+ *  - split the calculation from the python bindings, and added batch functions
+ *    for ensembles of coordinate sets
  *********************************************************************************
  *
  *  Copyright (c) 2009-2013 Pu Liu and Douglas L. Theobald
@@ -37,20 +39,25 @@
  *  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE. 
  *
  */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
 #include <stdio.h>
 #include <math.h>
 #include <stdlib.h>
-#include <Python.h>
 
-static PyObject* py_FastCalcRMSDAndRotation(PyObject* self, PyObject* args) {
+/* Calculate the RMSD, and optionally the rotation matrix and quaternion, from
+ * the inner product matrix A (row-major Sxx, Sxy, ..., Szz) of two centered
+ * coordinate sets.  If rot is NULL, only the RMSD is calculated.  Returns -1
+ * if minScore is positive and the RMSD is below it.  Does not touch any
+ * Python objects, so it can be called without holding the GIL.
+ */
+static double FastCalcRMSDAndRotation(const double A[9], double E0, double len,
+                                      double minScore, double rot[9], double q[4]) {
 	double Sxx, Sxy, Sxz, Syx, Syy, Syz, Szx, Szy, Szz;
-	double E0;
-	double len;
-	double minScore;
 	double Szz2, Syy2, Sxx2, Sxy2, Syz2, Sxz2, Syx2, Szy2, Szx2, SyzSzymSyySzz2,
 			Sxx2Syy2Szz2Syz2Szy2, Sxy2Sxz2Syx2Szx2, SxzpSzx, SyzpSzy, SxypSyx,
 			SyzmSzy, SxzmSzx, SxymSyx, SxxpSyy, SxxmSyy;
-	double C[4], rot[9];
+	double C[4];
 	int i;
 	double mxEigenV, rmsd;
 	double oldg = 0.0;
@@ -65,8 +72,9 @@ static PyObject* py_FastCalcRMSDAndRotation(PyObject* self, PyObject* args) {
 	double evecprec = 1e-6;
 	double evalprec = 1e-11;
 
-	/* parse the arguments  */
-	PyArg_ParseTuple(args, "dddddddddddd", &Sxx, &Sxy, &Sxz, &Syx, &Syy, &Syz, &Szx, &Szy, &Szz, &E0, &len, &minScore);
+	Sxx = A[0]; Sxy = A[1]; Sxz = A[2];
+	Syx = A[3]; Syy = A[4]; Syz = A[5];
+	Szx = A[6]; Szy = A[7]; Szz = A[8];
 
 	Sxx2 = Sxx * Sxx;
 	Syy2 = Syy * Syy;
@@ -134,10 +142,13 @@ static PyObject* py_FastCalcRMSDAndRotation(PyObject* self, PyObject* args) {
 
 	if (minScore > 0) {
 		if (rms < minScore)  {
-			return Py_BuildValue("dddddddddddddd", -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1);
+			return -1;
 		}
 	}
 
+	if (rot == NULL)
+		return rmsd;
+
 	a11 = SxxpSyy + Szz - mxEigenV;
 	a12 = SyzmSzy;
 	a13 = -SxzmSzx;
@@ -198,8 +209,9 @@ static PyObject* py_FastCalcRMSDAndRotation(PyObject* self, PyObject* args) {
 				if (qsqr < evecprec) {
 					rot[0] = rot[4] = rot[8] = 1.0;
 					rot[1] = rot[2] = rot[3] = rot[5] = rot[6] = rot[7] = 0.0;
+					q[0] = q1; q[1] = q2; q[2] = q3; q[3] = q4;
 
-					return Py_BuildValue("dddddddddddddd", rmsd, rot[0], rot[1], rot[2], rot[3], rot[4], rot[5], rot[6], rot[7], rot[8], q1, q2, q3, q4);
+					return rmsd;
 				}
 			}
 		}
@@ -232,12 +244,311 @@ static PyObject* py_FastCalcRMSDAndRotation(PyObject* self, PyObject* args) {
 	rot[6] = 2 * (zx + ay);
 	rot[7] = 2 * (yz - ax);
 	rot[8] = a2 - x2 - y2 + z2;
+	q[0] = q1; q[1] = q2; q[2] = q3; q[3] = q4;
+
+	return rmsd;
+}
+
+static PyObject* py_FastCalcRMSDAndRotation(PyObject* self, PyObject* args) {
+	double A[9];
+	double E0;
+	double len;
+	double minScore;
+	double rot[9], q[4];
+	double rmsd;
+
+	/* parse the arguments  */
+	if (!PyArg_ParseTuple(args, "dddddddddddd", &A[0], &A[1], &A[2], &A[3], &A[4], &A[5], &A[6], &A[7], &A[8], &E0, &len, &minScore))
+		return NULL;
+
+	rmsd = FastCalcRMSDAndRotation(A, E0, len, minScore, rot, q);
+	if (rmsd == -1)
+		return Py_BuildValue("dddddddddddddd", -1., -1., -1., -1., -1., -1., -1., -1., -1., -1., -1., -1., -1., -1.);
+
+	return Py_BuildValue("dddddddddddddd", rmsd, rot[0], rot[1], rot[2], rot[3], rot[4], rot[5], rot[6], rot[7], rot[8], q[0], q[1], q[2], q[3]);
+}
+
+/* Sum of squared coordinates of a centered (N, 3) coordinate set. */
+static double InnerProductSelf(const double* x, Py_ssize_t n) {
+	Py_ssize_t k;
+	double g = 0.0;
+	for (k = 0; k < 3 * n; k++)
+		g += x[k] * x[k];
+	return g;
+}
+
+/* Inner product matrix A = x^T y of two centered (N, 3) coordinate sets. */
+static void InnerProduct(double A[9], const double* x, const double* y, Py_ssize_t n) {
+	Py_ssize_t k;
+	double x0, x1, x2, y0, y1, y2;
+	A[0] = A[1] = A[2] = A[3] = A[4] = A[5] = A[6] = A[7] = A[8] = 0.0;
+	for (k = 0; k < n; k++) {
+		x0 = x[3 * k]; x1 = x[3 * k + 1]; x2 = x[3 * k + 2];
+		y0 = y[3 * k]; y1 = y[3 * k + 1]; y2 = y[3 * k + 2];
+		A[0] += x0 * y0; A[1] += x0 * y1; A[2] += x0 * y2;
+		A[3] += x1 * y0; A[4] += x1 * y1; A[5] += x1 * y2;
+		A[6] += x2 * y0; A[7] += x2 * y1; A[8] += x2 * y2;
+	}
+}
+
+static int
+double_buffer_converter(PyObject* object, Py_buffer* view, int ndim, int columns, const char* name)
+{
+	const int flags = PyBUF_C_CONTIGUOUS | PyBUF_FORMAT;
+	char datatype;
+	if (PyObject_GetBuffer(object, view, flags) == -1) {
+		PyErr_Format(PyExc_ValueError,
+			"%s is not a C-contiguous array", name);
+		return 0;
+	}
+	datatype = view->format[0];
+	switch (datatype) {
+		case '@':
+		case '=':
+		case '<':
+		case '>':
+		case '!': datatype = view->format[1]; break;
+		default: break;
+	}
+	if (datatype != 'd') {
+		PyErr_Format(PyExc_ValueError,
+			"%s has incorrect data format ('%c', expected 'd')",
+			name, datatype);
+		PyBuffer_Release(view);
+		view->obj = NULL;
+		return 0;
+	}
+	if (view->ndim != ndim) {
+		PyErr_Format(PyExc_ValueError,
+			"%s has incorrect rank (%d expected %d)",
+			name, view->ndim, ndim);
+		PyBuffer_Release(view);
+		view->obj = NULL;
+		return 0;
+	}
+	if (columns && view->shape[ndim - 1] != columns) {
+		PyErr_Format(PyExc_ValueError,
+			"%s should have %d columns (%zd columns found)",
+			name, columns, view->shape[ndim - 1]);
+		PyBuffer_Release(view);
+		view->obj = NULL;
+		return 0;
+	}
+	return 1;
+}
+
+static int
+coords_converter(PyObject* object, void* address)
+{
+	return double_buffer_converter(object, address, 3, 3, "coordinate array");
+}
+
+static int
+reference_converter(PyObject* object, void* address)
+{
+	return double_buffer_converter(object, address, 2, 3, "reference coordinate array");
+}
+
+static int
+rotations_converter(PyObject* object, void* address)
+{
+	Py_buffer* view = address;
+	if (object == Py_None) return 1;
+	if (!double_buffer_converter(object, view, 3, 3, "rotation array")) return 0;
+	if (view->shape[1] != 3) {
+		PyErr_SetString(PyExc_ValueError,
+			"rotation array should have shape (M, 3, 3)");
+		PyBuffer_Release(view);
+		view->obj = NULL;
+		return 0;
+	}
+	return 1;
+}
+
+static int
+rmsd_converter(PyObject* object, void* address)
+{
+	return double_buffer_converter(object, address, 1, 0, "RMSD array");
+}
+
+static int
+rmsd_matrix_converter(PyObject* object, void* address)
+{
+	return double_buffer_converter(object, address, 2, 0, "RMSD matrix");
+}
+
+static char CalcRMSDToReference__doc__[] =
+"    CalcRMSDToReference(coords, reference, rmsds, rotations)\n"
+"\n"
+"Superimpose each of the M centered (N, 3) coordinate sets in the\n"
+"(M, N, 3) array coords onto the centered (N, 3) array reference.\n"
+"The RMSD values are stored in the (M,) array rmsds and, unless\n"
+"rotations is None, the right-multiplying rotation matrices are\n"
+"stored in the (M, 3, 3) array rotations. All arrays must be\n"
+"C-contiguous arrays of doubles. The GIL is released during the\n"
+"calculation.\n";
+
+static PyObject* py_CalcRMSDToReference(PyObject* self, PyObject* args, PyObject* keywords) {
+	static char* kwlist[] = {"coords", "reference", "rmsds", "rotations", NULL};
+	Py_buffer coords, reference, rmsds, rotations;
+	PyObject* result = NULL;
+	Py_ssize_t i, a, b, m, n;
+	const double* x;
+	const double* y;
+	double* r;
+	double* rot;
+	double A[9], R[9], q[4];
+	double G1, G2;
+
+	coords.obj = NULL;
+	reference.obj = NULL;
+	rmsds.obj = NULL;
+	rotations.obj = NULL;
+	if (!PyArg_ParseTupleAndKeywords(args, keywords, "O&O&O&O&", kwlist,
+	                                 coords_converter, &coords,
+	                                 reference_converter, &reference,
+	                                 rmsd_converter, &rmsds,
+	                                 rotations_converter, &rotations)) goto exit;
+	m = coords.shape[0];
+	n = coords.shape[1];
+	if (reference.shape[0] != n) {
+		PyErr_SetString(PyExc_ValueError,
+			"Coordinate number mismatch between coordinates and reference.");
+		goto exit;
+	}
+	if (rmsds.shape[0] != m) {
+		PyErr_SetString(PyExc_ValueError, "size of RMSD array is inconsistent");
+		goto exit;
+	}
+	if (rotations.obj && rotations.shape[0] != m) {
+		PyErr_SetString(PyExc_ValueError, "size of rotation array is inconsistent");
+		goto exit;
+	}
+	x = coords.buf;
+	y = reference.buf;
+	r = rmsds.buf;
+	rot = rotations.obj ? rotations.buf : NULL;
+	Py_BEGIN_ALLOW_THREADS
+	G2 = InnerProductSelf(y, n);
+	for (i = 0; i < m; i++) {
+		G1 = InnerProductSelf(x + 3 * n * i, n);
+		InnerProduct(A, x + 3 * n * i, y, n);
+		if (rot) {
+			r[i] = FastCalcRMSDAndRotation(A, (G1 + G2) / 2, (double) n, -1.0, R, q);
+			/* store the transpose, i.e. the right-multiplying matrix */
+			for (a = 0; a < 3; a++)
+				for (b = 0; b < 3; b++)
+					rot[9 * i + 3 * a + b] = R[3 * b + a];
+		}
+		else {
+			r[i] = FastCalcRMSDAndRotation(A, (G1 + G2) / 2, (double) n, -1.0, NULL, NULL);
+		}
+	}
+	Py_END_ALLOW_THREADS
+	Py_INCREF(Py_None);
+	result = Py_None;
+exit:
+	if (coords.obj) PyBuffer_Release(&coords);
+	if (reference.obj) PyBuffer_Release(&reference);
+	if (rmsds.obj) PyBuffer_Release(&rmsds);
+	if (rotations.obj) PyBuffer_Release(&rotations);
+	return result;
+}
+
+static char CalcRMSDMatrix__doc__[] =
+"    CalcRMSDMatrix(coords, references, rmsds, start=0, step=1, symmetric=False)\n"
+"\n"
+"Calculate the optimal RMSD between each of the M centered (N, 3)\n"
+"coordinate sets in coords and each of the K centered (N, 3)\n"
+"coordinate sets in references, storing the values in the (M, K)\n"
+"array rmsds. Only rows start, start + step, start + 2 * step, ...\n"
+"are calculated, so that the work can be divided over threads.\n"
+"If symmetric is true, references must be the same ensemble as\n"
+"coords; only the upper triangle is calculated and then mirrored.\n"
+"The GIL is released during the calculation.\n";
+
+static PyObject* py_CalcRMSDMatrix(PyObject* self, PyObject* args, PyObject* keywords) {
+	static char* kwlist[] = {"coords", "references", "rmsds", "start", "step", "symmetric", NULL};
+	Py_buffer coords, references, rmsds;
+	PyObject* result = NULL;
+	Py_ssize_t start = 0;
+	Py_ssize_t step = 1;
+	int symmetric = 0;
+	Py_ssize_t i, j, m, k, n;
+	const double* x;
+	const double* y;
+	double* r;
+	double* G = NULL;
+	double A[9];
+	double G1;
 
-	return Py_BuildValue("dddddddddddddd", rmsd, rot[0], rot[1], rot[2], rot[3], rot[4], rot[5], rot[6], rot[7], rot[8], q1, q2, q3, q4);
+	coords.obj = NULL;
+	references.obj = NULL;
+	rmsds.obj = NULL;
+	if (!PyArg_ParseTupleAndKeywords(args, keywords, "O&O&O&|nni", kwlist,
+	                                 coords_converter, &coords,
+	                                 coords_converter, &references,
+	                                 rmsd_matrix_converter, &rmsds,
+	                                 &start, &step, &symmetric)) goto exit;
+	m = coords.shape[0];
+	n = coords.shape[1];
+	k = references.shape[0];
+	if (references.shape[1] != n) {
+		PyErr_SetString(PyExc_ValueError,
+			"Coordinate number mismatch between coordinates and references.");
+		goto exit;
+	}
+	if (rmsds.shape[0] != m || rmsds.shape[1] != k) {
+		PyErr_SetString(PyExc_ValueError, "size of RMSD matrix is inconsistent");
+		goto exit;
+	}
+	if (symmetric && m != k) {
+		PyErr_SetString(PyExc_ValueError, "symmetric RMSD matrix must be square");
+		goto exit;
+	}
+	if (start < 0 || step < 1) {
+		PyErr_SetString(PyExc_ValueError, "invalid start or step");
+		goto exit;
+	}
+	G = PyMem_Malloc((k > 0 ? k : 1) * sizeof(double));
+	if (!G) {
+		PyErr_NoMemory();
+		goto exit;
+	}
+	x = coords.buf;
+	y = references.buf;
+	r = rmsds.buf;
+	Py_BEGIN_ALLOW_THREADS
+	for (j = 0; j < k; j++)
+		G[j] = InnerProductSelf(y + 3 * n * j, n);
+	for (i = start; i < m; i += step) {
+		G1 = InnerProductSelf(x + 3 * n * i, n);
+		j = 0;
+		if (symmetric) {
+			r[k * i + i] = 0.0;
+			j = i + 1;
+		}
+		for (; j < k; j++) {
+			InnerProduct(A, x + 3 * n * i, y + 3 * n * j, n);
+			r[k * i + j] = FastCalcRMSDAndRotation(A, (G1 + G[j]) / 2, (double) n, -1.0, NULL, NULL);
+			if (symmetric) r[k * j + i] = r[k * i + j];
+		}
+	}
+	Py_END_ALLOW_THREADS
+	Py_INCREF(Py_None);
+	result = Py_None;
+exit:
+	if (G) PyMem_Free(G);
+	if (coords.obj) PyBuffer_Release(&coords);
+	if (references.obj) PyBuffer_Release(&references);
+	if (rmsds.obj) PyBuffer_Release(&rmsds);
+	return result;
 }
 
 static PyMethodDef qcprot_methods[] = {
         {"FastCalcRMSDAndRotation", (PyCFunction)py_FastCalcRMSDAndRotation, METH_VARARGS, "The method calculates the RMSD by solving for the most positive eigenvalue using the Newton-Raphson method. The rotation matrix is given by the corresponding eigenvector and is calculated by finding roots of the characteristic polynomial of the matrix. The method returns the rmsd, the rotation matrix and the 4 quaternions."},
+        {"CalcRMSDToReference", (PyCFunction)py_CalcRMSDToReference, METH_VARARGS | METH_KEYWORDS, CalcRMSDToReference__doc__},
+        {"CalcRMSDMatrix", (PyCFunction)py_CalcRMSDMatrix, METH_VARARGS | METH_KEYWORDS, CalcRMSDMatrix__doc__},
         {NULL, NULL, 0, NULL} 
 };
 
@@ -0,0 +1,396 @@
+# Copyright 2018 by Biopython contributors.  All rights reserved.
+#
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Compact binary storage of parsed structures, for use as an on-disk cache.
+
+Reparsing PDB or mmCIF text files is often the most expensive part of a
+repeated structural analysis. This module stores a parsed Structure object
+in a simple binary file with one column (NumPy array) per atom, residue,
+chain or model property, which can be memory-mapped back in.
+
+A file can be loaded either as a Structure object (rebuilt through a
+StructureBuilder, just like the text parsers do), or as a dictionary of
+memory-mapped arrays for code that only needs coordinates and labels:
+
+    >>> from Bio.PDB import PDBParser
+    >>> from Bio.PDB.StructureCache import save_structure, load_structure
+    >>> from Bio.PDB.StructureCache import load_arrays
+    >>> parser = PDBParser(QUIET=True)
+    >>> structure = parser.get_structure("1a8o", "PDB/1A8O.pdb")
+    >>> import tempfile, os
+    >>> filename = os.path.join(tempfile.mkdtemp(), "1a8o.bpdb")
+    >>> save_structure(structure, filename)
+    >>> cached = load_structure(filename)
+    >>> len(list(cached.get_atoms())) == len(list(structure.get_atoms()))
+    True
+    >>> info, arrays = load_arrays(filename)
+    >>> print(info["id"])
+    1a8o
+    >>> print(arrays["coord"].shape)
+    (644, 3)
+
+The PDBParser, MMCIFParser and FastMMCIFParser classes can use this as a
+transparent cache by passing a directory name as their cache_dir argument.
+
+File layout: an 8 byte magic string, the length of the metadata as an
+unsigned 64 bit little endian integer, the metadata as UTF-8 encoded JSON,
+followed by the raw array data. Each array starts at a multiple of 64 bytes,
+at the offset listed in the metadata together with its dtype and shape.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import warnings
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.PDB.StructureCache.")
+
+from Bio.PDB.PDBExceptions import PDBConstructionWarning
+from Bio.PDB.StructureBuilder import StructureBuilder
+
+
+_MAGIC = b"BioPDBc1"
+_ALIGNMENT = 64
+_FORMAT_VERSION = 1
+
+# Columns that may be missing from a structure (all atoms lacking them)
+_OPTIONAL_ATOM_ARRAYS = (("anisou", 6), ("siguij", 6), ("sigatm", 3))
+
+
+def structure_to_arrays(structure):
+    """Return a dictionary of NumPy arrays describing the structure.
+
+    The per-atom arrays (coord, bfactor, occupancy, serial_number, name,
+    fullname, altloc, element and atom_residue) have one row per atom,
+    including every alternative location of disordered atoms, in the
+    order of Residue.get_unpacked_list (except that an atom with a blank
+    altloc is listed before its alternatives). Missing occupancies are stored as
+    NaN, and missing serial numbers as -1. The anisou, siguij and sigatm
+    arrays are only present if at least one atom has them (NaN otherwise).
+
+    The hierarchy is stored as index arrays into the residue, chain and
+    model tables: atom_residue gives the row in the res_* arrays for each
+    atom, res_chain the row in the chain_* arrays for each residue, and
+    chain_model the row in the model_* arrays for each chain. Every
+    residue of a DisorderedResidue has its own row.
+    """
+    model_id, model_serial = [], []
+    chain_id, chain_model = [], []
+    res_hetfield, res_resseq, res_icode = [], [], []
+    res_resname, res_segid, res_chain = [], [], []
+    atoms, atom_residue = [], []
+    for model in structure:
+        model_id.append(model.id)
+        model_serial.append(model.serial_num)
+        for chain in model:
+            chain_id.append(chain.id)
+            chain_model.append(len(model_id) - 1)
+            for residue in chain:
+                if residue.is_disordered() == 2:
+                    residues = residue.disordered_get_list()
+                else:
+                    residues = [residue]
+                for residue in residues:
+                    hetfield, resseq, icode = residue.id
+                    res_hetfield.append(hetfield)
+                    res_resseq.append(resseq)
+                    res_icode.append(icode)
+                    res_resname.append(residue.resname)
+                    res_segid.append(residue.segid)
+                    res_chain.append(len(chain_id) - 1)
+                    residue_index = len(res_resname) - 1
+                    for atom in residue:
+                        if atom.is_disordered():
+                            # A blank altloc atom in a DisorderedAtom (an
+                            # error in the PDB file) goes first, so that
+                            # StructureBuilder rebuilds it the same way
+                            unpacked = sorted(atom.disordered_get_list(),
+                                              key=lambda a: a.altloc != " ")
+                        else:
+                            unpacked = [atom]
+                        for atom in unpacked:
+                            atoms.append(atom)
+                            atom_residue.append(residue_index)
+    arrays = {
+        "model_id": numpy.array(model_id, numpy.int64),
+        "model_serial": numpy.array(model_serial, numpy.int64),
+        "chain_id": numpy.array(chain_id, numpy.str_),
+        "chain_model": numpy.array(chain_model, numpy.int32),
+        "res_hetfield": numpy.array(res_hetfield, numpy.str_),
+        "res_resseq": numpy.array(res_resseq, numpy.int64),
+        "res_icode": numpy.array(res_icode, numpy.str_),
+        "res_resname": numpy.array(res_resname, numpy.str_),
+        "res_segid": numpy.array(res_segid, numpy.str_),
+        "res_chain": numpy.array(res_chain, numpy.int32),
+        "atom_residue": numpy.array(atom_residue, numpy.int32),
+        "name": numpy.array([a.name for a in atoms], numpy.str_),
+        "fullname": numpy.array([a.fullname for a in atoms], numpy.str_),
+        "altloc": numpy.array([a.altloc for a in atoms], numpy.str_),
+        "element": numpy.array([a.element or "" for a in atoms], numpy.str_),
+        "bfactor": numpy.array([a.bfactor for a in atoms], numpy.float64),
+        "occupancy": numpy.array([numpy.nan if a.occupancy is None
+                                  else a.occupancy for a in atoms],
+                                 numpy.float64),
+        "serial_number": numpy.array([-1 if a.serial_number is None
+                                      else a.serial_number for a in atoms],
+                                     numpy.int64),
+    }
+    coord = numpy.empty((len(atoms), 3), numpy.float32)
+    for i, atom in enumerate(atoms):
+        coord[i] = atom.coord
+    arrays["coord"] = coord
+    for key, width in _OPTIONAL_ATOM_ARRAYS:
+        values = [getattr(atom, "get_" + key)() for atom in atoms]
+        if any(value is not None for value in values):
+            column = numpy.full((len(atoms), width), numpy.nan, numpy.float32)
+            for i, value in enumerate(values):
+                if value is not None:
+                    column[i] = value
+            arrays[key] = column
+    return arrays
+
+
+def save_structure(structure, filename, header=None, trailer=None, source=None):
+    """Write the structure to a binary structure cache file.
+
+    Arguments:
+     - structure - the Structure object
+     - filename - name of the output file
+     - header - header dictionary to store, defaults to structure.header
+     - trailer - optional list of trailing lines (see PDBParser.get_trailer)
+     - source - optional dictionary describing the source file, used by
+       the parsers to check if a cache file is still valid
+
+    """
+    if header is None:
+        header = getattr(structure, "header", None)
+    arrays = structure_to_arrays(structure)
+    meta = {"version": _FORMAT_VERSION,
+            "id": structure.id,
+            "header": header,
+            "trailer": trailer,
+            "source": source,
+            "arrays": {}}
+    # Arrays are laid out after the metadata, whose size depends on the
+    # array offsets; so lay them out relative to the start of the data and
+    # then shift everything by the (aligned) metadata size.
+    layout = []
+    offset = 0
+    for key in sorted(arrays):
+        array = numpy.ascontiguousarray(arrays[key])
+        if array.dtype.kind in "iuf":
+            array = array.astype(array.dtype.newbyteorder("<"), copy=False)
+        layout.append((key, array, offset))
+        offset += _aligned(array.nbytes)
+    while True:
+        # The metadata length changes as the offsets grow, so iterate
+        # until the start of the data is stable.
+        start = _aligned(len(_MAGIC) + 8 + len(_encode_meta(meta)))
+        for key, array, offset in layout:
+            meta["arrays"][key] = {"dtype": array.dtype.str,
+                                   "shape": list(array.shape),
+                                   "offset": start + offset}
+        encoded = _encode_meta(meta)
+        if _aligned(len(_MAGIC) + 8 + len(encoded)) == start:
+            break
+    with open(filename, "wb") as handle:
+        handle.write(_MAGIC)
+        handle.write(struct.pack("<Q", len(encoded)))
+        handle.write(encoded)
+        handle.write(b"\0" * (start - len(_MAGIC) - 8 - len(encoded)))
+        for key, array, offset in layout:
+            handle.write(array.tobytes())
+            handle.write(b"\0" * (_aligned(array.nbytes) - array.nbytes))
+
+
+def load_metadata(filename):
+    """Return the metadata dictionary of a binary structure cache file.
+
+    This contains the structure id, header dictionary, trailer, source
+    description and the layout of the arrays.
+    """
+    with open(filename, "rb") as handle:
+        magic = handle.read(len(_MAGIC))
+        if magic != _MAGIC:
+            raise ValueError("%s is not a binary structure cache file"
+                             % filename)
+        size, = struct.unpack("<Q", handle.read(8))
+        meta = json.loads(handle.read(size).decode("utf-8"))
+    if meta["version"] != _FORMAT_VERSION:
+        raise ValueError("Unsupported binary structure cache version %r"
+                         % meta["version"])
+    return meta
+
+
+def load_arrays(filename, mmap=True):
+    """Load a binary structure cache file as arrays.
+
+    Returns a tuple of the metadata dictionary (see load_metadata) and a
+    dictionary of NumPy arrays (see structure_to_arrays). By default the
+    arrays are memory-mapped read-only, so only the data actually used
+    is read from disk.
+    """
+    meta = load_metadata(filename)
+    arrays = {}
+    if mmap:
+        data = numpy.memmap(filename, dtype=numpy.uint8, mode="r")
+    else:
+        data = numpy.fromfile(filename, dtype=numpy.uint8)
+    for key, layout in meta["arrays"].items():
+        dtype = numpy.dtype(layout["dtype"])
+        shape = tuple(layout["shape"])
+        count = int(numpy.prod(shape)) if shape else 1
+        start = layout["offset"]
+        buf = data[start:start + count * dtype.itemsize]
+        arrays[key] = numpy.ndarray(shape, dtype, buffer=buf)
+    return meta, arrays
+
+
+def load_structure(filename, structure_id=None, structure_builder=None):
+    """Load a Structure object from a binary structure cache file.
+
+    Arguments:
+     - filename - name of the binary structure cache file
+     - structure_id - id for the structure, defaults to the stored id
+     - structure_builder - an optional user implemented StructureBuilder
+       object, which is called in the same way as by the text parsers
+
+    """
+    meta, arrays = load_arrays(filename, mmap=False)
+    if structure_id is None:
+        structure_id = meta["id"]
+    if structure_builder is None:
+        structure_builder = StructureBuilder()
+    with warnings.catch_warnings():
+        # Any warnings were already given when the file was first parsed
+        warnings.simplefilter("ignore", PDBConstructionWarning)
+        _build_structure(structure_builder, structure_id, arrays)
+    structure_builder.set_header(meta["header"])
+    return structure_builder.get_structure()
+
+
+def _build_structure(structure_builder, structure_id, arrays):
+    """Replay the stored structure through a StructureBuilder (PRIVATE)."""
+    model_id = arrays["model_id"].tolist()
+    model_serial = arrays["model_serial"].tolist()
+    chain_id = arrays["chain_id"].tolist()
+    chain_model = arrays["chain_model"].tolist()
+    res_hetfield = arrays["res_hetfield"].tolist()
+    res_resseq = arrays["res_resseq"].tolist()
+    res_icode = arrays["res_icode"].tolist()
+    res_resname = arrays["res_resname"].tolist()
+    res_segid = arrays["res_segid"].tolist()
+    res_chain = arrays["res_chain"].tolist()
+    name = arrays["name"].tolist()
+    fullname = arrays["fullname"].tolist()
+    altloc = arrays["altloc"].tolist()
+    element = arrays["element"].tolist()
+    bfactor = arrays["bfactor"].tolist()
+    occupancy = arrays["occupancy"].tolist()
+    serial_number = arrays["serial_number"].tolist()
+    coord = numpy.array(arrays["coord"])
+    optional = [(key, numpy.array(arrays[key]))
+                for key, width in _OPTIONAL_ATOM_ARRAYS if key in arrays]
+    setters = {"anisou": structure_builder.set_anisou,
+               "siguij": structure_builder.set_siguij,
+               "sigatm": structure_builder.set_sigatm}
+
+    structure_builder.init_structure(structure_id)
+    current_model = current_chain = current_residue = None
+    for i, residue_index in enumerate(arrays["atom_residue"].tolist()):
+        if residue_index != current_residue:
+            current_residue = residue_index
+            chain_index = res_chain[residue_index]
+            if chain_index != current_chain:
+                current_chain = chain_index
+                model_index = chain_model[chain_index]
+                if model_index != current_model:
+                    current_model = model_index
+                    structure_builder.init_model(model_id[model_index],
+                                                 model_serial[model_index])
+                structure_builder.init_chain(chain_id[chain_index])
+            resname = res_resname[residue_index]
+            field = res_hetfield[residue_index]
+            if field.startswith("H_"):
+                field = "H"
+            structure_builder.init_seg(res_segid[residue_index])
+            structure_builder.init_residue(resname, field,
+                                           res_resseq[residue_index],
+                                           res_icode[residue_index])
+        occ = occupancy[i]
+        serial = serial_number[i]
+        structure_builder.init_atom(name[i], coord[i], bfactor[i],
+                                    None if occ != occ else occ,
+                                    altloc[i], fullname[i],
+                                    None if serial == -1 else serial,
+                                    element[i] or None)
+        for key, column in optional:
+            if not numpy.isnan(column[i, 0]):
+                setters[key](column[i])
+
+
+def _aligned(size):
+    """Round size up to a multiple of the array alignment (PRIVATE)."""
+    return (size + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _encode_meta(meta):
+    """Encode the metadata dictionary as JSON (PRIVATE)."""
+    return json.dumps(meta, default=str, sort_keys=True).encode("utf-8")
+
+
+def _cache_filename(cache_dir, filename, parser_name):
+    """Return the cache file name for a structure file and parser (PRIVATE)."""
+    key = "%s\0%s" % (parser_name, os.path.abspath(filename))
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    basename = os.path.basename(filename)
+    return os.path.join(cache_dir, "%s.%s.bpdb" % (basename, digest[:16]))
+
+
+def _source_info(filename):
+    """Describe a source file so changes to it can be detected (PRIVATE)."""
+    stat = os.stat(filename)
+    return {"path": os.path.abspath(filename),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime}
+
+
+def _load_cached(cache_dir, filename, parser_name, structure_id,
+                 structure_builder):
+    """Load a structure from the cache, or return None if not there (PRIVATE).
+
+    Returns a tuple of the structure and the metadata dictionary.
+    """
+    cache_file = _cache_filename(cache_dir, filename, parser_name)
+    try:
+        meta = load_metadata(cache_file)
+    except (IOError, OSError, ValueError):
+        return None
+    if meta["source"] != _source_info(filename):
+        # Stale cache file, the structure file has changed
+        return None
+    structure = load_structure(cache_file, structure_id, structure_builder)
+    return structure, meta
+
+
+def _save_cached(cache_dir, filename, parser_name, structure, trailer=None):
+    """Store a parsed structure in the cache directory (PRIVATE)."""
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+    cache_file = _cache_filename(cache_dir, filename, parser_name)
+    # Write to a temporary file first so that other processes never see
+    # a partially written cache file
+    tmp_file = "%s.%i.tmp" % (cache_file, os.getpid())
+    save_structure(structure, tmp_file, trailer=trailer,
+                   source=_source_info(filename))
+    # os.replace is atomic and also overwrites on Windows, but is Python 3 only
+    getattr(os, "replace", os.rename)(tmp_file, cache_file)
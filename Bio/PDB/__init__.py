@@ -31,6 +31,7 @@ from Bio.Data.SCOPData import protein_letters_3to1
 # IO of PDB files (including flexible selective output)
 from .PDBIO import PDBIO, Select
 from .mmcifio import MMCIFIO
+from .bulkio import BulkPDBIO, BulkMMCIFIO
 
 # Some methods to eg. get a list of Residues
 # from a list of Atoms.
@@ -42,6 +43,7 @@ from .Superimposer import Superimposer
 # 3D vector class
 from .vectors import Vector, calc_angle, calc_dihedral, refmat, rotmat, rotaxis
 from .vectors import vector_to_axis, m2rotaxis, rotaxis2m
+from .vectors import calc_angles, calc_dihedrals
 
 # Alignment module
 from .StructureAlignment import StructureAlignment
@@ -0,0 +1,616 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+
+"""Fast writing of PDB and mmCIF files from structure arrays.
+
+The PDBIO and MMCIFIO classes walk the Structure object atom by atom,
+calling the Select methods and formatting a line for each atom. The
+classes here instead work on the columnar arrays used by
+Bio.PDB.StructureCache (see structure_to_arrays and load_arrays), use a
+boolean atom mask instead of Select callbacks, and format each model in
+one go: the fixed part of every atom line is prepared once, and the
+coordinates of a whole model are filled in with a single string
+formatting operation. Each model is written as soon as it is formatted,
+and output files ending in .gz or .bz2 are compressed.
+
+This is particularly useful when writing many sets of coordinates for
+the same atoms, for example poses from a docking run:
+
+    >>> from Bio.PDB import PDBParser
+    >>> from Bio.PDB.bulkio import BulkPDBIO
+    >>> structure = PDBParser(QUIET=True).get_structure("1a8o", "PDB/1A8O.pdb")
+    >>> io = BulkPDBIO()
+    >>> io.set_structure(structure)
+    >>> coords = io.arrays["coord"]
+    >>> poses = (coords + shift for shift in (0.0, 1.0, 2.0))
+    >>> from Bio._py3k import StringIO
+    >>> handle = StringIO()
+    >>> io.save_models(handle, poses, mask=io.arrays["name"] == "CA")
+    >>> handle = StringIO(handle.getvalue())
+    >>> models = PDBParser(QUIET=True).get_structure("poses", handle)
+    >>> print(len(models))
+    3
+    >>> print(len(list(models[2].get_atoms())))
+    70
+
+Without a mask, BulkPDBIO.save and BulkMMCIFIO.save write the same
+files as PDBIO.save and MMCIFIO.save. The only exception is a disordered
+atom with both a blank and a non-blank altloc, where the atom with the
+blank altloc is written first.
+"""
+
+import bz2
+import gzip
+import warnings
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.PDB.bulkio.")
+
+from Bio import BiopythonWarning
+from Bio._py3k import basestring
+from Bio.Data.IUPACData import atom_weights
+from Bio.PDB.PDBIO import PDBIO
+from Bio.PDB.mmcifio import MMCIFIO, mmcif_order
+from Bio.PDB.StructureCache import structure_to_arrays
+
+
+# Used for the formatting helpers of MMCIFIO
+_mmcifio = MMCIFIO()
+
+_TER_FORMAT_STRING = "TER   %5i      %3s %c%4i%c                                                      \n"
+
+
+def _open_output(file, compression):
+    """Open the output file, return handle, close flag and encode flag (PRIVATE)."""
+    if isinstance(file, basestring):
+        if compression is None:
+            if file.endswith(".gz"):
+                compression = "gzip"
+            elif file.endswith(".bz2"):
+                compression = "bz2"
+        if compression is None:
+            return open(file, "w"), True, False
+        elif compression == "gzip":
+            return gzip.open(file, "wb"), True, True
+        elif compression == "bz2":
+            return bz2.BZ2File(file, "wb"), True, True
+    else:
+        if compression is None:
+            # text mode filehandle, I hope :-)
+            return file, False, False
+        elif compression == "gzip":
+            return gzip.GzipFile(fileobj=file, mode="wb"), True, True
+        elif compression == "bz2":
+            raise ValueError("bz2 compression requires a file name")
+    raise ValueError("Unknown compression %r, use 'gzip' or 'bz2'"
+                     % compression)
+
+
+class _BulkIO(object):
+    """Base class for the bulk writers (PRIVATE)."""
+
+    def __init__(self):
+        """Initialize the class."""
+        self.arrays = None
+        self.structure_id = ""
+
+    def set_structure(self, pdb_object):
+        """Set the Structure (or Model, Chain, Residue or Atom) to write."""
+        # Let PDBIO wrap partial structures in a Structure object
+        io = PDBIO()
+        io.set_structure(pdb_object)
+        self.set_arrays(structure_to_arrays(io.structure), io.structure.id)
+
+    def set_arrays(self, arrays, structure_id=""):
+        """Set the structure arrays to write.
+
+        Arguments:
+         - arrays - dictionary of arrays, as returned by structure_to_arrays
+           or load_arrays in Bio.PDB.StructureCache
+         - structure_id - id of the structure (used for the mmCIF data block)
+
+        """
+        self.arrays = arrays
+        self.structure_id = structure_id
+        atom_residue = numpy.asarray(arrays["atom_residue"])
+        atom_chain = numpy.asarray(arrays["res_chain"])[atom_residue]
+        self._atom_model = numpy.asarray(arrays["chain_model"])[atom_chain]
+        # Plain lists are much faster than arrays for per-atom access
+        self._lists = {}
+
+    def _list(self, key):
+        """Return one of the arrays as a cached list (PRIVATE)."""
+        try:
+            return self._lists[key]
+        except KeyError:
+            values = self._lists[key] = numpy.asarray(self.arrays[key]).tolist()
+            return values
+
+    def _selected_models(self, mask):
+        """Return (model index, atom indices) for each model (PRIVATE)."""
+        if self.arrays is None:
+            raise ValueError("Use set_structure or set_arrays to set the "
+                             "atoms to write out")
+        selected = numpy.ones(len(self._atom_model), bool)
+        if mask is not None:
+            mask = numpy.asarray(mask, bool)
+            if mask.shape != selected.shape:
+                raise ValueError("Atom mask should have one value per atom")
+            selected &= mask
+        result = []
+        for model_index in range(len(self.arrays["model_id"])):
+            atoms = numpy.flatnonzero(selected &
+                                      (self._atom_model == model_index))
+            result.append((model_index, atoms))
+        return result
+
+    def _topology(self, mask):
+        """Return atoms of the first model used by save_models (PRIVATE).
+
+        Returns the selected atom indices, their positions within the
+        first model, and the number of atoms in the first model.
+        """
+        model_index, atoms = self._selected_models(None)[0]
+        n_atoms = len(atoms)
+        selected = numpy.arange(n_atoms)
+        if mask is not None:
+            mask = numpy.asarray(mask, bool)
+            if mask.shape != atoms.shape:
+                raise ValueError("Atom mask should have one value per atom "
+                                 "of the first model")
+            atoms = atoms[mask]
+            selected = selected[mask]
+        return atoms, selected, n_atoms
+
+    @staticmethod
+    def _check_coords(coords, n_atoms):
+        """Return model coordinates as an array, checking the shape (PRIVATE)."""
+        coords = numpy.asarray(coords)
+        if coords.shape != (n_atoms, 3):
+            raise ValueError("Expected coordinates of shape (%i, 3), got %r"
+                             % (n_atoms, coords.shape))
+        return coords
+
+
+class BulkPDBIO(_BulkIO):
+    """Write structure arrays as a PDB file, formatting a model at a time.
+
+    This writes the same output as PDBIO, using an atom mask instead of
+    a Select object.
+    """
+
+    def __init__(self, use_model_flag=0):
+        """Create the BulkPDBIO object.
+
+        :param use_model_flag: if 1, force use of the MODEL record in output.
+        :type use_model_flag: int
+        """
+        _BulkIO.__init__(self)
+        self.use_model_flag = use_model_flag
+
+    def _get_template(self, atoms, preserve_atom_numbering):
+        """Return format string for the ATOM/HETATM/TER lines of the atoms (PRIVATE).
+
+        The coordinates are left as %8.3f placeholders.
+        """
+        atom_residue = self._list("atom_residue")
+        res_chain = self._list("res_chain")
+        res_hetfield = self._list("res_hetfield")
+        res_resseq = self._list("res_resseq")
+        res_icode = self._list("res_icode")
+        res_resname = self._list("res_resname")
+        res_segid = self._list("res_segid")
+        chain_id = self._list("chain_id")
+        fullname = self._list("fullname")
+        altloc = self._list("altloc")
+        element = self._list("element")
+        bfactor = self._list("bfactor")
+        occupancy = self._list("occupancy")
+        serial_number = self._list("serial_number")
+        elements = {}
+        names = {}
+        lines = []
+        atom_number = 1
+        current_chain = None
+        ter_line = None
+        missing_occupancy = 0
+        for i in atoms.tolist():
+            r = atom_residue[i]
+            c = res_chain[r]
+            if c != current_chain:
+                if current_chain is not None:
+                    lines.append(ter_line)
+                current_chain = c
+            hetfield = res_hetfield[r]
+            resname = res_resname[r]
+            resseq = res_resseq[r]
+            icode = res_icode[r]
+            if preserve_atom_numbering:
+                atom_number = serial_number[i]
+            try:
+                element_str = elements[element[i]]
+            except KeyError:
+                element_str = element[i].strip().upper()
+                if element_str:
+                    if element_str.capitalize() not in atom_weights:
+                        raise ValueError("Unrecognised element %r"
+                                         % element[i])
+                    element_str = element_str.rjust(2)
+                else:
+                    element_str = "  "
+                elements[element[i]] = element_str
+            key = (fullname[i], element_str)
+            try:
+                name = names[key]
+            except KeyError:
+                # Pad atom name as in PDBIO._get_atom_line
+                name = fullname[i].strip()
+                if len(name) < 4 and name[:1].isalpha() and \
+                        len(element_str.strip()) < 2:
+                    name = " " + name
+                names[key] = name
+            occ = occupancy[i]
+            if occ != occ:
+                occupancy_str = " " * 6
+                missing_occupancy += 1
+            else:
+                occupancy_str = "%6.2f" % occ
+            prefix = "%s%5i %-4s%c%3s %c%4i%c   " % (
+                "ATOM  " if hetfield == " " else "HETATM", atom_number,
+                name, altloc[i], resname, chain_id[c], resseq, icode)
+            suffix = "%s%6.2f      %4s%2s%2s\n" % (
+                occupancy_str, bfactor[i], res_segid[r], element_str, "  ")
+            lines.append(prefix.replace("%", "%%") + "%8.3f%8.3f%8.3f" +
+                         suffix.replace("%", "%%"))
+            if not preserve_atom_numbering:
+                atom_number += 1
+            ter_line = (_TER_FORMAT_STRING % (atom_number, resname,
+                                              chain_id[c], resseq,
+                                              icode)).replace("%", "%%")
+        if current_chain is not None:
+            lines.append(ter_line)
+        if missing_occupancy:
+            warnings.warn("Missing occupancy in %i atoms written as blank"
+                          % missing_occupancy, BiopythonWarning)
+        return "".join(lines)
+
+    def save(self, file, mask=None, write_end=True,
+             preserve_atom_numbering=False, compression=None):
+        """Save the structure arrays to a file.
+
+        :param file: output file, a file name or a text mode filehandle.
+        :type file: string or filehandle
+
+        :param mask: optional boolean array with one value per atom, only
+            atoms with a true value are written.
+
+        :param write_end: if True (default), write an END record at the end
+            of the file.
+        :type write_end: boolean
+
+        :param preserve_atom_numbering: if True, use the serial numbers of
+            the atoms, rather than numbering them from 1 (the default).
+        :type preserve_atom_numbering: boolean
+
+        :param compression: None, "gzip" or "bz2". If file is a file name
+            ending in .gz or .bz2 the output is compressed by default.
+            If file is a filehandle, it must be in binary mode to use
+            compression.
+        """
+        coord = self.arrays["coord"] if self.arrays is not None else None
+        models = self._selected_models(mask)
+        model_flag = len(models) > 1 or self.use_model_flag
+        model_serial = self._list("model_serial")
+        handle, close, encode = _open_output(file, compression)
+        try:
+            for model_index, atoms in models:
+                text = []
+                if model_flag:
+                    text.append("MODEL      %s\n" % model_serial[model_index])
+                if len(atoms):
+                    template = self._get_template(atoms,
+                                                  preserve_atom_numbering)
+                    text.append(template % tuple(
+                        numpy.asarray(coord[atoms]).ravel().tolist()))
+                    if model_flag:
+                        text.append("ENDMDL\n")
+                self._write(handle, "".join(text), encode)
+            if write_end:
+                self._write(handle, "END\n", encode)
+        finally:
+            if close:
+                handle.close()
+
+    def save_models(self, file, models, mask=None, write_end=True,
+                    preserve_atom_numbering=False, compression=None):
+        """Write several sets of coordinates for the atoms of the first model.
+
+        The atom records of the first model of the structure arrays are
+        formatted once, and then written out as a separate MODEL for each
+        set of coordinates, numbered from 1. The models argument can be
+        any iterable (e.g. a generator) of arrays of shape (N, 3), where
+        N is the number of atoms in the first model, and each model is
+        written out before the next one is taken from the iterable.
+
+        :param mask: optional boolean array with one value per atom of the
+            first model; only atoms with a true value are written.
+
+        See the save method for the other arguments.
+        """
+        atoms, selected, n_atoms = self._topology(mask)
+        template = self._get_template(atoms, preserve_atom_numbering)
+        handle, close, encode = _open_output(file, compression)
+        try:
+            for serial, coords in enumerate(models, 1):
+                coords = self._check_coords(coords, n_atoms)
+                text = ["MODEL      %s\n" % serial]
+                if len(atoms):
+                    text.append(template % tuple(
+                        coords[selected].ravel().tolist()))
+                    text.append("ENDMDL\n")
+                self._write(handle, "".join(text), encode)
+            if write_end:
+                self._write(handle, "END\n", encode)
+        finally:
+            if close:
+                handle.close()
+
+    @staticmethod
+    def _write(handle, text, encode):
+        if encode:
+            text = text.encode("utf-8")
+        handle.write(text)
+
+
+class BulkMMCIFIO(_BulkIO):
+    """Write structure arrays as an mmCIF file, formatting a model at a time.
+
+    This writes the same _atom_site table as MMCIFIO, using an atom mask
+    instead of a Select object.
+    """
+
+    # The _atom_site columns written, in the order used by MMCIFIO
+    _columns = [key for key in mmcif_order["_atom_site"]
+                if key not in ("pdbx_formal_charge", "auth_comp_id",
+                               "auth_atom_id")]
+    _coord_columns = ("Cartn_x", "Cartn_y", "Cartn_z")
+
+    def _get_values(self, atoms, preserve_atom_numbering):
+        """Return dict of column name to list of string values (PRIVATE).
+
+        This follows MMCIFIO._save_structure, except for the coordinates.
+        Residues without any atoms in the atom mask are skipped, as if
+        rejected by Select.accept_residue.
+        """
+        atom_residue = self._list("atom_residue")
+        res_chain = self._list("res_chain")
+        res_hetfield = self._list("res_hetfield")
+        res_resseq = self._list("res_resseq")
+        res_icode = self._list("res_icode")
+        res_resname = self._list("res_resname")
+        chain_id = self._list("chain_id")
+        chain_model = self._list("chain_model")
+        model_serial = self._list("model_serial")
+        name = self._list("name")
+        altloc = self._list("altloc")
+        element = self._list("element")
+        bfactor = self._list("bfactor")
+        occupancy = self._list("occupancy")
+        serial_number = self._list("serial_number")
+        values = dict((key, []) for key in self._columns
+                      if key not in self._coord_columns)
+        current_model = current_chain = current_residue = None
+        for i in atoms.tolist():
+            r = atom_residue[i]
+            if r != current_residue:
+                current_residue = r
+                c = res_chain[r]
+                if c != current_chain:
+                    current_chain = c
+                    m = chain_model[c]
+                    if m != current_model:
+                        current_model = m
+                        serial = model_serial[m]
+                        model_n = "1" if serial == 0 else str(serial)
+                        entity_id = 0
+                        atom_number = 1
+                    chain = chain_id[c]
+                    if chain == " ":
+                        chain = "."
+                    residue_number = 1
+                    prev_residue_type = ""
+                    prev_resname = ""
+                if res_hetfield[r] == " ":
+                    residue_type = "ATOM"
+                    label_seq_id = str(residue_number)
+                    residue_number += 1
+                else:
+                    residue_type = "HETATM"
+                    label_seq_id = "."
+                resseq = str(res_resseq[r])
+                icode = res_icode[r]
+                if icode == " ":
+                    icode = "?"
+                resname = res_resname[r]
+                if residue_type != prev_residue_type or \
+                        (residue_type == "HETATM" and resname != prev_resname):
+                    entity_id += 1
+                prev_residue_type = residue_type
+                prev_resname = resname
+                label_asym_id = _mmcifio._get_label_asym_id(entity_id)
+            values["group_PDB"].append(residue_type)
+            if preserve_atom_numbering:
+                atom_number = serial_number[i]
+                if atom_number == -1:
+                    atom_number = None
+            values["id"].append(str(atom_number))
+            if not preserve_atom_numbering:
+                atom_number += 1
+            values["type_symbol"].append(element[i].strip() or "?")
+            values["label_atom_id"].append(name[i].strip())
+            values["label_alt_id"].append("." if altloc[i] == " " else altloc[i])
+            values["label_comp_id"].append(resname.strip())
+            values["label_asym_id"].append(label_asym_id)
+            values["label_entity_id"].append("?")
+            values["label_seq_id"].append(label_seq_id)
+            values["pdbx_PDB_ins_code"].append(icode)
+            occ = occupancy[i]
+            values["occupancy"].append(str(None if occ != occ else occ))
+            values["B_iso_or_equiv"].append(str(bfactor[i]))
+            values["auth_seq_id"].append(resseq)
+            values["auth_asym_id"].append(chain)
+            values["pdbx_PDB_model_num"].append(model_n)
+        return values
+
+    @staticmethod
+    def _column_width(values):
+        """Return the width of a column as calculated by MMCIFIO (PRIVATE)."""
+        width = 0
+        for val in set(values):
+            len_val = len(val)
+            if _mmcifio._requires_quote(val) and \
+                    not _mmcifio._requires_newline(val):
+                len_val += 2
+            if len_val > width:
+                width = len_val
+        return width
+
+    @staticmethod
+    def _coord_widths(coords):
+        """Return the widths of the %.3f formatted coordinate columns (PRIVATE)."""
+        if not len(coords):
+            return [0, 0, 0]
+        # The length of "%.3f" % x only grows with the magnitude of x, so
+        # the widest value is either the minimum or the maximum
+        return [max(len("%.3f" % col.min()), len("%.3f" % col.max()))
+                for col in numpy.asarray(coords, float).T]
+
+    def _get_template(self, atoms, values, widths, start=0, end=None):
+        """Return format string for the rows of the given atoms (PRIVATE)."""
+        if end is None:
+            end = len(atoms)
+        columns = []
+        for key in self._columns:
+            if key in self._coord_columns:
+                columns.append(None)
+                continue
+            formatted = {}
+            width = widths[key] + 1
+            column = []
+            for val in values[key][start:end]:
+                try:
+                    column.append(formatted[val])
+                except KeyError:
+                    text = _mmcifio._format_mmcif_col(val, width)
+                    text = formatted[val] = text.replace("%", "%%")
+                    column.append(text)
+            columns.append(column)
+        coord_format = dict((key, "%%-%i.3f" % (widths[key] + 1))
+                            for key in self._coord_columns)
+        rows = []
+        for k in range(end - start):
+            row = []
+            for key, column in zip(self._columns, columns):
+                if column is None:
+                    row.append(coord_format[key])
+                else:
+                    row.append(column[k])
+            row.append("\n")
+            rows.append("".join(row))
+        return "".join(rows)
+
+    def _write_header(self, handle, encode):
+        """Write the data block name and the _atom_site keys (PRIVATE)."""
+        structure_id = self.structure_id
+        for c in ["#", "$", "'", "\"", "[", "]", " ", "\t", "\n"]:
+            structure_id = structure_id.replace(c, "")
+        text = []
+        if structure_id:
+            text.append("data_" + structure_id + "\n#\n")
+        text.append("loop_\n")
+        for key in self._columns:
+            text.append("_atom_site." + key + "\n")
+        self._write(handle, "".join(text), encode)
+
+    def save(self, file, mask=None, preserve_atom_numbering=False,
+             compression=None):
+        """Save the structure arrays to a file.
+
+        The column widths are calculated over all models first (as in
+        MMCIFIO), and then the rows are formatted and written a model at
+        a time. See BulkPDBIO.save for the arguments.
+        """
+        coord = self.arrays["coord"] if self.arrays is not None else None
+        models = self._selected_models(mask)
+        atoms = numpy.concatenate([a for m, a in models]) if models \
+            else numpy.zeros(0, int)
+        values = self._get_values(atoms, preserve_atom_numbering)
+        if not len(atoms):
+            raise ValueError("No atoms selected to write out")
+        widths = dict((key, self._column_width(values[key]))
+                      for key in values)
+        coords = numpy.asarray(coord[atoms])
+        widths.update(zip(self._coord_columns, self._coord_widths(coords)))
+        handle, close, encode = _open_output(file, compression)
+        try:
+            self._write_header(handle, encode)
+            start = 0
+            for model_index, model_atoms in models:
+                end = start + len(model_atoms)
+                if end > start:
+                    template = self._get_template(atoms, values, widths,
+                                                  start, end)
+                    self._write(handle, template % tuple(
+                        coords[start:end].ravel().tolist()), encode)
+                start = end
+            self._write(handle, "#\n", encode)
+        finally:
+            if close:
+                handle.close()
+
+    def save_models(self, file, models, mask=None,
+                    preserve_atom_numbering=False, compression=None):
+        """Write several sets of coordinates for the atoms of the first model.
+
+        Like BulkPDBIO.save_models, the rows of the first model are
+        formatted once, and each set of coordinates is written out as a
+        model (numbered from 1) of a single _atom_site table as soon as it
+        is taken from the iterable. As the coordinates are not known in
+        advance, the coordinate columns may not line up between models.
+        """
+        atoms, selected, n_atoms = self._topology(mask)
+        if not len(atoms):
+            raise ValueError("No atoms selected to write out")
+        values = self._get_values(atoms, preserve_atom_numbering)
+        # Put a placeholder in the model number column, which is the last
+        # column and only contains the model number in each model
+        values["pdbx_PDB_model_num"] = ["\0"] * len(atoms)
+        widths = dict((key, self._column_width(values[key]))
+                      for key in values)
+        handle, close, encode = _open_output(file, compression)
+        try:
+            self._write_header(handle, encode)
+            template = None
+            template_widths = None
+            for serial, coords in enumerate(models, 1):
+                coords = self._check_coords(coords, n_atoms)[selected]
+                coord_widths = self._coord_widths(coords)
+                if template is None or coord_widths != template_widths:
+                    template_widths = coord_widths
+                    widths.update(zip(self._coord_columns, coord_widths))
+                    template = self._get_template(atoms, values, widths)
+                text = template.replace("\0 ", "%i " % serial)
+                self._write(handle, text % tuple(coords.ravel().tolist()),
+                            encode)
+            self._write(handle, "#\n", encode)
+        finally:
+            if close:
+                handle.close()
+
+    _write = staticmethod(BulkPDBIO._write)
@@ -223,6 +223,64 @@ def calc_dihedral(v1, v2, v3, v4):
     return angle
 
 
+def calc_angles(p1, p2, p3):
+    """Calculate many angles at once from arrays of coordinates.
+
+    This is the array version of calc_angle, for (..., 3) arrays of
+    coordinates instead of Vector objects. The angles at p2 are returned
+    in radians as an array of shape (...), with NaN where any of the
+    coordinates is NaN (e.g. for missing atoms).
+
+    >>> import numpy
+    >>> from Bio.PDB.vectors import calc_angles
+    >>> p1 = numpy.array([[1.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+    >>> p2 = numpy.zeros((2, 3))
+    >>> p3 = numpy.array([[0.0, 1.0, 0.0], [-1.0, 0.0, 0.0]])
+    >>> print("%.4f %.4f" % tuple(calc_angles(p1, p2, p3)))
+    1.5708 3.1416
+
+    """
+    v1 = numpy.asarray(p1, float) - p2
+    v3 = numpy.asarray(p3, float) - p2
+    # atan2 of the cross and dot products is accurate near 0 and pi
+    cross = numpy.linalg.norm(numpy.cross(v1, v3), axis=-1)
+    dot = (v1 * v3).sum(axis=-1)
+    return numpy.arctan2(cross, dot)
+
+
+def calc_dihedrals(p1, p2, p3, p4):
+    """Calculate many dihedral angles at once from arrays of coordinates.
+
+    This is the array version of calc_dihedral, for (..., 3) arrays of
+    coordinates instead of Vector objects. The dihedral angles are
+    returned in radians in ]-pi, pi] as an array of shape (...), with
+    NaN where any of the coordinates is NaN (e.g. for missing atoms).
+
+    >>> import numpy
+    >>> from Bio.PDB.vectors import calc_dihedrals, calc_dihedral, Vector
+    >>> p = numpy.array([[1.0, 0.0, 0.0], [0.0, 0.0, 0.0],
+    ...                  [0.0, 1.0, 0.0], [0.0, 1.0, 1.0]])
+    >>> print("%.4f" % calc_dihedrals(p[0], p[1], p[2], p[3]))
+    -1.5708
+    >>> print("%.4f" % calc_dihedral(*[Vector(x) for x in p]))
+    -1.5708
+
+    """
+    b0 = numpy.asarray(p1, float) - p2
+    b1 = numpy.asarray(p3, float) - p2
+    b2 = numpy.asarray(p4, float) - p3
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        b1 = b1 / numpy.linalg.norm(b1, axis=-1)[..., None]
+    # Components of b0 and b2 perpendicular to the central bond
+    v = b0 - (b0 * b1).sum(axis=-1)[..., None] * b1
+    w = b2 - (b2 * b1).sum(axis=-1)[..., None] * b1
+    x = (v * w).sum(axis=-1)
+    y = (numpy.cross(b1, v) * w).sum(axis=-1)
+    angle = numpy.arctan2(y, x)
+    # arctan2 gives [-pi, pi], but calc_dihedral gives ]-pi, pi]
+    return numpy.where(angle == -numpy.pi, numpy.pi, angle)
+
+
 class Vector(object):
     """3D vector."""
 
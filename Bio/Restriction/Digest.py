@@ -0,0 +1,184 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Simulate restriction digests with many enzyme combinations.
+
+The catalyse method of the restriction enzymes returns the fragments of a
+digest as sequences, which is slow when only the sizes of the fragments
+are needed, for example to compare many double digests when designing a
+ddRAD or GBS experiment. The Digest class searches the sequence once with
+a RestrictionBatch, keeps the cut positions of each enzyme as an array,
+and returns the fragments of any combination of these enzymes as arrays
+of coordinates, without building any sequences:
+
+>>> from Bio.Seq import Seq
+>>> from Bio.Restriction import RestrictionBatch, EcoRI, MseI, PstI
+>>> from Bio.Restriction.Digest import Digest
+>>> seq = Seq("TTAAGAATTCGGGCTGCAGGGTTAACCCGAATTCAA")
+>>> digest = Digest(RestrictionBatch([EcoRI, MseI, PstI]), seq)
+>>> print(digest.cuts(EcoRI))
+[ 5 29]
+>>> starts, ends = digest.fragments([EcoRI, PstI])
+>>> print(starts)
+[ 0  5 18 29]
+>>> print(ends)
+[ 5 18 29 36]
+>>> print(digest.lengths([EcoRI, PstI]))
+[ 5 13 11  7]
+
+The coordinates are Python style (zero based, end exclusive), so the first
+fragment above is seq[0:5]. All the combinations of a number of enzymes
+can be digested in turn, reusing the cut positions of each enzyme:
+
+>>> for enzymes, starts, ends in digest.combinations(2):
+...     lengths = ends - starts
+...     print("%s %i" % ("+".join(map(str, enzymes)), len(lengths)))
+...
+EcoRI+MseI 5
+EcoRI+PstI 4
+MseI+PstI 4
+
+Which enzyme produced each end of the fragments is given by the
+end_enzymes method, for example to keep only the fragments with one end
+of each kind (as sequenced in a ddRAD experiment):
+
+>>> left, right = digest.end_enzymes([EcoRI, MseI])
+>>> print(left)
+[-1  1  0  1  0]
+>>> print(right)
+[ 1  0  1  0 -1]
+"""
+
+import itertools
+
+from Bio.Restriction.Restriction import RestrictionBatch, RestrictionType
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class Digest(object):
+    """Fragments of a sequence digested by combinations of enzymes.
+
+    The sequence (a Seq, MutableSeq or FormattedSeq object) is searched once
+    with all the enzymes of the RestrictionBatch. The cut positions of each
+    enzyme are stored as sorted arrays of zero based positions (i.e. the
+    search results minus one) in the sites dictionary.
+
+    For circular sequences (linear=False), the fragment running over the
+    end of the sequence is given first, as by catalyse, and its end is
+    larger than the length of the sequence.
+    """
+
+    def __init__(self, restrictionbatch, sequence, linear=True):
+        """Search the sequence with the enzymes of the batch."""
+        if numpy is None:
+            from Bio import MissingPythonDependencyError
+            raise MissingPythonDependencyError(
+                "Install NumPy if you want to use Bio.Restriction.Digest.")
+        batch = RestrictionBatch(restrictionbatch)
+        self.length = len(sequence)
+        self.linear = linear
+        self.sites = {}
+        for enzyme, positions in batch.search(sequence, linear).items():
+            self.sites[enzyme] = numpy.unique(
+                numpy.array(positions, numpy.intp) - 1)
+        self.enzymes = sorted(self.sites, key=str)
+
+    def _enzymes(self, enzymes):
+        """Return the enzymes as a list (PRIVATE)."""
+        if isinstance(enzymes, RestrictionType):
+            enzymes = [enzymes]
+        else:
+            enzymes = list(enzymes)
+        for enzyme in enzymes:
+            if enzyme not in self.sites:
+                raise ValueError("%s is not in the RestrictionBatch"
+                                 % enzyme)
+        return enzymes
+
+    def _merge(self, enzymes):
+        """Return the cuts of the enzymes, and the index of the enzyme (PRIVATE).
+
+        Positions cut by several enzymes are assigned to the first of them.
+        """
+        enzymes = self._enzymes(enzymes)
+        if len(enzymes) == 1:
+            cuts = self.sites[enzymes[0]]
+            return cuts, numpy.zeros(len(cuts), numpy.intp)
+        positions = [self.sites[enzyme] for enzyme in enzymes]
+        owners = numpy.repeat(numpy.arange(len(enzymes)),
+                              [len(p) for p in positions])
+        positions = numpy.concatenate(positions)
+        order = numpy.lexsort((owners, positions))
+        positions = positions[order]
+        keep = numpy.ones(len(positions), bool)
+        keep[1:] = positions[1:] != positions[:-1]
+        return positions[keep], owners[order][keep]
+
+    def cuts(self, enzymes):
+        """Return the sorted cut positions of an enzyme or list of enzymes.
+
+        The positions are zero based, so the sequence is cut between
+        position - 1 and position.
+        """
+        return self._merge(enzymes)[0]
+
+    def _fragments(self, cuts):
+        """Return the starts and ends of the fragments (PRIVATE)."""
+        if self.linear:
+            bounds = numpy.concatenate([[0], cuts, [self.length]])
+            return bounds[:-1], bounds[1:]
+        elif not len(cuts):
+            return numpy.array([0]), numpy.array([self.length])
+        starts = numpy.roll(cuts, 1)
+        ends = cuts.copy()
+        ends[0] += self.length
+        return starts, ends
+
+    def fragments(self, enzymes):
+        """Return the starts and ends of the fragments as two arrays.
+
+        The sequence is digested with the given enzyme or list of enzymes.
+        """
+        return self._fragments(self.cuts(enzymes))
+
+    def lengths(self, enzymes):
+        """Return the lengths of the fragments as an array."""
+        starts, ends = self.fragments(enzymes)
+        return ends - starts
+
+    def end_enzymes(self, enzymes):
+        """Return the enzymes producing the ends of the fragments.
+
+        Returns two arrays with the index in the list of enzymes of the
+        enzyme which cut at the start (left) and at the end (right) of each
+        fragment, or -1 for the ends of a linear sequence. If several
+        enzymes cut at the same position, the first one in the list is
+        given.
+        """
+        cuts, owners = self._merge(enzymes)
+        if self.linear:
+            bounds = numpy.concatenate([[-1], owners, [-1]])
+            return bounds[:-1], bounds[1:]
+        elif not len(cuts):
+            return numpy.array([-1]), numpy.array([-1])
+        return numpy.roll(owners, 1), owners.copy()
+
+    def combinations(self, size=2, enzymes=None):
+        """Digest with all the combinations of size enzymes.
+
+        Yields (enzymes, starts, ends) tuples for each combination of the
+        given enzymes (by default all the enzymes of the batch, sorted by
+        name). Enzymes which do not cut the sequence are included.
+        """
+        if enzymes is None:
+            enzymes = self.enzymes
+        else:
+            enzymes = self._enzymes(enzymes)
+        for combination in itertools.combinations(enzymes, size):
+            starts, ends = self.fragments(combination)
+            yield combination, starts, ends
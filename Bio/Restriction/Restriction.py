@@ -166,12 +166,14 @@ class FormattedSeq(object):
             self.linear = linear
             self.klass = seq.__class__
             self.alphabet = seq.alphabet
+            self.site_index = None
         elif isinstance(seq, FormattedSeq):
             self.lower = seq.lower
             self.data = seq.data
             self.linear = seq.linear
             self.alphabet = seq.alphabet
             self.klass = seq.klass
+            self.site_index = None
         else:
             raise TypeError('expected Seq or MutableSeq, got %s' % type(seq))
 
@@ -224,7 +226,12 @@ class FormattedSeq(object):
         Pattern is the regular expression pattern corresponding to the
         enzyme restriction site.
         Size is the size of the restriction enzyme recognition-site size.
+
+        If a site index has been set (see RestrictionBatch.search), it is
+        used instead of searching the whole sequence with the pattern.
         """
+        if self.site_index is not None:
+            return self.site_index.finditer(pattern, size)
         if self.is_linear():
             data = self.data
         else:
@@ -2222,6 +2229,26 @@ class RestrictionBatch(set):
         print('\n'.join(supply))
         return
 
+    def _search_all(self, fseq):
+        """Search the FormattedSeq with all enzymes of the batch (PRIVATE).
+
+        Rather than searching the whole sequence once for every enzyme, the
+        sequence is indexed once, and the sites of all enzymes are looked up
+        in the index (this requires NumPy).
+        """
+        if len(self) > 1:
+            try:
+                from Bio.Restriction._siteindex import SiteIndex
+            except ImportError:
+                pass
+            else:
+                fseq.site_index = SiteIndex(fseq,
+                                            max(x.size for x in self))
+        try:
+            return dict((x, x.search(fseq)) for x in self)
+        finally:
+            fseq.site_index = None
+
     def search(self, dna, linear=True):
         """Return a dic of cutting sites in the seq for the batch enzymes."""
         #
@@ -2242,14 +2269,14 @@ class RestrictionBatch(set):
             else:
                 self.already_mapped = str(dna), linear
                 fseq = FormattedSeq(dna, linear)
-                self.mapping = dict((x, x.search(fseq)) for x in self)
+                self.mapping = self._search_all(fseq)
                 return self.mapping
         elif isinstance(dna, FormattedSeq):
             if (str(dna), dna.linear) == self.already_mapped:
                 return self.mapping
             else:
                 self.already_mapped = str(dna), dna.linear
-                self.mapping = dict((x, x.search(dna)) for x in self)
+                self.mapping = self._search_all(FormattedSeq(dna))
                 return self.mapping
         raise TypeError("Expected Seq or MutableSeq instance, got %s instead"
                         % type(dna))
@@ -0,0 +1,202 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Find the recognition sites of many restriction enzymes at once (PRIVATE).
+
+Searching a sequence with a RestrictionBatch used to run a separate regular
+expression search over the whole sequence for every enzyme. The SiteIndex
+class instead encodes the sequence once, and builds an index of the
+positions of every trinucleotide. The sites of each enzyme (including
+ambiguous ones) are then found by looking up the positions of the most
+specific trinucleotide in the site, and checking the rest of the site at
+those positions only. The results are identical to the regular expression
+search in FormattedSeq.finditer.
+"""
+
+import re
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.Restriction._siteindex.")
+
+
+# Length of the words in the index
+_K = 3
+
+# Translation table from the sequence letters to codes 0-3; any other
+# letter (ambiguous bases, and the leading space of FormattedSeq.data)
+# is coded as 4, and can only be matched by "." in a site pattern
+_codes = bytearray([4]) * 256
+for _index, _letter in enumerate(bytearray(b"ACGT")):
+    _codes[_letter] = _index
+_codes = bytes(_codes)
+del _index, _letter
+
+# The site patterns look like (?=(?P<EcoRI>GAATTC)) for palindromic sites,
+# or (?=(?P<BsaI>GGTCTC))|(?=(?P<BsaI_as>GAGACC)) for non-palindromic sites
+_alternative = re.compile(r"\(\?=\(\?P<(\w+)>([^()]*)\)\)")
+_token = re.compile(r"\[([ACGT]+)\]|([ACGT])|(\.)|(.)")
+
+# Parsed patterns, see _parse_pattern
+_parsed = {}
+
+
+def _parse_pattern(pattern):
+    """Parse a compiled site pattern of an enzyme (PRIVATE).
+
+    Returns a list of (group name, tokens) tuples for the alternatives in
+    the pattern, where tokens is a list with a boolean array of length 5
+    for each position in the site (giving which codes match), or None for
+    positions matching any letter. Returns None for patterns which are not
+    in the expected format.
+    """
+    try:
+        return _parsed[pattern.pattern]
+    except KeyError:
+        pass
+    text = pattern.pattern
+    alternatives = []
+    end = 0
+    for match in _alternative.finditer(text):
+        if text[end:match.start()] not in ("", "|"):
+            alternatives = None
+            break
+        end = match.end()
+        tokens = []
+        for group, letter, dot, other in _token.findall(match.group(2)):
+            if other:
+                alternatives = None
+                break
+            if dot:
+                tokens.append(None)
+            else:
+                allowed = numpy.zeros(5, bool)
+                for c in group or letter:
+                    allowed["ACGT".index(c)] = True
+                tokens.append(allowed)
+        if alternatives is None:
+            break
+        alternatives.append((match.group(1), tokens))
+    if end != len(text) or not alternatives or len(alternatives) > 2:
+        alternatives = None
+    _parsed[pattern.pattern] = alternatives
+    return alternatives
+
+
+class SiteIndex(object):
+    """Index of the trinucleotides in a FormattedSeq, for finding sites."""
+
+    def __init__(self, dna, max_size):
+        """Index the sequence dna (a FormattedSeq).
+
+        Sites up to max_size long are found over the end of circular
+        sequences.
+        """
+        self.dna = dna
+        data = dna.data
+        if not dna.is_linear():
+            data = data + data[1:max_size]
+        self.data = data
+        self.max_size = max_size
+        codes = data.encode("ascii") if not isinstance(data, bytes) else data
+        self.codes = codes = numpy.frombuffer(codes.translate(_codes),
+                                              numpy.uint8)
+        n = len(codes) - _K + 1
+        if n > 0:
+            words = numpy.zeros(n, numpy.intp)
+            valid = numpy.ones(n, bool)
+            for j in range(_K):
+                window = codes[j:j + n]
+                words = words * 4 + window
+                valid &= window < 4
+            # Words containing other letters are put in an extra bucket
+            words[~valid] = 4 ** _K
+        else:
+            words = numpy.zeros(0, numpy.intp)
+        self.order = numpy.argsort(words, kind="mergesort")
+        counts = numpy.bincount(words, minlength=4 ** _K + 1)
+        self.bucket_starts = numpy.concatenate([[0], numpy.cumsum(counts)])
+
+    def _find(self, tokens, limit):
+        """Return the sorted positions matching the tokens (PRIVATE).
+
+        Only matches ending before limit are returned.
+        """
+        length = len(tokens)
+        best = None
+        for offset in range(length - _K + 1):
+            window = tokens[offset:offset + _K]
+            if any(allowed is None for allowed in window):
+                continue
+            count = 1
+            for allowed in window:
+                count *= allowed[:4].sum()
+            if best is None or count < best[0]:
+                best = count, offset
+        if best is None:
+            # No position without ambiguity to use the index, so check all
+            positions = numpy.arange(max(limit - length + 1, 0))
+            checks = range(length)
+        else:
+            offset = best[1]
+            words = numpy.zeros(1, numpy.intp)
+            for allowed in tokens[offset:offset + _K]:
+                words = (words[:, None] * 4 +
+                         numpy.flatnonzero(allowed[:4])[None, :]).ravel()
+            starts = self.bucket_starts
+            positions = numpy.concatenate(
+                [self.order[starts[word]:starts[word + 1]]
+                 for word in words]) - offset
+            if len(words) > 1:
+                positions.sort()
+            positions = positions[(positions >= 0) &
+                                  (positions + length <= limit)]
+            checks = [j for j in range(length)
+                      if not offset <= j < offset + _K]
+        codes = self.codes
+        for j in checks:
+            allowed = tokens[j]
+            if allowed is not None and len(positions):
+                positions = positions[allowed[codes[positions + j]]]
+        return positions
+
+    def finditer(self, pattern, size):
+        """Return a list of the sites of the pattern in the sequence.
+
+        This returns the same list of (location, group) tuples as the
+        finditer method of FormattedSeq, except that group is not the
+        group method of a regular expression match object, but a function
+        returning a true value for the name of the group which matched
+        (i.e. the enzyme name for sites on the forward strand).
+        """
+        dna = self.dna
+        if dna.is_linear():
+            limit = len(dna.data)
+        else:
+            limit = len(dna.data) + len(dna.data[1:size])
+        alternatives = _parse_pattern(pattern)
+        if alternatives is None or size > self.max_size:
+            data = self.data[:limit]
+            return [(i.start(), i.group) for i in re.finditer(pattern, data)]
+        name, tokens = alternatives[0]
+        positions = self._find(tokens, limit)
+        group = {name: True}.get
+        if len(alternatives) == 1:
+            return [(position, group) for position in positions.tolist()]
+        # The regular expression only tries the second alternative if the
+        # first one does not match
+        rev_name, rev_tokens = alternatives[1]
+        rev_positions = self._find(rev_tokens, limit)
+        # (numpy.isin needs NumPy 1.13, and numpy.in1d is gone in NumPy 2.4)
+        rev_positions = numpy.setdiff1d(rev_positions, positions,
+                                        assume_unique=True)
+        rev_group = {rev_name: True}.get
+        sites = [(position, group) for position in positions.tolist()]
+        sites.extend((position, rev_group)
+                     for position in rev_positions.tolist())
+        sites.sort(key=lambda site: site[0])
+        return sites
@@ -171,6 +171,23 @@ The blast-xml write function also accepts 'use_raw_query_ids' and
 writer are set to 'True'. This is because the writer is meant to mimic native
 BLAST result as much as possible.
 
+The parser converts each <Hit> element as soon as it has been read and then
+discards it, so memory use depends on the largest query result rather than on
+the size of the file. If you do not need the alignment strings, you can also
+give the parser 'alignments=False'. The Hsp_qseq, Hsp_hseq and Hsp_midline
+elements are then ignored, leaving the HSP objects without 'query', 'hit' and
+'aln_annotation' values. The coordinates, scores and 'aln_span' are still set.
+This saves both time and memory for large searches:
+
+    >>> from Bio import SearchIO
+    >>> for qresult in SearchIO.parse('Blast/mirna.xml', 'blast-xml',
+    ...                               alignments=False):
+    ...     print("%s %i %r" % (qresult.id, len(qresult), qresult.hsps[0].hit))
+    ...
+    33211 100 None
+    33212 44 None
+    33213 95 None
+
 
 blast-tab
 =========
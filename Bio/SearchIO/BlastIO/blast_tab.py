@@ -147,6 +147,25 @@ _MIN_HIT_FIELDS = set(['sseqid', 'sacc', 'saccver', 'sallseqid'])
 _RE_GAPOPEN = re.compile(r'\w-')
 
 
+def _prep_fields(fields):
+    """Validate and format the given fields for use by the parser (PRIVATE)."""
+    # cast into list if fields is a space-separated string
+    if isinstance(fields, basestring):
+        fields = fields.strip().split(' ')
+    # blast allows 'std' as a proxy for the standard default lists
+    # we want to transform 'std' to its proper column names
+    if 'std' in fields:
+        idx = fields.index('std')
+        fields = fields[:idx] + _DEFAULT_FIELDS + fields[idx + 1:]
+    # if set(fields) has a null intersection with minimum required
+    # fields for hit and query, raise an exception
+    if not set(fields).intersection(_MIN_QUERY_FIELDS) or \
+            not set(fields).intersection(_MIN_HIT_FIELDS):
+        raise ValueError("Required query and/or hit ID field not found.")
+
+    return fields
+
+
 def _compute_gapopen_num(hsp):
     """Return the number of gap openings in the given HSP (PRIVATE)."""
     gapopen = 0
@@ -230,21 +249,7 @@ class BlastTabParser(object):
 
     def _prep_fields(self, fields):
         """Validate and format the given fields for use by the parser (PRIVATE)."""
-        # cast into list if fields is a space-separated string
-        if isinstance(fields, basestring):
-            fields = fields.strip().split(' ')
-        # blast allows 'std' as a proxy for the standard default lists
-        # we want to transform 'std' to its proper column names
-        if 'std' in fields:
-            idx = fields.index('std')
-            fields = fields[:idx] + _DEFAULT_FIELDS + fields[idx + 1:]
-        # if set(fields) has a null intersection with minimum required
-        # fields for hit and query, raise an exception
-        if not set(fields).intersection(_MIN_QUERY_FIELDS) or \
-                not set(fields).intersection(_MIN_HIT_FIELDS):
-            raise ValueError("Required query and/or hit ID field not found.")
-
-        return fields
+        return _prep_fields(fields)
 
     def _parse_commented_qresult(self):
         """Yield `QueryResult` objects from a commented file (PRIVATE)."""
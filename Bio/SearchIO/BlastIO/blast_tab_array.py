@@ -0,0 +1,389 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Columnar parser for BLAST+ tabular output, using NumPy.
+
+The blast-tab parser of Bio.SearchIO creates QueryResult, Hit, HSP and
+HSPFragment objects for every row of the file, which is too slow for very
+large tabular outputs (e.g. from all-vs-all BLAST or DIAMOND searches).
+This module instead reads the rows into a BlastTabArray, with a NumPy
+array for each column. The columns are named by the fields of the file
+(by default those of -outfmt 6, or given in the comments of -outfmt 7),
+and numeric columns are converted to integers or floats (as done by the
+blast-tab parser), while the other columns are arrays of strings.
+
+>>> from Bio.SearchIO.BlastIO import blast_tab_array
+>>> table = blast_tab_array.read("Blast/tab_2226_tblastn_001.txt")
+>>> len(table)
+12
+>>> print(table["evalue"].dtype)
+float64
+>>> for query_id in table.query_ids():
+...     print(query_id)
+...
+gi|16080617|ref|NP_391444.1|
+gi|11464971:4-101
+
+The rows can be selected by boolean arrays, indices or slices, or with the
+filter method. The best_hits method selects the row with the highest bit
+score for each query:
+
+>>> good = table.filter(max_evalue=1e-10, min_pident=90)
+>>> for hit_id, bitscore in zip(good["sseqid"], good["bitscore"]):
+...     print("%s %0.1f" % (hit_id, bitscore))
+...
+gi|350596019|ref|XM_003360601.2| 199.0
+gi|301779869|ref|XM_002925302.1| 202.0
+gi|296223671|ref|XM_002757683.1| 202.0
+gi|338714227|ref|XM_001492113.3| 202.0
+>>> best = table.best_hits()
+>>> for hit_id in best["sseqid"]:
+...     print(hit_id)
+...
+gi|145479850|ref|XM_001425911.1|
+gi|301779869|ref|XM_002925302.1|
+
+Large files can be read in chunks with the parse function, which yields a
+BlastTabArray for every chunksize rows or so; the rows of a query are never
+split over two chunks. The QueryResult objects of the rows are only created
+when asked for, using the blast-tab parser:
+
+>>> for chunk in blast_tab_array.parse("Blast/tab_2226_tblastn_001.txt",
+...                                    chunksize=2):
+...     for qresult in chunk.best_hits().to_qresults():
+...         print("%s %s" % (qresult.id, qresult[0].id))
+...
+gi|16080617|ref|NP_391444.1| gi|145479850|ref|XM_001425911.1|
+gi|11464971:4-101 gi|301779869|ref|XM_002925302.1|
+
+"""
+
+from Bio._py3k import StringIO
+from Bio._py3k import basestring
+from Bio.File import as_handle
+
+from .blast_tab import BlastTabParser
+from .blast_tab import _prep_fields, _DEFAULT_FIELDS, _LONG_SHORT_MAP
+from .blast_tab import _COLUMN_QRESULT, _COLUMN_HIT, _COLUMN_HSP, _COLUMN_FRAG
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SearchIO.BlastIO.blast_tab_array.")
+
+
+__all__ = ('BlastTabArray', 'parse', 'read')
+
+
+def _column_dtypes():
+    """Return the NumPy types of the numeric fields (PRIVATE).
+
+    These are the fields which the blast-tab parser converts to integers or
+    floats; all other fields are kept as strings.
+    """
+    dtypes = {}
+    for mapping in (_COLUMN_QRESULT, _COLUMN_HIT, _COLUMN_HSP, _COLUMN_FRAG):
+        for field, (attr, caster) in mapping.items():
+            if caster is int:
+                dtypes[field] = numpy.int64
+            elif caster is float:
+                dtypes[field] = numpy.float64
+    return dtypes
+
+
+_DTYPES = _column_dtypes()
+
+
+def _key_field(fields, choices):
+    """Return the first of the choices present in the fields (PRIVATE)."""
+    for field in choices:
+        if field in fields:
+            return field
+    raise ValueError("Required query and/or hit ID field not found.")
+
+
+class BlastTabArray(object):
+    """Rows of BLAST+ tabular output, as a NumPy array for each field.
+
+    A column is retrieved by its field name, e.g. table["evalue"], while
+    other indices (boolean arrays, integer arrays or slices) select rows,
+    returning a new BlastTabArray.
+
+    The rows of each query are expected to be consecutive, as they are in
+    the output of BLAST+. Queries without any hits have no rows.
+    """
+
+    def __init__(self, columns, fields, comments=None):
+        """Initialize the class.
+
+        Arguments:
+         - columns - list of arrays, one for each field
+         - fields - list of the BLAST field names of the columns
+         - comments - optional dictionary mapping query IDs to a
+           dictionary of the comments of the query (from -outfmt 7)
+
+        """
+        if len(columns) != len(fields):
+            raise ValueError("Expected %i columns, found: %i"
+                             % (len(fields), len(columns)))
+        self.fields = list(fields)
+        self._columns = list(columns)
+        if comments is None:
+            comments = {}
+        self.comments = comments
+        self._query_field = _key_field(fields, ('qseqid', 'qacc', 'qaccver'))
+
+    def __len__(self):
+        """Return the number of rows."""
+        if not self._columns:
+            return 0
+        return len(self._columns[0])
+
+    def __repr__(self):
+        """Return a short description of the rows."""
+        return "%s(%i rows, fields=%r)" % (self.__class__.__name__,
+                                           len(self), self.fields)
+
+    def __getitem__(self, index):
+        """Return a column by field name, or a selection of the rows."""
+        if isinstance(index, basestring):
+            try:
+                return self._columns[self.fields.index(index)]
+            except ValueError:
+                raise KeyError(index)
+        return self.__class__([column[index] for column in self._columns],
+                              self.fields, self.comments)
+
+    def _query_starts(self):
+        """Return the index of the first row of each query (PRIVATE)."""
+        ids = self[self._query_field]
+        if not len(ids):
+            return numpy.zeros(0, numpy.intp)
+        return numpy.concatenate([[0], numpy.flatnonzero(ids[1:] !=
+                                                         ids[:-1]) + 1])
+
+    def query_ids(self):
+        """Return the query IDs, in the order of the rows."""
+        return self[self._query_field][self._query_starts()].tolist()
+
+    def filter(self, max_evalue=None, min_bitscore=None, min_pident=None,
+               min_length=None):
+        """Return the rows passing the given thresholds.
+
+        Rows are kept if their e-value is at most max_evalue, and their
+        bit score, percent identity and alignment length are at least the
+        given minimum values. The thresholds which are None (default) are
+        not used; the others need the corresponding field in the table.
+        """
+        keep = numpy.ones(len(self), bool)
+        if max_evalue is not None:
+            keep &= self["evalue"] <= max_evalue
+        if min_bitscore is not None:
+            keep &= self["bitscore"] >= min_bitscore
+        if min_pident is not None:
+            keep &= self["pident"] >= min_pident
+        if min_length is not None:
+            keep &= self["length"] >= min_length
+        return self[keep]
+
+    def best_hits(self, by="bitscore"):
+        """Return the best row of each query.
+
+        This is the row with the highest bit score (by="bitscore", default)
+        or with the lowest e-value (by="evalue"); ties are resolved by the
+        other of the two values (if present), and then by the row order.
+        """
+        if by == "bitscore":
+            keys = [-self["bitscore"]]
+            if "evalue" in self.fields:
+                keys.insert(0, self["evalue"])
+        elif by == "evalue":
+            keys = [self["evalue"]]
+            if "bitscore" in self.fields:
+                keys.insert(0, -self["bitscore"])
+        else:
+            raise ValueError("Can only select the best hits by 'bitscore' or "
+                             "'evalue', not %r" % by)
+        starts = self._query_starts()
+        groups = numpy.zeros(len(self), numpy.intp)
+        groups[starts[1:]] = 1
+        groups = numpy.cumsum(groups)
+        # lexsort is stable, and sorts by the last key first
+        order = numpy.lexsort(keys + [groups])
+        return self[order[numpy.searchsorted(groups[order], groups[starts])]]
+
+    def to_records(self):
+        """Return the rows as a NumPy record array, with the field names."""
+        return numpy.rec.fromarrays(self._columns, names=self.fields)
+
+    def to_qresults(self):
+        """Iterate over the rows as QueryResult objects.
+
+        The objects are created by the blast-tab parser, with the same
+        attributes as from Bio.SearchIO.parse (including those from the
+        comments of a commented file).
+        """
+        if not len(self):
+            return
+        columns = []
+        for field, column in zip(self.fields, self._columns):
+            if _DTYPES.get(field) is numpy.float64:
+                # repr gives back exactly the same float
+                columns.append([repr(value) for value in column.tolist()])
+            else:
+                columns.append([str(value) for value in column.tolist()])
+        text = "\n".join("\t".join(row) for row in zip(*columns)) + "\n"
+        for qresult in BlastTabParser(StringIO(text), fields=self.fields):
+            comments = self.comments.get(qresult.id)
+            if comments:
+                for key, value in comments.items():
+                    setattr(qresult, key, value)
+            yield qresult
+
+
+def _columns(lines, fields):
+    """Return the column arrays of a list of tabular lines (PRIVATE)."""
+    count = len(fields)
+    values = "".join(lines).replace("\n", "\t").split("\t")
+    # the text ends with a newline, giving an empty value at the end
+    if len(values) != len(lines) * count + 1:
+        for line in lines:
+            found = len(line.rstrip("\n").split("\t"))
+            if found != count:
+                raise ValueError("Expected %i columns, found: %i"
+                                 % (count, found))
+    columns = []
+    for index, field in enumerate(fields):
+        column = values[index:-1:count]
+        dtype = _DTYPES.get(field)
+        if dtype is None:
+            columns.append(numpy.array(column, str))
+        else:
+            columns.append(numpy.array(column, dtype))
+    return columns
+
+
+def _empty_columns(fields):
+    """Return empty column arrays for the fields (PRIVATE)."""
+    return [numpy.zeros(0, _DTYPES.get(field, str)) for field in fields]
+
+
+def _parse_comment(line, comments, fields):
+    """Update the comments of a query with a comment line (PRIVATE).
+
+    Returns the fields, which are changed by a Fields comment line. This
+    follows the comment parsing of the blast-tab parser.
+    """
+    if 'BLAST' in line and 'processed' not in line:
+        program_line = line[len(' #'):].split(' ')
+        comments['program'] = program_line[0].lower()
+        comments['version'] = program_line[1]
+    elif 'Query' in line:
+        query_line = line[len('# Query: '):].split(' ', 1)
+        comments['id'] = query_line[0]
+        if len(query_line) == 2:
+            comments['description'] = query_line[1]
+    elif 'Database' in line:
+        comments['target'] = line[len('# Database: '):]
+    elif 'RID' in line:
+        comments['rid'] = line[len('# RID: '):]
+    elif 'Fields' in line:
+        long_fields = line[len('# Fields: '):].split(', ')
+        fields = _prep_fields([_LONG_SHORT_MAP[long_name]
+                               for long_name in long_fields])
+        comments['fields'] = fields
+    return fields
+
+
+def parse(handle, comments=False, fields=_DEFAULT_FIELDS, chunksize=100000):
+    """Iterate over a BLAST+ tabular file, as BlastTabArray chunks.
+
+    Arguments:
+     - handle - handle to the file, or the filename as a string
+     - comments - whether the file has comments (-outfmt 7)
+     - fields - the fields of the rows, as for the blast-tab parser (for
+       commented files, the fields are taken from the comments)
+     - chunksize - the number of rows of the chunks
+
+    Each chunk has at least chunksize rows (except the last one), and is
+    extended to include all rows of its last query, so that a query is
+    never split over two chunks.
+    """
+    fields = _prep_fields(fields)
+    query_field = _key_field(fields, ('qseqid', 'qacc', 'qaccver'))
+    with as_handle(handle, 'rU') as handle:
+        lines = []
+        query_comments = {}
+        current = {}
+        key_idx = fields.index(query_field)
+        last_key = None
+        for line in handle:
+            if line.startswith('#'):
+                if not comments:
+                    raise ValueError("Encountered unexpected character '#' "
+                                     "at the beginning of a line. Set "
+                                     "comments=True if the file is a "
+                                     "commented file.")
+                line = line.strip()
+                if 'BLAST' in line and 'processed' not in line:
+                    # the first comment line of a new query
+                    current = {}
+                new_fields = _parse_comment(line, current, fields)
+                if 'id' in current:
+                    query_comments[current['id']] = current
+                if new_fields != fields:
+                    if lines:
+                        yield BlastTabArray(_columns(lines, fields), fields,
+                                            query_comments)
+                        lines = []
+                        query_comments = {current.get('id'): current}
+                    fields = new_fields
+                    query_field = _key_field(fields, ('qseqid', 'qacc',
+                                                      'qaccver'))
+                    key_idx = fields.index(query_field)
+                continue
+            if not line.strip():
+                continue
+            if not line.endswith('\n'):
+                line += '\n'
+            if len(lines) >= chunksize:
+                key = line.split('\t', key_idx + 1)[key_idx]
+                if last_key is None:
+                    last_key = lines[-1].split('\t', key_idx + 1)[key_idx]
+                if key != last_key:
+                    yield BlastTabArray(_columns(lines, fields), fields,
+                                        query_comments)
+                    lines = []
+                    query_comments = {}
+                    if 'id' in current:
+                        query_comments[current['id']] = current
+                    last_key = None
+            lines.append(line)
+        if lines:
+            yield BlastTabArray(_columns(lines, fields), fields,
+                                query_comments)
+
+
+def read(handle, comments=False, fields=_DEFAULT_FIELDS):
+    """Read a whole BLAST+ tabular file as one BlastTabArray.
+
+    The arguments are as for the parse function. All queries must have the
+    same fields.
+    """
+    chunks = list(parse(handle, comments, fields))
+    if not chunks:
+        fields = _prep_fields(fields)
+        return BlastTabArray(_empty_columns(fields), fields)
+    fields = chunks[0].fields
+    query_comments = {}
+    for chunk in chunks:
+        if chunk.fields != fields:
+            raise ValueError("The queries have different fields, use the "
+                             "parse function instead")
+        query_comments.update(chunk.comments)
+    columns = [numpy.concatenate([chunk[field] for chunk in chunks])
+               for field in fields]
+    return BlastTabArray(columns, fields, query_comments)
@@ -104,6 +104,12 @@ _ELEM_QRESULT_FALLBACK = {
     'BlastOutput_query-def': ('description', str),
     'BlastOutput_query-len': ('len', str),
 }
+# query elements inside <Iteration>, read as they are parsed
+_ELEM_QRESULT_ITER = (
+    'Iteration_query-ID', 'Iteration_query-def', 'Iteration_query-len',
+)
+# alignment strings, which are not parsed with alignments=False
+_ELEM_ALN = ('Hsp_qseq', 'Hsp_hseq', 'Hsp_midline')
 # element-attribute maps, for writing
 _WRITE_MAPS = {
     'preamble': (
@@ -225,11 +231,21 @@ def _extract_ids_and_descs(raw_id, raw_desc):
 class BlastXmlParser(object):
     """Parser for the BLAST XML format."""
 
-    def __init__(self, handle, use_raw_query_ids=False, use_raw_hit_ids=False):
+    def __init__(self, handle, use_raw_query_ids=False, use_raw_hit_ids=False,
+                 alignments=True):
         """Initialize the class."""
         self.xml_iter = iter(ElementTree.iterparse(handle, events=('start', 'end')))
         self._use_raw_query_ids = use_raw_query_ids
         self._use_raw_hit_ids = use_raw_hit_ids
+        self._alignments = alignments
+        if alignments:
+            self._elem_frag = _ELEM_FRAG
+        else:
+            self._elem_frag = dict((key, value) for key, value
+                                   in _ELEM_FRAG.items()
+                                   if key not in _ELEM_ALN)
+        # parent of the <Iteration> elements, set by _parse_preamble
+        self._iterations_elem = None
         self._meta, self._fallback = self._parse_preamble()
 
     def __iter__(self):
@@ -271,7 +287,9 @@ class BlastXmlParser(object):
                 elem.clear()
                 continue
 
-            if event == 'start' and elem.tag == 'Iteration':
+            if event == 'start' and elem.tag == 'BlastOutput_iterations':
+                self._iterations_elem = elem
+            elif event == 'start' and elem.tag == 'Iteration':
                 break
 
         # we only want the version number, sans the program name or date
@@ -283,52 +301,41 @@ class BlastXmlParser(object):
 
     def _parse_qresult(self):
         """Parse query results (PRIVATE)."""
-        # parse the queries
-        for event, qresult_elem in self.xml_iter:
-            # </Iteration> marks the end of a single query
-            # which means we can process it
-            if event == 'end' and qresult_elem.tag == 'Iteration':
-
-                # we'll use the following schema
-                # <!ELEMENT Iteration (
-                #        Iteration_iter-num,
-                #        Iteration_query-ID?,
-                #        Iteration_query-def?,
-                #        Iteration_query-len?,
-                #        Iteration_hits?,
-                #        Iteration_stat?,
-                #        Iteration_message?)>
-
-                # assign query attributes with fallbacks
-                query_id = qresult_elem.findtext('Iteration_query-ID')
-                if query_id is None:
-                    query_id = self._fallback['id']
-
-                query_desc = qresult_elem.findtext('Iteration_query-def')
-                if query_desc is None:
-                    query_desc = self._fallback['description']
-
-                query_len = qresult_elem.findtext('Iteration_query-len')
-                if query_len is None:
-                    query_len = self._fallback['len']
-
-                blast_query_id = query_id
-                # handle blast searches against databases with Blast's IDs
-                # 'Query_' marks the beginning of a BLAST+-generated ID,
-                # 'lcl|' marks the beginning of a BLAST legacy-generated ID
-                if not self._use_raw_query_ids and \
-                        (query_id.startswith('Query_') or query_id.startswith('lcl|')):
-                    # store the Blast-generated query ID
-                    id_desc = query_desc.split(' ', 1)
-                    query_id = id_desc[0]
-                    try:
-                        query_desc = id_desc[1]
-                    except IndexError:
-                        query_desc = ''
+        # we'll use the following schema
+        # <!ELEMENT Iteration (
+        #        Iteration_iter-num,
+        #        Iteration_query-ID?,
+        #        Iteration_query-def?,
+        #        Iteration_query-len?,
+        #        Iteration_hits?,
+        #        Iteration_stat?,
+        #        Iteration_message?)>
+
+        # each <Hit> is converted as soon as it is complete and then dropped
+        # from the tree, as is each <Iteration>, so that memory use depends
+        # on the largest hit and not on the size of the file
+        hits_elem = None
+        query_id = query_desc = blast_query_id = None
+        hit_list, key_list = [], []
+        raw_query = {}
+        skip_tags = () if self._alignments else _ELEM_ALN
+        for event, elem in self.xml_iter:
+            tag = elem.tag
+            if event == 'start':
+                if tag == 'Iteration_hits':
+                    hits_elem = elem
+                continue
 
-                hit_list, key_list = [], []
-                for hit in self._parse_hit(qresult_elem.find('Iteration_hits'),
-                                           query_id):
+            if tag in skip_tags:
+                # drop the alignment strings as soon as they are read
+                elem.text = None
+            elif tag in _ELEM_QRESULT_ITER:
+                raw_query[tag] = elem.text or ''
+            elif tag == 'Hit':
+                if query_id is None:
+                    query_id, query_desc, blast_query_id = \
+                        self._parse_query_id(raw_query)
+                for hit in self._parse_hit([elem], query_id):
                     if hit:
                         # need to keep track of hit IDs, since there could be duplicates,
                         if hit.id in key_list:
@@ -349,6 +356,16 @@ class BlastXmlParser(object):
                             key_list.append(hit.id)
 
                         hit_list.append(hit)
+                hits_elem.remove(elem)
+            # </Iteration> marks the end of a single query
+            # which means we can process it
+            elif tag == 'Iteration':
+                if query_id is None:
+                    query_id, query_desc, blast_query_id = \
+                        self._parse_query_id(raw_query)
+                query_len = raw_query.get('Iteration_query-len')
+                if query_len is None:
+                    query_len = self._fallback['len']
 
                 # create qresult and assign its attributes
                 qresult = QueryResult(hit_list, query_id)
@@ -369,7 +386,7 @@ class BlastXmlParser(object):
                 #        Statistics_lambda,
                 #        Statistics_entropy)>
 
-                stat_iter_elem = qresult_elem.find('Iteration_stat')
+                stat_iter_elem = elem.find('Iteration_stat')
                 if stat_iter_elem is not None:
                     stat_elem = stat_iter_elem.find('Statistics')
 
@@ -382,10 +399,50 @@ class BlastXmlParser(object):
                                 value = caster(value)
                             setattr(qresult, val_info[0], value)
 
-                # delete element after we finish parsing it
-                qresult_elem.clear()
+                # delete element after we finish parsing it, and detach it
+                # from <BlastOutput_iterations> (absent when indexing)
+                elem.clear()
+                if self._iterations_elem is not None:
+                    self._iterations_elem.remove(elem)
+                hits_elem = None
+                query_id = query_desc = blast_query_id = None
+                hit_list, key_list = [], []
+                raw_query = {}
                 yield qresult
 
+    def _parse_query_id(self, raw_query):
+        """Return the query ID, description and BLAST ID (PRIVATE).
+
+        :param raw_query: text of the ``Iteration_query-ID`` and
+                          ``Iteration_query-def`` elements seen so far
+        :type raw_query: dict
+
+        """
+        # assign query attributes with fallbacks
+        query_id = raw_query.get('Iteration_query-ID')
+        if query_id is None:
+            query_id = self._fallback['id']
+
+        query_desc = raw_query.get('Iteration_query-def')
+        if query_desc is None:
+            query_desc = self._fallback['description']
+
+        blast_query_id = query_id
+        # handle blast searches against databases with Blast's IDs
+        # 'Query_' marks the beginning of a BLAST+-generated ID,
+        # 'lcl|' marks the beginning of a BLAST legacy-generated ID
+        if not self._use_raw_query_ids and \
+                (query_id.startswith('Query_') or query_id.startswith('lcl|')):
+            # store the Blast-generated query ID
+            id_desc = query_desc.split(' ', 1)
+            query_id = id_desc[0]
+            try:
+                query_desc = id_desc[1]
+            except IndexError:
+                query_desc = ''
+
+        return query_id, query_desc, blast_query_id
+
     def _parse_hit(self, root_hit_elem, query_id):
         """Yield a generator object that transforms Iteration_hits XML elements into Hit objects (PRIVATE).
 
@@ -488,7 +545,7 @@ class BlastXmlParser(object):
         for hsp_frag_elem in root_hsp_frag_elem:
             coords = {}  # temporary container for coordinates
             frag = HSPFragment(hit_id, query_id)
-            for key, val_info in _ELEM_FRAG.items():
+            for key, val_info in self._elem_frag.items():
                 value = hsp_frag_elem.findtext(key)
                 caster = val_info[1]
 
@@ -504,7 +561,9 @@ class BlastXmlParser(object):
                     setattr(frag, val_info[0], value)
 
             # set the similarity characters into aln_annotation dict
-            frag.aln_annotation['similarity'] = hsp_frag_elem.findtext('Hsp_midline')
+            if self._alignments:
+                frag.aln_annotation['similarity'] = \
+                    hsp_frag_elem.findtext('Hsp_midline')
 
             # process coordinates
             # since 'x-from' could be bigger than 'x-to', we need to figure
@@ -0,0 +1,512 @@
+# Copyright 2018 by Biopython contributors.  All rights reserved.
+#
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Bio.SearchIO support for a compact binary cache of parsed search results.
+
+Reparsing large HMMER or BLAST text and XML files is often the most expensive
+part of a repeated analysis of the same search results. The 'searchio-cache'
+format stores the parsed QueryResult objects (from any SearchIO format) in a
+binary file, with the attributes of all Hit, HSP and HSPFragment objects of
+a query stored as columns (NumPy arrays), which are much faster to load
+than reparsing the original output:
+
+    >>> from Bio import SearchIO
+    >>> import os, tempfile
+    >>> filename = os.path.join(tempfile.mkdtemp(), "mirna.searchio")
+    >>> qresults = SearchIO.parse('Blast/mirna.xml', 'blast-xml')
+    >>> SearchIO.write(qresults, filename, 'searchio-cache')
+    (3, 239, 277, 277)
+    >>> for qresult in SearchIO.parse(filename, 'searchio-cache'):
+    ...     print("%s %s %i" % (qresult.id, qresult.description, len(qresult)))
+    ...
+    33211 mir_1 100
+    33212 mir_2 44
+    33213 mir_3 95
+
+The file ends with an index of the query IDs and the location of their
+results, so that SearchIO.index and SearchIO.index_db can use it for random
+access without scanning the file:
+
+    >>> cache = SearchIO.index(filename, 'searchio-cache')
+    >>> qresult = cache['33212']
+    >>> print("%s %s" % (qresult.program, qresult[0].id))
+    blastn gi|296923684|ref|NR_031821.1|
+    >>> cache.close()
+
+The aligned query and hit sequences (and the alignment annotation) usually
+take most of the space. Writing with the 'alignments' keyword argument set
+to False leaves them out, and the HSPFragment objects read back have no
+sequences:
+
+    >>> SearchIO.write(SearchIO.parse('Blast/mirna.xml', 'blast-xml'),
+    ...                filename, 'searchio-cache', alignments=False)
+    (3, 239, 277, 277)
+    >>> hsp = next(SearchIO.parse(filename, 'searchio-cache'))[0][0]
+    >>> print("%s %s %s" % (hsp.evalue, hsp.query_range, hsp.query))
+    4.91151e-23 (0, 61) None
+
+All attributes of the objects are stored, except for the sequence features
+of HSPFragment objects and any custom hit key function of the QueryResult.
+Attribute values must be numbers, strings, booleans, None, or lists and
+dictionaries of these (as written by all the SearchIO parsers).
+
+File layout: an 8 byte magic string, followed by one block per query and
+an index block, and ending with the offset of the index block as an
+unsigned 64 bit little endian integer and the magic string again. Each
+block starts with a one byte type (Q for a query, I for the index), the
+length of its header as an unsigned 64 bit little endian integer, and the
+header as UTF-8 encoded JSON. The header describes the columns stored in
+the data following it, each at an offset from the start of the data which
+is a multiple of 8 bytes. Numbers are stored in little endian order.
+"""
+
+import json
+import struct
+from io import BytesIO
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SearchIO.CacheIO.")
+
+from Bio import bgzf
+from Bio.Alphabet import generic_alphabet, single_letter_alphabet
+from Bio.Alphabet import generic_dna, generic_rna, generic_nucleotide
+from Bio.Alphabet import generic_protein
+from Bio.SearchIO._index import SearchIndexer
+from Bio.SearchIO._model import QueryResult, Hit, HSP, HSPFragment
+
+
+__all__ = ('SearchCacheParser', 'SearchCacheIndexer', 'SearchCacheWriter')
+
+
+_MAGIC = b"BioSIOc1"
+_FORMAT_VERSION = 1
+_ALIGNMENT = 8
+
+# Alphabets of the HSPFragment objects, stored by their repr
+_ALPHABETS = dict((repr(alphabet), alphabet) for alphabet in
+                  (generic_alphabet, single_letter_alphabet, generic_dna,
+                   generic_rna, generic_nucleotide, generic_protein))
+
+# Attributes handled separately from the other attributes of each object
+_SKIP_ATTRS = {
+    'qresult': ('_items', '_hit_key_function', '_QueryResult__alt_hit_ids'),
+    'hit': ('_items',),
+    'hsp': ('_items',),
+    'fragment': ('_query', '_hit', '_query_features', '_hit_features'),
+}
+_ALN_ATTRS = ('_query', '_hit', 'aln_annotation')
+
+# Placeholder for the value of an attribute an object does not have
+_MISSING = object()
+
+# Values of the presence mask of a column
+_MASK_MISSING, _MASK_NONE, _MASK_VALUE = 0, 1, 2
+
+
+def _aligned(size):
+    """Round size up to a multiple of the array alignment (PRIVATE)."""
+    return -(-size // _ALIGNMENT) * _ALIGNMENT
+
+
+def _json_value(value):
+    """Return the value with any tuples replaced by tagged lists (PRIVATE).
+
+    JSON has no tuples, so these are stored as {"__tuple__": [...]}.
+    """
+    if isinstance(value, tuple):
+        return {"__tuple__": [_json_value(item) for item in value]}
+    elif isinstance(value, list):
+        return [_json_value(item) for item in value]
+    elif isinstance(value, dict):
+        return dict((key, _json_value(item)) for key, item in value.items())
+    return value
+
+
+def _json_object(obj):
+    """Turn tagged lists back into tuples when decoding JSON (PRIVATE)."""
+    if len(obj) == 1 and "__tuple__" in obj:
+        return tuple(obj["__tuple__"])
+    return obj
+
+
+def _encode_meta(meta):
+    """Return the UTF-8 encoded JSON of the header dictionary (PRIVATE)."""
+    return json.dumps(meta, sort_keys=True,
+                      separators=(",", ":")).encode("utf-8")
+
+
+class _BlockData(object):
+    """Data of a block, built up array by array (PRIVATE)."""
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+
+    def add(self, data):
+        """Add the array or bytes, returns the offset (PRIVATE)."""
+        if isinstance(data, numpy.ndarray):
+            data = data.tobytes()
+        offset = self.size
+        padding = _aligned(len(data)) - len(data)
+        self.chunks.append(data + b"\0" * padding)
+        self.size += len(data) + padding
+        return offset
+
+    def tobytes(self):
+        """Return the data of the block (PRIVATE)."""
+        return b"".join(self.chunks)
+
+
+def _column_kind(values):
+    """Return the storage type of the given attribute values (PRIVATE)."""
+    types = set(type(value) for value in values)
+    if not types:
+        return "json"
+    elif types == set([bool]):
+        return "u1"
+    elif types == set([int]):
+        return "<i8"
+    elif types == set([float]):
+        return "<f8"
+    elif types == set([str]):
+        return "str"
+    return "json"
+
+
+def _encode_column(values, data):
+    """Store a column of attribute values, returns its description (PRIVATE).
+
+    The values are those of each object, or _MISSING for an object which
+    does not have the attribute.
+    """
+    mask = numpy.array([_MASK_MISSING if value is _MISSING else
+                        _MASK_NONE if value is None else _MASK_VALUE
+                        for value in values], numpy.uint8)
+    present = [value for value in values
+               if value is not _MISSING and value is not None]
+    kind = _column_kind(present)
+    column = {"kind": kind}
+    if kind == "json":
+        column["values"] = [None if value is _MISSING else _json_value(value)
+                            for value in values]
+    elif kind == "str":
+        encoded = [b"" if value is _MISSING or value is None else
+                   value.encode("utf-8") for value in values]
+        lengths = numpy.array([len(value) for value in encoded], "<i8")
+        column["offset"] = data.add(lengths)
+        column["data"] = data.add(b"".join(encoded))
+    else:
+        try:
+            array = numpy.array([value if mask_value == _MASK_VALUE else 0
+                                 for value, mask_value in zip(values, mask)],
+                                kind)
+        except OverflowError:
+            # integers too large for 64 bits
+            kind = "json"
+            column = {"kind": kind,
+                      "values": [None if value is _MISSING else value
+                                 for value in values]}
+        else:
+            column["offset"] = data.add(array)
+    if (mask != _MASK_VALUE).any() and \
+            (kind != "json" or (mask == _MASK_MISSING).any()):
+        column["mask"] = data.add(mask)
+    return column
+
+
+def _decode_column(column, count, data):
+    """Return the list of attribute values of a column (PRIVATE).
+
+    Objects without the attribute have the value _MISSING.
+    """
+    kind = column["kind"]
+    if kind == "json":
+        values = column["values"]
+    elif kind == "str":
+        lengths = numpy.frombuffer(data, "<i8", count, column["offset"])
+        ends = numpy.cumsum(lengths) + column["data"]
+        starts = ends - lengths
+        values = [data[start:end].decode("utf-8")
+                  for start, end in zip(starts.tolist(), ends.tolist())]
+    else:
+        values = numpy.frombuffer(data, kind, count, column["offset"])
+        if kind == "u1":
+            values = values.astype(bool)
+        values = values.tolist()
+    if "mask" not in column:
+        return values
+    mask = numpy.frombuffer(data, numpy.uint8, count, column["mask"])
+    return [_MISSING if mask_value == _MASK_MISSING else
+            None if mask_value == _MASK_NONE else value
+            for value, mask_value in zip(values, mask.tolist())]
+
+
+def _encode_level(objects, level, data, alignments):
+    """Store the attributes of the objects as columns (PRIVATE)."""
+    skip = _SKIP_ATTRS[level]
+    if not alignments:
+        skip += _ALN_ATTRS
+    names = set()
+    for obj in objects:
+        names.update(obj.__dict__)
+    columns = {}
+    for name in sorted(names.difference(skip)):
+        values = [obj.__dict__.get(name, _MISSING) for obj in objects]
+        if name == '_alphabet':
+            for alphabet in values:
+                if repr(alphabet) not in _ALPHABETS:
+                    raise ValueError("Cannot store HSPFragment alphabet %r"
+                                     % alphabet)
+            values = [repr(alphabet) for alphabet in values]
+        columns[name] = _encode_column(values, data)
+    if level == 'fragment' and alignments:
+        for name in ('_query', '_hit'):
+            values = [None if obj.__dict__.get(name) is None else
+                      str(obj.__dict__[name].seq) for obj in objects]
+            columns[name] = _encode_column(values, data)
+    return columns
+
+
+def _decode_level(columns, count, data):
+    """Return the attribute dictionaries of the objects of a level (PRIVATE)."""
+    attrs = [{} for _ in range(count)]
+    for name, column in columns.items():
+        values = _decode_column(column, count, data)
+        if name == '_alphabet':
+            values = [_ALPHABETS[value] for value in values]
+        for obj_attrs, value in zip(attrs, values):
+            if value is not _MISSING:
+                obj_attrs[name] = value
+    return attrs
+
+
+def _read_block(handle):
+    """Read the next block from the handle (PRIVATE).
+
+    Returns the block type, header dictionary, and data; or None at the
+    end of the file.
+    """
+    kind = handle.read(1)
+    if not kind:
+        return None
+    size, = struct.unpack("<Q", handle.read(8))
+    header = json.loads(handle.read(size).decode("utf-8"),
+                        object_hook=_json_object)
+    data = handle.read(header["size"])
+    return kind, header, data
+
+
+def _check_magic(handle):
+    """Check the handle is at the start of a SearchIO cache file (PRIVATE)."""
+    magic = handle.read(len(_MAGIC))
+    if magic != _MAGIC:
+        raise ValueError("Not a SearchIO cache file (format "
+                         "'searchio-cache'), or not opened in binary mode")
+
+
+def _build_qresult(header, data):
+    """Return the QueryResult object stored in a query block (PRIVATE)."""
+    if header["version"] != _FORMAT_VERSION:
+        raise ValueError("Unsupported SearchIO cache version %r"
+                         % header["version"])
+    hit_count, hsp_count, frag_count = header["counts"]
+    hit_hsps = numpy.frombuffer(data, "<i8", hit_count,
+                                header["hit_hsps"]).tolist()
+    hsp_frags = numpy.frombuffer(data, "<i8", hsp_count,
+                                 header["hsp_frags"]).tolist()
+    columns = header["columns"]
+
+    # The objects were valid when written, so restore their attributes
+    # directly instead of validating them again through their constructors
+    frags = []
+    for attrs in _decode_level(columns["fragment"], frag_count, data):
+        query = attrs.pop('_query', None)
+        hit = attrs.pop('_hit', None)
+        frag = HSPFragment.__new__(HSPFragment)
+        frag.__dict__.update(aln_annotation={}, _query=None, _hit=None,
+                             _query_features=[], _hit_features=[])
+        frag.__dict__.update(attrs)
+        # build the SeqRecord objects just like the parsers do
+        frag.query = query
+        frag.hit = hit
+        frags.append(frag)
+
+    hsps = []
+    start = 0
+    for attrs, frag_count in zip(_decode_level(columns["hsp"], hsp_count,
+                                               data), hsp_frags):
+        hsp = HSP.__new__(HSP)
+        hsp.__dict__.update(attrs)
+        hsp._items = frags[start:start + frag_count]
+        hsps.append(hsp)
+        start += frag_count
+
+    qresult = QueryResult(id=header["id"])
+    qresult.__dict__.update(header["attributes"])
+    start = 0
+    for attrs, hsp_count in zip(_decode_level(columns["hit"], hit_count,
+                                              data), hit_hsps):
+        hit = Hit.__new__(Hit)
+        hit.__dict__.update(attrs)
+        hit._items = hsps[start:start + hsp_count]
+        qresult.append(hit)
+        start += hsp_count
+    return qresult
+
+
+class SearchCacheParser(object):
+    """Parser for the SearchIO binary cache format."""
+
+    def __init__(self, handle):
+        """Initialize the class, handle must be opened in binary mode."""
+        self.handle = handle
+        _check_magic(handle)
+
+    def __iter__(self):
+        """Iterate over the file, yields QueryResult objects."""
+        while True:
+            block = _read_block(self.handle)
+            if block is None or block[0] != b"Q":
+                # reached the index (or a file truncated after a query)
+                break
+            yield _build_qresult(block[1], block[2])
+
+
+class SearchCacheIndexer(SearchIndexer):
+    """Indexer class for the SearchIO binary cache format.
+
+    This uses the index stored at the end of the file, instead of scanning
+    the whole file.
+    """
+
+    _parser = SearchCacheParser
+
+    def __init__(self, filename):
+        """Initialize the class."""
+        SearchIndexer.__init__(self, filename)
+        handle = self._handle
+        if isinstance(handle, bgzf.BgzfReader):
+            raise ValueError("SearchIO cache files cannot be BGZF compressed")
+        _check_magic(handle)
+        handle.seek(-8 - len(_MAGIC), 2)
+        offset, = struct.unpack("<Q", handle.read(8))
+        _check_magic(handle)
+        handle.seek(offset)
+        kind, header, data = _read_block(handle)
+        assert kind == b"I", kind
+        count = len(header["ids"])
+        self._ids = header["ids"]
+        self._offsets = numpy.frombuffer(data, "<i8", count,
+                                         header["offsets"]).tolist()
+        self._lengths = numpy.frombuffer(data, "<i8", count,
+                                         header["lengths"]).tolist()
+
+    def __iter__(self):
+        """Iterate over the stored index; yields key, start offset, and length."""
+        return iter(zip(self._ids, self._offsets, self._lengths))
+
+    def get_raw(self, offset):
+        """Return the raw bytes of the QueryResult block at the given offset."""
+        handle = self._handle
+        handle.seek(offset)
+        kind = handle.read(1)
+        size, = struct.unpack("<Q", handle.read(8))
+        header = handle.read(size)
+        data_size = json.loads(header.decode("utf-8"))["size"]
+        return kind + struct.pack("<Q", size) + header + handle.read(data_size)
+
+    def get(self, offset):
+        """Return the QueryResult object at the given offset."""
+        kind, header, data = _read_block(BytesIO(self.get_raw(offset)))
+        return _build_qresult(header, data)
+
+
+class SearchCacheWriter(object):
+    """Writer for the SearchIO binary cache format."""
+
+    def __init__(self, handle, alignments=True):
+        """Initialize the class, handle must be opened in binary mode.
+
+        Set alignments to False to leave out the aligned sequences and the
+        alignment annotation of the HSPFragment objects.
+        """
+        self.handle = handle
+        self.alignments = alignments
+
+    def write_file(self, qresults):
+        """Write to the handle, return the number of objects written."""
+        handle = self.handle
+        qresult_counter, hit_counter, hsp_counter, frag_counter = 0, 0, 0, 0
+        ids, offsets, lengths = [], [], []
+        handle.write(_MAGIC)
+        position = len(_MAGIC)
+        for qresult in qresults:
+            block, counts = self._build_block(qresult)
+            handle.write(block)
+            ids.append(qresult.id)
+            offsets.append(position)
+            lengths.append(len(block))
+            position += len(block)
+            qresult_counter += 1
+            hit_counter += counts[0]
+            hsp_counter += counts[1]
+            frag_counter += counts[2]
+
+        data = _BlockData()
+        header = {"version": _FORMAT_VERSION,
+                  "ids": ids,
+                  "offsets": data.add(numpy.array(offsets, "<i8")),
+                  "lengths": data.add(numpy.array(lengths, "<i8"))}
+        handle.write(self._block_bytes(b"I", header, data))
+        handle.write(struct.pack("<Q", position))
+        handle.write(_MAGIC)
+
+        return qresult_counter, hit_counter, hsp_counter, frag_counter
+
+    def _block_bytes(self, kind, header, data):
+        """Return a block as bytes (PRIVATE)."""
+        header["size"] = data.size
+        encoded = _encode_meta(header)
+        return (kind + struct.pack("<Q", len(encoded)) + encoded +
+                data.tobytes())
+
+    def _build_block(self, qresult):
+        """Return the block of a QueryResult and its object counts (PRIVATE)."""
+        hits = list(qresult)
+        hsps = [hsp for hit in hits for hsp in hit]
+        frags = [frag for hsp in hsps for frag in hsp]
+        data = _BlockData()
+        attributes = dict((name, _json_value(value))
+                          for name, value in qresult.__dict__.items()
+                          if name not in _SKIP_ATTRS['qresult'])
+        header = {
+            "version": _FORMAT_VERSION,
+            "id": qresult.id,
+            "attributes": attributes,
+            "counts": [len(hits), len(hsps), len(frags)],
+            "hit_hsps": data.add(numpy.array([len(hit) for hit in hits],
+                                             "<i8")),
+            "hsp_frags": data.add(numpy.array([len(hsp) for hsp in hsps],
+                                              "<i8")),
+            "columns": {
+                "hit": _encode_level(hits, 'hit', data, self.alignments),
+                "hsp": _encode_level(hsps, 'hsp', data, self.alignments),
+                "fragment": _encode_level(frags, 'fragment', data,
+                                          self.alignments),
+            },
+        }
+        return (self._block_bytes(b"Q", header, data),
+                (len(hits), len(hsps), len(frags)))
+
+
+# if not used as a module, run the doctest
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
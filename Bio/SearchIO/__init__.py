@@ -8,7 +8,8 @@
 The SearchIO submodule provides parsers, indexers, and writers for outputs from
 various sequence search programs. It provides an API similar to SeqIO and
 AlignIO, with the following main functions: `parse`, `read`, `to_dict`, `index`,
-`index_db`, `write`, and `convert`.
+`index_db`, `write`, and `convert`. Large files can also be parsed using
+several processes with `parse_parallel`.
 
 SearchIO parses a search output file's contents into a hierarchy of four nested
 objects: QueryResult, Hit, HSP, and HSPFragment. Each of them models a part of
@@ -172,6 +173,8 @@ Support for parsing, indexing, and writing:
  - hmmer3-domtab    - HMMER3 domain table output. When using this format, the
                       program name has to be specified. For example, for parsing
                       hmmscan output, the name would be 'hmmscan-domtab'.
+ - searchio-cache   - Binary cache of parsed search results (from any of the
+                      formats here), for fast reloading. Requires NumPy.
 
 Support for parsing and indexing:
 
@@ -226,6 +229,7 @@ _ITERATOR_MAP = {
         'hmmsearch3-domtab': ('HmmerIO', 'Hmmer3DomtabHmmqueryParser'),
         'interproscan-xml': ('InterproscanIO', 'InterproscanXmlParser'),
         'phmmer3-domtab': ('HmmerIO', 'Hmmer3DomtabHmmqueryParser'),
+        'searchio-cache': ('CacheIO', 'SearchCacheParser'),
 }
 
 # dictionary of supported formats for index()
@@ -243,6 +247,7 @@ _INDEXER_MAP = {
         'hmmscan3-domtab': ('HmmerIO', 'Hmmer3DomtabHmmhitIndexer'),
         'hmmsearch3-domtab': ('HmmerIO', 'Hmmer3DomtabHmmqueryIndexer'),
         'phmmer3-domtab': ('HmmerIO', 'Hmmer3DomtabHmmqueryIndexer'),
+        'searchio-cache': ('CacheIO', 'SearchCacheIndexer'),
 }
 
 # dictionary of supported formats for write()
@@ -254,8 +259,12 @@ _WRITER_MAP = {
         'hmmscan3-domtab': ('HmmerIO', 'Hmmer3DomtabHmmhitWriter'),
         'hmmsearch3-domtab': ('HmmerIO', 'Hmmer3DomtabHmmqueryWriter'),
         'phmmer3-domtab': ('HmmerIO', 'Hmmer3DomtabHmmqueryWriter'),
+        'searchio-cache': ('CacheIO', 'SearchCacheWriter'),
 }
 
+# formats which are read and written in binary mode
+_BinaryFormats = ['searchio-cache']
+
 
 def parse(handle, format=None, **kwargs):
     """Iterate over search tool output file as QueryResult objects.
@@ -301,14 +310,122 @@ def parse(handle, format=None, **kwargs):
     if format == 'blast-xml' and sys.version_info[0] > 2:
         handle_kwargs['encoding'] = 'utf-8'
 
+    if format in _BinaryFormats:
+        mode = 'rb'
+    else:
+        mode = 'rU'
+
     # and start iterating
-    with as_handle(handle, 'rU', **handle_kwargs) as source_file:
+    with as_handle(handle, mode, **handle_kwargs) as source_file:
         generator = iterator(source_file, **kwargs)
 
         for qresult in generator:
             yield qresult
 
 
+# Set in the worker processes of parse_parallel by _init_parse_worker
+_worker_indexer = None
+_worker_function = None
+
+
+def _init_parse_worker(filename, format, function, kwargs):
+    """Open the file to be parsed in a worker process (PRIVATE)."""
+    global _worker_indexer, _worker_function
+    _worker_indexer = get_processor(format, _INDEXER_MAP)(filename, **kwargs)
+    _worker_function = function
+
+
+def _parse_worker(offsets):
+    """Parse the query results at the given offsets in a worker (PRIVATE)."""
+    qresults = [_worker_indexer.get(offset) for offset in offsets]
+    if _worker_function is not None:
+        qresults = [_worker_function(qresult) for qresult in qresults]
+    return qresults
+
+
+def _offset_chunks(proxy, chunksize):
+    """Yield lists of query result offsets from an indexer (PRIVATE)."""
+    offsets = []
+    for key, offset, length in proxy:
+        offsets.append(offset)
+        if len(offsets) == chunksize:
+            yield offsets
+            offsets = []
+    if offsets:
+        yield offsets
+
+
+def parse_parallel(filename, format=None, function=None, processes=None,
+                   chunksize=100, **kwargs):
+    """Parse a search output file using several processes.
+
+    Arguments:
+     - filename - string giving the name of the file to be parsed.
+     - format - Lower case string denoting one of the formats supported
+       by `index`.
+     - function - Optional function called with each QueryResult in the
+       worker processes, whose return value is yielded instead of the
+       QueryResult. Use this to return only a summary of each query, as
+       the results have to be pickled to be sent back.
+     - processes - number of worker processes. With one process, the query
+       results are parsed in the current process, and with None (the
+       default), the number of CPUs is used.
+     - chunksize - number of query results parsed by a worker at once.
+     - kwargs - Format-specific keyword arguments.
+
+    The file is first scanned for the start of each query result, as done
+    by `index`. The query results are then parsed in a pool of worker
+    processes, and yielded in the same order as by `parse`:
+
+    >>> from Bio import SearchIO
+    >>> for qresult in SearchIO.parse_parallel('Blast/mirna.xml', 'blast-xml',
+    ...                                        processes=2):
+    ...     print("Search %s has %i hits" % (qresult.id, len(qresult)))
+    ...
+    Search 33211 has 100 hits
+    Search 33212 has 44 hits
+    Search 33213 has 95 hits
+
+    The function (which must be defined at the top level of a module, so
+    that it can be pickled) is applied in the worker processes:
+
+    >>> for count in SearchIO.parse_parallel('Blast/mirna.xml', 'blast-xml',
+    ...                                      len, processes=2):
+    ...     print(count)
+    ...
+    100
+    44
+    95
+
+    """
+    if not isinstance(filename, basestring):
+        raise TypeError("Need a filename (not a handle)")
+
+    proxy = get_processor(format, _INDEXER_MAP)(filename, **kwargs)
+    try:
+        if processes == 1:
+            for key, offset, length in proxy:
+                qresult = proxy.get(offset)
+                if function is not None:
+                    qresult = function(qresult)
+                yield qresult
+            return
+        import multiprocessing
+        pool = multiprocessing.Pool(processes, _init_parse_worker,
+                                    (filename, format, function, kwargs))
+        try:
+            for qresults in pool.imap(_parse_worker,
+                                      _offset_chunks(proxy, chunksize)):
+                for qresult in qresults:
+                    yield qresult
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+    finally:
+        proxy._handle.close()
+
+
 def read(handle, format=None, **kwargs):
     """Turn a search output file containing one query into a single QueryResult.
 
@@ -604,8 +721,13 @@ def write(qresults, handle, format=None, **kwargs):
     # get the writer object and do error checking
     writer_class = get_processor(format, _WRITER_MAP)
 
+    if format in _BinaryFormats:
+        mode = 'wb'
+    else:
+        mode = 'w'
+
     # write to the handle
-    with as_handle(handle, 'w') as target_file:
+    with as_handle(handle, mode) as target_file:
         writer = writer_class(target_file, **kwargs)
         # count how many qresults, hits, and hsps
         qresult_count, hit_count, hsp_count, frag_count = writer.write_file(qresults)
@@ -336,6 +336,17 @@ class Hit(_BaseSearchObject):
         self._validate_hsp(hsp)
         self._items.append(hsp)
 
+    def hsp_table(self, attributes=None):
+        """Return the HSPs as an HSPTable, with a NumPy array per attribute.
+
+        :param attributes: names of the numeric HSP attributes to read
+        :type attributes: list of strings, or None for the common ones
+
+        See QueryResult.hsp_table and Bio.SearchIO.hsptable, which needs NumPy.
+        """
+        from Bio.SearchIO.hsptable import HSPTable
+        return HSPTable(self.hsps, attributes)
+
     def filter(self, func=None):
         """Create new Hit object whose HSP objects pass the filter function.
 
@@ -624,6 +624,19 @@ class QueryResult(_BaseSearchObject):
         self._transfer_attrs(obj)
         return obj
 
+    def hsp_table(self, attributes=None):
+        """Return the HSPs as an HSPTable, with a NumPy array per attribute.
+
+        :param attributes: names of the numeric HSP attributes to read
+        :type attributes: list of strings, or None for the common ones
+
+        The table allows filtering, sorting and calculating the coverage of
+        many HSPs at once, and its to_qresult method gives back a QueryResult
+        with the selected HSPs. See Bio.SearchIO.hsptable, which needs NumPy.
+        """
+        from Bio.SearchIO.hsptable import HSPTable
+        return HSPTable(self.hsps, attributes, self)
+
     # marker for default self.pop() return value
     # this method is adapted from Python's built in OrderedDict.pop
     # implementation
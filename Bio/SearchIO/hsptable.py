@@ -0,0 +1,361 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Table of the HSPs of a search result, with a NumPy array per attribute.
+
+Filtering or sorting a QueryResult with many hits calls a Python function
+for every Hit or HSP object. An HSPTable instead reads the numeric
+attributes of all HSPs (e-value, bit score, coordinates and so on) once,
+into NumPy arrays with one row per HSP, on which the selections and
+calculations are done at once. The table is usually created with the
+hsp_table method of a QueryResult or Hit:
+
+>>> from Bio import SearchIO
+>>> qresult = next(SearchIO.parse("Blast/mirna.xml", "blast-xml"))
+>>> table = qresult.hsp_table()
+>>> table
+HSPTable(137 HSPs, 100 hits)
+>>> print(table["bitscore"].dtype)
+float64
+>>> print(table["query_start"].dtype)
+int64
+
+Attributes missing in some of the HSPs are NaN in the (floating point)
+arrays, while those missing in all HSPs have no column. The rows are
+selected using boolean arrays, indices or slices, giving a new table:
+
+>>> good = table[(table["evalue"] < 1e-10) & (table["gap_num"] == 0)]
+>>> len(good)
+54
+
+The query_coverage method gives the number of query positions covered by
+the HSPs (counting overlapping HSPs once), in total or for each hit:
+
+>>> table.query_coverage()
+61
+>>> print(table.query_coverage(per_hit=True)[:5])
+[61 60 61 61 60]
+
+The best HSP of each hit is selected with best_hsps, and sort gives the
+rows ordered by one or more columns:
+
+>>> best = table.best_hsps().sort("bitscore", reverse=True)
+>>> for hit_id, bitscore in zip(best["hit_id"][:3], best["bitscore"][:3]):
+...     print("%s %0.2f" % (hit_id, bitscore))
+...
+gi|262205317|ref|NR_030195.1| 111.29
+gi|301171311|ref|NR_035856.1| 109.49
+gi|270133242|ref|NR_032573.1| 102.28
+
+Finally, to_qresult gives a QueryResult with the selected HSPs, and the
+Hit objects containing them:
+
+>>> reduced = best[:3].to_qresult()
+>>> print("%s %i" % (reduced.id, len(reduced)))
+33211 3
+
+"""
+
+import warnings
+
+from Bio._py3k import basestring
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SearchIO.hsptable.")
+
+
+__all__ = ('HSPTable',)
+
+
+# numeric HSP attributes read by default, when present
+_DEFAULT_ATTRS = (
+    'evalue', 'evalue_cond', 'bitscore', 'bitscore_raw', 'bias',
+    'ident_num', 'ident_pct', 'pos_num', 'pos_pct', 'gap_num', 'aln_span',
+    'query_start', 'query_end', 'hit_start', 'hit_end', 'env_start',
+    'env_end', 'acc_avg', 'query_strand', 'hit_strand', 'query_frame',
+    'hit_frame',
+)
+
+
+def _hsp_value(hsp, attr):
+    """Return an attribute of the HSP, or None if it is missing (PRIVATE)."""
+    try:
+        return getattr(hsp, attr, None)
+    except ValueError:
+        # strand or frame of an HSP with several fragments
+        return getattr(hsp, attr + '_all')[0]
+
+
+def _column(values, attr):
+    """Return the values of an attribute as an int or float array (PRIVATE)."""
+    if None not in values and \
+            all(isinstance(value, int) for value in values):
+        return numpy.array(values, numpy.int64)
+    try:
+        return numpy.array([numpy.nan if value is None else value
+                            for value in values], numpy.float64)
+    except (TypeError, ValueError):
+        raise ValueError("HSP attribute %r is not numeric" % attr)
+
+
+def _group_starts(groups):
+    """Return the index of the first row of each run of equal values (PRIVATE)."""
+    if not len(groups):
+        return numpy.zeros(0, numpy.intp)
+    return numpy.concatenate([[0], numpy.flatnonzero(groups[1:] !=
+                                                     groups[:-1]) + 1])
+
+
+class HSPTable(object):
+    """HSPs of a search result, as a NumPy array for each attribute.
+
+    A column is retrieved by its attribute name, e.g. table["evalue"],
+    while other indices (boolean arrays, integer arrays or slices) select
+    rows, returning a new HSPTable. Besides the numeric attributes, there
+    are the columns hit_id (an array of strings) and hit_index (the order
+    of the hit of the HSP in the search result).
+    """
+
+    def __init__(self, hsps, attributes=None, qresult=None):
+        """Initialize the class.
+
+        Arguments:
+         - hsps - list of HSP objects, in the order of their hits
+         - attributes - names of the numeric HSP attributes to read. By
+           default, the common attributes of BLAST, HMMER, BLAT and
+           Exonerate HSPs are read (those missing in all HSPs are left
+           out), while explicitly given attributes are always included.
+         - qresult - the QueryResult containing the HSPs, used by to_qresult
+
+        """
+        hsps = list(hsps)
+        self.qresult = qresult
+        self._hsps = numpy.empty(len(hsps), object)
+        self._hsps[:] = hsps
+        hit_ids = [hsp.hit_id for hsp in hsps]
+        order = {}
+        for hit_id in hit_ids:
+            order.setdefault(hit_id, len(order))
+        self.attributes = ['hit_id', 'hit_index']
+        self._columns = [numpy.array(hit_ids, numpy.str_),
+                         numpy.array([order[hit_id] for hit_id in hit_ids],
+                                     numpy.int64)]
+        if attributes is None:
+            attributes = _DEFAULT_ATTRS
+            required = False
+        else:
+            required = True
+        with warnings.catch_warnings():
+            # coordinates of fragments without them
+            warnings.simplefilter('ignore')
+            for attr in attributes:
+                values = [_hsp_value(hsp, attr) for hsp in hsps]
+                if not required and all(value is None for value in values):
+                    continue
+                self.attributes.append(attr)
+                self._columns.append(_column(values, attr))
+
+    @classmethod
+    def _from_columns(cls, columns, attributes, hsps, qresult):
+        """Create a table from its columns (PRIVATE)."""
+        table = cls.__new__(cls)
+        table.qresult = qresult
+        table.attributes = list(attributes)
+        table._columns = columns
+        table._hsps = hsps
+        return table
+
+    def __len__(self):
+        """Return the number of rows."""
+        return len(self._hsps)
+
+    def __repr__(self):
+        """Return a short description of the table."""
+        return "%s(%i HSPs, %i hits)" % (self.__class__.__name__, len(self),
+                                         len(set(self["hit_index"].tolist())))
+
+    def __getitem__(self, index):
+        """Return a column by attribute name, or a selection of the rows."""
+        if isinstance(index, basestring):
+            try:
+                return self._columns[self.attributes.index(index)]
+            except ValueError:
+                raise KeyError(index)
+        return self._from_columns([column[index] for column in self._columns],
+                                  self.attributes, self._hsps[index],
+                                  self.qresult)
+
+    @property
+    def hsps(self):
+        """List of the HSP objects of the rows."""
+        return self._hsps.tolist()
+
+    def _first_rows(self):
+        """Return the first row of each hit, in the order of the rows (PRIVATE)."""
+        return numpy.sort(numpy.unique(self["hit_index"], return_index=True)[1])
+
+    def hit_ids(self):
+        """Return the hit IDs, in the order of the rows."""
+        return self["hit_id"][self._first_rows()].tolist()
+
+    def sort(self, key, reverse=False):
+        """Return the table with the rows sorted by one or more columns.
+
+        The key is an attribute name, or a list of names in which case the
+        rows are sorted by the first one, then by the second one and so
+        on. The sort is stable, also with reverse=True (sorting from high
+        to low values), and NaN values come last.
+        """
+        if isinstance(key, basestring):
+            key = [key]
+        keys = []
+        for attr in reversed(key):
+            values = self[attr]
+            if reverse:
+                if values.dtype.kind == 'U':
+                    # sort by the (descending) rank of the strings
+                    values = -numpy.unique(values, return_inverse=True)[1]
+                else:
+                    values = -values
+            keys.append(values)
+        return self[numpy.lexsort(keys)]
+
+    def best_hsps(self, by="bitscore"):
+        """Return the best HSP of each hit, in the order of the hits.
+
+        This is the HSP with the highest bit score (by="bitscore", default)
+        or with the lowest e-value (by="evalue"); ties are resolved by the
+        other of the two values (if present), and then by the row order.
+        """
+        if by == "bitscore":
+            keys = [-self["bitscore"]]
+            if "evalue" in self.attributes:
+                keys.insert(0, self["evalue"])
+        elif by == "evalue":
+            keys = [self["evalue"]]
+            if "bitscore" in self.attributes:
+                keys.insert(0, -self["bitscore"])
+        else:
+            raise ValueError("Can only select the best HSPs by 'bitscore' or "
+                             "'evalue', not %r" % by)
+        groups = self["hit_index"]
+        # lexsort is stable, and sorts by the last key first
+        order = numpy.lexsort(keys + [groups])
+        return self[order[_group_starts(groups[order])]]
+
+    def _intervals(self, seq_type, groups):
+        """Sort the ranges of the rows by group and start (PRIVATE).
+
+        Returns the row indices in this order, the groups (numbered from
+        zero) and the starts and ends of the ranges, together with the
+        largest end of the ranges before each of them in the same group
+        (or -inf). Rows without coordinates are left out.
+        """
+        starts = self[seq_type + "_start"]
+        ends = self[seq_type + "_end"]
+        rows = numpy.flatnonzero((starts == starts) & (ends == ends))
+        group_ids, groups = numpy.unique(groups[rows], return_inverse=True)
+        if not len(rows):
+            empty = numpy.zeros(0)
+            return rows, group_ids, groups, empty, empty, empty
+        order = numpy.lexsort((starts[rows], groups))
+        rows, groups = rows[order], groups[order]
+        starts, ends = starts[rows], ends[rows]
+        # shift each group beyond the previous one, so that the running
+        # maximum of the ends never carries over from one group to the next
+        shift = groups * float(ends.max() - starts.min() + 1)
+        previous = numpy.maximum.accumulate(ends + shift) - shift
+        previous = numpy.concatenate([[-numpy.inf], previous[:-1]])
+        previous[_group_starts(groups)] = -numpy.inf
+        return rows, group_ids, groups, starts, ends, previous
+
+    def _coverage(self, seq_type, per_hit):
+        """Return the positions covered by the rows, or by each hit (PRIVATE)."""
+        hit_index = self["hit_index"]
+        if not len(self):
+            if per_hit:
+                return numpy.zeros(0, numpy.int64)
+            return 0
+        if per_hit:
+            groups = hit_index
+        else:
+            groups = numpy.zeros(len(self), numpy.int64)
+        rows, group_ids, groups, starts, ends, previous = \
+            self._intervals(seq_type, groups)
+        lengths = numpy.maximum(ends - numpy.maximum(starts, previous), 0)
+        totals = numpy.rint(numpy.bincount(groups, lengths, len(group_ids)))
+        totals = totals.astype(numpy.int64)
+        if not per_hit:
+            return int(totals.sum())
+        hits = hit_index[self._first_rows()]
+        coverage = numpy.zeros(len(hits), numpy.int64)
+        coverage[numpy.searchsorted(numpy.sort(hits), group_ids)] = totals
+        return coverage[numpy.argsort(numpy.argsort(hits))]
+
+    def query_coverage(self, per_hit=False):
+        """Return the number of query positions covered by the HSPs.
+
+        Positions covered by several HSPs are counted once. With
+        per_hit=True, an array with the coverage of each hit is returned
+        (in the order of hit_ids), otherwise the coverage of all HSPs.
+        """
+        return self._coverage("query", per_hit)
+
+    def hit_coverage(self):
+        """Return an array with the hit positions covered by each hit.
+
+        Positions covered by several HSPs of a hit are counted once. The
+        values are in the order of hit_ids.
+        """
+        return self._coverage("hit", True)
+
+    def chains(self, max_gap=0):
+        """Return an array numbering the chain of HSPs of each row.
+
+        HSPs of the same hit (and hit strand) are in the same chain if
+        their query ranges overlap or are at most max_gap positions apart,
+        either directly or through other HSPs of the chain. This groups
+        the HSPs of each hit into separate regions of the query. The
+        chains are numbered from zero, in the order of the rows where they
+        start; rows without query coordinates are in a chain of their own.
+        """
+        count = len(self)
+        if not count:
+            return numpy.zeros(0, numpy.int64)
+        groups = 2 * self["hit_index"]
+        if "hit_strand" in self.attributes:
+            groups += self["hit_strand"] < 0
+        rows, group_ids, groups, starts, ends, previous = \
+            self._intervals("query", groups)
+        breaks = starts - previous > max_gap
+        chains = numpy.arange(count)
+        chains[rows] = rows[numpy.flatnonzero(breaks)][numpy.cumsum(breaks) - 1]
+        # number the chains in the order of their first rows
+        first = numpy.full(count, count, numpy.int64)
+        numpy.minimum.at(first, chains, numpy.arange(count))
+        number = numpy.zeros(count, numpy.int64)
+        number[first[first < count]] = 1
+        number = numpy.cumsum(number) - 1
+        return number[first[chains]]
+
+    def to_records(self):
+        """Return the rows as a NumPy record array, with the attribute names."""
+        return numpy.rec.fromarrays(self._columns, names=self.attributes)
+
+    def to_qresult(self):
+        """Return a QueryResult with the HSPs of the rows.
+
+        The QueryResult and its Hit objects are copies of those of the
+        search result the table was made from, with their attributes, but
+        with only the selected HSPs (in their original order). Hits
+        without selected HSPs are left out.
+        """
+        if self.qresult is None:
+            raise ValueError("The table was not made from a QueryResult")
+        selected = set(id(hsp) for hsp in self._hsps)
+        return self.qresult.hsp_filter(lambda hsp: id(hsp) in selected)
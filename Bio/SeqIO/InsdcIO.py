@@ -34,6 +34,7 @@ from __future__ import print_function
 
 import warnings
 from datetime import datetime
+from operator import itemgetter
 from Bio import BiopythonWarning
 
 from Bio.Seq import UnknownSeq
@@ -46,6 +47,9 @@ from Bio._py3k import _is_int_or_long
 from Bio._py3k import basestring
 
 
+_ExactPosition = SeqFeature.ExactPosition
+
+
 # NOTE
 # ====
 # The "brains" for parsing GenBank, EMBL and IMGT files (and any
@@ -54,7 +58,8 @@ from Bio._py3k import basestring
 # However, all the writing code is in this file.
 
 
-def GenBankIterator(handle):
+def GenBankIterator(handle, lazy_features=False, feature_types=None,
+                    feature_qualifiers=None):
     """Break up a Genbank file into SeqRecord objects.
 
     Every section from the LOCUS line to the terminating // becomes
@@ -89,12 +94,42 @@ def GenBankIterator(handle):
     L31939.1
     AF297471.1
 
+    With lazy_features=True the features are only parsed when used, which
+    is much faster if most of them are never looked at. Any problems with
+    a feature's location or qualifiers are then reported on first use:
+
+    >>> record = next(SeqIO.parse("GenBank/NC_005816.gb", "gb",
+    ...                           lazy_features=True))
+    >>> len(record.features)
+    41
+    >>> feature = record.features[3]
+    >>> feature.type, int(feature.location.start), int(feature.location.end)
+    ('CDS', 86, 1109)
+    >>> print(feature.qualifiers["locus_tag"])
+    ['YP_pPCP01']
+
+    If only some kinds of feature are needed, give their keys as
+    feature_types, and optionally the qualifiers to keep as
+    feature_qualifiers. All other features and qualifiers are skipped
+    over without being parsed:
+
+    >>> record = next(SeqIO.parse("GenBank/NC_005816.gb", "gb",
+    ...                           feature_types=["CDS"],
+    ...                           feature_qualifiers=["locus_tag"]))
+    >>> len(record.features)
+    10
+    >>> print(record.features[0].qualifiers)
+    OrderedDict([('locus_tag', ['YP_pPCP01'])])
+
     """
     # This calls a generator function:
-    return GenBankScanner(debug=0).parse_records(handle)
+    return GenBankScanner(debug=0).parse_records(
+        handle, lazy_features=lazy_features, feature_types=feature_types,
+        feature_qualifiers=feature_qualifiers)
 
 
-def EmblIterator(handle):
+def EmblIterator(handle, lazy_features=False, feature_types=None,
+                 feature_qualifiers=None):
     """Break up an EMBL file into SeqRecord objects.
 
     Every section from the LOCUS line to the terminating // becomes
@@ -135,12 +170,18 @@ def EmblIterator(handle):
     A00078.1
     CQ797900.1
 
+    As with GenBankIterator, lazy_features=True leaves the parsing of each
+    feature until its location or qualifiers are used, while feature_types
+    and feature_qualifiers limit the features and qualifiers parsed.
+
     """
     # This calls a generator function:
-    return EmblScanner(debug=0).parse_records(handle)
+    return EmblScanner(debug=0).parse_records(
+        handle, lazy_features=lazy_features, feature_types=feature_types,
+        feature_qualifiers=feature_qualifiers)
 
 
-def ImgtIterator(handle):
+def ImgtIterator(handle, feature_types=None, feature_qualifiers=None):
     """Break up an IMGT file into SeqRecord objects.
 
     Every section from the LOCUS line to the terminating // becomes
@@ -148,9 +189,14 @@ def ImgtIterator(handle):
 
     Note that for genomes or chromosomes, there is typically only
     one record.
+
+    The feature_types and feature_qualifiers arguments are as for the
+    GenBankIterator.
     """
     # This calls a generator function:
-    return _ImgtScanner(debug=0).parse_records(handle)
+    return _ImgtScanner(debug=0).parse_records(
+        handle, feature_types=feature_types,
+        feature_qualifiers=feature_qualifiers)
 
 
 def GenBankCdsFeatureIterator(handle, alphabet=Alphabet.generic_protein):
@@ -208,6 +254,12 @@ def _insdc_location_string_ignoring_strand_and_subfeatures(location, rec_length)
     else:
         ref = ""
     assert not location.ref_db
+    start = location.start
+    end = location.end
+    if type(start) is _ExactPosition and type(end) is _ExactPosition \
+            and start + 1 < end:
+        # Most common case by far, e.g. 12..15 gets mapped to 11:15
+        return "%s%i..%i" % (ref, start + 1, end)
     if isinstance(location.start, SeqFeature.ExactPosition) \
         and isinstance(location.end, SeqFeature.ExactPosition) \
             and location.start.position == location.end.position:
@@ -286,8 +338,18 @@ def _insdc_location_string(location, rec_length):
             return loc
 
 
+class _RecordBuffer(list):
+    """Collects the text of a record, to write it in one go (PRIVATE)."""
+
+    write = list.append
+
+
 class _InsdcWriter(SequentialSequenceWriter):
-    """Base class for GenBank and EMBL writers (PRIVATE)."""
+    """Base class for GenBank and EMBL writers (PRIVATE).
+
+    Each record is formatted into a buffer by the _format_record method of
+    the subclass, and written to the output handle with a single call.
+    """
 
     MAX_WIDTH = 80
     QUALIFIER_INDENT = 21
@@ -298,6 +360,16 @@ class _InsdcWriter(SequentialSequenceWriter):
                        "rpt_type", "rpt_unit_range", "tag_peptide",
                        "transl_except", "transl_table")
 
+    def write_record(self, record):
+        """Write a single record to the output file."""
+        handle = self.handle
+        self.handle = buffer = _RecordBuffer()
+        try:
+            self._format_record(record)
+        finally:
+            self.handle = handle
+        handle.write("".join(buffer))
+
     def _write_feature_qualifier(self, key, value=None, quote=None):
         if value is None:
             # Value-less entry like /pseudo
@@ -318,21 +390,20 @@ class _InsdcWriter(SequentialSequenceWriter):
         if len(line) <= self.MAX_WIDTH:
             self.handle.write(line + "\n")
             return
+        lines = []
         while line.lstrip():
             if len(line) <= self.MAX_WIDTH:
-                self.handle.write(line + "\n")
-                return
-            # Insert line break...
-            for index in range(min(len(line) - 1, self.MAX_WIDTH),
-                               self.QUALIFIER_INDENT + 1, -1):
-                if line[index] == " ":
-                    break
-            if line[index] != " ":
+                lines.append(line)
+                break
+            # Insert line break at the last space, if any...
+            index = line.rfind(" ", self.QUALIFIER_INDENT + 2,
+                               min(len(line) - 1, self.MAX_WIDTH) + 1)
+            if index == -1:
                 # No nice place to break...
                 index = self.MAX_WIDTH
-            assert index <= self.MAX_WIDTH
-            self.handle.write(line[:index] + "\n")
+            lines.append(line[:index])
             line = self.QUALIFIER_INDENT_STR + line[index:].lstrip()
+        self.handle.write("\n".join(lines) + "\n")
 
     def _wrap_location(self, location):
         """Split a feature location into lines (break at commas) (PRIVATE)."""
@@ -813,15 +884,23 @@ class GenBankWriter(_InsdcWriter):
         data = self._get_seq_string(record).lower()
         seq_len = len(data)
         self.handle.write("ORIGIN\n")
-        for line_number in range(0, seq_len, self.LETTERS_PER_LINE):
-            self.handle.write(str(line_number + 1).rjust(self.SEQUENCE_INDENT))
-            for words in range(line_number,
-                               min(line_number + self.LETTERS_PER_LINE, seq_len), 10):
-                self.handle.write(" %s" % data[words:words + 10])
-            self.handle.write("\n")
+        # Format all the full lines in one go, each as blocks of ten letters
+        width = self.LETTERS_PER_LINE
+        blocks = itemgetter(*[slice(i, i + 10) for i in range(0, width, 10)])
+        template = "%*i" + " %s" * (width // 10) + "\n"
+        full = seq_len - seq_len % width
+        self.handle.write("".join([
+            template % ((self.SEQUENCE_INDENT, i + 1) + blocks(data[i:i + width]))
+            for i in range(0, full, width)]))
+        if full < seq_len:
+            # Final (partial) line
+            rest = data[full:]
+            self.handle.write("%*i %s\n" % (
+                self.SEQUENCE_INDENT, full + 1,
+                " ".join(rest[i:i + 10] for i in range(0, len(rest), 10))))
 
-    def write_record(self, record):
-        """Write a single record to the output file."""
+    def _format_record(self, record):
+        """Write a single record to the (buffered) output (PRIVATE)."""
         handle = self.handle
         self._write_the_first_line(record)
 
@@ -997,26 +1076,25 @@ class EmblWriter(_InsdcWriter):
         else:
             handle.write("SQ   \n")
 
-        for line_number in range(0, seq_len // self.LETTERS_PER_LINE):
-            handle.write("    ")  # Just four, not five
-            for block in range(self.BLOCKS_PER_LINE):
-                index = self.LETTERS_PER_LINE * line_number + \
-                    self.LETTERS_PER_BLOCK * block
-                handle.write((" %s" % data[index:index + self.LETTERS_PER_BLOCK]))
-            handle.write(str((line_number + 1) *
-                             self.LETTERS_PER_LINE).rjust(self.POSITION_PADDING))
-            handle.write("\n")
-        if seq_len % self.LETTERS_PER_LINE:
-            # Final (partial) line
-            line_number = (seq_len // self.LETTERS_PER_LINE)
-            handle.write("    ")  # Just four, not five
-            for block in range(self.BLOCKS_PER_LINE):
-                index = self.LETTERS_PER_LINE * line_number + \
-                    self.LETTERS_PER_BLOCK * block
-                handle.write(
-                    (" %s" % data[index:index + self.LETTERS_PER_BLOCK]).ljust(11))
-            handle.write(str(seq_len).rjust(self.POSITION_PADDING))
-            handle.write("\n")
+        # Format all the full lines in one go (indented by just four spaces,
+        # not five, as each block is preceded by a space):
+        block_len = self.LETTERS_PER_BLOCK
+        width = self.LETTERS_PER_LINE
+        blocks = itemgetter(*[slice(i, i + block_len)
+                              for i in range(0, width, block_len)])
+        template = "    " + " %s" * self.BLOCKS_PER_LINE + "%*i\n"
+        full = seq_len - seq_len % width
+        handle.write("".join([
+            template % (blocks(data[i:i + width]) + (self.POSITION_PADDING, i + width))
+            for i in range(0, full, width)]))
+        if full < seq_len:
+            # Final (partial) line, padded to the full width
+            rest = data[full:]
+            handle.write("    %s%*i\n" % (
+                "".join((" " + rest[i:i + block_len]).ljust(block_len + 1)
+                        for i in range(0, len(rest), block_len)).ljust(
+                    self.BLOCKS_PER_LINE * (block_len + 1)),
+                self.POSITION_PADDING, seq_len))
 
     def _write_single_line(self, tag, text):
         assert len(tag) == 2
@@ -1206,8 +1284,8 @@ class EmblWriter(_InsdcWriter):
             self._write_multi_line("CC", line)
         self.handle.write("XX\n")
 
-    def write_record(self, record):
-        """Write a single record to the output file."""
+    def _format_record(self, record):
+        """Write a single record to the (buffered) output (PRIVATE)."""
         handle = self.handle
         self._write_the_first_lines(record)
 
@@ -540,7 +540,7 @@ def write(sequences, handle, format):
     return count
 
 
-def parse(handle, format, alphabet=None):
+def parse(handle, format, alphabet=None, **kwargs):
     r"""Turn a sequence file into an iterator returning SeqRecords.
 
     Arguments:
@@ -550,6 +550,9 @@ def parse(handle, format, alphabet=None):
      - alphabet - optional Alphabet object, useful when the sequence type
        cannot be automatically inferred from the file itself
        (e.g. format="fasta" or "tab")
+     - kwargs   - any additional format specific keyword arguments, passed
+       to the underlying iterator (e.g. lazy_features for "genbank" and
+       "embl", see Bio.SeqIO.InsdcIO).
 
     Typical usage, opening a file to read in, and looping over the record(s):
 
@@ -622,16 +625,18 @@ def parse(handle, format, alphabet=None):
         if format in _FormatToIterator:
             iterator_generator = _FormatToIterator[format]
             if alphabet is None:
-                i = iterator_generator(fp)
+                i = iterator_generator(fp, **kwargs)
             else:
                 try:
-                    i = iterator_generator(fp, alphabet=alphabet)
+                    i = iterator_generator(fp, alphabet=alphabet, **kwargs)
                 except TypeError:
-                    i = _force_alphabet(iterator_generator(fp), alphabet)
+                    i = _force_alphabet(iterator_generator(fp, **kwargs),
+                                        alphabet)
         elif format in AlignIO._FormatToIterator:
             # Use Bio.AlignIO to read in the alignments
             i = (r for alignment in AlignIO.parse(fp, format,
-                                                  alphabet=alphabet)
+                                                  alphabet=alphabet,
+                                                  **kwargs)
                  for r in alignment)
         else:
             raise ValueError("Unknown format '%s'" % format)
@@ -655,7 +660,7 @@ def _force_alphabet(record_iterator, alphabet):
                              % (alphabet, record.seq.alphabet))
 
 
-def read(handle, format, alphabet=None):
+def read(handle, format, alphabet=None, **kwargs):
     """Turn a sequence file into a single SeqRecord.
 
     Arguments:
@@ -665,6 +670,8 @@ def read(handle, format, alphabet=None):
      - alphabet - optional Alphabet object, useful when the sequence type
        cannot be automatically inferred from the file itself
        (e.g. format="fasta" or "tab")
+     - kwargs   - any additional format specific keyword arguments, as
+       for the parse function.
 
     This function is for use parsing sequence files containing
     exactly one record.  For example, reading a GenBank file:
@@ -699,7 +706,7 @@ def read(handle, format, alphabet=None):
     Use the Bio.SeqIO.parse(handle, format) function if you want
     to read multiple records from the handle.
     """
-    iterator = parse(handle, format, alphabet)
+    iterator = parse(handle, format, alphabet, **kwargs)
     try:
         first = next(iterator)
     except StopIteration:
@@ -777,7 +784,7 @@ def to_dict(sequences, key_function=None):
     return d
 
 
-def index(filename, format, alphabet=None, key_function=None):
+def index(filename, format, alphabet=None, key_function=None, **kwargs):
     """Indexes a sequence file and returns a dictionary like object.
 
     Arguments:
@@ -789,6 +796,9 @@ def index(filename, format, alphabet=None, key_function=None):
      - key_function - Optional callback function which when given a
        SeqRecord identifier string should return a unique key for the
        dictionary.
+     - kwargs   - any additional format specific keyword arguments, used
+       when parsing each record (e.g. feature_types for "genbank", see
+       Bio.SeqIO.InsdcIO).
 
     This indexing function will return a dictionary like object, giving the
     SeqRecord objects as values:
@@ -907,9 +917,12 @@ def index(filename, format, alphabet=None, key_function=None):
         proxy_class = _FormatToRandomAccess[format]
     except KeyError:
         raise ValueError("Unsupported format %r" % format)
-    repr = "SeqIO.index(%r, %r, alphabet=%r, key_function=%r)" \
+    repr = "SeqIO.index(%r, %r, alphabet=%r, key_function=%r" \
         % (filename, format, alphabet, key_function)
-    return _IndexedSeqFileDict(proxy_class(filename, format, alphabet),
+    for key in sorted(kwargs):
+        repr += ", %s=%r" % (key, kwargs[key])
+    repr += ")"
+    return _IndexedSeqFileDict(proxy_class(filename, format, alphabet, **kwargs),
                                key_function, repr, "SeqRecord")
 
 
@@ -1055,6 +1068,50 @@ def convert(in_file, in_format, out_file, out_format, alphabet=None):
     return count
 
 
+def group_identical(in_file, format, alphabet=None, ignore_case=False,
+                    buffer_size=1000000, partitions=64, tmpdir=None):
+    """Group the records with identical sequences, yielding lists of ids.
+
+    Arguments:
+     - in_file - an input handle or filename
+     - format - file format, lower case string
+     - alphabet - optional alphabet to assume
+     - ignore_case - if True, sequences differing only in case are grouped
+     - buffer_size - the number of records grouped in memory
+     - partitions - the number of temporary files used for larger inputs
+     - tmpdir - the directory for the temporary files (by default, the
+       system temporary directory)
+
+    Every record is in one group, so sequences occurring only once give a
+    group with a single id, and the ids within a group are in file order.
+    The records are compared by the SHA1 digest of their sequence. Files
+    with up to buffer_size records are grouped in memory, with the groups
+    in the order of their first record. For larger files the digests and
+    ids are spilled to partitions temporary files, which are grouped one
+    by one, so that the memory used stays bounded (the groups are then in
+    no particular order).
+
+    >>> from Bio import SeqIO
+    >>> for ids in SeqIO.group_identical("Fasta/f002", "fasta"):
+    ...     print(ids)
+    ...
+    ['gi|1348912|gb|G26680|G26680']
+    ['gi|1348917|gb|G26685|G26685']
+    ['gi|1592936|gb|G29385|G29385']
+
+    """
+    if format in _BinaryFormats:
+        mode = "rb"
+    else:
+        mode = "rU"
+    from ._dedup import _group_identical  # Lazy import
+    with as_handle(in_file, mode) as in_handle:
+        for group in _group_identical(in_handle, format, alphabet,
+                                      ignore_case, buffer_size, partitions,
+                                      tmpdir):
+            yield group
+
+
 # This helpful trick for testing no longer works with the
 # local imports :(
 #
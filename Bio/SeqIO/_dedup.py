@@ -0,0 +1,130 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Grouping of records with identical sequences (PRIVATE).
+
+You are not expected to access this module directly, the public interface
+is the Bio.SeqIO.group_identical(...) function.
+
+Each sequence is reduced to its SHA1 digest, and the record identifiers are
+grouped by digest. Up to buffer_size records are grouped in memory; for
+larger files the digests and identifiers are written to a number of
+temporary partition files (by the first byte of the digest), which are then
+grouped one at a time, so that the memory used is bounded by the size of a
+partition rather than by the number of records.
+"""
+
+import hashlib
+import os
+import shutil
+import struct
+import tempfile
+
+from Bio import SeqIO
+
+
+_entry = struct.Struct("<20sI")
+
+
+def _ids_and_sequences(handle, format, alphabet):
+    """Iterate over the (id, sequence) of the records (PRIVATE).
+
+    FASTA and FASTQ files are read with the low level parsers, rather than
+    building SeqRecord objects, giving the same ids as SeqIO.parse.
+    """
+    if format == "fasta" and alphabet is None:
+        from Bio.SeqIO.FastaIO import SimpleFastaParser
+        for title, sequence in SimpleFastaParser(handle):
+            try:
+                yield title.split(None, 1)[0], sequence
+            except IndexError:
+                yield "", sequence
+    elif format in ("fastq", "fastq-sanger", "fastq-solexa",
+                    "fastq-illumina") and alphabet is None:
+        from Bio.SeqIO.QualityIO import FastqGeneralIterator
+        for title, sequence, quality in FastqGeneralIterator(handle):
+            try:
+                yield title.split(None, 1)[0], sequence
+            except IndexError:
+                yield "", sequence
+    else:
+        for record in SeqIO.parse(handle, format, alphabet):
+            yield record.id, str(record.seq)
+
+
+def _group(entries):
+    """Group the (digest, id) pairs by digest, in order (PRIVATE)."""
+    groups = {}
+    order = []
+    for digest, identifier in entries:
+        try:
+            groups[digest].append(identifier)
+        except KeyError:
+            groups[digest] = [identifier]
+            order.append(digest)
+    for digest in order:
+        yield groups[digest]
+
+
+def _read_partition(filename):
+    """Iterate over the (digest, id) pairs in a partition file (PRIVATE)."""
+    with open(filename, "rb") as handle:
+        while True:
+            data = handle.read(_entry.size)
+            if not data:
+                break
+            digest, length = _entry.unpack(data)
+            yield digest, handle.read(length).decode("utf-8")
+
+
+def _group_identical(handle, format, alphabet=None, ignore_case=False,
+                     buffer_size=1000000, partitions=64, tmpdir=None):
+    """Yield the ids of the records with identical sequences (PRIVATE).
+
+    See Bio.SeqIO.group_identical for the arguments.
+    """
+    buffer = []
+    directory = None
+    files = None
+    try:
+        for identifier, sequence in _ids_and_sequences(handle, format,
+                                                       alphabet):
+            if ignore_case:
+                sequence = sequence.upper()
+            digest = hashlib.sha1(sequence.encode("utf-8")).digest()
+            buffer.append((digest, identifier))
+            if len(buffer) >= buffer_size:
+                if files is None:
+                    directory = tempfile.mkdtemp(dir=tmpdir)
+                    files = [open(os.path.join(directory, str(i)), "wb")
+                             for i in range(partitions)]
+                _spill(buffer, files)
+                buffer = []
+        if files is None:
+            # Everything fitted in memory
+            for group in _group(buffer):
+                yield group
+            return
+        _spill(buffer, files)
+        buffer = None
+        for partition in files:
+            partition.close()
+        for partition in files:
+            for group in _group(_read_partition(partition.name)):
+                yield group
+    finally:
+        if files is not None:
+            for partition in files:
+                partition.close()
+            shutil.rmtree(directory)
+
+
+def _spill(buffer, files):
+    """Append the (digest, id) pairs to the partition files (PRIVATE)."""
+    partitions = len(files)
+    for digest, identifier in buffer:
+        identifier = identifier.encode("utf-8")
+        partition = files[bytearray(digest[:1])[0] % partitions]
+        partition.write(_entry.pack(digest, len(identifier)))
+        partition.write(identifier)
@@ -39,8 +39,12 @@ from Bio.File import _IndexedSeqFileProxy, _open_for_random_access
 
 
 class SeqFileRandomAccess(_IndexedSeqFileProxy):
-    def __init__(self, filename, format, alphabet):
-        """Initialize the class."""
+    def __init__(self, filename, format, alphabet, **kwargs):
+        """Initialize the class.
+
+        Any keyword arguments are passed to the format's iterator when
+        parsing a record (e.g. feature_types for GenBank files).
+        """
         self._handle = _open_for_random_access(filename)
         self._alphabet = alphabet
         self._format = format
@@ -52,15 +56,16 @@ class SeqFileRandomAccess(_IndexedSeqFileProxy):
         if alphabet is None:
             def _parse(handle):
                 """Dynamically generated parser function (PRIVATE)."""
-                return next(i(handle))
+                return next(i(handle, **kwargs))
         else:
             # TODO - Detect alphabet support ONCE at __init__
             def _parse(handle):
                 """Dynamically generated parser function (PRIVATE)."""
                 try:
-                    return next(i(handle, alphabet=alphabet))
+                    return next(i(handle, alphabet=alphabet, **kwargs))
                 except TypeError:
-                    return next(SeqIO._force_alphabet(i(handle), alphabet))
+                    return next(SeqIO._force_alphabet(i(handle, **kwargs),
+                                                      alphabet))
         self._parse = _parse
 
     def get(self, offset):
@@ -172,9 +177,9 @@ class SffTrimedRandomAccess(SffRandomAccess):
 ###################
 
 class SequentialSeqFileRandomAccess(SeqFileRandomAccess):
-    def __init__(self, filename, format, alphabet):
+    def __init__(self, filename, format, alphabet, **kwargs):
         """Initialize the class."""
-        SeqFileRandomAccess.__init__(self, filename, format, alphabet)
+        SeqFileRandomAccess.__init__(self, filename, format, alphabet, **kwargs)
         marker = {"ace": b"CO ",
                   "embl": b"ID ",
                   "fasta": b">",
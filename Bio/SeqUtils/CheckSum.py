@@ -5,16 +5,36 @@
 # license.  Please see the LICENSE file that should have been included
 # as part of this package.
 
-"""Functions to calculate assorted sequence checksums."""
+"""Functions to calculate assorted sequence checksums.
+
+To calculate checksums for a large number of sequences, use the checksums
+function, which encodes each sequence once and calculates the requested
+checksums from the encoded sequence:
+
+>>> from Bio.SeqUtils.CheckSum import checksums
+>>> for values in checksums(["ACGTACGTACGT", "acgtACGTacgt"],
+...                         ["crc64", "gcg", "seguid"]):
+...     print(values)
+...
+('CRC-C4FBB762C4A87EBD', 5688, 'If6HIvcnRSQDVNiAoefAzySc6i4')
+('CRC-DA4509DC64A87EBD', 5688, 'If6HIvcnRSQDVNiAoefAzySc6i4')
+"""
 
 # crc32, crc64, gcg, and seguid
 # crc64 is adapted from BioPerl
 
 from __future__ import print_function
 
+import base64
+import hashlib
 from binascii import crc32 as _crc32
 from Bio._py3k import _as_bytes
 
+try:
+    from Bio.SeqUtils import _checksum
+except ImportError:
+    _checksum = None
+
 
 def crc32(seq):
     """Return the crc32 checksum for a sequence (string or Seq object).
@@ -70,6 +90,13 @@ def crc64(s):
     'CRC-DA4509DC64A87EBD'
 
     """
+    if _checksum is not None:
+        try:
+            data = str(s).encode("ascii")
+        except UnicodeError:
+            pass
+        else:
+            return "CRC-%016X" % _checksum.crc64(data)
     crcl = 0
     crch = 0
     for c in s:
@@ -107,6 +134,11 @@ def gcg(seq):
     except AttributeError:
         # Assume its a string
         pass
+    if _checksum is not None:
+        try:
+            return _checksum.gcg(seq.encode("ascii"))
+        except UnicodeError:
+            pass
     index = checksum = 0
     for char in seq:
         index += 1
@@ -134,8 +166,6 @@ def seguid(seq):
     http://bioinformatics.anl.gov/seguid/
     https://doi.org/10.1002/pmic.200600032
     """
-    import hashlib
-    import base64
     m = hashlib.sha1()
     try:
         # Assume it's a Seq object
@@ -154,6 +184,63 @@ def seguid(seq):
     return base64.b64encode(m.digest()).rstrip("=")
 
 
+def _seguid_bytes(data):
+    """Return the SEGUID of an ASCII sequence as bytes (PRIVATE)."""
+    digest = hashlib.sha1(data.upper()).digest()
+    return base64.b64encode(digest).decode().rstrip("=")
+
+
+def _checksum_functions():
+    """Return the checksum functions of ASCII sequences as bytes (PRIVATE).
+
+    Each function gives the same value as the function of the same name in
+    this module.
+    """
+    functions = {"crc32": _crc32, "seguid": _seguid_bytes}
+    if _checksum is None:
+        functions["crc64"] = lambda data: crc64(data.decode())
+        functions["gcg"] = lambda data: gcg(data.decode())
+    else:
+        functions["crc64"] = lambda data: "CRC-%016X" % _checksum.crc64(data)
+        functions["gcg"] = _checksum.gcg
+    return functions
+
+
+def checksums(sequences, names=("crc32", "crc64", "gcg", "seguid")):
+    """Calculate checksums for each of the sequences.
+
+    Iterates over the sequences (strings, Seq or SeqRecord objects, e.g.
+    from Bio.SeqIO.parse), and yields a tuple with the checksums given by
+    names for each sequence, as calculated by the functions of the same
+    name in this module. If a single name is given as a string, the
+    checksums are yielded directly rather than as tuples.
+    """
+    single = isinstance(names, str)
+    if single:
+        names = [names]
+    available = _checksum_functions()
+    for name in names:
+        if name not in available:
+            raise ValueError("Unknown checksum %r" % name)
+    functions = [available[name] for name in names]
+    # for sequences which are not ASCII
+    fallback = {"crc32": crc32, "crc64": crc64, "gcg": gcg, "seguid": seguid}
+    fallback = [fallback[name] for name in names]
+    for sequence in sequences:
+        # A SeqRecord, or a sequence
+        sequence = str(getattr(sequence, "seq", sequence))
+        try:
+            data = sequence.encode("ascii")
+        except UnicodeError:
+            values = [function(sequence) for function in fallback]
+        else:
+            values = [function(data) for function in functions]
+        if single:
+            yield values[0]
+        else:
+            yield tuple(values)
+
+
 if __name__ == "__main__":
     from Bio._utils import run_doctest
     run_doctest()
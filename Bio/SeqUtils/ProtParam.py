@@ -42,6 +42,14 @@ Example:
      - gravy
      - protein_scale
      - flexibility
+
+To analyse many proteins, use the BatchProteinAnalysis class (or the
+analyse_proteins function for very large numbers of proteins), which
+calculates the same properties for all the proteins at once using NumPy,
+returning an array with one value (or row) per protein. For example,
+BatchProteinAnalysis(sequences).isoelectric_point() gives an array of the
+isoelectric points, and its table method a structured array of several
+properties.
 """
 
 from __future__ import print_function
@@ -54,6 +62,11 @@ from Bio.Alphabet import IUPAC
 from Bio.Data import IUPACData
 from Bio.SeqUtils import molecular_weight
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class ProteinAnalysis(object):
     """Class containing methods for protein analysis.
@@ -328,6 +341,280 @@ class ProteinAnalysis(object):
         return(mec_reduced, mec_cystines)
 
 
+class BatchProteinAnalysis(object):
+    """Calculate the properties of many proteins at once.
+
+    The constructor takes a list of protein sequences (strings, Seq or
+    SeqRecord objects), and optionally monoisotopic (as for
+    ProteinAnalysis). The sequences are encoded together as a single NumPy
+    array, and the methods calculate the same values as the methods of the
+    same name of ProteinAnalysis for all the proteins at once, returning
+    arrays with one value (or row) per protein.
+
+    The lengths and the counts of the 20 standard amino acids (in the order
+    of IUPACData.protein_letters) are in the lengths and counts attributes.
+
+    Where ProteinAnalysis would raise an exception (for example for letters
+    without a molecular weight or a hydropathy value, or for an empty
+    sequence) the value is NaN instead.
+    """
+
+    # The columns which can be selected in table, and their dtypes
+    descriptors = (("length", int),
+                   ("molecular_weight", float),
+                   ("aromaticity", float),
+                   ("instability_index", float),
+                   ("gravy", float),
+                   ("isoelectric_point", float),
+                   ("helix", float),
+                   ("turn", float),
+                   ("sheet", float),
+                   ("extinction_reduced", int),
+                   ("extinction_cystines", int))
+
+    # The descriptors which are columns of the values of a method
+    _columns = {"helix": ("secondary_structure_fraction", 0),
+                "turn": ("secondary_structure_fraction", 1),
+                "sheet": ("secondary_structure_fraction", 2),
+                "extinction_reduced": ("molar_extinction_coefficient", 0),
+                "extinction_cystines": ("molar_extinction_coefficient", 1)}
+
+    def __init__(self, sequences, monoisotopic=False):
+        """Initialize the class."""
+        if numpy is None:
+            from Bio import MissingPythonDependencyError
+            raise MissingPythonDependencyError(
+                "Install NumPy if you want to use BatchProteinAnalysis.")
+        data = []
+        for sequence in sequences:
+            # A SeqRecord, or a sequence
+            sequence = str(getattr(sequence, "seq", sequence)).upper()
+            data.append(sequence.encode("ascii", "replace"))
+        self.monoisotopic = monoisotopic
+        self.lengths = numpy.array([len(sequence) for sequence in data],
+                                   numpy.intp)
+        self.codes = numpy.frombuffer(b"".join(data), numpy.uint8)
+        self.starts = numpy.concatenate([[0], numpy.cumsum(self.lengths)])
+        # The index of the protein of each residue
+        self.proteins = numpy.repeat(numpy.arange(len(data)), self.lengths)
+        letters = IUPACData.protein_letters
+        self._index = numpy.full(256, len(letters), numpy.intp)
+        for index, letter in enumerate(letters):
+            self._index[ord(letter)] = index
+        self._letters = dict((letter, index)
+                             for index, letter in enumerate(letters))
+        n = len(data)
+        counts = numpy.bincount(
+            self.proteins * (len(letters) + 1) + self._index[self.codes],
+            minlength=n * (len(letters) + 1))
+        self.counts = counts.reshape(n, len(letters) + 1)[:, :-1]
+
+    def __len__(self):
+        """Return the number of proteins."""
+        return len(self.lengths)
+
+    def _count(self, letters):
+        """Return the total counts of the given amino acids (PRIVATE)."""
+        return sum(self.counts[:, self._letters[letter]]
+                   for letter in letters)
+
+    def _divide(self, values):
+        """Divide the values by the lengths, giving NaN for 0 (PRIVATE)."""
+        lengths = self.lengths.astype(float)
+        lengths[lengths == 0] = numpy.nan
+        return values / lengths
+
+    def _sum_scale(self, scale):
+        """Sum a dictionary of values per residue for each protein (PRIVATE).
+
+        Residues not in the dictionary give NaN.
+        """
+        table = numpy.full(256, numpy.nan)
+        for letter, value in scale.items():
+            table[ord(letter)] = value
+        return numpy.bincount(self.proteins, table[self.codes],
+                              minlength=len(self))
+
+    def molecular_weight(self):
+        """Calculate the molecular weight of each protein."""
+        if self.monoisotopic:
+            weights = IUPACData.monoisotopic_protein_weights
+            water = 18.010565
+        else:
+            weights = IUPACData.protein_weights
+            water = 18.0153
+        weight = self._sum_scale(weights) - (self.lengths - 1) * water
+        weight[self.lengths == 0] = numpy.nan
+        return weight
+
+    def aromaticity(self):
+        """Calculate the aromaticity (relative frequency of Phe+Trp+Tyr)."""
+        return self._divide(self._count("YWF"))
+
+    def instability_index(self):
+        """Calculate the instability index of each protein."""
+        letters = IUPACData.protein_letters
+        table = numpy.full((len(letters) + 1, len(letters) + 1), numpy.nan)
+        for first, values in ProtParamData.DIWV.items():
+            for second, value in values.items():
+                table[self._letters[first], self._letters[second]] = value
+        index = self._index[self.codes]
+        # The dipeptides within each protein
+        within = self.proteins[1:] == self.proteins[:-1]
+        values = table[index[:-1][within], index[1:][within]]
+        scores = numpy.bincount(self.proteins[1:][within], values,
+                                minlength=len(self))
+        return self._divide(10.0 * scores)
+
+    def gravy(self):
+        """Calculate the gravy according to Kyte and Doolittle."""
+        return self._divide(self._sum_scale(ProtParamData.kd))
+
+    def _terminal_pKs(self, residues, pKs, default):
+        """Return the pK of the terminal residue of each protein (PRIVATE)."""
+        table = numpy.full(256, default)
+        for letter, pK in pKs.items():
+            table[ord(letter)] = pK
+        result = numpy.full(len(self), numpy.nan)
+        nonempty = self.lengths > 0
+        result[nonempty] = table[self.codes[residues[nonempty]]]
+        return result
+
+    def _charge(self, pH, charged, nterm, cterm):
+        """Return the charges of the proteins at the given pH (PRIVATE).
+
+        The terms are summed in the same order as by IsoelectricPoint.
+        """
+        cr = 10 ** (nterm - pH)
+        positive = cr / (cr + 1.0)
+        for aa in ("K", "R", "H"):
+            cr = 10 ** (IsoelectricPoint.positive_pKs[aa] - pH)
+            positive = positive + charged[aa] * (cr / (cr + 1.0))
+        cr = 10 ** (pH - cterm)
+        negative = cr / (cr + 1.0)
+        for aa in ("D", "E", "C", "Y"):
+            cr = 10 ** (pH - IsoelectricPoint.negative_pKs[aa])
+            negative = negative + charged[aa] * (cr / (cr + 1.0))
+        return positive - negative
+
+    def isoelectric_point(self):
+        """Calculate the isoelectric point of each protein.
+
+        This uses the same bracketing and bisection as the IsoelectricPoint
+        module, for all the proteins at once.
+        """
+        charged = dict((aa, self.counts[:, self._letters[aa]].astype(float))
+                       for aa in IsoelectricPoint.charged_aas)
+        nterm = self._terminal_pKs(self.starts[:-1],
+                                   IsoelectricPoint.pKnterminal,
+                                   IsoelectricPoint.positive_pKs["Nterm"])
+        cterm = self._terminal_pKs(self.starts[1:] - 1,
+                                   IsoelectricPoint.pKcterminal,
+                                   IsoelectricPoint.negative_pKs["Cterm"])
+
+        def charge(pH, selection):
+            return self._charge(pH, dict((aa, values[selection]) for aa,
+                                         values in charged.items()),
+                                nterm[selection], cterm[selection])
+
+        pH = numpy.full(len(self), 7.0)
+        pH[self.lengths == 0] = numpy.nan
+        current = charge(pH, slice(None))
+        pH1 = pH.copy()
+        pH2 = pH.copy()
+        # Bracket between pH1 and pH2, in steps of one pH unit
+        up = current > 0.0
+        down = current < 0.0
+        while up.any() or down.any():
+            pH[up] += 1.0
+            pH[down] -= 1.0
+            moving = up | down
+            current[moving] = charge(pH[moving], moving)
+            pH1[up & (current > 0.0)] = pH[up & (current > 0.0)]
+            pH2[up & ~(current > 0.0)] = pH[up & ~(current > 0.0)]
+            pH2[down & (current < 0.0)] = pH[down & (current < 0.0)]
+            pH1[down & ~(current < 0.0)] = pH[down & ~(current < 0.0)]
+            up &= current > 0.0
+            down &= current < 0.0
+        # Bisection
+        active = (pH2 - pH1 > 0.0001) & (current != 0.0)
+        while active.any():
+            pH[active] = (pH1[active] + pH2[active]) / 2.0
+            current[active] = charge(pH[active], active)
+            positive = active & (current > 0.0)
+            pH1[positive] = pH[positive]
+            pH2[active & ~positive] = pH[active & ~positive]
+            active &= (pH2 - pH1 > 0.0001) & (current != 0.0)
+        return pH
+
+    def secondary_structure_fraction(self):
+        """Calculate the fractions of helix, turn and sheet.
+
+        Returns an array with three columns (helix, turn, sheet).
+        """
+        return numpy.column_stack([self._divide(self._count(letters))
+                                   for letters in ("VIYFWL", "NPGS",
+                                                   "EMAL")])
+
+    def molar_extinction_coefficient(self):
+        """Calculate the molar extinction coefficients.
+
+        Returns an array with two columns, assuming reduced cysteines and
+        cystines (Cys-Cys-bonds).
+        """
+        reduced = self._count("W") * 5500 + self._count("Y") * 1490
+        cystines = reduced + (self._count("C") // 2) * 125
+        return numpy.column_stack([reduced, cystines])
+
+    def table(self, descriptors=None):
+        """Return a table of properties, with one row per protein.
+
+        The table is a NumPy structured array, with a field for each of the
+        given descriptors (by default, all those in the descriptors
+        attribute of this class).
+        """
+        available = dict(self.descriptors)
+        if descriptors is None:
+            descriptors = [name for name, dtype in self.descriptors]
+        for name in descriptors:
+            if name not in available:
+                raise ValueError("Unknown descriptor %r" % name)
+        table = numpy.zeros(len(self), [(name, available[name])
+                                        for name in descriptors])
+        computed = {}
+        for name in descriptors:
+            if name == "length":
+                values = self.lengths
+            elif name in self._columns:
+                method, column = self._columns[name]
+                if method not in computed:
+                    computed[method] = getattr(self, method)()
+                values = computed[method][:, column]
+            else:
+                values = getattr(self, name)()
+            table[name] = values
+        return table
+
+
+def analyse_proteins(sequences, descriptors=None, monoisotopic=False,
+                     chunksize=10000):
+    """Calculate the properties of the proteins, in chunks.
+
+    Iterates over the sequences (strings, Seq or SeqRecord objects, for
+    example from Bio.SeqIO.parse), analysing chunksize proteins at a time
+    with BatchProteinAnalysis, and yields the table of each chunk (see the
+    table method of BatchProteinAnalysis).
+    """
+    chunk = []
+    for sequence in sequences:
+        chunk.append(sequence)
+        if len(chunk) == chunksize:
+            yield BatchProteinAnalysis(chunk, monoisotopic).table(descriptors)
+            chunk = []
+    if chunk:
+        yield BatchProteinAnalysis(chunk, monoisotopic).table(descriptors)
+
+
 if __name__ == "__main__":
     from Bio._utils import run_doctest
     run_doctest()
@@ -98,6 +98,9 @@ def GC_skew(seq, window=100):
     Returns 0 for windows without any G/C by handling zero division errors.
 
     Does NOT look at any ambiguous nucleotides.
+
+    See also gc_skew in Bio.SeqUtils.windows, which is much faster on long
+    sequences and allows overlapping windows.
     """
     # 8/19/03: Iddo: added lowercase
     values = []
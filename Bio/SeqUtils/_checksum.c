@@ -0,0 +1,138 @@
+/* This file is part of the Biopython distribution and governed by your
+ * choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+ * Please see the LICENSE file that should have been included as part of this
+ * package.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+
+/* The table used by crc64, as calculated by _init_table_h in CheckSum.py;
+ * only the high 32 bits of the entries are nonzero. */
+static unsigned long long crc64_table[256];
+
+static void
+init_crc64_table(void)
+{
+    int i, j;
+    for (i = 0; i < 256; i++) {
+        unsigned long part_l = i;
+        unsigned long part_h = 0;
+        for (j = 0; j < 8; j++) {
+            int rflag = part_l & 1;
+            part_l >>= 1;
+            if (part_h & 1) part_l |= (1UL << 31);
+            part_h >>= 1;
+            if (rflag) part_h ^= 0xd8000000UL;
+        }
+        crc64_table[i] = ((unsigned long long) part_h) << 32;
+    }
+}
+
+
+static char crc64__doc__[] =
+"crc64(data) -> int\n"
+"\n"
+"Return the CRC64 checksum of the bytes in data, as a 64 bit integer\n"
+"(see crc64 in Bio.SeqUtils.CheckSum).\n";
+
+static PyObject*
+py_crc64(PyObject* self, PyObject* args)
+{
+    Py_buffer data;
+    Py_ssize_t i;
+    const unsigned char* s;
+    unsigned long long crc = 0;
+
+    if (!PyArg_ParseTuple(args, "s*:crc64", &data)) return NULL;
+    s = data.buf;
+    Py_BEGIN_ALLOW_THREADS
+    for (i = 0; i < data.len; i++)
+        crc = (crc >> 8) ^ crc64_table[(crc ^ s[i]) & 0xFF];
+    Py_END_ALLOW_THREADS
+    PyBuffer_Release(&data);
+    return PyLong_FromUnsignedLongLong(crc);
+}
+
+
+static char gcg__doc__[] =
+"gcg(data) -> int\n"
+"\n"
+"Return the GCG checksum of the bytes in data, ignoring their case\n"
+"(see gcg in Bio.SeqUtils.CheckSum).\n";
+
+static PyObject*
+py_gcg(PyObject* self, PyObject* args)
+{
+    Py_buffer data;
+    Py_ssize_t i;
+    const unsigned char* s;
+    unsigned long long checksum = 0;
+    unsigned long long index = 0;
+    unsigned char c;
+
+    if (!PyArg_ParseTuple(args, "s*:gcg", &data)) return NULL;
+    s = data.buf;
+    Py_BEGIN_ALLOW_THREADS
+    for (i = 0; i < data.len; i++) {
+        c = s[i];
+        if (c >= 'a' && c <= 'z') c -= 'a' - 'A';
+        index++;
+        checksum += index * c;
+        if (index == 57) index = 0;
+    }
+    Py_END_ALLOW_THREADS
+    PyBuffer_Release(&data);
+    return PyLong_FromUnsignedLongLong(checksum % 10000);
+}
+
+
+static struct PyMethodDef methods[] = {
+   {"crc64", (PyCFunction)py_crc64, METH_VARARGS, crc64__doc__},
+   {"gcg", (PyCFunction)py_gcg, METH_VARARGS, gcg__doc__},
+   {NULL,          NULL, 0, NULL} /* sentinel */
+};
+
+
+#if PY_MAJOR_VERSION >= 3
+
+static struct PyModuleDef moduledef = {
+        PyModuleDef_HEAD_INIT,
+        "_checksum",
+        "Fast calculation of sequence checksums",
+        -1,
+        methods,
+        NULL,
+        NULL,
+        NULL,
+        NULL
+};
+
+PyObject*
+PyInit__checksum(void)
+
+#else
+
+void init_checksum(void)
+#endif
+{
+  PyObject *m;
+  init_crc64_table();
+#if PY_MAJOR_VERSION >= 3
+  m = PyModule_Create(&moduledef);
+  if (m==NULL) return NULL;
+#else
+  m = Py_InitModule4("_checksum",
+                     methods,
+                     "Fast calculation of sequence checksums",
+                     NULL,
+                     PYTHON_API_VERSION);
+  if (m==NULL) return;
+#endif
+
+  if (PyErr_Occurred()) Py_FatalError("can't initialize module _checksum");
+#if PY_MAJOR_VERSION >= 3
+    return m;
+#endif
+}
@@ -0,0 +1,225 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Codon usage of many genes as a matrix of codon counts, using NumPy.
+
+The count_codons function counts the codons of many coding sequences at
+once, giving a matrix with one row per gene and one column per codon (in
+the order of CODONS). The codon usage statistics of all the genes can then
+be calculated from this matrix:
+
+>>> from Bio.SeqUtils.codonmatrix import count_codons, cai, rscu, enc
+>>> genes = ["ATGAAAAAGAAATTTTAA", "ATGCTGCTGCTGTTATGA"]
+>>> counts = count_codons(genes)
+>>> print(counts.shape)
+(2, 64)
+>>> print(counts.sum(axis=1))
+[6 6]
+>>> print(" ".join("%0.3f" % value for value in cai(counts)))
+0.422 0.271
+
+The CAI values are calculated as by the cai_for_gene method of the
+CodonAdaptationIndex class in Bio.SeqUtils.CodonUsage, by default with
+the index of Sharp & Li for E. coli. An index can also be calculated from
+a matrix of counts with relative_adaptiveness, which gives the same index
+as the generate_index method.
+"""
+
+from Bio.SeqUtils.CodonUsage import SynonymousCodons
+from Bio.SeqUtils.CodonUsageIndices import SharpEcoliIndex
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SeqUtils.codonmatrix.")
+
+
+# The codons in the order of the columns of the count matrices
+CODONS = tuple(a + b + c for a in "TCAG" for b in "TCAG" for c in "TCAG")
+
+_column = dict((codon, index) for index, codon in enumerate(CODONS))
+
+# Translation table from nucleotides to codes 0-3 (in the order TCAG),
+# anything else is 4
+_codes = bytearray([4]) * 256
+for _index, _letter in enumerate(bytearray(b"TCAG")):
+    _codes[_letter] = _index
+    _codes[_letter + 32] = _index  # lower case
+_codes = bytes(_codes)
+del _index, _letter
+
+
+def _count_chunk(sequences):
+    """Return the codon count matrix of a list of bytes sequences (PRIVATE)."""
+    codes = numpy.frombuffer(b"".join(sequences).translate(_codes),
+                             numpy.uint8)
+    lengths = numpy.array([len(sequence) for sequence in sequences],
+                          numpy.intp)
+    starts = numpy.cumsum(lengths) - lengths
+    n_codons = lengths // 3
+    genes = numpy.repeat(numpy.arange(len(sequences)), n_codons)
+    first_codons = numpy.cumsum(n_codons) - n_codons
+    # the position of the first base of each codon
+    positions = (numpy.repeat(starts, n_codons) +
+                 3 * (numpy.arange(len(genes)) -
+                      numpy.repeat(first_codons, n_codons)))
+    first = codes[positions]
+    second = codes[positions + 1]
+    third = codes[positions + 2]
+    valid = (first < 4) & (second < 4) & (third < 4)
+    columns = (first.astype(numpy.intp) * 16 + second * 4 + third)[valid]
+    counts = numpy.bincount(genes[valid] * 64 + columns,
+                            minlength=len(sequences) * 64)
+    return counts.reshape(len(sequences), 64)
+
+
+def count_codons(sequences, chunksize=10 ** 7):
+    """Count the codons of each coding sequence.
+
+    Returns an integer matrix with a row for each of the sequences (strings,
+    Seq or SeqRecord objects, e.g. from Bio.SeqIO.parse) and a column for
+    each codon in CODONS. The codons are counted in the first reading frame,
+    ignoring any incomplete codon at the end of a sequence, and any codons
+    with letters other than A, C, G and T (in upper or lower case).
+
+    The sequences are processed in chunks of about chunksize nucleotides,
+    so that the memory used does not depend on the number of sequences
+    (apart from the returned matrix).
+    """
+    rows = []
+    chunk = []
+    size = 0
+    for sequence in sequences:
+        # A SeqRecord, or a sequence
+        sequence = str(getattr(sequence, "seq", sequence))
+        chunk.append(sequence.encode("ascii", "replace"))
+        size += len(sequence)
+        if size >= chunksize:
+            rows.append(_count_chunk(chunk))
+            chunk = []
+            size = 0
+    if chunk or not rows:
+        rows.append(_count_chunk(chunk))
+    return numpy.concatenate(rows)
+
+
+def _families(include_single=False):
+    """Return the columns of the synonymous codon families (PRIVATE)."""
+    return dict((aa, [_column[codon] for codon in codons])
+                for aa, codons in SynonymousCodons.items()
+                if include_single or len(codons) > 1)
+
+
+def rscu(counts):
+    """Return the relative synonymous codon usage (RSCU) of the codons.
+
+    The RSCU of a codon is its count divided by the average count of the
+    codons for the same amino acid (or stop). The argument is a matrix of
+    counts as from count_codons (or a single row), and an array of the same
+    shape is returned, with NaN for amino acids which are not used.
+    """
+    counts = numpy.asarray(counts, float)
+    result = numpy.full(counts.shape, numpy.nan)
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        for aa, columns in _families(True).items():
+            family = counts[..., columns]
+            mean = family.sum(axis=-1) / len(columns)
+            values = family / mean[..., None]
+            values[mean == 0] = numpy.nan
+            result[..., columns] = values
+    return result
+
+
+def relative_adaptiveness(counts):
+    """Return a codon adaptation index from the codon counts of genes.
+
+    The counts of all the genes (a matrix from count_codons, or a single
+    row) are added together, and the relative adaptiveness of each codon
+    (its RSCU divided by the highest RSCU for the same amino acid) is
+    returned as a dictionary, as generated by the generate_index method of
+    CodonAdaptationIndex. This can be used as index for cai.
+    """
+    counts = numpy.asarray(counts)
+    if counts.ndim > 1:
+        counts = counts.sum(axis=tuple(range(counts.ndim - 1)))
+    values = rscu(counts)
+    index = {}
+    for aa, columns in _families(True).items():
+        family = values[columns]
+        for column, value in zip(columns, family / family.max()):
+            index[CODONS[column]] = float(value)
+    return index
+
+
+def cai(counts, index=None):
+    """Return the codon adaptation index (CAI) of each gene.
+
+    The CAI is calculated from the codon counts as by the cai_for_gene
+    method of CodonAdaptationIndex, using the given index (a dictionary
+    of relative adaptiveness values, such as from relative_adaptiveness),
+    by default the SharpEcoliIndex. Codons not in the index are ignored.
+    """
+    if index is None:
+        index = SharpEcoliIndex
+    counts = numpy.asarray(counts, float)
+    weights = numpy.zeros(64)
+    used = numpy.zeros(64, bool)
+    for codon, value in index.items():
+        # these two codons are always one, and excluded
+        if codon in _column and codon not in ("ATG", "TGG"):
+            used[_column[codon]] = True
+            weights[_column[codon]] = value
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        logs = numpy.log(weights[used])
+        used_counts = counts[..., used]
+        total = numpy.where(used_counts > 0, used_counts * logs, 0.0)
+        return numpy.exp(total.sum(axis=-1) /
+                         (used_counts.sum(axis=-1) - 1.0))
+
+
+def enc(counts):
+    """Return the effective number of codons (ENc) of each gene.
+
+    This is the ENc of Wright (1990), calculated from the homozygosity F
+    of each amino acid with more than one codon (excluding the stop codons)
+    and averaged over the amino acids with the same number of codons.
+    If no isoleucine is used its F is estimated from the average of the
+    two- and four-fold families; if another class of amino acids is not
+    used, the ENc is NaN. Values above 61 are set to 61.
+
+    Wright F. The 'effective number of codons' used in a gene.
+    Gene 87:23-29 (1990).
+    """
+    counts = numpy.asarray(counts, float)
+    single = counts.ndim == 1
+    counts = numpy.atleast_2d(counts)
+    classes = {}
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        for aa, columns in _families().items():
+            if aa == "STOP":
+                continue
+            family = counts[..., columns]
+            n = family.sum(axis=-1)
+            frequencies = family / n[..., None]
+            f = (n * (frequencies ** 2).sum(axis=-1) - 1) / (n - 1)
+            f[n < 2] = numpy.nan
+            classes.setdefault(len(columns), []).append(f)
+        averages = {}
+        for size, values in classes.items():
+            values = numpy.array(values)
+            used = ~numpy.isnan(values)
+            averages[size] = (numpy.where(used, values, 0).sum(axis=0) /
+                              used.sum(axis=0))
+        missing = numpy.isnan(averages[3])
+        averages[3][missing] = (averages[2][missing] +
+                                averages[4][missing]) / 2
+        result = 2.0
+        for size, values in averages.items():
+            result = result + len(classes[size]) / values
+    result = numpy.minimum(result, 61.0)
+    if single:
+        return result[0]
+    return result
@@ -22,6 +22,9 @@ def lcc_mult(seq, wsize):
     The result is the same as applying lcc_simp multiple times, but this
     version is optimized for speed. The optimization works by using the
     value of previous window as a base to compute the next one.
+
+    See also lcc in Bio.SeqUtils.windows, which is much faster on long
+    sequences and allows a step between the windows.
     """
     l2 = math.log(2)
     tamseq = len(seq)
@@ -0,0 +1,571 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Melting temperatures of many oligonucleotides at once, using NumPy.
+
+The functions Tm_Wallace, Tm_GC and Tm_NN in this module take a list (or
+any iterable) of sequences, and return an array with the melting
+temperature of each sequence, as calculated by the functions of the same
+name in Bio.SeqUtils.MeltingTemp with the same arguments. The sequences
+are encoded into a single array, and the nearest neighbor sums and the
+salt corrections are calculated for all sequences at once:
+
+>>> from Bio.SeqUtils import tmarray
+>>> primers = ["CGTTCCAAAGATGTGGGCATGAGCTTAC", "ACGTTGCAATGCCGTA",
+...            "GGGCCCGGGCCCAAATTT"]
+>>> print(" ".join("%0.2f" % tm for tm in tmarray.Tm_Wallace(primers)))
+84.00 48.00 60.00
+>>> print(" ".join("%0.2f" % tm for tm in tmarray.Tm_GC(primers)))
+58.73 42.65 53.65
+>>> print(" ".join("%0.2f" % tm for tm in tmarray.Tm_NN(primers)))
+60.32 48.45 57.49
+
+Tm_NN only considers perfectly matched duplexes (there is no c_seq or shift
+argument), so mismatches and dangling ends still need the Tm_NN function
+in Bio.SeqUtils.MeltingTemp.
+
+For probe design, tiled_Tm calculates the melting temperature of all the
+probes of a given length along a (long) sequence, such as a genome. The
+sums over the probes are calculated from cumulative sums along the whole
+sequence, so the time taken does not depend on the probe length. Probes
+with letters other than A, C, G and T get NaN:
+
+>>> from Bio.SeqUtils.tmarray import tiled_Tm
+>>> genome = "CGTTCCAAAGATGTGGGCATGAGCTTACNNNACGTTGCAATGCCGTA"
+>>> tms = tiled_Tm(genome, 16, step=10)
+>>> print(" ".join("%0.2f" % tm for tm in tms))
+43.80 46.80 nan nan
+"""
+
+import math
+import warnings
+
+from Bio import BiopythonWarning
+from Bio.Seq import complement
+from Bio.SeqUtils.MeltingTemp import DNA_NN3, DNA_IMM1
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SeqUtils.tmarray.")
+
+from Bio.SeqUtils.windows import window_starts
+
+
+# The letters removed by the sequence check of Tm_GC and Tm_NN
+_deletions = {}
+for _method, _baseset in (("Tm_GC", b"ABCDGHIKMNRSTVWXY"),
+                          ("Tm_NN", b"ACGTI")):
+    _deletions[_method] = bytes(bytearray(
+        letter for letter in range(256) if letter not in bytearray(_baseset)))
+
+# Groups of letters counted by Tm_Wallace and Tm_GC: A, T and W (0); C, G
+# and S (1); the ambiguous K, M, N, R and Y (2), B and V (3), D and H (4);
+# the mismatches X (5) and anything else (6).
+_groups = bytearray([6]) * 256
+for _index, _letters in enumerate((b"ATW", b"CGS", b"KMNRY", b"BV", b"DH",
+                                   b"X")):
+    for _letter in bytearray(_letters):
+        _groups[_letter] = _index
+_groups = bytes(_groups)
+
+# SeqUtils.GC counts these letters in either case
+_gc = bytearray(256)
+for _letter in bytearray(b"CGScgs"):
+    _gc[_letter] = 1
+_gc = bytes(_gc)
+
+# Nucleotide codes for Tm_NN: A, C, G, T and I are 0-4, anything else is 5
+_NN_LETTERS = "ACGTI"
+_nn_codes = bytearray([5]) * 256
+for _index, _letter in enumerate(bytearray(_NN_LETTERS.encode("ascii"))):
+    _nn_codes[_letter] = _index
+_nn_codes = bytes(_nn_codes)
+
+# Codes for tiled_Tm, as above but in either case, with U as T, and I (or
+# anything else) as 5, so that probes with inosine are not used.
+_tile_codes = bytearray(_nn_codes)
+_tile_codes[ord("I")] = 5
+for _index, _letter in enumerate(bytearray(b"acgt")):
+    _tile_codes[_letter] = _index
+_tile_codes[ord("U")] = _tile_codes[ord("u")] = 3
+_tile_codes = bytes(_tile_codes)
+del _method, _baseset, _index, _letters, _letter
+
+# The first and last codes of these sequences count as A/T or G/C ends
+_AT_END = numpy.array([1, 0, 0, 1, 0, 0], bool)
+_GC_END = numpy.array([0, 1, 1, 0, 0, 0], bool)
+
+
+def _encode(sequences, method, check):
+    """Return the concatenated sequences and their lengths (PRIVATE).
+
+    With check=True, each sequence is processed as by the _check function
+    in Bio.SeqUtils.MeltingTemp, i.e. it is converted to upper case, RNA is
+    back-transcribed and the letters not used by the method are removed.
+    """
+    chunks = []
+    for sequence in sequences:
+        # A SeqRecord, or a sequence
+        data = str(getattr(sequence, "seq", sequence)).encode("ascii",
+                                                              "replace")
+        if check:
+            data = data.upper().replace(b"U", b"T")
+            if method in _deletions:
+                data = data.translate(None, _deletions[method])
+        chunks.append(data)
+    lengths = numpy.array([len(data) for data in chunks], numpy.intp)
+    return b"".join(chunks), lengths
+
+
+def _segment_sums(values, lengths):
+    """Return the sums of consecutive segments of the given lengths (PRIVATE).
+
+    The values are per position of the concatenated sequences.
+    """
+    sums = numpy.concatenate([numpy.zeros(1, values.dtype),
+                              numpy.cumsum(values)])
+    ends = numpy.cumsum(lengths)
+    return sums[ends] - sums[ends - lengths]
+
+
+def _group_counts(data, lengths):
+    """Count the letter groups of Tm_Wallace and Tm_GC (PRIVATE).
+
+    Returns a matrix with a row for each sequence and a column per group.
+    """
+    codes = numpy.frombuffer(data.translate(_groups), numpy.uint8)
+    index = numpy.repeat(numpy.arange(len(lengths)), lengths) * 7 + codes
+    counts = numpy.bincount(index, minlength=len(lengths) * 7)
+    return counts.reshape(len(lengths), 7)
+
+
+def _gc_counts(data, lengths):
+    """Return the G, C and S counts of each sequence, as SeqUtils.GC (PRIVATE).
+
+    This counts the letters in either case.
+    """
+    values = numpy.frombuffer(data.translate(_gc), numpy.uint8)
+    return _segment_sums(values, lengths)
+
+
+def salt_correction(Na=0, K=0, Tris=0, Mg=0, dNTPs=0, method=1,
+                    sequences=None):
+    """Calculate the terms to correct Tm for salt ions of many sequences.
+
+    This is the salt_correction function of Bio.SeqUtils.MeltingTemp, with
+    the same arguments but taking a list of sequences (which are needed for
+    methods 5, 6 and 7), and returning an array with the correction term of
+    each sequence. Without sequences, a single value is returned.
+
+    >>> from Bio.SeqUtils.tmarray import salt_correction
+    >>> corrections = salt_correction(Na=50, method=7,
+    ...                               sequences=["ACGTACGT", "GGGGCCCCAA"])
+    >>> print(" ".join("%0.3g" % value for value in corrections))
+    0.000138 9.99e-05
+
+    """
+    if sequences is None:
+        lengths = gc = None
+    else:
+        data, lengths = _encode(sequences, None, False)
+        gc = _gc_counts(data, lengths)
+    return _salt_correction(Na, K, Tris, Mg, dNTPs, method, lengths, gc)
+
+
+def _salt_correction(Na, K, Tris, Mg, dNTPs, method, lengths, gc):
+    """Return the salt correction from the lengths and GC counts (PRIVATE).
+
+    The same calculation as salt_correction in Bio.SeqUtils.MeltingTemp,
+    taking arrays of the sequence lengths and their G+C counts.
+    """
+    if method in (5, 6, 7) and lengths is None:
+        raise ValueError('sequence is missing (is needed to calculate ' +
+                         'GC content or sequence length).')
+    if lengths is None:
+        corr = 0
+    else:
+        corr = numpy.zeros(len(lengths))
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            fraction_gc = numpy.where(lengths > 0, gc / lengths, 0.0)
+    if not method:
+        return corr
+    Mon = Na + K + Tris / 2.0  # Note: all these values are millimolar
+    mg = Mg * 1e-3             # Lowercase ions (mg, mon, dntps) are molar
+    # Na equivalent according to von Ahsen et al. (2001):
+    if sum((K, Mg, Tris, dNTPs)) > 0 and not method == 7 and dNTPs < Mg:
+        Mon += 120 * math.sqrt(Mg - dNTPs)
+    mon = Mon * 1e-3
+    if method in range(1, 7) and not mon:
+        raise ValueError('Total ion concentration of zero is not allowed in ' +
+                         'this method.')
+    if method == 1:
+        corr = corr + 16.6 * math.log10(mon)
+    if method == 2:
+        corr = corr + 16.6 * math.log10((mon) / (1.0 + 0.7 * (mon)))
+    if method == 3:
+        corr = corr + 12.5 * math.log10(mon)
+    if method == 4:
+        corr = corr + 11.7 * math.log10(mon)
+    if method == 5:
+        corr = 0.368 * (lengths - 1) * math.log(mon)
+    if method == 6:
+        corr = (4.29 * fraction_gc - 3.95) * 1e-5 * math.log(mon) + \
+            9.40e-6 * math.log(mon) ** 2
+    if method == 7:
+        a, b, c, d = 3.92, -0.911, 6.26, 1.42
+        e, f, g = -48.2, 52.5, 8.31
+        if dNTPs > 0:
+            dntps = dNTPs * 1e-3
+            ka = 3e4  # Dissociation constant for Mg:dNTP
+            # Free Mg2+ calculation:
+            mg = (-(ka * dntps - ka * mg + 1.0) +
+                  math.sqrt((ka * dntps - ka * mg + 1.0) ** 2 +
+                            4.0 * ka * mg)) / (2.0 * ka)
+        if Mon > 0:
+            R = math.sqrt(mg) / mon
+            if R < 0.22:
+                return (4.29 * fraction_gc - 3.95) * \
+                    1e-5 * math.log(mon) + 9.40e-6 * math.log(mon) ** 2
+            elif R < 6.0:
+                a = 3.92 * (0.843 - 0.352 * math.sqrt(mon) * math.log(mon))
+                d = 1.42 * (1.279 - 4.03e-3 * math.log(mon) -
+                            8.03e-3 * math.log(mon) ** 2)
+                g = 8.31 * (0.486 - 0.258 * math.log(mon) +
+                            5.25e-3 * math.log(mon) ** 3)
+        with numpy.errstate(divide="ignore"):
+            corr = (a + b * math.log(mg) + fraction_gc *
+                    (c + d * math.log(mg)) + (1 / (2.0 * (lengths - 1))) *
+                    (e + f * math.log(mg) + g * math.log(mg) ** 2)) * 1e-5
+    if method > 7:
+        raise ValueError('Allowed values for parameter \'method\' are 1-7.')
+    return corr
+
+
+def chem_correction(melting_temps, DMSO=0, fmd=0, DMSOfactor=0.75,
+                    fmdfactor=0.65, fmdmethod=1, GC=None):
+    """Correct the given Tm values for DMSO and formamide.
+
+    This is the chem_correction function of Bio.SeqUtils.MeltingTemp, with
+    the same arguments, taking an array of melting temperatures (and, for
+    fmdmethod=2, an array or a single value for the GC content in percent).
+    Returns a new array.
+
+    >>> from Bio.SeqUtils.tmarray import chem_correction
+    >>> tms = chem_correction([70, 60], DMSO=3)
+    >>> print(" ".join("%0.2f" % tm for tm in tms))
+    67.75 57.75
+
+    """
+    melting_temps = numpy.array(melting_temps, float)
+    if DMSO:
+        melting_temps -= DMSOfactor * DMSO
+    if fmd:
+        if fmdmethod == 1:
+            melting_temps -= fmdfactor * fmd
+        if fmdmethod == 2:
+            if GC is None or numpy.any(numpy.asarray(GC) < 0):
+                raise ValueError('\'GC\' is missing or negative')
+            melting_temps += (0.453 * (numpy.asarray(GC) / 100.0) -
+                              2.88) * fmd
+        if fmdmethod not in (1, 2):
+            raise ValueError('\'fmdmethod\' must be 1 or 2')
+    return melting_temps
+
+
+# The constants A, B, C, D and salt correction of the valuesets of Tm_GC
+_valuesets = {1: (69.3, 0.41, 650, 1, 0), 2: (81.5, 0.41, 675, 1, 0),
+              3: (81.5, 0.41, 675, 1, 2), 4: (81.5, 0.41, 500, 1, 3),
+              5: (78.0, 0.7, 500, 1, 3), 6: (67.0, 0.8, 500, 1, 3),
+              7: (81.5, 0.41, 600, 1, 2), 8: (77.1, 0.41, 528, 1, 4)}
+
+
+def Tm_Wallace(sequences, check=True, strict=True):
+    """Calculate the Tm of each sequence using the 'Wallace rule'.
+
+    Returns an array with the same values as Tm_Wallace in
+    Bio.SeqUtils.MeltingTemp for each of the sequences (strings, Seq or
+    SeqRecord objects).
+    """
+    data, lengths = _encode(sequences, "Tm_Wallace", check)
+    counts = _group_counts(data, lengths)
+    ambiguous = (3 * counts[:, 2] + 10 / 3.0 * counts[:, 3] +
+                 8 / 3.0 * counts[:, 4])
+    if strict and ambiguous.any():
+        raise ValueError('ambiguous bases B, D, H, K, M, N, R, V, Y not ' +
+                         'allowed when strict=True')
+    return 2.0 * counts[:, 0] + 4.0 * counts[:, 1] + ambiguous
+
+
+def _tm_gc(lengths, percent_gc, gc, mismatches, valueset, userset, Na, K,
+           Tris, Mg, dNTPs, saltcorr, mismatch):
+    """Calculate the Tm with the Tm_GC formulas (PRIVATE).
+
+    The GC percentages include the ambiguous bases, while the G+C counts
+    gc are used for the salt correction.
+    """
+    if saltcorr == 5:
+        raise ValueError('salt-correction method 5 not applicable '
+                         'to Tm_GC')
+    if valueset > 8 or not (userset or valueset in _valuesets):
+        raise ValueError('allowed values for parameter \'valueset\' are 0-8.')
+    if userset:
+        A, B, C, D = userset
+    else:
+        A, B, C, D, saltcorr = _valuesets[valueset]
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        melting_temps = A + B * percent_gc - C / (lengths * 1.0)
+        if saltcorr:
+            melting_temps += _salt_correction(Na, K, Tris, Mg, dNTPs,
+                                              saltcorr, lengths, gc)
+        if mismatch:
+            melting_temps -= D * (mismatches * 100.0 / lengths)
+    return melting_temps
+
+
+def Tm_GC(sequences, check=True, strict=True, valueset=7, userset=None,
+          Na=50, K=0, Tris=0, Mg=0, dNTPs=0, saltcorr=0, mismatch=True):
+    """Calculate the Tm of each sequence using empirical formulas.
+
+    Returns an array with the same values as Tm_GC in
+    Bio.SeqUtils.MeltingTemp for each of the sequences (strings, Seq or
+    SeqRecord objects), with the same arguments. Empty sequences get NaN.
+    """
+    data, lengths = _encode(sequences, "Tm_GC", check)
+    counts = _group_counts(data, lengths)
+    gc = _gc_counts(data, lengths)
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        # Ambiguous bases: add 0.5, 0.67 or 0.33% depending on G+C
+        # probability, as in Tm_GC
+        ambiguous = (counts[:, 2] * 50.0 / lengths +
+                     counts[:, 3] * 66.67 / lengths +
+                     counts[:, 4] * 33.33 / lengths)
+        if strict and numpy.nansum(ambiguous):
+            raise ValueError('ambiguous bases B, D, H, K, M, N, R, V, Y not '
+                             'allowed when \'strict=True\'')
+        percent_gc = gc * 100.0 / lengths + ambiguous
+    return _tm_gc(lengths, percent_gc, gc, counts[:, 5], valueset, userset,
+                  Na, K, Tris, Mg, dNTPs, saltcorr, mismatch)
+
+
+def _neighbor_table(nn_table, imm_table):
+    """Return dH and dS arrays indexed by pairs of nucleotide codes (PRIVATE).
+
+    The values for the neighbors of a perfectly matched duplex are looked
+    up as in Tm_NN (first in the internal mismatch table, which may have
+    inosine values, then in the nearest neighbor table). Missing values
+    are NaN.
+    """
+    size = len(_NN_LETTERS) + 1
+    delta_h = numpy.full(size * size, numpy.nan)
+    delta_s = numpy.full(size * size, numpy.nan)
+    for i, first in enumerate(_NN_LETTERS):
+        for j, second in enumerate(_NN_LETTERS):
+            neighbors = first + second + "/" + complement(first + second)
+            for table in (imm_table, nn_table):
+                if neighbors in table:
+                    values = table[neighbors]
+                    break
+                if neighbors[::-1] in table:
+                    values = table[neighbors[::-1]]
+                    break
+            else:
+                continue
+            delta_h[i * size + j], delta_s[i * size + j] = values
+    return delta_h, delta_s
+
+
+def _missing_neighbors(pair, strict):
+    """Raise an error or warn about neighbors without data (PRIVATE).
+
+    The pair of letters is shown as the neighbors would be in Tm_NN.
+    """
+    neighbors = pair + "/" + complement(pair)
+    if strict:
+        raise ValueError('no thermodynamic data for neighbors \'' + neighbors +
+                         '\' available')
+    warnings.warn('no themodynamic data for neighbors \'' + neighbors +
+                  '\' available. Calculation will be wrong',
+                  BiopythonWarning)
+
+
+def _tm_nn(lengths, gc, first, last, delta_h, delta_s, nn_table, dnac1,
+           dnac2, selfcomp, Na, K, Tris, Mg, dNTPs, saltcorr):
+    """Calculate the Tm from the nearest neighbor sums (PRIVATE).
+
+    Adds the initiation terms to the sums of the nearest neighbor values
+    delta_h and delta_s, as done by Tm_NN, using the lengths, the G+C
+    counts and the first and last nucleotide codes of the sequences.
+    """
+    delta_h = delta_h + nn_table['init'][0]
+    delta_s = delta_s + nn_table['init'][1]
+    # Duplex with no (allA/T) or at least one (oneG/C) GC pair
+    all_at = gc == 0
+    delta_h += numpy.where(all_at, nn_table['init_allA/T'][0],
+                           nn_table['init_oneG/C'][0])
+    delta_s += numpy.where(all_at, nn_table['init_allA/T'][1],
+                           nn_table['init_oneG/C'][1])
+    # Penalty if 5' end is T (on either strand)
+    penalties = (first == 3).astype(int) + (last == 0)
+    delta_h += nn_table['init_5T/A'][0] * penalties
+    delta_s += nn_table['init_5T/A'][1] * penalties
+    # Different values for G/C or A/T terminal basepairs
+    AT = _AT_END[first].astype(int) + _AT_END[last]
+    GC = _GC_END[first].astype(int) + _GC_END[last]
+    delta_h += nn_table['init_A/T'][0] * AT + nn_table['init_G/C'][0] * GC
+    delta_s += nn_table['init_A/T'][1] * AT + nn_table['init_G/C'][1] * GC
+
+    k = (dnac1 - (dnac2 / 2.0)) * 1e-9
+    if selfcomp:
+        k = dnac1 * 1e-9
+        delta_h += nn_table['sym'][0]
+        delta_s += nn_table['sym'][1]
+    R = 1.987  # universal gas constant in Cal/degrees C*Mol
+    if saltcorr:
+        corr = _salt_correction(Na, K, Tris, Mg, dNTPs, saltcorr, lengths, gc)
+    if saltcorr == 5:
+        delta_s += corr
+    melting_temps = (1000 * delta_h) / (delta_s + (R * (math.log(k)))) - \
+        273.15
+    if saltcorr in (1, 2, 3, 4):
+        melting_temps += corr
+    if saltcorr in (6, 7):
+        # Tm = 1/(1/Tm + corr)
+        melting_temps = (1 / (1 / (melting_temps + 273.15) + corr) - 273.15)
+    return melting_temps
+
+
+def Tm_NN(sequences, check=True, strict=True, nn_table=DNA_NN3,
+          imm_table=DNA_IMM1, dnac1=25, dnac2=25, selfcomp=False, Na=50, K=0,
+          Tris=0, Mg=0, dNTPs=0, saltcorr=5):
+    """Calculate the Tm of each sequence using nearest neighbor thermodynamics.
+
+    Returns an array with the same values as Tm_NN in
+    Bio.SeqUtils.MeltingTemp for each of the sequences (strings, Seq or
+    SeqRecord objects), hybridized to their perfect complement, with the
+    same arguments. The imm_table is only used for inosine. Empty
+    sequences get NaN.
+    """
+    data, lengths = _encode(sequences, "Tm_NN", check)
+    codes = numpy.frombuffer(data.translate(_nn_codes), numpy.uint8)
+    h_table, s_table = _neighbor_table(nn_table, imm_table)
+    pairs = codes[:-1].astype(numpy.intp) * 6 + codes[1:]
+    h_values = h_table[pairs]
+    s_values = s_table[pairs]
+    # The pair starting at the last letter of each sequence belongs to two
+    # different sequences, and is not used
+    ends = numpy.cumsum(lengths)
+    boundaries = ends[(lengths > 0) & (ends < len(codes))] - 1
+    h_values[boundaries] = 0
+    s_values[boundaries] = 0
+    missing = numpy.isnan(h_values) | numpy.isnan(s_values)
+    if missing.any():
+        position = numpy.flatnonzero(missing)[0]
+        _missing_neighbors(data[position:position + 2].decode(), strict)
+        h_values[missing] = 0
+        s_values[missing] = 0
+    # Each sequence of length n has n - 1 neighbors, followed by a boundary
+    pair_lengths = lengths.copy()
+    if len(codes):
+        pair_lengths[numpy.flatnonzero(lengths)[-1]] -= 1
+    delta_h = _segment_sums(h_values, pair_lengths)
+    delta_s = _segment_sums(s_values, pair_lengths)
+    gc = _gc_counts(data, lengths)
+    empty = lengths == 0
+    starts = numpy.where(empty, 0, ends - lengths)
+    last = numpy.where(empty, 0, ends - 1)
+    if len(codes):
+        first = codes[starts]
+        last = codes[last]
+    else:
+        first = last = numpy.zeros(len(lengths), numpy.uint8)
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        melting_temps = _tm_nn(lengths, gc, first, last, delta_h, delta_s,
+                               nn_table, dnac1, dnac2, selfcomp, Na, K, Tris,
+                               Mg, dNTPs, saltcorr)
+    melting_temps[empty] = numpy.nan
+    return melting_temps
+
+
+def tiled_Tm(sequence, length, step=1, method="Tm_NN", **kwargs):
+    """Calculate the Tm of the probes tiled along a sequence.
+
+    Arguments:
+     - sequence - the (long) sequence, as a string or Seq object
+     - length - the length of the probes
+     - step - the distance between the starts of the probes, by default 1
+     - method - "Tm_NN" (default), "Tm_GC" or "Tm_Wallace"
+     - any other keyword arguments are passed on to the method, except
+       check and strict
+
+    Returns an array with the Tm of the probes starting at positions 0,
+    step, 2 * step, ... (see window_starts in Bio.SeqUtils.windows), as
+    calculated by the method. The sequence may be in upper or lower case,
+    and RNA, but probes with any letter other than A, C, G, T and U get NaN.
+    """
+    if method not in ("Tm_NN", "Tm_GC", "Tm_Wallace"):
+        raise ValueError("Unknown method %r" % method)
+    starts = window_starts(len(sequence), length, step)
+    ends = starts + length
+    data = str(sequence).encode("ascii", "replace")
+    codes = numpy.frombuffer(data.translate(_tile_codes), numpy.uint8)
+
+    invalid = _range_sums(codes == 5, starts, ends) > 0
+    lengths = numpy.full(len(starts), length, numpy.intp)
+    gc = _range_sums((codes == 1) | (codes == 2), starts, ends)
+    if method == "Tm_Wallace":
+        _update({}, kwargs)
+        melting_temps = 2.0 * (length - gc) + 4.0 * gc
+    elif method == "Tm_GC":
+        arguments = {"valueset": 7, "userset": None, "Na": 50, "K": 0,
+                     "Tris": 0, "Mg": 0, "dNTPs": 0, "saltcorr": 0,
+                     "mismatch": True}
+        _update(arguments, kwargs)
+        melting_temps = _tm_gc(lengths, gc * 100.0 / length, gc,
+                               numpy.zeros(len(starts)), **arguments)
+    else:
+        arguments = {"nn_table": DNA_NN3, "imm_table": DNA_IMM1,
+                     "dnac1": 25, "dnac2": 25, "selfcomp": False, "Na": 50,
+                     "K": 0, "Tris": 0, "Mg": 0, "dNTPs": 0, "saltcorr": 5}
+        _update(arguments, kwargs)
+        h_table, s_table = _neighbor_table(arguments["nn_table"],
+                                           arguments.pop("imm_table"))
+        pairs = codes[:-1].astype(numpy.intp) * 6 + codes[1:]
+        h_values = h_table[pairs]
+        s_values = s_table[pairs]
+        missing = numpy.isnan(h_values) | numpy.isnan(s_values)
+        # Any pair of valid nucleotides without data
+        unknown = missing & (codes[:-1] < 5) & (codes[1:] < 5)
+        if unknown.any():
+            position = numpy.flatnonzero(unknown)[0]
+            _missing_neighbors(_NN_LETTERS[codes[position]] +
+                               _NN_LETTERS[codes[position + 1]], True)
+        h_values[missing] = 0
+        s_values[missing] = 0
+        # The probe from start to end has the neighbors from start to end - 1
+        delta_h = _range_sums(h_values, starts, ends - 1)
+        delta_s = _range_sums(s_values, starts, ends - 1)
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            melting_temps = _tm_nn(lengths, gc, codes[starts],
+                                   codes[ends - 1], delta_h, delta_s,
+                                   **arguments)
+    melting_temps[invalid] = numpy.nan
+    return melting_temps
+
+
+def _range_sums(values, starts, ends):
+    """Return the sums of the values from each start to end (PRIVATE)."""
+    sums = numpy.concatenate([numpy.zeros(1, numpy.result_type(values, 0)),
+                              numpy.cumsum(values)])
+    return sums[ends] - sums[starts]
+
+
+def _update(defaults, kwargs):
+    """Update the default arguments with the given ones (PRIVATE)."""
+    for key, value in kwargs.items():
+        if key not in defaults:
+            raise TypeError("Unexpected argument %r" % key)
+        defaults[key] = value
@@ -0,0 +1,199 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Sliding window statistics along sequences, using NumPy.
+
+The functions in this module compute statistics such as the GC content,
+GC skew, local composition complexity (LCC) or an amino acid scale (e.g.
+the hydropathy) in windows along a sequence. The sequence is encoded once
+as an array, and the sums over all the windows are computed from its
+cumulative sums, so the time taken does not depend on the window size.
+
+All functions take the sequence (a string or Seq object), the window size
+and the step between the windows (by default 1), and return a NumPy array
+with one value per window. The windows start at positions 0, step,
+2 * step, ... and only complete windows are used, unless partial is True,
+in which case the windows at the end of the sequence are shortened to fit:
+
+>>> from Bio.SeqUtils.windows import gc_content, gc_skew, window_starts
+>>> seq = "GGGGCCATATGCGCAT"
+>>> print(window_starts(len(seq), 8, 4))
+[0 4 8]
+>>> print(" ".join("%.2f" % value for value in gc_content(seq, 8, 4)))
+0.75 0.50 0.50
+>>> print(" ".join("%.2f" % value
+...                for value in gc_skew(seq, 8, step=8, partial=True)))
+0.33 0.00
+
+These values are the same as those from the GC function in Bio.SeqUtils
+(but as a fraction rather than a percentage), the GC_skew function (which
+uses partial windows with step equal to the window size), lcc_simp in
+Bio.SeqUtils.lcc, and the protein_scale method of ProteinAnalysis in
+Bio.SeqUtils.ProtParam.
+"""
+
+from Bio.SeqUtils import ProtParamData
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SeqUtils.windows.")
+
+
+def _encode(seq):
+    """Return the sequence as an array of bytes (PRIVATE)."""
+    if not isinstance(seq, (str, bytes)):
+        seq = str(seq)
+    if not isinstance(seq, bytes):
+        seq = seq.encode("ascii", "replace")
+    return numpy.frombuffer(seq, numpy.uint8)
+
+
+def _table(letters, dtype=bool):
+    """Return a lookup table selecting the letters in either case (PRIVATE)."""
+    table = numpy.zeros(256, dtype)
+    for letter in letters:
+        table[ord(letter.upper())] = 1
+        table[ord(letter.lower())] = 1
+    return table
+
+
+def window_starts(length, window, step=1, partial=False):
+    """Return the start positions of the windows along a sequence.
+
+    The windows start every step positions; with partial=False (default)
+    only the windows fitting completely in the sequence are used.
+    """
+    if window < 1 or step < 1:
+        raise ValueError("The window size and step must be positive")
+    if partial:
+        return numpy.arange(0, length, step)
+    return numpy.arange(0, max(length - window + 1, 0), step)
+
+
+def _window_sums(values, window, step, partial):
+    """Return the sums of the values in each window (PRIVATE).
+
+    Also returns the number of positions in each window.
+    """
+    starts = window_starts(len(values), window, step, partial)
+    ends = numpy.minimum(starts + window, len(values))
+    sums = numpy.concatenate([numpy.zeros(1, values.dtype),
+                              numpy.cumsum(values)])
+    return sums[ends] - sums[starts], ends - starts
+
+
+def count_letters(seq, letters, window, step=1, partial=False):
+    """Count the given letters (in either case) in each window.
+
+    >>> from Bio.SeqUtils.windows import count_letters
+    >>> print(count_letters("AACGTNNA", "A", 4, 2))
+    [2 0 1]
+    """
+    values = _table(letters, numpy.intp)[_encode(seq)]
+    return _window_sums(values, window, step, partial)[0]
+
+
+def gc_content(seq, window=100, step=1, partial=False):
+    """Return the G+C content (as a fraction) of each window.
+
+    As the GC function in Bio.SeqUtils, the ambiguous nucleotide S (G or C)
+    is counted, and the content is relative to the full window size.
+    """
+    values = _table("GCS", numpy.intp)[_encode(seq)]
+    counts, sizes = _window_sums(values, window, step, partial)
+    return counts / sizes.astype(float)
+
+
+def gc_skew(seq, window=100, step=1, partial=False):
+    """Return the GC skew (G-C)/(G+C) of each window.
+
+    Windows without any G or C have a skew of zero. Ambiguous nucleotides
+    are ignored.
+    """
+    codes = _encode(seq)
+    g = _window_sums(_table("G", numpy.intp)[codes], window, step,
+                     partial)[0]
+    c = _window_sums(_table("C", numpy.intp)[codes], window, step,
+                     partial)[0]
+    total = g + c
+    skew = numpy.zeros(len(total))
+    nonzero = total > 0
+    skew[nonzero] = (g - c)[nonzero] / total[nonzero].astype(float)
+    return skew
+
+
+def lcc(seq, window, step=1, partial=False):
+    """Return the local composition complexity (LCC) of each window.
+
+    The LCC is the entropy (in bits) of the frequencies of A, C, G and T,
+    relative to the window size, as calculated by lcc_simp in
+    Bio.SeqUtils.lcc.
+    """
+    codes = _encode(seq)
+    result = None
+    for letter in "ACGT":
+        counts, sizes = _window_sums(_table(letter, numpy.intp)[codes],
+                                     window, step, partial)
+        if result is None:
+            result = numpy.zeros(len(counts))
+        frequencies = counts / sizes.astype(float)
+        present = counts > 0
+        result[present] -= (frequencies[present] *
+                            numpy.log2(frequencies[present]))
+    return result
+
+
+def _scale_weights(window, edge):
+    """Return the weights of the window positions for protein_scale (PRIVATE).
+
+    The weights are the same as used by ProteinAnalysis.protein_scale.
+    """
+    weights = numpy.zeros(window)
+    unit = 2 * (1.0 - edge) / (window - 1) if window > 1 else 0.0
+    for i in range(window // 2):
+        weights[i] += edge + unit * i
+        weights[window - i - 1] += edge + unit * i
+    weights[window // 2] += 1.0
+    return weights
+
+
+def protein_scale(seq, param_dict, window, edge=1.0, step=1):
+    """Return the average of an amino acid scale in each window.
+
+    param_dict is a dictionary mapping the (upper case) amino acid letters
+    to their values, such as the scales in Bio.SeqUtils.ProtParamData, or
+    the name of one of these scales (e.g. "kd" for the Kyte & Doolittle
+    hydropathy). The window and edge arguments are as for the
+    protein_scale method of ProteinAnalysis: the residues at the edges of
+    the window have a relative weight of edge, increasing linearly to 1 for
+    the central residue. Letters not in param_dict count as zero.
+
+    >>> from Bio.SeqUtils.windows import protein_scale
+    >>> values = protein_scale("MAEGEITTFTALTEK", "kd", 9, step=3)
+    >>> print(" ".join("%.2f" % value for value in values))
+    0.24 0.77 -0.20
+    """
+    if not isinstance(param_dict, dict):
+        param_dict = getattr(ProtParamData, param_dict)
+    table = numpy.zeros(256)
+    for letter, value in param_dict.items():
+        table[ord(letter.upper())] = value
+        table[ord(letter.lower())] = value
+    values = table[_encode(seq)]
+    weights = _scale_weights(window, edge)
+    if (weights == weights[0]).all():
+        sums = _window_sums(values, window, step, False)[0]
+    elif len(values) >= window:
+        sums = numpy.correlate(values, weights, "valid")[::step]
+    else:
+        sums = numpy.zeros(0)
+    return sums / weights.sum()
+
+
+def hydropathy(seq, window=9, edge=1.0, step=1):
+    """Return the Kyte & Doolittle hydropathy averaged over each window."""
+    return protein_scale(seq, ProtParamData.kd, window, edge, step)
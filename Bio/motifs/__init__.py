@@ -17,6 +17,8 @@ from __future__ import print_function
 
 from Bio._py3k import range
 
+from .scanner import MotifScanner
+
 
 def create(instances, alphabet=None):
     instances = Instances(instances, alphabet)
@@ -1,52 +1,82 @@
+#define PY_SSIZE_T_CLEAN
 #include <Python.h>
 
 
+/* Calculate the score of the window starting at sequence; returns 0 if the
+ * window contains letters other than A, C, G, T. */
+static int
+score_window(const char sequence[], Py_ssize_t m, const double* matrix,
+             double* score)
+{
+    Py_ssize_t j;
+    double sum = 0.0;
+    for (j = 0; j < m; j++)
+    {
+        switch (sequence[j])
+        {
+          /* Handling mixed case input here rather than converting it to
+             uppercase in Python code first, since doing so could use too
+             much memory if sequence is too long (e.g. chromosome or
+             plasmid). */
+            case 'A':
+            case 'a':
+                sum += matrix[j*4+0]; break;
+            case 'C':
+            case 'c':
+                sum += matrix[j*4+1]; break;
+            case 'G':
+            case 'g':
+                sum += matrix[j*4+2]; break;
+            case 'T':
+            case 't':
+                sum += matrix[j*4+3]; break;
+            default:
+                return 0;
+        }
+    }
+    *score = sum;
+    return 1;
+}
+
 static void
-calculate(const char sequence[], int s, Py_ssize_t m, double* matrix,
+calculate(const char sequence[], Py_ssize_t s, Py_ssize_t m, double* matrix,
           Py_ssize_t n, float* scores)
 {
-    Py_ssize_t i, j;
-    char c;
+    Py_ssize_t i;
     double score;
-    int ok;
     float* p = scores;
     float nan = 0.0;
     nan /= nan;
     for (i = 0; i < n; i++)
     {
-        score = 0.0;
-        ok = 1;
-        for (j = 0; j < m; j++)
-        {
-            c = sequence[i+j];
-            switch (c)
-            {
-              /* Handling mixed case input here rather than converting it to
-                 uppercase in Python code first, since doing so could use too
-                 much memory if sequence is too long (e.g. chromosome or
-                 plasmid). */
-                case 'A':
-                case 'a':
-                    score += matrix[j*4+0]; break;
-                case 'C':
-                case 'c':
-                    score += matrix[j*4+1]; break;
-                case 'G':
-                case 'g':
-                    score += matrix[j*4+2]; break;
-                case 'T':
-                case 't':
-                    score += matrix[j*4+3]; break;
-                default:
-                    ok = 0;
-            }
-        }
-        if (ok) *p = (float)score;
+        if (score_window(sequence+i, m, matrix, &score)) *p = (float)score;
         else *p = nan;
         p++;
     }
 }
 
+static Py_ssize_t
+search(const char sequence[], Py_ssize_t m, const double* matrix,
+       Py_ssize_t n, double threshold, Py_ssize_t* positions, float* scores)
+{
+    Py_ssize_t i;
+    Py_ssize_t count = 0;
+    double score;
+    float value;
+    for (i = 0; i < n; i++)
+    {
+        if (!score_window(sequence+i, m, matrix, &score)) continue;
+        /* Compare the score as stored, as calculate would return it */
+        value = (float)score;
+        if (value > threshold) {
+            positions[count] = i;
+            scores[count] = value;
+            count++;
+        }
+    }
+    return count;
+}
+
 static int
 matrix_converter(PyObject* object, void* address)
 {
@@ -120,6 +150,41 @@ scores_converter(PyObject* object, void* address)
     return 1;
 }
 
+static int
+positions_converter(PyObject* object, void* address)
+{
+    const int flags = PyBUF_C_CONTIGUOUS | PyBUF_FORMAT;
+    char datatype;
+    Py_buffer* view = address;
+    if (PyObject_GetBuffer(object, view, flags) == -1)
+        return 0;
+    datatype = view->format[0];
+    switch (datatype) {
+        case '@':
+        case '=':
+        case '<':
+        case '>':
+        case '!': datatype = view->format[1]; break;
+        default: break;
+    }
+    if (!strchr("ilqn", datatype)
+     || view->itemsize != (Py_ssize_t)sizeof(Py_ssize_t)) {
+        PyErr_Format(PyExc_RuntimeError,
+            "positions array has incorrect data format ('%c', expected "
+            "an integer type of size %d)", datatype, (int)sizeof(Py_ssize_t));
+        PyBuffer_Release(view);
+        return 0;
+    }
+    if (view->ndim != 1) {
+        PyErr_Format(PyExc_ValueError,
+            "positions array has incorrect rank (%d expected 1)",
+            view->ndim);
+        PyBuffer_Release(view);
+        return 0;
+    }
+    return 1;
+}
+
 static char calculate__doc__[] =
 "    calculate(sequence, pwm) -> array of score values\n"
 "\n"
@@ -134,7 +199,7 @@ py_calculate(PyObject* self, PyObject* args, PyObject* keywords)
     static char* kwlist[] = {"sequence", "matrix", "scores", NULL};
     Py_ssize_t m;
     Py_ssize_t n;
-    int s;
+    Py_ssize_t s;
     PyObject* result = NULL;
     Py_buffer scores;
     Py_buffer matrix;
@@ -161,8 +226,63 @@ exit:
     return result;
 }
 
+static char search__doc__[] =
+"    search(sequence, matrix, threshold, positions, scores) -> number of hits\n"
+"\n"
+"This function calculates the position-weight matrix scores for all\n"
+"positions along the sequence, and stores the positions and scores of\n"
+"the windows scoring above the threshold in the positions and scores\n"
+"arrays, which should be large enough to store a hit at every position.\n"
+"The number of hits is returned.\n";
+
+static PyObject*
+py_search(PyObject* self, PyObject* args, PyObject* keywords)
+{
+    const char* sequence;
+    static char* kwlist[] = {"sequence", "matrix", "threshold", "positions",
+                             "scores", NULL};
+    Py_ssize_t m;
+    Py_ssize_t n;
+    Py_ssize_t s;
+    Py_ssize_t count;
+    double threshold;
+    PyObject* result = NULL;
+    Py_buffer positions;
+    Py_buffer scores;
+    Py_buffer matrix;
+    matrix.obj = NULL;
+    positions.obj = NULL;
+    scores.obj = NULL;
+    if(!PyArg_ParseTupleAndKeywords(args, keywords, "s#O&dO&O&", kwlist,
+                                    &sequence,
+                                    &s,
+                                    matrix_converter, &matrix,
+                                    &threshold,
+                                    positions_converter, &positions,
+                                    scores_converter, &scores)) goto exit;
+    m = matrix.shape[0];
+    n = s - m + 1;
+    if (n < 0) n = 0;
+    if (positions.shape[0] < n || scores.shape[0] < n) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "positions or scores array is too small");
+        goto exit;
+    }
+    Py_BEGIN_ALLOW_THREADS
+    count = search(sequence, m, matrix.buf, n, threshold,
+                   positions.buf, scores.buf);
+    Py_END_ALLOW_THREADS
+    result = PyLong_FromSsize_t(count);
+exit:
+    if (matrix.obj) PyBuffer_Release(&matrix);
+    if (positions.obj) PyBuffer_Release(&positions);
+    if (scores.obj) PyBuffer_Release(&scores);
+    return result;
+}
+
 static struct PyMethodDef methods[] = {
    {"calculate", (PyCFunction)py_calculate, METH_VARARGS | METH_KEYWORDS, calculate__doc__},
+   {"search", (PyCFunction)py_search, METH_VARARGS | METH_KEYWORDS, search__doc__},
    {NULL,          NULL, 0, NULL} /* sentinel */
 };
 
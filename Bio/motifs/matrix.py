@@ -38,6 +38,29 @@ try:
         _pwm.calculate(sequence, logodds, scores)
         return scores
 
+    def _search(score_dict, sequence, m, threshold, chunksize):
+        """Find positions scoring above the threshold using C code (PRIVATE).
+
+        The sequence is scanned in chunks of chunksize windows, so that
+        the temporary arrays do not depend on the length of the sequence.
+        """
+        n = len(sequence) - m + 1
+        logodds = numpy.array([[score_dict[letter][i] for letter in "ACGT"]
+                               for i in range(m)], float)
+        size = max(min(n, chunksize), 0)
+        positions = numpy.empty(size, numpy.intp)
+        scores = numpy.empty(size, numpy.float32)
+        found_positions = [positions[:0]]
+        found_scores = [scores[:0]]
+        for start in range(0, n, chunksize):
+            end = min(start + chunksize, n)
+            count = _pwm.search(sequence[start:end + m - 1], logodds,
+                                threshold, positions, scores)
+            found_positions.append(positions[:count] + start)
+            found_scores.append(scores[:count].copy())
+        return (numpy.concatenate(found_positions),
+                numpy.concatenate(found_scores))
+
 except ImportError:
     if platform.python_implementation() == 'CPython':
         import warnings
@@ -65,6 +88,16 @@ except ImportError:
             scores.append(score)
         return scores
 
+    def _search(score_dict, sequence, m, threshold, chunksize):
+        """Find positions scoring above the threshold using Python code (PRIVATE)."""
+        positions = []
+        scores = []
+        for position, score in enumerate(_calculate(score_dict, sequence, m)):
+            if score > threshold:
+                positions.append(position)
+                scores.append(score)
+        return positions, scores
+
 
 class GenericPositionMatrix(dict):
 
@@ -390,14 +423,7 @@ class PositionSpecificScoringMatrix(GenericPositionMatrix):
          - otherwise, the result is a one-dimensional list or numpy array
 
         """
-        # TODO - Code itself tolerates ambiguous bases (as NaN).
-        if not isinstance(self.alphabet, IUPAC.IUPACUnambiguousDNA):
-            raise ValueError("PSSM has wrong alphabet: %s - Use only with DNA motifs"
-                             % self.alphabet)
-        if not isinstance(sequence.alphabet, IUPAC.IUPACUnambiguousDNA):
-            raise ValueError("Sequence has wrong alphabet: %r - Use only with DNA sequences"
-                             % sequence.alphabet)
-
+        self._check_alphabets(sequence)
         # NOTE: The C code handles mixed case input as this could be large
         # (e.g. contig or chromosome), so requiring it be all upper or lower
         # case would impose an overhead to allocate the extra memory.
@@ -410,26 +436,106 @@ class PositionSpecificScoringMatrix(GenericPositionMatrix):
         else:
             return scores
 
-    def search(self, sequence, threshold=0.0, both=True):
+    def _check_alphabets(self, sequence):
+        """Check that the PSSM and the sequence are DNA (PRIVATE)."""
+        # TODO - Code itself tolerates ambiguous bases (as NaN).
+        if not isinstance(self.alphabet, IUPAC.IUPACUnambiguousDNA):
+            raise ValueError("PSSM has wrong alphabet: %s - Use only with DNA motifs"
+                             % self.alphabet)
+        if not isinstance(sequence.alphabet, IUPAC.IUPACUnambiguousDNA):
+            raise ValueError("Sequence has wrong alphabet: %r - Use only with DNA sequences"
+                             % sequence.alphabet)
+
+    def _scan(self, sequence, threshold, both, chunksize):
+        """Find hits on one or both strands as lists or arrays (PRIVATE).
+
+        Returns the positions and scores of the hits on the forward strand,
+        and those on the reverse strand (or None if both is False).
+        """
+        self._check_alphabets(sequence)
+        sequence = str(sequence)
+        m = self.length
+        forward = _search(self, sequence, m, threshold, chunksize)
+        if not both:
+            return forward, None
+        rc = self.reverse_complement()
+        return forward, _search(rc, sequence, m, threshold, chunksize)
+
+    def search(self, sequence, threshold=0.0, both=True, chunksize=10 ** 6):
         """Find hits with PWM score above given threshold.
 
         A generator function, returning found hits in the given sequence
-        with the pwm score higher than the threshold.
+        with the pwm score higher than the threshold. Hits on the reverse
+        strand are returned with a negative position (position - n for a
+        sequence of length n).
         """
-        sequence = sequence.upper()
         n = len(sequence)
-        m = self.length
-        if both:
-            rc = self.reverse_complement()
-        for position in range(0, n - m + 1):
-            s = sequence[position:position + m]
-            score = self.calculate(s)
-            if score > threshold:
-                yield (position, score)
-            if both:
-                score = rc.calculate(s)
-                if score > threshold:
-                    yield (position - n, score)
+        forward, reverse = self._scan(sequence, threshold, both, chunksize)
+        if reverse is None:
+            reverse = [], []
+        # Merge the hits on the two strands, forward strand first, as
+        # Python ints and floats rather than NumPy scalars
+        hits = zip(forward[0], forward[1])
+        reverse_hits = iter(zip(reverse[0], reverse[1]))
+        reverse_hit = next(reverse_hits, None)
+        for position, score in hits:
+            while reverse_hit is not None and reverse_hit[0] < position:
+                yield (int(reverse_hit[0]) - n, float(reverse_hit[1]))
+                reverse_hit = next(reverse_hits, None)
+            yield (int(position), float(score))
+        while reverse_hit is not None:
+            yield (int(reverse_hit[0]) - n, float(reverse_hit[1]))
+            reverse_hit = next(reverse_hits, None)
+
+    def scan(self, sequence, threshold=0.0, both=True, chunksize=10 ** 6):
+        """Find hits with PWM score above given threshold as NumPy arrays.
+
+        This is the same search as performed by the search method, but the
+        C code is called only once per strand for each chunk of chunksize
+        positions, and the threshold is applied in C. Returns three arrays:
+
+         - positions - the position of the hit on the forward strand
+           (i.e. the window sequence[position:position + length])
+         - strands - +1 for hits on the forward strand, -1 for hits on the
+           reverse strand
+         - scores - the PWM scores (float32, as returned by calculate)
+
+        The hits are sorted by position, with the forward strand first.
+
+        >>> from Bio import motifs
+        >>> from Bio.Seq import Seq
+        >>> from Bio.Alphabet import IUPAC
+        >>> motif = motifs.create([Seq("TACAA"), Seq("TACGC"), Seq("TACAC")])
+        >>> pssm = motif.counts.normalize(pseudocounts=0.5).log_odds()
+        >>> sequence = Seq("TTACAAGCGTTGTAAT", IUPAC.unambiguous_dna)
+        >>> positions, strands, scores = pssm.scan(sequence, threshold=3.0)
+        >>> print(positions)
+        [1 9]
+        >>> print(strands)
+        [ 1 -1]
+
+        """
+        try:
+            import numpy
+        except ImportError:
+            from Bio import MissingPythonDependencyError
+            raise MissingPythonDependencyError(
+                "Install NumPy if you want to use PSSM.scan.")
+        forward, reverse = self._scan(sequence, threshold, both, chunksize)
+        positions = numpy.asarray(forward[0], numpy.intp)
+        scores = numpy.asarray(forward[1], numpy.float32)
+        strands = numpy.ones(len(positions), numpy.int8)
+        if reverse is not None:
+            positions = numpy.concatenate([positions, reverse[0]])
+            scores = numpy.concatenate([scores, reverse[1]]).astype(numpy.float32)
+            strands = numpy.concatenate([strands,
+                                         -numpy.ones(len(reverse[0]),
+                                                     numpy.int8)])
+            order = numpy.lexsort((-strands, positions))
+            positions = positions[order]
+            strands = strands[order]
+            scores = scores[order]
+        return positions, strands, scores
 
     @property
     def max(self):
@@ -554,8 +660,12 @@ class PositionSpecificScoringMatrix(GenericPositionMatrix):
         return numerator / denominator
 
     def distribution(self, background=None, precision=10 ** 3):
-        """Calculate the distribution of the scores at the given precision."""
-        from .thresholds import ScoreDistribution
+        """Calculate the distribution of the scores at the given precision.
+
+        The distributions are cached, so asking for the distribution of the
+        same PSSM with the same background again is fast.
+        """
+        from .thresholds import _get_distribution
         if background is None:
             background = dict.fromkeys(self._letters, 1.0)
         else:
@@ -563,4 +673,4 @@ class PositionSpecificScoringMatrix(GenericPositionMatrix):
         total = sum(background.values())
         for letter in self._letters:
             background[letter] /= total
-        return ScoreDistribution(precision=precision, pssm=self, background=background)
+        return _get_distribution(self, background, precision)
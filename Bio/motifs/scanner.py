@@ -0,0 +1,222 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Scanning sequences with many position-specific scoring matrices at once.
+
+The search and scan methods of a PositionSpecificScoringMatrix look at a
+single motif. To annotate a genome with a whole motif database (such as
+JASPAR), the MotifScanner class encodes each chunk of the sequence once
+as an array of letter indices, scores every window for all motifs on
+both strands with NumPy, and yields the hits chunk by chunk as arrays:
+
+>>> from Bio import motifs
+>>> from Bio.Seq import Seq
+>>> motif1 = motifs.create([Seq("TACAA"), Seq("TACGC"), Seq("TACAC")])
+>>> motif2 = motifs.create([Seq("GGGCG"), Seq("GGGCC")])
+>>> pssms = [motif.counts.normalize(pseudocounts=0.5).log_odds()
+...          for motif in (motif1, motif2)]
+>>> scanner = motifs.MotifScanner(pssms, thresholds=3.0)
+>>> for hits in scanner.scan("TTACAAGCGTTGTAATGGGCGA"):
+...     for motif, position, strand, score in zip(*hits):
+...         print("%i %2i %2i %.2f" % (motif, position, strand, score))
+...
+0  1  1 5.72
+0  9 -1 5.72
+1 16  1 5.87
+
+The scores are identical to those calculated by the PSSM objects
+themselves. The thresholds can also be calculated from a false positive
+rate, using the score distribution of each motif (see ScoreDistribution
+in Bio.motifs.thresholds).
+"""
+
+from Bio._py3k import range
+
+from Bio.Alphabet import IUPAC
+from Bio.motifs.matrix import PositionSpecificScoringMatrix
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Translation table from sequence letters to the indices used in the
+# scoring tables; anything other than A, C, G, T scores NaN (as in _pwm.c)
+_letters = bytearray([4]) * 256
+for _index, _letter in enumerate(bytearray(b"ACGT")):
+    _letters[_letter] = _index
+    _letters[_letter + 32] = _index  # lower case
+_letters = bytes(_letters)
+del _index, _letter
+
+# Set in the worker processes by _init_worker
+_worker_scanner = None
+
+
+def _encode(sequence):
+    """Return the sequence as an array of letter indices (PRIVATE)."""
+    if not isinstance(sequence, bytes):
+        sequence = sequence.encode("ascii", "replace")
+    return numpy.frombuffer(sequence.translate(_letters), numpy.uint8)
+
+
+def _init_worker(scanner):
+    """Store the scanner in a worker process (PRIVATE)."""
+    global _worker_scanner
+    _worker_scanner = scanner
+
+
+def _scan_chunk_worker(args):
+    """Scan a chunk of the sequence in a worker process (PRIVATE)."""
+    sequence, start, n = args
+    return _worker_scanner._scan_chunk(sequence, start, n)
+
+
+class MotifScanner(object):
+    """Scan sequences for hits of many DNA motifs at once.
+
+    The scanner is created from a list of PSSMs (or Motif objects, in which
+    case their pssm is used). A window is a hit of a motif if its score
+    is above the threshold of the motif:
+
+     - thresholds - a single threshold for all motifs, or a list with a
+       threshold for each motif (default 0.0).
+     - fpr - if given, the threshold of each motif is calculated from its
+       score distribution with this false positive rate, using the given
+       background and precision (see ScoreDistribution.threshold_fpr).
+     - both - search both strands (default), or only the forward strand.
+
+    The thresholds used are stored in the thresholds attribute.
+    """
+
+    def __init__(self, pssms, thresholds=0.0, fpr=None, background=None,
+                 precision=10 ** 3, both=True):
+        """Initialize the scanner for the given PSSMs."""
+        if numpy is None:
+            from Bio import MissingPythonDependencyError
+            raise MissingPythonDependencyError(
+                "Install NumPy if you want to use Bio.motifs.MotifScanner.")
+        self.pssms = []
+        for pssm in pssms:
+            if not isinstance(pssm, PositionSpecificScoringMatrix):
+                # A Motif object
+                pssm = pssm.pssm
+            if not isinstance(pssm.alphabet, IUPAC.IUPACUnambiguousDNA):
+                raise ValueError("PSSM has wrong alphabet: %s - Use only with "
+                                 "DNA motifs" % pssm.alphabet)
+            self.pssms.append(pssm)
+        if fpr is not None:
+            thresholds = [pssm.distribution(background, precision)
+                          .threshold_fpr(fpr) for pssm in self.pssms]
+        elif numpy.ndim(thresholds) == 0:
+            thresholds = [thresholds] * len(self.pssms)
+        if len(thresholds) != len(self.pssms):
+            raise ValueError("Expected %i thresholds, got %i"
+                             % (len(self.pssms), len(thresholds)))
+        self.thresholds = [float(threshold) for threshold in thresholds]
+        self.both = both
+        # The scoring tables of each motif and strand, with a NaN score for
+        # unknown letters, as tuples (motif index, strand, table)
+        self._tables = []
+        for index, pssm in enumerate(self.pssms):
+            self._tables.append((index, 1, self._table(pssm)))
+            if both:
+                self._tables.append((index, -1,
+                                     self._table(pssm.reverse_complement())))
+        self.max_length = max(pssm.length for pssm in self.pssms) \
+            if self.pssms else 0
+
+    @staticmethod
+    def _table(pssm):
+        """Return the scoring table of a PSSM as an array (PRIVATE)."""
+        table = numpy.empty((pssm.length, 5))
+        for column, letter in enumerate("ACGT"):
+            table[:, column] = pssm[letter]
+        table[:, 4] = numpy.nan
+        return table
+
+    def _scan_chunk(self, sequence, start, n):
+        """Find the hits in the first n windows of a sequence chunk (PRIVATE).
+
+        Returns arrays of motif indices, positions (offset by start),
+        strands and scores, sorted by position, motif, and strand.
+        """
+        codes = _encode(sequence)
+        found = []
+        for index, strand, table in self._tables:
+            m = len(table)
+            count = min(n, len(codes) - m + 1)
+            if count <= 0:
+                continue
+            # Sum the scores in the same order as the C code in _pwm.c,
+            # which gives identical float32 scores
+            scores = numpy.take(table[0], codes[:count])
+            for j in range(1, m):
+                scores += numpy.take(table[j], codes[j:j + count])
+            scores = scores.astype(numpy.float32)
+            # Compare the float32 scores in double precision, as in _pwm.c
+            positions = numpy.flatnonzero(
+                scores.astype(float) > self.thresholds[index])
+            found.append((index, strand, positions, scores[positions]))
+        if not found:
+            motifs = positions = numpy.zeros(0, numpy.intp)
+            return (motifs, positions, numpy.zeros(0, numpy.int8),
+                    numpy.zeros(0, numpy.float32))
+        motifs = numpy.concatenate([numpy.full(len(hits[2]), hits[0],
+                                               numpy.intp)
+                                    for hits in found])
+        strands = numpy.concatenate([numpy.full(len(hits[2]), hits[1],
+                                                numpy.int8)
+                                     for hits in found])
+        positions = numpy.concatenate([hits[2] for hits in found]) + start
+        scores = numpy.concatenate([hits[3] for hits in found])
+        order = numpy.lexsort((-strands, motifs, positions))
+        return motifs[order], positions[order], strands[order], scores[order]
+
+    def _chunks(self, sequence, chunksize):
+        """Split the sequence into overlapping chunks (PRIVATE).
+
+        Yields (sequence chunk, start, number of windows) tuples.
+        """
+        n = len(sequence)
+        overlap = max(self.max_length - 1, 0)
+        for start in range(0, n, chunksize):
+            end = min(start + chunksize, n)
+            yield sequence[start:end + overlap], start, end - start
+
+    def scan(self, sequence, chunksize=10 ** 6, processes=1):
+        """Scan the sequence, yielding the hits for each chunk as arrays.
+
+        The sequence (a string or Seq object; letters other than A, C, G
+        and T are allowed but never part of a hit) is scanned in chunks of
+        chunksize positions. For each chunk, a tuple of four arrays is
+        yielded:
+
+         - motifs - the index of the motif in the list of PSSMs
+         - positions - the start of the hit on the forward strand
+         - strands - +1 for the forward strand, -1 for the reverse strand
+         - scores - the scores (float32, as calculated by the PSSMs)
+
+        The hits are sorted by position, motif and strand (forward first).
+        If processes is more than one (or None, to use all CPUs), the chunks
+        are scanned in parallel by a pool of worker processes; the results
+        are still yielded in order.
+        """
+        if not isinstance(sequence, (str, bytes)):
+            sequence = str(sequence)
+        chunks = self._chunks(sequence, chunksize)
+        if processes == 1:
+            for chunk in chunks:
+                yield self._scan_chunk(*chunk)
+            return
+        import multiprocessing
+        pool = multiprocessing.Pool(processes, _init_worker, (self,))
+        try:
+            for hits in pool.imap(_scan_chunk_worker, chunks):
+                yield hits
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
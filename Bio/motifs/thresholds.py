@@ -5,6 +5,50 @@
 # as part of this package.
 """Approximate calculation of appropriate thresholds for motif finding."""
 
+from collections import OrderedDict
+import copy
+
+try:
+    import numpy
+except ImportError:
+    # Fall back on (much slower) pure Python lists
+    numpy = None
+
+
+# Cache of score distributions, see _get_distribution
+_distributions = OrderedDict()
+_max_distributions = 64
+
+
+def _get_distribution(pssm, background, precision):
+    """Return the score distribution of a PSSM, using a cache (PRIVATE).
+
+    The cache is keyed by the PSSM values, the background and the
+    precision. A shallow copy of the cached ScoreDistribution is returned,
+    sharing its densities, which are made read-only so that the cache
+    cannot be changed by accident (the modify method replaces them).
+    """
+    letters = sorted(pssm)
+    key = (tuple(tuple(pssm[letter]) for letter in letters),
+           tuple(background[letter] for letter in letters),
+           tuple(letters), precision)
+    try:
+        distribution = _distributions[key]
+    except KeyError:
+        distribution = ScoreDistribution(precision=precision, pssm=pssm,
+                                         background=background)
+        if numpy is None:
+            distribution.mo_density = tuple(distribution.mo_density)
+            distribution.bg_density = tuple(distribution.bg_density)
+        else:
+            distribution.mo_density.flags.writeable = False
+            distribution.bg_density.flags.writeable = False
+        if len(_distributions) >= _max_distributions:
+            # Remove the oldest entry
+            _distributions.popitem(last=False)
+        _distributions[key] = distribution
+    return copy.copy(distribution)
+
 
 class ScoreDistribution(object):
     """Class representing approximate score distribution for a given motif.
@@ -12,6 +56,9 @@ class ScoreDistribution(object):
     Utilizes a dynamic programming approach to calculate the distribution of
     scores with a predefined precision. Provides a number of methods for calculating
     thresholds for motif occurrences.
+
+    The densities mo_density and bg_density are NumPy arrays if NumPy is
+    installed, and lists otherwise.
     """
 
     def __init__(self, motif=None, precision=10 ** 3, pssm=None, background=None):
@@ -27,27 +74,26 @@ class ScoreDistribution(object):
             self.n_points = precision * pssm.length
             self.ic = pssm.mean(background)
         self.step = self.interval / (self.n_points - 1)
-        self.mo_density = [0.0] * self.n_points
-        self.mo_density[-self._index_diff(self.min_score)] = 1.0
-        self.bg_density = [0.0] * self.n_points
-        self.bg_density[-self._index_diff(self.min_score)] = 1.0
+        if numpy is None:
+            mo_density = [0.0] * self.n_points
+        else:
+            mo_density = numpy.zeros(self.n_points)
+        mo_density[-self._index_diff(self.min_score)] = 1.0
+        bg_density = copy.copy(mo_density)
         if pssm is None:
             for lo, mo in zip(motif.log_odds(), motif.pwm()):
-                self.modify(lo, mo, motif.background)
+                mo_density, bg_density = self._modify(mo_density, bg_density,
+                                                      lo, mo, motif.background)
         else:
             for position in range(pssm.length):
-                mo_new = [0.0] * self.n_points
-                bg_new = [0.0] * self.n_points
                 lo = pssm[:, position]
+                mo = {}
                 for letter, score in lo.items():
-                    bg = background[letter]
-                    mo = pow(2, pssm[letter, position]) * bg
-                    d = self._index_diff(score)
-                    for i in range(self.n_points):
-                        mo_new[self._add(i, d)] += self.mo_density[i] * mo
-                        bg_new[self._add(i, d)] += self.bg_density[i] * bg
-                self.mo_density = mo_new
-                self.bg_density = bg_new
+                    mo[letter] = pow(2, pssm[letter, position]) * background[letter]
+                mo_density, bg_density = self._modify(mo_density, bg_density,
+                                                      lo, mo, background)
+        self.mo_density = mo_density
+        self.bg_density = bg_density
 
     def _index_diff(self, x, y=0.0):
         return int((x - y + 0.5 * self.step) // self.step)
@@ -55,16 +101,56 @@ class ScoreDistribution(object):
     def _add(self, i, j):
         return max(0, min(self.n_points - 1, i + j))
 
-    def modify(self, scores, mo_probs, bg_probs):
-        mo_new = [0.0] * self.n_points
-        bg_new = [0.0] * self.n_points
+    @staticmethod
+    def _shift_add(new, old, d, weight):
+        """Add old shifted by d positions to new, clipping at the ends (PRIVATE).
+
+        This is the array equivalent of adding old[i] * weight to
+        new[self._add(i, d)] for all i.
+        """
+        n = len(old)
+        if d >= n:
+            new[-1] += old.sum() * weight
+        elif d <= -n:
+            new[0] += old.sum() * weight
+        elif d >= 0:
+            new[d:] += old[:n - d] * weight
+            if d:
+                new[-1] += old[n - d:].sum() * weight
+        else:
+            new[:n + d] += old[-d:] * weight
+            new[0] += old[:-d].sum() * weight
+
+    def _modify(self, mo_density, bg_density, scores, mo_probs, bg_probs):
+        """Add a position to the score distributions given as arrays (PRIVATE).
+
+        The new distributions are the convolution of the old ones with the
+        (discretized) scores of the letters at the new position.
+        """
+        if numpy is None:
+            mo_new = [0.0] * self.n_points
+            bg_new = [0.0] * self.n_points
+            for k, v in scores.items():
+                d = self._index_diff(v)
+                for i in range(self.n_points):
+                    mo_new[self._add(i, d)] += mo_density[i] * mo_probs[k]
+                    bg_new[self._add(i, d)] += bg_density[i] * bg_probs[k]
+            return mo_new, bg_new
+        mo_density = numpy.asarray(mo_density)
+        bg_density = numpy.asarray(bg_density)
+        mo_new = numpy.zeros(self.n_points)
+        bg_new = numpy.zeros(self.n_points)
         for k, v in scores.items():
             d = self._index_diff(v)
-            for i in range(self.n_points):
-                mo_new[self._add(i, d)] += self.mo_density[i] * mo_probs[k]
-                bg_new[self._add(i, d)] += self.bg_density[i] * bg_probs[k]
-        self.mo_density = mo_new
-        self.bg_density = bg_new
+            self._shift_add(mo_new, mo_density, d, mo_probs[k])
+            self._shift_add(bg_new, bg_density, d, bg_probs[k])
+        return mo_new, bg_new
+
+    def modify(self, scores, mo_probs, bg_probs):
+        self.mo_density, self.bg_density = self._modify(self.mo_density,
+                                                        self.bg_density,
+                                                        scores, mo_probs,
+                                                        bg_probs)
 
     def threshold_fpr(self, fpr):
         """Approximate the log-odds threshold which makes the type I error (false positive rate)."""
@@ -94,7 +180,7 @@ class ScoreDistribution(object):
             fpr += self.bg_density[i]
             fnr -= self.mo_density[i]
         if return_rate:
-            return self.min_score + i * self.step, fpr
+            return self.min_score + i * self.step, float(fpr)
         else:
             return self.min_score + i * self.step
 
@@ -158,7 +158,20 @@ if numpy:
         "Bio.Affy.CelFile",
         "Bio.MaxEntropy",
         "Bio.PDB.Polypeptide",
+        "Bio.PDB.QCPSuperimposer",
         "Bio.PDB.Selection",
+        "Bio.PDB.StructureCache",
+        "Bio.PDB.bulkio",
+        "Bio.PDB.HSExposure",
+        "Bio.Restriction.Digest",
+        "Bio.SearchIO.BlastIO.blast_tab_array",
+        "Bio.SearchIO.hsptable",
+        "Bio.SearchIO.CacheIO",
+        "Bio.SeqUtils.codonmatrix",
+        "Bio.SeqUtils.tmarray",
+        "Bio.SeqUtils.windows",
+        "Bio.motifs.matrix",
+        "Bio.motifs.scanner",
         "Bio.SeqIO.PdbIO",
         "Bio.Statistics.lowess",
         "Bio.SVDSuperimposer",
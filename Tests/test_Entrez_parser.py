@@ -4302,6 +4302,103 @@ class EFetchTest(unittest.TestCase):
         self.assertRaises(CorruptedXMLError, next, records)
 
 
+class IterParseTest(unittest.TestCase):
+    """Tests for the streaming parser, Entrez.iterparse."""
+
+    def test_pubmed(self):
+        """Test parsing PubMed records into plain Python objects."""
+        with open('Entrez/pubmed1.xml', "rb") as handle:
+            records = list(Entrez.iterparse(handle))
+        with open('Entrez/pubmed1.xml', "rb") as handle:
+            expected = list(Entrez.parse(handle))
+        self.assertEqual(len(records), 2)
+        for record, other in zip(records, expected):
+            self.assertEqual(type(record), dict)
+            citation = record["MedlineCitation"]
+            self.assertEqual(citation["PMID"], other["MedlineCitation"]["PMID"])
+            self.assertEqual(type(citation["PMID"]), str)
+            article = citation["Article"]
+            self.assertEqual(article["ArticleTitle"],
+                             other["MedlineCitation"]["Article"]["ArticleTitle"])
+            self.assertEqual(article["Journal"]["JournalIssue"]["Volume"],
+                             other["MedlineCitation"]["Article"]["Journal"]
+                                  ["JournalIssue"]["Volume"])
+        # a single author is stored as a dictionary, several as a list
+        authors = records[1]["MedlineCitation"]["Article"]["AuthorList"]
+        self.assertEqual(authors["Author"]["LastName"], "Strekas")
+        types = records[0]["MedlineCitation"]["Article"]["PublicationTypeList"]
+        self.assertEqual(types["PublicationType"], ["Journal Article", "Review"])
+
+    def test_fields(self):
+        """Test selecting the fields of the records."""
+        fields = ["MedlineCitation/PMID",
+                  "/MedlineCitation/Article/AuthorList/Author/LastName/",
+                  "MedlineCitation/Article/Journal/JournalIssue"]
+        with open('Entrez/pubmed1.xml', "rb") as handle:
+            records = list(Entrez.iterparse(handle, fields=fields,
+                                            lists=["Author"]))
+        self.assertEqual(records[1], {"MedlineCitation": {
+            "PMID": "9997",
+            "Article": {
+                "Journal": {"JournalIssue": {"Volume": "446", "Issue": "1",
+                                             "PubDate": {"Year": "1976",
+                                                         "Month": "Sep",
+                                                         "Day": "28"}}},
+                "AuthorList": {"Author": [{"LastName": "Strekas"}]}}}})
+        with open('Entrez/pubmed1.xml', "rb") as handle:
+            records = list(Entrez.iterparse(handle, fields=["Nonexistent"]))
+        self.assertEqual(records, [{}, {}])
+
+    def test_tag_and_attributes(self):
+        """Test selecting the records by tag, and keeping attributes."""
+        with open('Entrez/pubmed1.xml', "rb") as handle:
+            records = list(Entrez.iterparse(handle, tag="Author",
+                                            attributes=True))
+        self.assertEqual(records, [{"@ValidYN": "Y", "LastName": "Olivero",
+                                    "ForeName": "J Michael",
+                                    "Initials": "JM"},
+                                   {"@ValidYN": "Y", "LastName": "Strekas",
+                                    "ForeName": "T C", "Initials": "TC"}])
+        with open('Entrez/esummary1.xml', "rb") as handle:
+            record = next(Entrez.iterparse(handle, attributes=True))
+        self.assertEqual(record["Id"], "11850928")
+        self.assertEqual(record["Item"][0], {"@Name": "PubDate",
+                                             "@Type": "Date",
+                                             "#text": "1965 Aug"})
+
+    def test_gbseq(self):
+        """Test parsing GBSeq records."""
+        with open('Entrez/nucleotide1.xml', "rb") as handle:
+            records = list(Entrez.iterparse(handle, lists=["GBQualifier"]))
+        self.assertEqual(len(records), 1)
+        record = records[0]
+        self.assertEqual(record["GBSeq_locus"], "X60065")
+        self.assertEqual(record["GBSeq_length"], "1136")
+        features = record["GBSeq_feature-table"]["GBFeature"]
+        self.assertEqual(len(features), 7)
+        self.assertEqual(features[0]["GBFeature_key"], "source")
+        qualifier = features[0]["GBFeature_quals"]["GBQualifier"][0]
+        self.assertEqual(qualifier["GBQualifier_name"], "organism")
+
+    def test_markup(self):
+        """Test inline markup is kept as text."""
+        with open('Entrez/pubmed4.xml', "rb") as handle:
+            record = next(Entrez.iterparse(handle))
+        self.assertEqual(record['MedlineCitation']['Article']['ArticleTitle'],
+                         'Leucocyte telomere length, genetic variants at the '
+                         '<i>TERT</i> gene region and risk of pancreatic '
+                         'cancer.')
+
+    def test_errors(self):
+        """Test error handling for invalid and truncated XML."""
+        from Bio.Entrez.Parser import CorruptedXMLError, NotXMLError
+        records = Entrez.iterparse(BytesIO(b"This is not XML"))
+        self.assertRaises(NotXMLError, next, records)
+        records = Entrez.iterparse(StringIO('<?xml version="1.0"?>\n'
+                                            '<GBSet><GBSeq><GBSeq_locus>'))
+        self.assertRaises(CorruptedXMLError, next, records)
+
+
 if __name__ == '__main__':
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
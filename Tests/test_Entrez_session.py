@@ -0,0 +1,210 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Tests for Bio.Entrez.Session, using a local mock Entrez server."""
+
+import threading
+import time
+import unittest
+import warnings
+
+try:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs, urlparse
+except ImportError:
+    # Python 2
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qs, urlparse
+
+from Bio import BiopythonWarning
+from Bio._py3k import HTTPError
+from Bio.Entrez.Session import EntrezSession, TokenBucket
+
+
+class MockEntrezHandler(BaseHTTPRequestHandler):
+    """Minimal epost and efetch, returning one line per record."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        parts = urlparse(self.path)
+        self.respond(parts.path, parse_qs(parts.query))
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        body = self.rfile.read(length).decode("ascii")
+        self.respond(urlparse(self.path).path, parse_qs(body))
+
+    def respond(self, path, params):
+        server = self.server
+        with server.lock:
+            server.requests.append((path, params))
+            status = server.failures.pop(0) if server.failures else 200
+        if status != 200:
+            self.send(status, b"")
+        elif path.endswith("/epost.fcgi"):
+            with server.lock:
+                server.posted.append(params["id"][0].split(","))
+                query_key = len(server.posted)
+            self.send(200, ("<?xml version=\"1.0\"?>\n<ePostResult>"
+                            "<QueryKey>%i</QueryKey><WebEnv>MOCK</WebEnv>"
+                            "</ePostResult>" % query_key).encode("ascii"))
+        elif path.endswith("/efetch.fcgi"):
+            if "id" in params:
+                ids = params["id"][0].split(",")
+            else:
+                ids = server.posted[int(params["query_key"][0]) - 1]
+                start = int(params["retstart"][0])
+                ids = ids[start:start + int(params["retmax"][0])]
+            self.send(200, "".join("record %s\n" % identifier
+                                   for identifier in ids).encode("utf-8"))
+        else:
+            self.send(400, b"")
+
+    def send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MockEntrezServer(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ("127.0.0.1", 0), MockEntrezHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = []
+        self.posted = []
+        self.failures = []
+
+
+class EntrezSessionCases(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockEntrezServer()
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        url = "http://127.0.0.1:%i/entrez/eutils/" % self.server.server_port
+        self.session = EntrezSession(email="biopython@biopython.org",
+                                     rate=1000, backoff=0.01, base_url=url)
+
+    def tearDown(self):
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_keep_alive(self):
+        for i in range(5):
+            handle = self.session.efetch("nucleotide", id=["1", str(i)])
+            self.assertEqual(handle.read(), "record 1\nrecord %i\n" % i)
+        self.assertEqual(self.server.connections, 1)
+        path, params = self.server.requests[0]
+        self.assertEqual(path, "/entrez/eutils/efetch.fcgi")
+        self.assertEqual(params["email"], ["biopython@biopython.org"])
+        self.assertEqual(params["tool"], ["biopython"])
+
+    def test_non_ascii(self):
+        text = u"Fran\xe7ois-Stra\xdfe"
+        handle = self.session.efetch("nucleotide", id=text)
+        data = handle.read()
+        if not isinstance(data, type(u"")):
+            # Python 2, where the bytes are returned
+            data = data.decode("utf-8")
+        self.assertEqual(data, u"record %s\n" % text)
+
+    def test_efetch_batches(self):
+        ids = [str(i) for i in range(1050)]
+        for threads in (1, 4):
+            del self.server.requests[:]
+            handles = self.session.efetch_batches("nucleotide", ids,
+                                                  batch_size=100,
+                                                  post_size=500,
+                                                  threads=threads,
+                                                  rettype="fasta")
+            lines = "".join(handle.read() for handle in handles).splitlines()
+            self.assertEqual(lines, ["record %s" % i for i in ids])
+            paths = [path.rsplit("/", 1)[1]
+                     for path, params in self.server.requests]
+            # the last 50 identifiers are fetched directly, without epost
+            self.assertEqual(paths.count("epost.fcgi"), 2)
+            self.assertEqual(paths.count("efetch.fcgi"), 11)
+            for path, params in self.server.requests:
+                if path.endswith("efetch.fcgi"):
+                    self.assertEqual(params["rettype"], ["fasta"])
+        # each thread has its own connection
+        self.assertTrue(self.server.connections <= 5, self.server.connections)
+        # a short list is fetched by identifier
+        handles = list(self.session.efetch_batches("nucleotide", ids[:3]))
+        self.assertEqual(len(handles), 1)
+        self.assertEqual(handles[0].read(), "record 0\nrecord 1\nrecord 2\n")
+        self.assertEqual(list(self.session.efetch_batches("nucleotide", [])),
+                         [])
+
+    def test_retry(self):
+        self.server.failures = [503, 429]
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", BiopythonWarning)
+            handle = self.session.efetch("nucleotide", id="42")
+        self.assertEqual(handle.read(), "record 42\n")
+        self.assertEqual(len(caught), 2)
+        self.assertEqual(len(self.server.requests), 3)
+
+        self.server.failures = [503] * 4
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", BiopythonWarning)
+            try:
+                self.session.efetch("nucleotide", id="42")
+            except HTTPError as error:
+                self.assertEqual(error.code, 503)
+            else:
+                self.fail("Expected an HTTPError")
+        self.assertEqual(len(self.server.requests), 7)
+
+        # other errors are not retried
+        self.server.failures = [400]
+        try:
+            self.session.efetch("nucleotide", id="42")
+        except HTTPError as error:
+            self.assertEqual(error.code, 400)
+        else:
+            self.fail("Expected an HTTPError")
+        self.assertEqual(len(self.server.requests), 8)
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(50)
+        start = time.time()
+        for i in range(11):
+            bucket.acquire()
+        self.assertTrue(time.time() - start >= 0.18)
+
+        bucket = TokenBucket(50, capacity=5)
+        threads = [threading.Thread(target=bucket.acquire) for i in range(10)]
+        start = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.time() - start
+        self.assertTrue(0.08 <= elapsed < 1, elapsed)
+        self.assertRaises(ValueError, TokenBucket, 0)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
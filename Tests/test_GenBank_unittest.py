@@ -4,6 +4,8 @@
 # license.  Please see the LICENSE file that should have been included
 # as part of this package.
 
+import copy
+import pickle
 import unittest
 from os import path
 import warnings
@@ -14,6 +16,7 @@ from Bio import BiopythonWarning
 from Bio import GenBank
 from Bio.GenBank import Scanner
 from Bio import SeqIO
+from Bio.SeqFeature import SeqFeature, FeatureLocation
 from Bio.SeqRecord import SeqRecord
 from Bio.Seq import Seq
 from Bio.Alphabet import generic_dna
@@ -503,6 +506,148 @@ class LineOneTests(unittest.TestCase):
                              "Wrong division %r not %r from %r" % (d, div, line))
 
 
+class LazyFeatureTests(unittest.TestCase):
+    """Check parsing with lazy_features=True matches the default."""
+
+    def compare_records(self, filename, format):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", BiopythonParserWarning)
+            expected = list(SeqIO.parse(filename, format))
+            records = list(SeqIO.parse(filename, format, lazy_features=True))
+            self.assertEqual(len(expected), len(records))
+            for old, new in zip(expected, records):
+                self.assertEqual(old.id, new.id)
+                self.assertEqual(str(old.seq), str(new.seq))
+                self.assertEqual(len(old.features), len(new.features))
+                for f1, f2 in zip(old.features, new.features):
+                    self.assertEqual(f1.type, f2.type)
+                    self.assertEqual(f1.location, f2.location)
+                    self.assertEqual(f1.qualifiers, f2.qualifiers)
+                    self.assertEqual(repr(f1), repr(f2))
+
+    def test_genbank(self):
+        for filename in ["NC_005816.gb", "NC_000932.gb", "cor6_6.gb",
+                         "one_of.gb", "iro.gb", "pri1.gb", "arab1.gb",
+                         "protein_refseq.gb", "bad_origin_wrap.gb"]:
+            self.compare_records(path.join("GenBank", filename), "genbank")
+
+    def test_embl(self):
+        for filename in ["TRBG361.embl", "DD231055_edited.embl",
+                         "location_wrap.embl", "AE017046.embl"]:
+            self.compare_records(path.join("EMBL", filename), "embl")
+
+    def test_lazy(self):
+        record = SeqIO.read(path.join("GenBank", "NC_005816.gb"), "genbank",
+                            lazy_features=True)
+        feature = record.features[2]
+        self.assertIn("_raw", feature.__dict__)
+        self.assertEqual(feature.type, "gene")
+        self.assertIn("_raw", feature.__dict__)
+        self.assertEqual(feature.qualifiers["locus_tag"], ["YP_pPCP01"])
+        self.assertNotIn("_raw", feature.__dict__)
+        self.assertEqual(type(feature), SeqFeature)
+        self.assertEqual(len(feature), 1023)
+        # setting the location or qualifiers first
+        feature = record.features[3]
+        feature.location = FeatureLocation(0, 10)
+        self.assertEqual(feature.location, FeatureLocation(0, 10))
+        self.assertEqual(feature.qualifiers["protein_id"], ["NP_995567.1"])
+        feature = record.features[4]
+        feature.qualifiers = {}
+        self.assertEqual(feature.qualifiers, {})
+        self.assertEqual(feature.location, FeatureLocation(86, 959, 1))
+        # copying and pickling
+        feature = copy.deepcopy(record.features[5])
+        self.assertEqual(type(feature), SeqFeature)
+        self.assertEqual(feature.location, record.features[5].location)
+        feature = pickle.loads(pickle.dumps(record.features[6]))
+        self.assertEqual(feature.qualifiers, record.features[6].qualifiers)
+
+    def test_deferred_warning(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", BiopythonParserWarning)
+            record = SeqIO.read(path.join("GenBank", "bad_loc_wrap.gb"),
+                                "genbank", lazy_features=True)
+            self.assertEqual(len(caught), 0)
+            for feature in record.features:
+                feature.location
+            self.assertEqual(len(caught), 1)
+            self.assertEqual(str(caught[0].message),
+                             "Non-standard feature line wrapping "
+                             "(didn't break on comma)?")
+
+
+class FeatureFilterTests(unittest.TestCase):
+    """Check the feature_types and feature_qualifiers options."""
+
+    def compare_filtered(self, filename, format, types, keys, **kwargs):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", BiopythonParserWarning)
+            expected = list(SeqIO.parse(filename, format))
+            records = list(SeqIO.parse(filename, format, feature_types=types,
+                                       feature_qualifiers=keys, **kwargs))
+            self.assertEqual(len(expected), len(records))
+            for old, new in zip(expected, records):
+                self.assertEqual(str(old.seq), str(new.seq))
+                features = [f for f in old.features if f.type in types]
+                self.assertEqual(len(features), len(new.features))
+                for f1, f2 in zip(features, new.features):
+                    self.assertEqual(f1.type, f2.type)
+                    self.assertEqual(f1.location, f2.location)
+                    self.assertEqual([(k, v) for k, v in f1.qualifiers.items()
+                                      if k in keys],
+                                     list(f2.qualifiers.items()))
+
+    def test_genbank(self):
+        filename = path.join("GenBank", "NC_005816.gb")
+        self.compare_filtered(filename, "genbank", ["CDS"],
+                              ["locus_tag", "translation"])
+        self.compare_filtered(filename, "genbank", ["CDS"],
+                              ["locus_tag", "translation"],
+                              lazy_features=True)
+        self.compare_filtered(filename, "genbank", ["gene", "misc_feature"],
+                              ["note", "pseudo"])
+        filename = path.join("GenBank", "cor6_6.gb")
+        self.compare_filtered(filename, "genbank", ["CDS", "mRNA"],
+                              ["gene", "translation", "db_xref"])
+
+    def test_embl(self):
+        for filename in ["TRBG361.embl", "AE017046.embl"]:
+            self.compare_filtered(path.join("EMBL", filename), "embl",
+                                  ["CDS"], ["translation", "protein_id"])
+
+    def test_single_string(self):
+        record = SeqIO.read(path.join("GenBank", "NC_005816.gb"), "genbank",
+                            feature_types="CDS", feature_qualifiers="gene")
+        self.assertEqual(len(record.features), 10)
+        self.assertEqual(set(f.type for f in record.features), set(["CDS"]))
+
+    def test_index(self):
+        records = SeqIO.index(path.join("GenBank", "cor6_6.gb"), "genbank",
+                              feature_types=["CDS"],
+                              feature_qualifiers=["gene", "translation"])
+        record = records["X62281.1"]
+        self.assertEqual([f.type for f in record.features], ["CDS"])
+        self.assertEqual(list(record.features[0].qualifiers),
+                         ["gene", "translation"])
+        records.close()
+
+    def test_record_parser(self):
+        with open(path.join("GenBank", "NC_005816.gb")) as handle:
+            expected = GenBank.read(handle)
+        with open(path.join("GenBank", "NC_005816.gb")) as handle:
+            record = GenBank.read(handle, feature_types=["CDS", "misc_RNA"],
+                                  feature_qualifiers=["locus_tag"])
+        features = [f for f in expected.features
+                    if f.key in ("CDS", "misc_RNA")]
+        self.assertEqual(len(features), len(record.features))
+        for f1, f2 in zip(features, record.features):
+            self.assertEqual(f1.location, f2.location)
+            self.assertEqual([(q.key, q.value) for q in f1.qualifiers
+                              if q.key == "/locus_tag="],
+                             [(q.key, q.value) for q in f2.qualifiers])
+
+
 class OutputTests(unittest.TestCase):
     """GenBank output tests."""
 
@@ -567,6 +712,44 @@ class OutputTests(unittest.TestCase):
         out_lines = out_handle.readlines()
         self.assertEqual(out_lines[0], invalid_line)
 
+    def test_buffered_write(self):
+        """Write each record with a single call, wrapping the sequence."""
+        class CountingHandle(StringIO):
+            calls = 0
+
+            def write(self, text):
+                self.calls += 1
+                return StringIO.write(self, text)
+
+        record = SeqRecord(Seq("ACGTACGTAA" * 13, generic_dna),
+                           id="example", name="example",
+                           description="buffered output")
+        record.features.append(SeqFeature(FeatureLocation(9, 20), type="gene",
+                                          qualifiers={"note": [" ".join(["word"] * 30)]}))
+        for format, full, partial in [
+                ("gb", "        1 acgtacgtaa acgtacgtaa acgtacgtaa acgtacgtaa "
+                       "acgtacgtaa acgtacgtaa\n",
+                       "      121 acgtacgtaa\n"),
+                ("embl", "     acgtacgtaa acgtacgtaa acgtacgtaa acgtacgtaa "
+                         "acgtacgtaa acgtacgtaa        60\n",
+                         "     acgtacgtaa" + " " * 55 + "       130\n")]:
+            handle = CountingHandle()
+            SeqIO.write([record, record], handle, format)
+            self.assertEqual(handle.calls, 2)
+            text = handle.getvalue()
+            self.assertIn(full, text)
+            self.assertIn(partial, text)
+            self.assertIn("10..20", text)
+            self.assertTrue(max(len(line) for line in text.splitlines()) <= 80)
+            handle.seek(0)
+            for new in SeqIO.parse(handle, format):
+                self.assertEqual(str(new.seq), str(record.seq))
+                feature = new.features[-1]
+                self.assertEqual(feature.location.start, 9)
+                self.assertEqual(feature.location.end, 20)
+                self.assertEqual(feature.qualifiers["note"],
+                                 [" ".join(["word"] * 30)])
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
@@ -37,6 +37,7 @@ from Bio.Alphabet import generic_protein
 from Bio.PDB import PDBParser, PPBuilder, CaPPBuilder, PDBIO, Select, MMCIFParser, MMCIFIO
 from Bio.PDB.MMCIF2Dict import MMCIF2Dict
 from Bio.PDB import HSExposureCA, HSExposureCB, ExposureCN
+from Bio.PDB.HSExposure import calc_exposure
 from Bio.PDB.PDBExceptions import PDBConstructionException, PDBConstructionWarning
 from Bio.PDB import rotmat, Vector, refmat, calc_angle, calc_dihedral, rotaxis, m2rotaxis
 from Bio.PDB import Residue, Atom
@@ -1151,6 +1152,19 @@ class Exposure(unittest.TestCase):
         self.assertEqual(1, len(residues[-1].xtra))
         self.assertEqual(38, residues[-1].xtra["EXP_CN"])
 
+    def test_calc_exposure(self):
+        """Exposure of several models in a process pool."""
+        expected = [HSExposureCB(self.model, self.radius).property_dict]
+        for filename in ("PDB/1A8O.pdb", "PDB/2BEG.pdb"):
+            structure = PDBParser(QUIET=True).get_structure("X", filename)
+            expected.append(HSExposureCB(structure.child_list[0],
+                                         self.radius).property_dict)
+        items = [self.model, "PDB/1A8O.pdb", "PDB/2BEG.pdb"]
+        for processes in (1, 2):
+            results = calc_exposure(items, HSExposureCB, self.radius,
+                                    processes=processes)
+            self.assertEqual(list(results), expected)
+
 
 class Atom_Element(unittest.TestCase):
     """induces Atom Element from Atom Name."""
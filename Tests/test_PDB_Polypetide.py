@@ -11,7 +11,17 @@
 
 import unittest
 
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.PDB.")
+
 from Bio.PDB import PDBParser, PPBuilder, CaPPBuilder
+from Bio.PDB.Polypeptide import get_backbone_coords, calc_backbone_geometry
+from Bio.PDB.Polypeptide import get_backbone_coords_from_arrays
+from Bio.PDB.StructureCache import structure_to_arrays
 
 
 class PolypeptideTests(unittest.TestCase):
@@ -63,6 +73,58 @@ class PolypeptideTests(unittest.TestCase):
         self.assertAlmostEqual(thetas[1], 1.7491703334817772, places=3)
         self.assertAlmostEqual(thetas[2], 2.0702447422720143, places=3)
 
+    def test_backbone_geometry(self):
+        """Compare the array based backbone geometry to the Vector based one."""
+        s = PDBParser(PERMISSIVE=True).get_structure("scr", "PDB/1A8O.pdb")
+        for pp in PPBuilder().build_peptides(s):
+            geometry = pp.get_backbone_geometry()
+            for i, (phi, psi) in enumerate(pp.get_phi_psi_list()):
+                if phi is None:
+                    self.assertTrue(numpy.isnan(geometry["phi"][i]))
+                else:
+                    self.assertAlmostEqual(phi, geometry["phi"][i], places=5)
+                if psi is None:
+                    self.assertTrue(numpy.isnan(geometry["psi"][i]))
+                else:
+                    self.assertAlmostEqual(psi, geometry["psi"][i], places=5)
+            for i, tau in enumerate(pp.get_tau_list()):
+                self.assertAlmostEqual(tau, geometry["tau"][i + 2], places=5)
+            for i, theta in enumerate(pp.get_theta_list()):
+                self.assertAlmostEqual(theta, geometry["theta"][i + 1], places=5)
+            # Peptide bonds are planar and about 1.33 Angstrom long
+            self.assertTrue(numpy.isnan(geometry["omega"][0]))
+            self.assertTrue(numpy.all(numpy.abs(geometry["omega"][1:]) > 2.5))
+            self.assertTrue(numpy.all(numpy.abs(geometry["c_n"][1:] - 1.33) < 0.1))
+            self.assertTrue(numpy.all(numpy.abs(geometry["ca_ca"][1:] - 3.8) < 0.2))
+
+    def test_backbone_geometry_batch(self):
+        """Calculate backbone geometry for a padded batch of chains."""
+        s = PDBParser(PERMISSIVE=True).get_structure("scr", "PDB/1A8O.pdb")
+        pps = PPBuilder().build_peptides(s)
+        length = max(len(pp) for pp in pps)
+        coords = numpy.full((len(pps), length, 3, 3), numpy.nan)
+        for i, pp in enumerate(pps):
+            coords[i, :len(pp)] = get_backbone_coords(pp)
+        geometry = calc_backbone_geometry(coords)
+        self.assertEqual(geometry["psi"].shape, (3, length))
+        for i, pp in enumerate(pps):
+            single = pp.get_backbone_geometry()
+            for key, values in single.items():
+                self.assertTrue(numpy.allclose(values,
+                                               geometry[key][i, :len(pp)],
+                                               equal_nan=True))
+            self.assertTrue(numpy.all(numpy.isnan(geometry["phi"][i, len(pp):])))
+        self.assertRaises(ValueError, calc_backbone_geometry, coords[..., :2])
+
+    def test_backbone_coords_from_arrays(self):
+        s = PDBParser(PERMISSIVE=True).get_structure("scr", "PDB/1A8O.pdb")
+        residues = list(s.get_residues())
+        coords = get_backbone_coords_from_arrays(structure_to_arrays(s))
+        self.assertTrue(numpy.array_equal(coords, get_backbone_coords(residues),
+                                          equal_nan=True))
+        # Waters have no backbone
+        self.assertTrue(numpy.all(numpy.isnan(coords[-1])))
+
 
 if __name__ == '__main__':
     runner = unittest.TextTestRunner(verbosity=2)
@@ -0,0 +1,160 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Unit tests for the Bio.PDB.StructureCache module."""
+
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.PDB.")
+
+from Bio.PDB import PDBParser, MMCIFParser, FastMMCIFParser
+from Bio.PDB.PDBExceptions import PDBConstructionWarning
+from Bio.PDB.StructureCache import save_structure, load_structure
+from Bio.PDB.StructureCache import load_arrays, load_metadata
+
+
+class StructureCacheTests(unittest.TestCase):
+    """Test writing and reading binary structure cache files."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def check_same(self, structure1, structure2):
+        """Compare all atoms, including the alternative locations."""
+        atoms1 = [a for r in structure1.get_residues()
+                  for a in r.get_unpacked_list()]
+        atoms2 = [a for r in structure2.get_residues()
+                  for a in r.get_unpacked_list()]
+        self.assertEqual(len(atoms1), len(atoms2))
+        for atom1, atom2 in zip(atoms1, atoms2):
+            self.assertEqual(atom1.get_full_id(), atom2.get_full_id())
+            self.assertEqual(atom1.fullname, atom2.fullname)
+            self.assertEqual(atom1.altloc, atom2.altloc)
+            self.assertEqual(atom1.element, atom2.element)
+            self.assertEqual(atom1.bfactor, atom2.bfactor)
+            self.assertEqual(atom1.occupancy, atom2.occupancy)
+            self.assertEqual(atom1.serial_number, atom2.serial_number)
+            self.assertTrue(numpy.array_equal(atom1.coord, atom2.coord))
+            self.assertEqual(atom1.coord.dtype, atom2.coord.dtype)
+            self.assertEqual(atom1.get_parent().resname,
+                             atom2.get_parent().resname)
+            self.assertEqual(atom1.get_parent().segid,
+                             atom2.get_parent().segid)
+        for model1, model2 in zip(structure1, structure2):
+            self.assertEqual(model1.serial_num, model2.serial_num)
+        self.assertEqual(structure1.header, structure2.header)
+
+    def roundtrip(self, structure):
+        filename = os.path.join(self.tmpdir, "test.bpdb")
+        save_structure(structure, filename)
+        return load_structure(filename)
+
+    def test_pdb(self):
+        """Round trip of PDB files, including disorder and multiple models."""
+        parser = PDBParser(QUIET=True)
+        for filename in ("PDB/1A8O.pdb", "PDB/2BEG.pdb",
+                         "PDB/a_structure.pdb", "PDB/occupancy.pdb"):
+            structure = parser.get_structure("test", filename)
+            self.check_same(structure, self.roundtrip(structure))
+
+    def test_mmcif(self):
+        """Round trip of mmCIF files, including anisotropic B factors."""
+        parser = MMCIFParser(QUIET=True)
+        for filename in ("PDB/1A8O.cif", "PDB/4ZHL.cif"):
+            structure = parser.get_structure("test", filename)
+            cached = self.roundtrip(structure)
+            self.check_same(structure, cached)
+            for atom1, atom2 in zip(structure.get_atoms(), cached.get_atoms()):
+                anisou1 = atom1.get_anisou()
+                anisou2 = atom2.get_anisou()
+                if anisou1 is None:
+                    self.assertIsNone(anisou2)
+                else:
+                    self.assertTrue(numpy.array_equal(anisou1, anisou2))
+
+    def test_arrays(self):
+        """Load a cache file as memory-mapped arrays."""
+        structure = PDBParser(QUIET=True).get_structure("1a8o", "PDB/1A8O.pdb")
+        filename = os.path.join(self.tmpdir, "test.bpdb")
+        save_structure(structure, filename)
+        info, arrays = load_arrays(filename)
+        atoms = list(structure.get_atoms())
+        self.assertEqual(info["id"], "1a8o")
+        self.assertEqual(arrays["coord"].shape, (len(atoms), 3))
+        self.assertEqual(arrays["name"][1], atoms[1].name)
+        self.assertTrue(numpy.array_equal(arrays["coord"][5], atoms[5].coord))
+        residues = list(structure.get_residues())
+        res_index = arrays["atom_residue"][-1]
+        self.assertEqual(arrays["res_resname"][res_index],
+                         residues[-1].resname)
+        self.assertEqual(arrays["res_resseq"][res_index], residues[-1].id[1])
+        self.assertEqual(load_metadata(filename)["arrays"], info["arrays"])
+
+    def test_not_a_cache_file(self):
+        self.assertRaises(ValueError, load_arrays, "PDB/1A8O.pdb")
+
+    def test_parser_cache(self):
+        """Use the cache_dir option of the parsers."""
+        cache_dir = os.path.join(self.tmpdir, "cache")
+        for parser_class, filename in ((PDBParser, "PDB/1A8O.pdb"),
+                                       (MMCIFParser, "PDB/1A8O.cif"),
+                                       (FastMMCIFParser, "PDB/1A8O.cif")):
+            parser = parser_class(QUIET=True, cache_dir=cache_dir)
+            structure = parser.get_structure("first", filename)
+            count = len(os.listdir(cache_dir))
+            cached = parser.get_structure("second", filename)
+            self.assertEqual(len(os.listdir(cache_dir)), count)
+            self.assertEqual(cached.id, "second")
+            self.assertEqual(structure.id, "first")
+            structure.id = "second"
+            self.check_same(structure, cached)
+        self.assertEqual(len(os.listdir(cache_dir)), 3)
+
+    def test_parser_cache_trailer(self):
+        cache_dir = os.path.join(self.tmpdir, "cache")
+        parser = PDBParser(QUIET=True, cache_dir=cache_dir)
+        parser.get_structure("test", "PDB/1A8O.pdb")
+        trailer = parser.get_trailer()
+        header = parser.get_header()
+        parser = PDBParser(QUIET=True, cache_dir=cache_dir)
+        parser.get_structure("test", "PDB/1A8O.pdb")
+        self.assertEqual(parser.get_trailer(), trailer)
+        self.assertEqual(parser.get_header(), header)
+
+    def test_parser_cache_stale(self):
+        """Cache files are not used after the structure file changes."""
+        cache_dir = os.path.join(self.tmpdir, "cache")
+        filename = os.path.join(self.tmpdir, "test.pdb")
+        shutil.copy("PDB/1A8O.pdb", filename)
+        parser = PDBParser(QUIET=True, cache_dir=cache_dir)
+        structure = parser.get_structure("test", filename)
+        with open(filename) as handle:
+            lines = [line for line in handle
+                     if not line.startswith("HETATM")]
+        with open(filename, "w") as handle:
+            handle.writelines(lines)
+        # make sure the modification time changes as well as the size
+        os.utime(filename, (0, 0))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", PDBConstructionWarning)
+            changed = parser.get_structure("test", filename)
+        self.assertLess(len(list(changed.get_atoms())),
+                        len(list(structure.get_atoms())))
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -0,0 +1,163 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Unit tests for the Bio.PDB.bulkio module."""
+
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.PDB.")
+
+from Bio import BiopythonWarning
+from Bio._py3k import StringIO
+from Bio.PDB import PDBParser, MMCIFParser, PDBIO, MMCIFIO, Select
+from Bio.PDB.bulkio import BulkPDBIO, BulkMMCIFIO
+from Bio.PDB.StructureCache import save_structure, load_arrays
+
+
+class SelectCA(Select):
+    def accept_atom(self, atom):
+        return atom.get_name() == "CA"
+
+
+class BulkIOTests(unittest.TestCase):
+    """Compare the bulk writers with PDBIO and MMCIFIO."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.parser = PDBParser(QUIET=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, io, structure, *args, **kwargs):
+        handle = StringIO()
+        io.set_structure(structure)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", BiopythonWarning)
+            io.save(handle, *args, **kwargs)
+        return handle.getvalue()
+
+    def test_pdb(self):
+        """Write the same PDB files as PDBIO."""
+        for filename in ("PDB/1A8O.pdb", "PDB/2BEG.pdb", "PDB/occupancy.pdb"):
+            structure = self.parser.get_structure("test", filename)
+            for preserve in (False, True):
+                self.assertEqual(
+                    self.write(BulkPDBIO(), structure,
+                               preserve_atom_numbering=preserve),
+                    self.write(PDBIO(), structure,
+                               preserve_atom_numbering=preserve))
+
+    def test_pdb_disordered(self):
+        """Atoms with and without altloc in one DisorderedAtom."""
+        structure = self.parser.get_structure("test", "PDB/a_structure.pdb")
+        bulk = self.write(BulkPDBIO(), structure).splitlines()
+        lines = self.write(PDBIO(), structure).splitlines()
+        # The atom without altloc comes first, its serial number differs
+        self.assertEqual(bulk[25][16:], lines[26][16:])
+        self.assertEqual(bulk[26][16:], lines[25][16:])
+        del bulk[25:27], lines[25:27]
+        self.assertEqual(bulk, lines)
+
+    def test_pdb_mask(self):
+        """Use an atom mask instead of a Select object."""
+        structure = self.parser.get_structure("test", "PDB/2BEG.pdb")
+        io = BulkPDBIO()
+        io.set_structure(structure)
+        mask = io.arrays["name"] == "CA"
+        self.assertEqual(self.write(io, structure, mask=mask),
+                         self.write(PDBIO(), structure, SelectCA()))
+        self.assertRaises(ValueError, io.save, StringIO(), mask=mask[:10])
+
+    def test_pdb_arrays(self):
+        """Write from the arrays of a structure cache file."""
+        structure = self.parser.get_structure("test", "PDB/1A8O.pdb")
+        filename = os.path.join(self.tmpdir, "test.bpdb")
+        save_structure(structure, filename)
+        info, arrays = load_arrays(filename)
+        io = BulkPDBIO()
+        io.set_arrays(arrays, info["id"])
+        handle = StringIO()
+        io.save(handle)
+        self.assertEqual(handle.getvalue(), self.write(PDBIO(), structure))
+
+    def test_pdb_compressed(self):
+        structure = self.parser.get_structure("test", "PDB/1A8O.pdb")
+        filename = os.path.join(self.tmpdir, "test.pdb.gz")
+        io = BulkPDBIO()
+        io.set_structure(structure)
+        io.save(filename)
+        with gzip.open(filename, "rb") as handle:
+            data = handle.read().decode()
+        self.assertEqual(data, self.write(PDBIO(), structure))
+        self.assertRaises(ValueError, io.save, os.path.join(self.tmpdir, "x"),
+                          compression="zip")
+
+    def test_pdb_models(self):
+        """Write several sets of coordinates for the same atoms."""
+        structure = self.parser.get_structure("test", "PDB/1A8O.pdb")
+        io = BulkPDBIO()
+        io.set_structure(structure)
+        coords = io.arrays["coord"]
+        filename = os.path.join(self.tmpdir, "models.pdb")
+        io.save_models(filename, (coords + i for i in range(3)))
+        models = self.parser.get_structure("models", filename)
+        self.assertEqual(len(models), 3)
+        for i, model in enumerate(models):
+            self.assertEqual(model.serial_num, i + 1)
+            new = numpy.array([a.coord for a in model.get_atoms()])
+            self.assertTrue(numpy.allclose(new, coords + i, atol=1e-3))
+        self.assertRaises(ValueError, io.save_models, StringIO(),
+                          [coords[:10]])
+
+    def test_mmcif(self):
+        """Write the same _atom_site table as MMCIFIO."""
+        structures = [self.parser.get_structure("test", filename)
+                      for filename in ("PDB/1A8O.pdb", "PDB/2BEG.pdb")]
+        structures.append(MMCIFParser(QUIET=True).get_structure(
+            "4zhl", "PDB/4ZHL.cif"))
+        for structure in structures:
+            for preserve in (False, True):
+                self.assertEqual(
+                    self.write(BulkMMCIFIO(), structure,
+                               preserve_atom_numbering=preserve),
+                    self.write(MMCIFIO(), structure,
+                               preserve_atom_numbering=preserve))
+
+    def test_mmcif_mask(self):
+        structure = self.parser.get_structure("test", "PDB/2BEG.pdb")
+        io = BulkMMCIFIO()
+        io.set_structure(structure)
+        mask = io.arrays["name"] == "CA"
+        self.assertEqual(self.write(io, structure, mask=mask),
+                         self.write(MMCIFIO(), structure, SelectCA()))
+
+    def test_mmcif_models(self):
+        structure = self.parser.get_structure("test", "PDB/1A8O.pdb")
+        io = BulkMMCIFIO()
+        io.set_structure(structure)
+        coords = io.arrays["coord"]
+        filename = os.path.join(self.tmpdir, "models.cif.gz")
+        io.save_models(filename, (coords * (i + 1) for i in range(3)))
+        with gzip.open(filename, "rt") as handle:
+            models = MMCIFParser(QUIET=True).get_structure("models", handle)
+        self.assertEqual(len(models), 3)
+        for i, model in enumerate(models):
+            new = numpy.array([a.coord for a in model.get_atoms()])
+            self.assertTrue(numpy.allclose(new, coords * (i + 1), atol=1e-3))
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -0,0 +1,111 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Unit tests for BatchProteinAnalysis in Bio.SeqUtils.ProtParam."""
+
+import random
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use BatchProteinAnalysis.")
+
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+from Bio.SeqUtils.ProtParam import ProteinAnalysis, BatchProteinAnalysis
+from Bio.SeqUtils.ProtParam import analyse_proteins
+
+
+class BatchProtParamTest(unittest.TestCase):
+    """Compare BatchProteinAnalysis with ProteinAnalysis."""
+
+    def setUp(self):
+        rnd = random.Random(37)
+        self.sequences = ["".join(rnd.choice("ACDEFGHIKLMNPQRSTVWY")
+                                  for i in range(rnd.randint(1, 300)))
+                          for j in range(100)]
+        self.sequences.extend(["K", "D", "KKKKKRRRRR", "DDDDDEEEEE",
+                               "mkllv"])
+        self.batch = BatchProteinAnalysis(self.sequences)
+
+    def test_example(self):
+        batch = BatchProteinAnalysis(["MAEGEITTFTALTEKFNLPPGNYKKPKLLYCSNGG",
+                                      "HFLRILPDGTVDGTRDRSDQHIQLQLSAESVGEVY"])
+        self.assertEqual(batch.lengths.tolist(), [35, 35])
+        self.assertEqual(["%0.2f" % pi for pi in batch.isoelectric_point()],
+                         ["7.88", "4.86"])
+        table = batch.table(["length", "gravy", "instability_index"])
+        self.assertEqual(table.dtype.names,
+                         ("length", "gravy", "instability_index"))
+        self.assertEqual("%0.2f" % table["gravy"][0], "-0.45")
+
+    def test_descriptors(self):
+        batch = self.batch
+        pi = batch.isoelectric_point()
+        weights = batch.molecular_weight()
+        instability = batch.instability_index()
+        gravy = batch.gravy()
+        aromaticity = batch.aromaticity()
+        secondary = batch.secondary_structure_fraction()
+        extinction = batch.molar_extinction_coefficient()
+        for i, sequence in enumerate(self.sequences):
+            analysis = ProteinAnalysis(sequence)
+            self.assertEqual(batch.lengths[i], len(sequence))
+            self.assertEqual(pi[i], analysis.isoelectric_point())
+            self.assertAlmostEqual(weights[i], analysis.molecular_weight())
+            self.assertAlmostEqual(instability[i],
+                                   analysis.instability_index())
+            self.assertAlmostEqual(gravy[i], analysis.gravy())
+            self.assertAlmostEqual(aromaticity[i], analysis.aromaticity())
+            self.assertTrue(numpy.allclose(
+                secondary[i], analysis.secondary_structure_fraction()))
+            self.assertEqual(tuple(extinction[i]),
+                             analysis.molar_extinction_coefficient())
+
+    def test_monoisotopic(self):
+        batch = BatchProteinAnalysis(self.sequences[:5], monoisotopic=True)
+        for weight, sequence in zip(batch.molecular_weight(),
+                                    self.sequences):
+            analysis = ProteinAnalysis(sequence, monoisotopic=True)
+            self.assertAlmostEqual(weight, analysis.molecular_weight())
+
+    def test_unknown_letters(self):
+        """Values which cannot be calculated are NaN."""
+        batch = BatchProteinAnalysis(["ACXD", "", Seq("ACD"),
+                                      SeqRecord(Seq("ACD"))])
+        self.assertTrue(numpy.isnan(batch.gravy()[:2]).all())
+        self.assertTrue(numpy.isnan(batch.instability_index()[:2]).all())
+        self.assertTrue(numpy.isnan(batch.isoelectric_point()[1]))
+        self.assertFalse(numpy.isnan(batch.isoelectric_point()[0]))
+        self.assertEqual(batch.gravy()[2], batch.gravy()[3])
+
+    def test_table(self):
+        table = self.batch.table()
+        self.assertEqual(len(table), len(self.sequences))
+        self.assertEqual(table.dtype.names,
+                         tuple(name for name, dtype
+                               in BatchProteinAnalysis.descriptors))
+        self.assertTrue(numpy.array_equal(
+            table["turn"], self.batch.secondary_structure_fraction()[:, 1]))
+        self.assertTrue(numpy.array_equal(
+            table["extinction_cystines"],
+            self.batch.molar_extinction_coefficient()[:, 1]))
+        self.assertRaises(ValueError, self.batch.table, ["flexibility"])
+
+    def test_analyse_proteins(self):
+        tables = list(analyse_proteins(self.sequences, ["length", "gravy"],
+                                       chunksize=30))
+        self.assertEqual([len(table) for table in tables], [30, 30, 30, 15])
+        table = numpy.concatenate(tables)
+        self.assertTrue(numpy.array_equal(table["length"],
+                                          self.batch.lengths))
+        self.assertTrue(numpy.allclose(table["gravy"], self.batch.gravy()))
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
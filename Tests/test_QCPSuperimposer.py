@@ -17,6 +17,7 @@ except ImportError:
 
 try:
     from Bio.PDB.QCPSuperimposer import QCPSuperimposer
+    from Bio.PDB.QCPSuperimposer import superimpose_ensemble, rmsd_matrix
 except ImportError:
     from Bio import MissingExternalDependencyError
     raise MissingExternalDependencyError(
@@ -173,6 +174,72 @@ class QCPSuperimposerTest(unittest.TestCase):
             array_equal(around(y_on_x2, decimals=3), around(y_x_solution, decimals=3)))
 
 
+class QCPEnsembleTest(unittest.TestCase):
+
+    def setUp(self):
+        x = array([[51.65, -1.90, 50.07],
+                   [50.40, -1.23, 50.65],
+                   [50.68, -0.04, 51.54],
+                   [50.22, -0.02, 52.85]])
+        y = array([[51.30, -2.99, 46.54],
+                   [51.09, -1.88, 47.58],
+                   [52.36, -1.20, 48.03],
+                   [52.71, -1.18, 49.38]])
+        z = array([[1.1, 1.2, 1.3],
+                   [1.4, 1.5, 1.6],
+                   [1.7, 2.8, 1.9],
+                   [0.7, 1.8, 3.9]])
+        self.x = x
+        self.ensemble = array([x, y, z])
+
+    def test_superimpose_ensemble(self):
+        for threads in (1, 2):
+            rms, rot, tran = superimpose_ensemble(self.ensemble, self.x,
+                                                  threads=threads)
+            self.assertEqual(rms.shape, (3,))
+            self.assertEqual(rot.shape, (3, 3, 3))
+            self.assertEqual(tran.shape, (3, 3))
+            sup = QCPSuperimposer()
+            for i, coords in enumerate(self.ensemble):
+                sup.set(self.x, coords)
+                sup.run()
+                self.assertAlmostEqual(sup.get_rms(), rms[i], places=5)
+                self.assertTrue(array_equal(around(sup.rot, decimals=5),
+                                            around(rot[i], decimals=5)))
+                self.assertTrue(array_equal(around(sup.tran, decimals=5),
+                                            around(tran[i], decimals=5)))
+                self.assertTrue(array_equal(
+                    around(sup.get_transformed(), decimals=3),
+                    around(dot(coords, rot[i]) + tran[i], decimals=3)))
+
+    def test_rmsd_matrix(self):
+        rmsds = rmsd_matrix(self.ensemble)
+        self.assertEqual(rmsds.shape, (3, 3))
+        sup = QCPSuperimposer()
+        for i in range(3):
+            self.assertEqual(rmsds[i, i], 0.0)
+            for j in range(3):
+                sup.set(self.ensemble[j], self.ensemble[i])
+                sup.run()
+                self.assertAlmostEqual(sup.get_rms(), rmsds[i, j], places=5)
+        rmsds_threaded = rmsd_matrix(self.ensemble, threads=2)
+        self.assertTrue(array_equal(rmsds, rmsds_threaded))
+
+    def test_rmsd_matrix_references(self):
+        rmsds = rmsd_matrix(self.ensemble, self.ensemble[:2], threads=2)
+        self.assertEqual(rmsds.shape, (3, 2))
+        self.assertTrue(array_equal(around(rmsds, decimals=5),
+                                    around(rmsd_matrix(self.ensemble)[:, :2],
+                                           decimals=5)))
+
+    def test_mismatch(self):
+        self.assertRaises(ValueError, superimpose_ensemble,
+                          self.ensemble, self.x[:3])
+        self.assertRaises(ValueError, rmsd_matrix,
+                          self.ensemble, self.ensemble[:, :3])
+        self.assertRaises(ValueError, rmsd_matrix, self.x)
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
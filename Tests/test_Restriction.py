@@ -484,6 +484,25 @@ class RestrictionBatches(unittest.TestCase):
         search = seq / NonComm
         self.assertEqual(search[McrI], [28])
 
+    def test_search_batch_same_as_enzymes(self):
+        """Test batch search gives the same sites as each enzyme alone."""
+        import random
+        rnd = random.Random(34)
+        for letters in ("ACGT", "ACGTACGTACGTNRY"):
+            seq = Seq("".join(rnd.choice(letters) for i in range(3000)),
+                      IUPACAmbiguousDNA())
+            for linear in (True, False):
+                batch = RestrictionBatch(AllEnzymes)
+                search = batch.search(seq, linear)
+                for enzyme in batch:
+                    self.assertEqual(search[enzyme],
+                                     enzyme.search(seq, linear), enzyme)
+        # Sequences shorter than the recognition sites
+        for seq in ("GAATT", "A"):
+            seq = Seq(seq, IUPACAmbiguousDNA())
+            search = RestrictionBatch(AllEnzymes).search(seq, linear=False)
+            self.assertEqual(search[EcoRI], EcoRI.search(seq, linear=False))
+
     def test_analysis_restrictions(self):
         """Test Fancier restriction analysis."""
         new_seq = Seq('TTCAAAAAAAAAAAAAAAAAAAAAAAAAAAAGAA',
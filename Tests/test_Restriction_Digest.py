@@ -0,0 +1,99 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Unit tests for the Bio.Restriction.Digest module."""
+
+import random
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.Restriction.Digest.")
+
+from Bio.Alphabet.IUPAC import IUPACAmbiguousDNA
+from Bio.Restriction import RestrictionBatch, CommOnly
+from Bio.Restriction import EcoRI, MseI, PstI, SphI, BsmBI
+from Bio.Restriction.Digest import Digest
+from Bio.Seq import Seq
+
+
+class DigestTests(unittest.TestCase):
+    """Compare the fragments with those from catalyse."""
+
+    def setUp(self):
+        rnd = random.Random(35)
+        self.seq = Seq("".join(rnd.choice("ACGT") for i in range(5000)),
+                       IUPACAmbiguousDNA())
+        self.batch = RestrictionBatch([EcoRI, MseI, PstI, SphI, BsmBI])
+
+    def check_catalyse(self, linear):
+        digest = Digest(self.batch, self.seq, linear)
+        for enzyme in self.batch:
+            fragments = enzyme.catalyse(self.seq, linear)
+            starts, ends = digest.fragments(enzyme)
+            self.assertEqual(list(ends - starts),
+                             [len(f) for f in fragments])
+            double = self.seq + self.seq
+            self.assertEqual([str(double[s:e]) for s, e in zip(starts, ends)],
+                             [str(f) for f in fragments])
+
+    def test_linear(self):
+        self.check_catalyse(True)
+
+    def test_circular(self):
+        self.check_catalyse(False)
+
+    def test_double_digest(self):
+        """Cut positions of several enzymes are merged."""
+        for linear in (True, False):
+            digest = Digest(self.batch, self.seq, linear)
+            cuts = sorted(set(EcoRI.search(self.seq, linear) +
+                              MseI.search(self.seq, linear)))
+            self.assertEqual(list(digest.cuts([EcoRI, MseI]) + 1), cuts)
+            lengths = digest.lengths([EcoRI, MseI])
+            self.assertEqual(lengths.sum(), len(self.seq))
+            left, right = digest.end_enzymes([EcoRI, MseI])
+            self.assertEqual(len(left), len(lengths))
+            starts, ends = digest.fragments([EcoRI, MseI])
+            eco = set(EcoRI.search(self.seq, linear))
+            for start, index in zip(starts, left):
+                if index == 0:
+                    self.assertIn(start + 1, eco)
+                elif index == 1:
+                    self.assertNotIn(start + 1, eco)
+                else:
+                    self.assertEqual(start, 0)
+            self.assertTrue(numpy.array_equal(numpy.roll(right, 1)[1:],
+                                              left[1:]))
+
+    def test_no_cuts(self):
+        seq = Seq("A" * 100, IUPACAmbiguousDNA())
+        for linear in (True, False):
+            digest = Digest(self.batch, seq, linear)
+            starts, ends = digest.fragments(list(self.batch))
+            self.assertEqual(list(starts), [0])
+            self.assertEqual(list(ends), [100])
+            left, right = digest.end_enzymes(EcoRI)
+            self.assertEqual(list(left), [-1])
+
+    def test_combinations(self):
+        digest = Digest(self.batch, self.seq)
+        combinations = list(digest.combinations(2))
+        self.assertEqual(len(combinations), 10)
+        for enzymes, starts, ends in combinations:
+            self.assertEqual(len(enzymes), 2)
+            self.assertTrue(numpy.array_equal(
+                ends - starts, digest.lengths(enzymes)))
+        combinations = list(digest.combinations(3, [EcoRI, MseI, PstI]))
+        self.assertEqual(len(combinations), 1)
+        self.assertEqual(combinations[0][0], (EcoRI, MseI, PstI))
+        self.assertRaises(ValueError, digest.lengths, CommOnly.get("AluI"))
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
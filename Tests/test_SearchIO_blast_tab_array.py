@@ -0,0 +1,146 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Tests for the columnar BLAST tabular parser."""
+
+import os
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use "
+        "Bio.SearchIO.BlastIO.blast_tab_array.")
+
+from Bio import SearchIO
+from Bio.SearchIO.BlastIO import blast_tab_array
+
+from search_tests_common import compare_search_obj
+
+
+TEST_DIR = 'Blast'
+
+# (filename, comments, fields)
+FILES = [
+    ('tab_2226_tblastn_001.txt', False, None),
+    ('tab_2226_tblastn_002.txt', False, None),
+    ('tab_2226_tblastn_003.txt', False, None),
+    ('tab_2226_tblastn_004.txt', False, None),
+    ('tab_2226_tblastn_005.txt', True, None),
+    ('tab_2226_tblastn_006.txt', True, None),
+    ('tab_2226_tblastn_007.txt', True, None),
+    ('tab_2226_tblastn_008.txt', True, None),
+    ('tab_2226_tblastn_009.txt', False, 'qseqid sseqid'),
+    ('tab_2226_tblastn_010.txt', True, None),
+    ('tab_2226_tblastn_011.txt', True, None),
+    ('tab_2226_tblastn_012.txt', True, None),
+    ('tab_2226_tblastn_013.txt', False, 'qseq std sseq'),
+    ('tab_2228_tblastn_001.txt', True, None),
+    ('tab_2228_tblastx_001.txt', True, None),
+]
+
+
+def _parse(filename, comments, fields, chunksize=100000):
+    kwargs = {'comments': comments, 'chunksize': chunksize}
+    if fields:
+        kwargs['fields'] = fields
+    return list(blast_tab_array.parse(filename, **kwargs))
+
+
+class BlastTabArrayCases(unittest.TestCase):
+
+    def test_same_as_parser(self):
+        """Same QueryResult objects as from SearchIO.parse, with hits."""
+        for filename, comments, fields in FILES:
+            filename = os.path.join(TEST_DIR, filename)
+            kwargs = {'comments': comments}
+            if fields:
+                kwargs['fields'] = fields
+            expected = [qresult for qresult in
+                        SearchIO.parse(filename, 'blast-tab', **kwargs)
+                        if qresult]
+            for chunksize in (1, 3, 100000):
+                chunks = _parse(filename, comments, fields, chunksize)
+                qresults = [qresult for chunk in chunks
+                            for qresult in chunk.to_qresults()]
+                self.assertEqual(len(expected), len(qresults), filename)
+                for qres1, qres2 in zip(expected, qresults):
+                    self.assertTrue(compare_search_obj(qres1, qres2))
+                    if comments:
+                        for attr in ('program', 'version', 'target',
+                                     'description'):
+                            self.assertEqual(getattr(qres1, attr, None),
+                                             getattr(qres2, attr, None))
+
+    def test_chunks(self):
+        filename = os.path.join(TEST_DIR, 'tab_2226_tblastn_010.txt')
+        table = blast_tab_array.read(filename, comments=True)
+        chunks = _parse(filename, True, None, chunksize=2)
+        self.assertEqual(sum(len(chunk) for chunk in chunks), len(table))
+        query_ids = []
+        for chunk in chunks:
+            self.assertTrue(len(chunk) >= 2 or chunk is chunks[-1])
+            query_ids.extend(chunk.query_ids())
+        # no query is split over chunks
+        self.assertEqual(query_ids, table.query_ids())
+        self.assertEqual(len(set(query_ids)), len(query_ids))
+
+    def test_columns(self):
+        filename = os.path.join(TEST_DIR, 'tab_2226_tblastn_013.txt')
+        table = blast_tab_array.read(filename, fields='qseq std sseq')
+        self.assertEqual(table.fields[0], 'qseq')
+        self.assertEqual(table["qstart"].dtype, numpy.int64)
+        self.assertEqual(table["pident"].dtype, numpy.float64)
+        self.assertEqual(table["sseq"].dtype.kind, "U")
+        records = table.to_records()
+        self.assertEqual(records.dtype.names, tuple(table.fields))
+        self.assertEqual(records.qstart.tolist(), table["qstart"].tolist())
+        self.assertRaises(KeyError, table.__getitem__, "staxids")
+        empty = blast_tab_array.read(
+            os.path.join(TEST_DIR, 'tab_2226_tblastn_002.txt'))
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(empty["evalue"].dtype, numpy.float64)
+        self.assertEqual(empty.query_ids(), [])
+        self.assertEqual(len(empty.best_hits()), 0)
+        self.assertEqual(list(empty.to_qresults()), [])
+
+    def test_filter_and_best_hits(self):
+        filename = os.path.join(TEST_DIR, 'tab_2226_tblastn_001.txt')
+        table = blast_tab_array.read(filename)
+        qresults = list(SearchIO.parse(filename, 'blast-tab'))
+        hsps = [hsp for qresult in qresults for hsp in qresult.hsps]
+        expected = [hsp.hit_id for hsp in hsps
+                    if hsp.evalue <= 1e-5 and hsp.bitscore >= 40 and
+                    hsp.ident_pct >= 50 and hsp.aln_span >= 50]
+        filtered = table.filter(max_evalue=1e-5, min_bitscore=40,
+                                min_pident=50, min_length=50)
+        self.assertEqual(filtered["sseqid"].tolist(), expected)
+        self.assertEqual(len(table[table["evalue"] < 1e-5]),
+                         len([hsp for hsp in hsps if hsp.evalue < 1e-5]))
+
+        best = table.best_hits()
+        self.assertEqual(best.query_ids(), table.query_ids())
+        for qresult, bitscore in zip(qresults, best["bitscore"]):
+            self.assertEqual(max(hsp.bitscore for hsp in qresult.hsps),
+                             bitscore)
+        best = table.best_hits(by="evalue")
+        for qresult, evalue in zip(qresults, best["evalue"]):
+            self.assertEqual(min(hsp.evalue for hsp in qresult.hsps), evalue)
+        self.assertRaises(ValueError, table.best_hits, by="pident")
+
+    def test_errors(self):
+        filename = os.path.join(TEST_DIR, 'tab_2226_tblastn_005.txt')
+        self.assertRaises(ValueError, blast_tab_array.read, filename)
+        filename = os.path.join(TEST_DIR, 'tab_2226_tblastn_001.txt')
+        self.assertRaises(ValueError, blast_tab_array.read, filename,
+                          fields='qseqid sseqid evalue')
+        self.assertRaises(ValueError, blast_tab_array.read, filename,
+                          fields='qseqid evalue')
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
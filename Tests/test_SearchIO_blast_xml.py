@@ -3216,6 +3216,26 @@ class BlastXmlSpecialCases(unittest.TestCase):
         self.assertEqual(qresult.description, 'gi|347972582|ref|XM_309352.4| Anopheles gambiae str. PEST AGAP011294-PA (DEFI_ANOGA) mRNA, complete cds')
         self.assertEqual(qresult.blast_id, 'Query_1')
 
+    def test_xml_2226_blastp_004_no_alignments(self):
+        xml_file = get_file('xml_2226_blastp_004.xml')
+        full = list(parse(xml_file, FMT))
+        qresults = list(parse(xml_file, FMT, alignments=False))
+        self.assertEqual(len(full), len(qresults))
+        for qres1, qres2 in zip(full, qresults):
+            self.assertEqual(qres1.id, qres2.id)
+            self.assertEqual(qres1.hit_keys, qres2.hit_keys)
+            self.assertEqual(qres1.stat_kappa, qres2.stat_kappa)
+            for hsp1, hsp2 in zip(qres1.hsps, qres2.hsps):
+                self.assertEqual(hsp1.evalue, hsp2.evalue)
+                self.assertEqual(hsp1.query_range, hsp2.query_range)
+                self.assertEqual(hsp1.hit_range, hsp2.hit_range)
+                self.assertEqual(hsp1.aln_span, hsp2.aln_span)
+                self.assertTrue(hsp1.query is not None)
+                self.assertTrue('similarity' in hsp1.aln_annotation)
+                self.assertEqual(hsp2.query, None)
+                self.assertEqual(hsp2.hit, None)
+                self.assertEqual(hsp2.aln_annotation, {})
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
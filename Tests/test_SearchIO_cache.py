@@ -0,0 +1,121 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Tests for the SearchIO binary cache format, searchio-cache."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from io import BytesIO
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SearchIO.CacheIO.")
+
+from Bio import SearchIO
+
+from search_tests_common import compare_search_obj
+
+
+# (filename, format, keyword arguments)
+FILES = [
+    ('Blast/mirna.xml', 'blast-xml', {}),
+    ('Blast/xml_2226_blastp_004.xml', 'blast-xml', {}),
+    ('Blast/text_2226_tblastn_001.txt', 'blast-text', {}),
+    ('Blast/tab_2226_tblastn_005.txt', 'blast-tab', {'comments': True}),
+    ('Hmmer/text_30_hmmscan_001.out', 'hmmer3-text', {}),
+    ('Hmmer/text_21_hmmpfam_001.out', 'hmmer2-text', {}),
+    ('Hmmer/domtab_30_hmmscan_001.out', 'hmmscan3-domtab', {}),
+    ('Blat/pslx_34_004.pslx', 'blat-psl', {'pslx': True}),
+    ('Exonerate/exn_22_m_genome2genome.exn', 'exonerate-text', {}),
+    ('Exonerate/exn_22_o_vulgar_fshifts2.exn', 'exonerate-vulgar', {}),
+    ('Fasta/output002.m10', 'fasta-m10', {}),
+]
+
+
+class SearchCacheCases(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.temp_dir, 'results.searchio')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_roundtrip(self):
+        for filename, format, kwargs in FILES:
+            expected = list(SearchIO.parse(filename, format, **kwargs))
+            self.assertTrue(expected, filename)
+            counts = SearchIO.write(expected, self.filename, 'searchio-cache')
+            self.assertEqual(counts[0], len(expected))
+            self.assertEqual(counts[3], sum(len(qresult.fragments)
+                                            for qresult in expected))
+            qresults = list(SearchIO.parse(self.filename, 'searchio-cache'))
+            self.assertEqual(len(expected), len(qresults), filename)
+            for qres1, qres2 in zip(expected, qresults):
+                self.assertTrue(compare_search_obj(qres1, qres2))
+                self.assertEqual(qres1.hit_keys, qres2.hit_keys)
+
+    def test_no_alignments(self):
+        expected = list(SearchIO.parse('Blast/mirna.xml', 'blast-xml'))
+        handle = BytesIO()
+        SearchIO.write(expected, handle, 'searchio-cache')
+        size = len(handle.getvalue())
+        handle = BytesIO()
+        SearchIO.write(expected, handle, 'searchio-cache', alignments=False)
+        self.assertTrue(len(handle.getvalue()) < size)
+        handle.seek(0)
+        qresults = list(SearchIO.parse(handle, 'searchio-cache'))
+        for qres1, qres2 in zip(expected, qresults):
+            self.assertEqual(qres1.hit_keys, qres2.hit_keys)
+            for frag1, frag2 in zip(qres1.fragments, qres2.fragments):
+                self.assertEqual(frag1.query_range, frag2.query_range)
+                self.assertEqual(frag1.hit_range, frag2.hit_range)
+                self.assertEqual(frag1.alphabet, frag2.alphabet)
+                self.assertEqual(frag2.query, None)
+                self.assertEqual(frag2.hit, None)
+                self.assertEqual(frag2.aln_annotation, {})
+            for hsp1, hsp2 in zip(qres1.hsps, qres2.hsps):
+                self.assertEqual(hsp1.evalue, hsp2.evalue)
+                self.assertEqual(hsp1.bitscore, hsp2.bitscore)
+
+    def test_index(self):
+        filename = 'Hmmer/text_30_hmmscan_001.out'
+        expected = list(SearchIO.parse(filename, 'hmmer3-text'))
+        SearchIO.write(expected, self.filename, 'searchio-cache')
+        index = SearchIO.index(self.filename, 'searchio-cache')
+        self.assertEqual(list(index), [qresult.id for qresult in expected])
+        for qresult in reversed(expected):
+            self.assertTrue(compare_search_obj(qresult, index[qresult.id]))
+            raw = index.get_raw(qresult.id)
+            self.assertEqual(raw[:1], b"Q")
+        index.close()
+        db_filename = os.path.join(self.temp_dir, 'results.idx')
+        index = SearchIO.index_db(db_filename, self.filename,
+                                  'searchio-cache')
+        self.assertEqual(len(index), len(expected))
+        self.assertTrue(compare_search_obj(expected[1], index[expected[1].id]))
+        index.close()
+
+    def test_empty(self):
+        handle = BytesIO()
+        self.assertEqual(SearchIO.write([], handle, 'searchio-cache'),
+                         (0, 0, 0, 0))
+        handle.seek(0)
+        self.assertEqual(list(SearchIO.parse(handle, 'searchio-cache')), [])
+
+    def test_errors(self):
+        self.assertRaises(ValueError, list,
+                          SearchIO.parse('Blast/mirna.xml', 'searchio-cache'))
+        self.assertRaises(ValueError, SearchIO.index, 'Blast/mirna.xml',
+                          'searchio-cache')
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
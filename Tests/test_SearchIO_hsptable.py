@@ -0,0 +1,179 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Tests for the Bio.SearchIO.hsptable module."""
+
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SearchIO.hsptable.")
+
+from Bio import SearchIO
+from Bio.SearchIO import HSPFragment, HSP, Hit, QueryResult
+
+
+# (filename, format)
+FILES = [
+    ('Blast/mirna.xml', 'blast-xml'),
+    ('Blast/tab_2226_tblastn_001.txt', 'blast-tab'),
+    ('Hmmer/domtab_30_hmmscan_001.out', 'hmmscan3-domtab'),
+    ('Hmmer/text_30_hmmscan_001.out', 'hmmer3-text'),
+    ('Blat/psl_34_004.psl', 'blat-psl'),
+    ('Exonerate/exn_22_m_affine_local.exn', 'exonerate-text'),
+]
+
+
+def _make_qresult(rows):
+    """Return a QueryResult of HSPs from (hit ID, query and hit ranges, strand)."""
+    hits = []
+    for hit_id, query_range, hit_range, strand in rows:
+        frag = HSPFragment(hit_id, 'query')
+        frag.query_start, frag.query_end = query_range
+        frag.hit_start, frag.hit_end = hit_range
+        frag.query_strand = 1
+        frag.hit_strand = strand
+        hsp = HSP([frag])
+        if hits and hits[-1].id == hit_id:
+            hits[-1].append(hsp)
+        else:
+            hits.append(Hit([hsp]))
+    return QueryResult(hits, 'query')
+
+
+def _covered(ranges):
+    """Return the number of positions in the union of the ranges."""
+    positions = set()
+    for start, end in ranges:
+        positions.update(range(start, end))
+    return len(positions)
+
+
+class HSPTableCases(unittest.TestCase):
+
+    def test_columns(self):
+        for filename, format in FILES:
+            for qresult in SearchIO.parse(filename, format):
+                table = qresult.hsp_table()
+                hsps = qresult.hsps
+                self.assertEqual(len(table), len(hsps))
+                self.assertEqual(table.hsps, hsps)
+                self.assertEqual(table.hit_ids(), qresult.hit_keys)
+                self.assertEqual(table["hit_id"].tolist(),
+                                 [hsp.hit_id for hsp in hsps])
+                for attr in table.attributes[2:]:
+                    for hsp, value in zip(hsps, table[attr].tolist()):
+                        try:
+                            expected = getattr(hsp, attr, None)
+                        except ValueError:
+                            # HSP with several fragments
+                            expected = getattr(hsp, attr + '_all')[0]
+                        if expected is None:
+                            self.assertTrue(numpy.isnan(value))
+                        else:
+                            self.assertEqual(expected, value, attr)
+                records = table.to_records()
+                self.assertEqual(records.dtype.names, tuple(table.attributes))
+
+    def test_coverage(self):
+        for filename, format in FILES:
+            for qresult in SearchIO.parse(filename, format):
+                table = qresult.hsp_table()
+                self.assertEqual(table.query_coverage(),
+                                 _covered(hsp.query_range
+                                          for hsp in qresult.hsps))
+                self.assertEqual(table.query_coverage(per_hit=True).tolist(),
+                                 [_covered(hsp.query_range for hsp in hit)
+                                  for hit in qresult])
+                self.assertEqual(table.hit_coverage().tolist(),
+                                 [_covered(hsp.hit_range for hsp in hit)
+                                  for hit in qresult])
+                # a selection of the rows
+                rows = table[::2]
+                self.assertEqual(rows.query_coverage(),
+                                 _covered(hsp.query_range
+                                          for hsp in qresult.hsps[::2]))
+                self.assertEqual(len(rows.query_coverage(per_hit=True)),
+                                 len(rows.hit_ids()))
+        empty = QueryResult(id='query').hsp_table()
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(empty.query_coverage(), 0)
+        self.assertEqual(len(empty.chains()), 0)
+
+    def test_best_and_sort(self):
+        qresult = next(SearchIO.parse('Blast/mirna.xml', 'blast-xml'))
+        table = qresult.hsp_table()
+        best = table.best_hsps()
+        self.assertEqual(best.hsps,
+                         [max(hit, key=lambda hsp: (hsp.bitscore, -hsp.evalue))
+                          for hit in qresult])
+        best = table.best_hsps(by="evalue")
+        self.assertEqual(best.hsps,
+                         [min(hit, key=lambda hsp: (hsp.evalue, -hsp.bitscore))
+                          for hit in qresult])
+        self.assertRaises(ValueError, table.best_hsps, by="aln_span")
+
+        hsps = qresult.hsps
+        self.assertEqual(table.sort("evalue").hsps,
+                         sorted(hsps, key=lambda hsp: hsp.evalue))
+        self.assertEqual(table.sort("bitscore", reverse=True).hsps,
+                         sorted(hsps, key=lambda hsp: -hsp.bitscore))
+        self.assertEqual(table.sort(["hit_id", "aln_span"], True).hsps,
+                         sorted(hsps, key=lambda hsp: (hsp.hit_id,
+                                                       hsp.aln_span),
+                                reverse=True))
+        self.assertEqual(len(table[table["evalue"] < 1e-10]),
+                         len([hsp for hsp in hsps if hsp.evalue < 1e-10]))
+        self.assertRaises(KeyError, table.__getitem__, "bias")
+
+    def test_to_qresult(self):
+        qresults = SearchIO.parse('Hmmer/text_30_hmmscan_001.out',
+                                  'hmmer3-text')
+        qresult = [qresult for qresult in qresults if len(qresult) > 2][0]
+        table = qresult.hsp_table()
+        rows = table[table["evalue"] < 1e-5]
+        expected = qresult.hsp_filter(lambda hsp: hsp.evalue < 1e-5)
+        reduced = rows.to_qresult()
+        self.assertEqual(reduced.id, qresult.id)
+        self.assertEqual(reduced.hit_keys, expected.hit_keys)
+        self.assertEqual(reduced.hsps, expected.hsps)
+        self.assertEqual(reduced.program, qresult.program)
+        hit_table = qresult[0].hsp_table(["evalue", "bitscore"])
+        self.assertEqual(hit_table.attributes,
+                         ["hit_id", "hit_index", "evalue", "bitscore"])
+        self.assertRaises(ValueError, hit_table.to_qresult)
+        self.assertRaises(ValueError, qresult.hsp_table, ["hit_id"])
+
+    def test_chains(self):
+        qresult = _make_qresult([
+            ("a", (30, 40), (125, 140), 1),
+            ("a", (0, 10), (100, 110), 1),
+            ("a", (10, 20), (110, 120), 1),
+            ("a", (5, 15), (200, 210), 1),
+            ("b", (0, 10), (90, 100), -1),
+            ("b", (12, 20), (80, 88), -1),
+            ("b", (5, 8), (90, 99), 1),
+            ("c", (0, 10), (0, 10), 1),
+        ])
+        table = qresult.hsp_table()
+        self.assertEqual(table.chains().tolist(), [0, 1, 1, 1, 2, 3, 4, 5])
+        self.assertEqual(table.chains(max_gap=2).tolist(),
+                         [0, 1, 1, 1, 2, 2, 3, 4])
+        self.assertEqual(table.chains(max_gap=10).tolist(),
+                         [0, 0, 0, 0, 1, 1, 2, 3])
+        self.assertEqual(table[::-1].chains().tolist(),
+                         [0, 1, 2, 3, 4, 4, 4, 5])
+        # the HSPs of a hit need not be consecutive rows
+        self.assertEqual(table[[0, 4, 1, 5, 2]].chains().tolist(),
+                         [0, 1, 2, 3, 2])
+        self.assertEqual(table[[0, 4, 1, 5, 2]].query_coverage(True).tolist(),
+                         [30, 18])
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
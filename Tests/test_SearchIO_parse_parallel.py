@@ -0,0 +1,70 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Tests for Bio.SearchIO.parse_parallel."""
+
+import unittest
+
+from Bio import SearchIO
+
+from search_tests_common import compare_search_obj
+
+
+# (filename, format, keyword arguments)
+FILES = [
+    ('Blast/tab_2226_tblastn_001.txt', 'blast-tab', {}),
+    ('Blast/tab_2226_tblastn_005.txt', 'blast-tab', {'comments': True}),
+    ('Blast/wnts.xml', 'blast-xml', {}),
+    ('Blast/wnts.xml.bgz', 'blast-xml', {}),
+    ('Hmmer/domtab_30_hmmscan_001.out', 'hmmscan3-domtab', {}),
+    ('Hmmer/tab_30_hmmscan_001.out', 'hmmer3-tab', {}),
+    ('Hmmer/text_30_hmmscan_001.out', 'hmmer3-text', {}),
+    ('Blat/psl_34_001.psl', 'blat-psl', {}),
+    ('Blat/pslx_34_001.pslx', 'blat-psl', {'pslx': True}),
+    ('Exonerate/exn_22_m_affine_local.exn', 'exonerate-text', {}),
+]
+
+
+def hsp_count(qresult):
+    """Return the query ID and number of HSPs, in the worker processes."""
+    return qresult.id, len(qresult.hsps)
+
+
+class ParseParallelCases(unittest.TestCase):
+
+    def test_same_as_parse(self):
+        for filename, format, kwargs in FILES:
+            # parse does not read BGZF files, so use the uncompressed one
+            expected = list(SearchIO.parse(filename.replace('.bgz', ''),
+                                           format, **kwargs))
+            self.assertTrue(expected, filename)
+            for processes, chunksize in ((1, 100), (2, 1), (2, 100)):
+                qresults = list(SearchIO.parse_parallel(
+                    filename, format, processes=processes,
+                    chunksize=chunksize, **kwargs))
+                self.assertEqual(len(expected), len(qresults), filename)
+                for qres1, qres2 in zip(expected, qresults):
+                    self.assertTrue(compare_search_obj(qres1, qres2))
+
+    def test_function(self):
+        filename = 'Hmmer/domtab_30_hmmscan_001.out'
+        expected = [hsp_count(qresult) for qresult in
+                    SearchIO.parse(filename, 'hmmscan3-domtab')]
+        for processes in (1, 2):
+            counts = SearchIO.parse_parallel(filename, 'hmmscan3-domtab',
+                                             hsp_count, processes=processes,
+                                             chunksize=2)
+            self.assertEqual(list(counts), expected)
+
+    def test_errors(self):
+        with open('Blast/wnts.xml') as handle:
+            self.assertRaises(TypeError, list,
+                              SearchIO.parse_parallel(handle, 'blast-xml'))
+        self.assertRaises(ValueError, list,
+                          SearchIO.parse_parallel('Blast/wnts.xml', 'blast-text'))
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -0,0 +1,52 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Tests for grouping records with identical sequences, SeqIO.group_identical."""
+
+import unittest
+
+from Bio import SeqIO
+from Bio.Alphabet import generic_dna
+from Bio._py3k import StringIO
+
+
+class GroupIdentical(unittest.TestCase):
+    """Check grouping records with identical sequences."""
+
+    def setUp(self):
+        sequences = ["ACGT", "acgt", "GGCC", "ACGT", "T", "GGCC", "ACGT"]
+        self.handle_text = "".join(">seq%i description\n%s\n" % (i, seq)
+                                   for i, seq in enumerate(sequences))
+
+    def test_in_memory(self):
+        groups = list(SeqIO.group_identical(StringIO(self.handle_text),
+                                            "fasta"))
+        self.assertEqual(groups, [["seq0", "seq3", "seq6"], ["seq1"],
+                                  ["seq2", "seq5"], ["seq4"]])
+        groups = list(SeqIO.group_identical(StringIO(self.handle_text),
+                                            "fasta", ignore_case=True))
+        self.assertEqual(groups, [["seq0", "seq1", "seq3", "seq6"],
+                                  ["seq2", "seq5"], ["seq4"]])
+
+    def test_spilled(self):
+        for ignore_case in (False, True):
+            expected = list(SeqIO.group_identical(
+                StringIO(self.handle_text), "fasta", ignore_case=ignore_case))
+            groups = list(SeqIO.group_identical(
+                StringIO(self.handle_text), "fasta", ignore_case=ignore_case,
+                buffer_size=2, partitions=3))
+            self.assertEqual(sorted(groups), sorted(expected))
+
+    def test_generic_format(self):
+        handle = StringIO(self.handle_text)
+        expected = list(SeqIO.group_identical(handle, "fasta"))
+        handle = StringIO(self.handle_text)
+        groups = list(SeqIO.group_identical(handle, "fasta",
+                                            alphabet=generic_dna))
+        self.assertEqual(groups, expected)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -12,7 +12,7 @@ from Bio.Seq import Seq, MutableSeq
 from Bio.SeqRecord import SeqRecord
 from Bio.SeqUtils import GC, seq1, seq3, GC_skew
 from Bio.SeqUtils.lcc import lcc_simp, lcc_mult
-from Bio.SeqUtils.CheckSum import crc32, crc64, gcg, seguid
+from Bio.SeqUtils.CheckSum import crc32, crc64, gcg, seguid, checksums
 from Bio.SeqUtils.CodonUsage import CodonAdaptationIndex
 
 
@@ -136,6 +136,22 @@ class SeqUtilsTests(unittest.TestCase):
                            "1.98",
                            "0.00, 2.00, 1.99, 1.99, 2.00, 1.99, 1.97, 1.99, 1.99, 1.99, 1.96, 1.96, 1.96, 1.96")
 
+    def test_checksums(self):
+        sequences = [self.str_light_chain_one,
+                     Seq(self.str_light_chain_two, single_letter_alphabet),
+                     SeqRecord(Seq("acgtNNacgt"), id="test"),
+                     "", u"ACGT\xe9"]
+        expected = [(crc32(s), crc64(s), gcg(s), seguid(s))
+                    for s in [self.str_light_chain_one,
+                              self.str_light_chain_two,
+                              "acgtNNacgt", "", u"ACGT\xe9"]]
+        self.assertEqual(list(checksums(sequences)), expected)
+        self.assertEqual(list(checksums(sequences, "gcg")),
+                         [values[2] for values in expected])
+        self.assertEqual(list(checksums(sequences, ["seguid", "crc64"])),
+                         [(values[3], values[1]) for values in expected])
+        self.assertRaises(ValueError, list, checksums(sequences, "md5"))
+
     def test_GC(self):
         seq = "ACGGGCTACCGTATAGGCAAGAGATGATGCCC"
         self.assertEqual(GC(seq), 56.25)
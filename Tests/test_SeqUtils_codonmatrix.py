@@ -0,0 +1,110 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Unit tests for the Bio.SeqUtils.codonmatrix module."""
+
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SeqUtils.codonmatrix.")
+
+from Bio import SeqIO
+from Bio.SeqRecord import SeqRecord
+from Bio.SeqUtils.CodonUsage import CodonAdaptationIndex, SynonymousCodons
+from Bio.SeqUtils import codonmatrix
+
+
+class CodonMatrixTests(unittest.TestCase):
+    """Compare with CodonAdaptationIndex on the CDS of a plasmid."""
+
+    def setUp(self):
+        record = SeqIO.read("GenBank/NC_005816.gb", "genbank")
+        self.records = [SeqRecord(feature.extract(record.seq), id="cds")
+                        for feature in record.features
+                        if feature.type == "CDS"]
+        self.counts = codonmatrix.count_codons(self.records)
+
+    def test_count_codons(self):
+        self.assertEqual(self.counts.shape, (len(self.records), 64))
+        for record, row in zip(self.records, self.counts):
+            sequence = str(record.seq)
+            for codon, count in zip(codonmatrix.CODONS, row):
+                self.assertEqual(count, sum(
+                    1 for i in range(0, len(sequence) - 2, 3)
+                    if sequence[i:i + 3] == codon))
+        chunked = codonmatrix.count_codons(self.records, chunksize=100)
+        self.assertTrue(numpy.array_equal(chunked, self.counts))
+        counts = codonmatrix.count_codons(["atgNNNATGa", ""])
+        self.assertEqual(counts.sum(axis=1).tolist(), [2, 0])
+        self.assertEqual(codonmatrix.count_codons([]).shape, (0, 64))
+
+    def test_cai(self):
+        """Same index and CAI values as CodonAdaptationIndex."""
+        handle, filename = tempfile.mkstemp(suffix=".fasta")
+        os.close(handle)
+        try:
+            SeqIO.write(self.records, filename, "fasta")
+            generated = CodonAdaptationIndex()
+            generated.generate_index(filename)
+        finally:
+            os.remove(filename)
+        index = codonmatrix.relative_adaptiveness(self.counts)
+        self.assertEqual(sorted(index), sorted(generated.index))
+        for codon in index:
+            self.assertAlmostEqual(index[codon], generated.index[codon])
+        default = CodonAdaptationIndex()
+        for record, value, ecoli_value in zip(
+                self.records, codonmatrix.cai(self.counts, index),
+                codonmatrix.cai(self.counts)):
+            self.assertAlmostEqual(value,
+                                   generated.cai_for_gene(str(record.seq)))
+            self.assertAlmostEqual(ecoli_value,
+                                   default.cai_for_gene(str(record.seq)))
+
+    def test_rscu(self):
+        values = codonmatrix.rscu(self.counts)
+        self.assertEqual(values.shape, self.counts.shape)
+        for codons in SynonymousCodons.values():
+            columns = [codonmatrix.CODONS.index(codon) for codon in codons]
+            totals = values[:, columns].sum(axis=1)
+            used = self.counts[:, columns].sum(axis=1) > 0
+            self.assertTrue(numpy.allclose(totals[used], len(codons)))
+            self.assertTrue(numpy.isnan(totals[~used]).all())
+
+    def test_enc(self):
+        # A single codon for each amino acid gives the minimum of 20
+        gene = "".join(codons[0] * 3 for aa, codons
+                       in sorted(SynonymousCodons.items()) if aa != "STOP")
+        self.assertAlmostEqual(codonmatrix.enc(
+            codonmatrix.count_codons([gene]))[0], 20.0)
+        # All codons used equally often gives the maximum of 61
+        gene = "".join(codon * 10 for codon in codonmatrix.CODONS)
+        self.assertEqual(codonmatrix.enc(
+            codonmatrix.count_codons([gene]))[0], 61.0)
+        values = codonmatrix.enc(self.counts)
+        self.assertEqual(len(values), len(self.records))
+        used = ~numpy.isnan(values)
+        self.assertTrue(used.any())
+        self.assertTrue(((values[used] >= 20) & (values[used] <= 61)).all())
+
+    def test_enc_single(self):
+        values = codonmatrix.enc(self.counts)
+        for row, expected in zip(self.counts, values):
+            value = codonmatrix.enc(row)
+            self.assertEqual(numpy.ndim(value), 0)
+            if numpy.isnan(expected):
+                self.assertTrue(numpy.isnan(value))
+            else:
+                self.assertAlmostEqual(value, expected)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
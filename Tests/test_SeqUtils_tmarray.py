@@ -0,0 +1,160 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Unit tests for the Bio.SeqUtils.tmarray module."""
+
+import random
+import unittest
+import warnings
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SeqUtils.tmarray.")
+
+from Bio import BiopythonWarning
+from Bio.Seq import Seq
+from Bio.SeqUtils import MeltingTemp as mt
+from Bio.SeqUtils import tmarray
+
+
+class TmArrayTests(unittest.TestCase):
+    """Compare with the functions in Bio.SeqUtils.MeltingTemp."""
+
+    def setUp(self):
+        rnd = random.Random(42)
+        self.sequences = ["".join(rnd.choice("ACGT")
+                                  for i in range(rnd.randint(2, 40)))
+                          for j in range(100)]
+        self.sequences.extend(["AAAATTTT", "GATC", Seq("acgu ugca"),
+                               "ACGTIACGT", "1ACGT2TGCA3ATGC4CGTA"])
+
+    def assertSame(self, expected, values):
+        self.assertEqual(len(expected), len(values))
+        for expected_value, value in zip(expected, values):
+            self.assertAlmostEqual(expected_value, value)
+
+    def test_Tm_Wallace(self):
+        self.assertSame([mt.Tm_Wallace(s) for s in self.sequences],
+                        tmarray.Tm_Wallace(self.sequences))
+        ambiguous = ["ACGTNNRYSWKMBDHV", "ACGT"]
+        self.assertSame([mt.Tm_Wallace(s, strict=False) for s in ambiguous],
+                        tmarray.Tm_Wallace(ambiguous, strict=False))
+        self.assertRaises(ValueError, tmarray.Tm_Wallace, ambiguous)
+
+    def test_Tm_GC(self):
+        for valueset in range(1, 9):
+            for saltcorr in (0, 1, 2, 3, 4, 6, 7):
+                self.assertSame(
+                    [mt.Tm_GC(s, valueset=valueset, saltcorr=saltcorr,
+                              Mg=1.5) for s in self.sequences],
+                    tmarray.Tm_GC(self.sequences, valueset=valueset,
+                                  saltcorr=saltcorr, Mg=1.5))
+        self.assertSame(
+            [mt.Tm_GC(s, userset=(70, 0.5, 600, 1)) for s in self.sequences],
+            tmarray.Tm_GC(self.sequences, userset=(70, 0.5, 600, 1)))
+        ambiguous = ["ACGTNNRYSWKMBDHVX", "CTGCTGATXGCACGAGGTTATGG"]
+        self.assertSame([mt.Tm_GC(s, strict=False) for s in ambiguous],
+                        tmarray.Tm_GC(ambiguous, strict=False))
+        self.assertRaises(ValueError, tmarray.Tm_GC, ambiguous)
+        self.assertRaises(ValueError, tmarray.Tm_GC, ["ACGT"], saltcorr=5)
+        self.assertRaises(ValueError, tmarray.Tm_GC, ["ACGT"], valueset=9)
+
+    def test_Tm_NN(self):
+        tables = (mt.DNA_NN1, mt.DNA_NN2, mt.DNA_NN3, mt.DNA_NN4,
+                  mt.RNA_NN1, mt.RNA_NN2, mt.RNA_NN3, mt.R_DNA_NN1)
+        for nn_table in tables:
+            for saltcorr in range(8):
+                self.assertSame(
+                    [mt.Tm_NN(s, nn_table=nn_table, saltcorr=saltcorr)
+                     for s in self.sequences],
+                    tmarray.Tm_NN(self.sequences, nn_table=nn_table,
+                                  saltcorr=saltcorr))
+        arguments = {"Na": 50, "Tris": 10, "Mg": 1.5, "dNTPs": 0.6,
+                     "dnac1": 100, "dnac2": 10, "selfcomp": True}
+        for saltcorr in range(8):
+            self.assertSame(
+                [mt.Tm_NN(s, saltcorr=saltcorr, **arguments)
+                 for s in self.sequences],
+                tmarray.Tm_NN(self.sequences, saltcorr=saltcorr,
+                              **arguments))
+
+    def test_Tm_NN_missing_data(self):
+        values = tmarray.Tm_NN(["", "ACGT", ""])
+        self.assertTrue(numpy.isnan(values[[0, 2]]).all())
+        self.assertAlmostEqual(values[1], mt.Tm_NN("ACGT"))
+        with self.assertRaises(ValueError) as cm:
+            tmarray.Tm_NN(["ACGT", "GGIICC"])
+        self.assertEqual(str(cm.exception),
+                         "no thermodynamic data for neighbors 'II/II' "
+                         "available")
+        self.assertRaises(ValueError, tmarray.Tm_NN, ["ACGTN"], check=False)
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always", BiopythonWarning)
+            tmarray.Tm_NN(["ACGTN"], check=False, strict=False)
+        self.assertEqual(len(w), 1)
+
+    def test_salt_correction(self):
+        for method in (1, 2, 3, 4):
+            self.assertAlmostEqual(
+                tmarray.salt_correction(Na=100, Tris=20, Mg=1.5,
+                                        method=method),
+                mt.salt_correction(Na=100, Tris=20, Mg=1.5, method=method))
+        for method in (5, 6, 7):
+            for Mg in (0, 1.5, 20):
+                self.assertSame(
+                    [mt.salt_correction(Na=50, Mg=Mg, dNTPs=0.8,
+                                        method=method, seq=s)
+                     for s in self.sequences],
+                    tmarray.salt_correction(Na=50, Mg=Mg, dNTPs=0.8,
+                                            method=method,
+                                            sequences=self.sequences))
+            self.assertRaises(ValueError, tmarray.salt_correction,
+                              method=method)
+
+    def test_chem_correction(self):
+        tms = tmarray.Tm_NN(self.sequences)
+        self.assertSame([mt.chem_correction(tm, DMSO=3, fmd=5) for tm in tms],
+                        tmarray.chem_correction(tms, DMSO=3, fmd=5))
+        self.assertSame(
+            [mt.chem_correction(tm, fmd=1.25, fmdmethod=2, GC=40)
+             for tm in tms],
+            tmarray.chem_correction(tms, fmd=1.25, fmdmethod=2, GC=40))
+        self.assertRaises(ValueError, tmarray.chem_correction, tms, fmd=1,
+                          fmdmethod=2)
+
+    def test_tiled_Tm(self):
+        rnd = random.Random(7)
+        genome = "".join(rnd.choice("ACGT") for i in range(1000))
+        genome = genome[:500] + "N" + genome[501:]
+        functions = {"Tm_NN": mt.Tm_NN, "Tm_GC": mt.Tm_GC,
+                     "Tm_Wallace": mt.Tm_Wallace}
+        for length in (2, 20, 45):
+            for method, function in functions.items():
+                values = tmarray.tiled_Tm(genome.lower(), length, step=3,
+                                          method=method)
+                starts = range(0, len(genome) - length + 1, 3)
+                self.assertEqual(len(values), len(starts))
+                for start, value in zip(starts, values):
+                    probe = genome[start:start + length]
+                    if "N" in probe:
+                        self.assertTrue(numpy.isnan(value))
+                    else:
+                        self.assertAlmostEqual(value, function(probe))
+        values = tmarray.tiled_Tm(genome, 25, method="Tm_NN", saltcorr=7,
+                                  Mg=2, nn_table=mt.DNA_NN4)
+        self.assertAlmostEqual(values[0], mt.Tm_NN(genome[:25], saltcorr=7,
+                                                   Mg=2, nn_table=mt.DNA_NN4))
+        self.assertEqual(len(tmarray.tiled_Tm("ACGT", 5)), 0)
+        self.assertRaises(TypeError, tmarray.tiled_Tm, genome, 20,
+                          method="Tm_GC", selfcomp=True)
+        self.assertRaises(ValueError, tmarray.tiled_Tm, genome, 20,
+                          method="Tm_staluc")
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
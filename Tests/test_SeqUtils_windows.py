@@ -0,0 +1,75 @@
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Unit tests for the Bio.SeqUtils.windows module."""
+
+import random
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SeqUtils.windows.")
+
+from Bio.Seq import Seq
+from Bio.SeqUtils import GC, GC_skew, ProtParamData
+from Bio.SeqUtils.lcc import lcc_simp
+from Bio.SeqUtils.ProtParam import ProteinAnalysis
+from Bio.SeqUtils import windows
+
+
+class WindowTests(unittest.TestCase):
+    """Compare the window statistics with the existing functions."""
+
+    def setUp(self):
+        rnd = random.Random(36)
+        self.dna = "".join(rnd.choice("ACGTacgtNS") for i in range(2000))
+        self.protein = "".join(rnd.choice("ACDEFGHIKLMNPQRSTVWY")
+                               for i in range(300))
+
+    def test_window_starts(self):
+        self.assertEqual(list(windows.window_starts(10, 4, 3)), [0, 3, 6])
+        self.assertEqual(list(windows.window_starts(10, 4, 3, True)),
+                         [0, 3, 6, 9])
+        self.assertEqual(list(windows.window_starts(3, 4)), [])
+        self.assertRaises(ValueError, windows.window_starts, 10, 0)
+
+    def test_gc_content(self):
+        values = windows.gc_content(Seq(self.dna), 50, 7)
+        expected = [GC(self.dna[i:i + 50]) / 100.0
+                    for i in range(0, len(self.dna) - 49, 7)]
+        self.assertTrue(numpy.allclose(values, expected))
+
+    def test_gc_skew(self):
+        for window in (10, 100, 333):
+            values = windows.gc_skew(self.dna, window, window, partial=True)
+            self.assertTrue(numpy.allclose(values,
+                                           GC_skew(self.dna, window)))
+
+    def test_lcc(self):
+        dna = self.dna.upper()
+        values = windows.lcc(dna, 40, 3)
+        expected = [lcc_simp(dna[i:i + 40])
+                    for i in range(0, len(dna) - 39, 3)]
+        self.assertTrue(numpy.allclose(values, expected))
+
+    def test_protein_scale(self):
+        analysis = ProteinAnalysis(self.protein)
+        for window, edge in ((9, 1.0), (9, 0.4), (4, 0.5), (21, 0.1)):
+            expected = analysis.protein_scale(ProtParamData.kd, window, edge)
+            for step in (1, 4):
+                values = windows.protein_scale(self.protein, ProtParamData.kd,
+                                               window, edge, step)
+                self.assertTrue(numpy.allclose(values, expected[::step]))
+        self.assertTrue(numpy.allclose(
+            windows.hydropathy(self.protein, 9, 0.4),
+            windows.protein_scale(self.protein, "kd", 9, 0.4)))
+        self.assertEqual(len(windows.protein_scale("ACD", "kd", 9, 0.4)), 0)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
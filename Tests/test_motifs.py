@@ -8,6 +8,11 @@ import os
 import unittest
 import math
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from Bio.Alphabet import generic_dna
 from Bio.Alphabet import Gapped
 from Bio.Alphabet import IUPAC
@@ -1911,6 +1916,39 @@ class MotifTestPWM(unittest.TestCase):
         self.assertAlmostEqual(result[5], -25.18009186, places=5)
         self.assertTrue(math.isnan(result[6]), "Expected nan, not %r" % result[6])
 
+    @unittest.skipIf(numpy is None,
+                     "Install NumPy if you want to use PositionSpecificScoringMatrix.scan.")
+    def test_scan(self):
+        """Test scanning both strands, in chunks and with bad letters."""
+        pssm = self.m.counts.normalize(pseudocounts=0.25).log_odds()
+        rc = pssm.reverse_complement()
+        sequence = Seq("AcGTGTGCGTAGTGCGTNCCATATAAGGACG" * 3, self.m.alphabet)
+        threshold = -30.0
+        forward = pssm.calculate(sequence)
+        reverse = rc.calculate(sequence)
+        expected = []
+        for position in range(len(forward)):
+            if forward[position] > threshold:
+                expected.append((position, 1, forward[position]))
+            if reverse[position] > threshold:
+                expected.append((position, -1, reverse[position]))
+        for chunksize in (5, 1000):
+            positions, strands, scores = pssm.scan(sequence, threshold,
+                                                   chunksize=chunksize)
+            self.assertEqual(list(zip(positions, strands, scores)), expected)
+            hits = list(pssm.search(sequence, threshold, chunksize=chunksize))
+            self.assertEqual(hits, [(p if s == 1 else p - len(sequence), x)
+                                    for p, s, x in expected])
+            for position, score in hits:
+                self.assertIsInstance(position, int)
+                self.assertIsInstance(score, float)
+        positions, strands, scores = pssm.scan(sequence, threshold,
+                                               both=False)
+        self.assertEqual(list(zip(positions, strands, scores)),
+                         [hit for hit in expected if hit[1] == 1])
+        result = pssm.scan(sequence[:5], threshold)
+        self.assertEqual([len(array) for array in result], [0, 0, 0])
+
     def test_mixed_alphabets(self):
         """Test creating motif with mixed alphabets."""
         # TODO - Can we support this?
@@ -1925,6 +1963,121 @@ class MotifTestPWM(unittest.TestCase):
         self.assertRaises(ValueError, motifs.create, seqs)
 
 
+class ScoreDistributionTests(unittest.TestCase):
+    """Tests for the score distribution and thresholds of a PSSM."""
+
+    def setUp(self):
+        motif = motifs.create([Seq("TACAA"), Seq("TACGC"), Seq("TACAC"),
+                               Seq("TACCC"), Seq("AACCC"), Seq("AATGC"),
+                               Seq("AATGC")])
+        self.pssm = motif.counts.normalize(pseudocounts=0.5).log_odds()
+        self.background = {"A": 0.3, "C": 0.2, "G": 0.2, "T": 0.3}
+
+    def test_thresholds(self):
+        distribution = self.pssm.distribution(background=self.background)
+        self.assertAlmostEqual(sum(distribution.bg_density), 1.0)
+        self.assertAlmostEqual(distribution.threshold_fpr(0.01), 4.21009351)
+        self.assertAlmostEqual(distribution.threshold_fnr(0.1), -0.43363223)
+        self.assertAlmostEqual(distribution.threshold_balanced(1000),
+                               5.82960139)
+        self.assertAlmostEqual(distribution.threshold_patser(), 0.66763312)
+
+    def test_pure_python(self):
+        from Bio.motifs import thresholds
+        if thresholds.numpy is None:
+            self.skipTest("Already testing the pure Python code")
+        expected = thresholds.ScoreDistribution(
+            pssm=self.pssm, background=self.background, precision=100)
+        numpy = thresholds.numpy
+        thresholds.numpy = None
+        try:
+            distribution = thresholds.ScoreDistribution(
+                pssm=self.pssm, background=self.background, precision=100)
+        finally:
+            thresholds.numpy = numpy
+        self.assertIsInstance(distribution.bg_density, list)
+        for x, y in zip(expected.bg_density, distribution.bg_density):
+            self.assertAlmostEqual(x, y)
+        for x, y in zip(expected.mo_density, distribution.mo_density):
+            self.assertAlmostEqual(x, y)
+        self.assertAlmostEqual(expected.threshold_fpr(0.01),
+                               distribution.threshold_fpr(0.01))
+
+    def test_cache(self):
+        distribution = self.pssm.distribution(background=self.background)
+        threshold = distribution.threshold_fpr(0.01)
+        again = self.pssm.distribution(background=self.background)
+        self.assertIsNot(again, distribution)
+        # The densities are shared with the cache, and read-only
+        self.assertIs(again.bg_density, distribution.bg_density)
+        try:
+            distribution.bg_density[-1] = 1.0
+        except (TypeError, ValueError):
+            pass
+        else:
+            self.fail("Expected the cached densities to be read-only")
+        # Modifying a distribution replaces its densities
+        distribution.modify({"A": 1.0, "C": 1.0, "G": 1.0, "T": 1.0},
+                            self.background, self.background)
+        self.assertIsNot(again.bg_density, distribution.bg_density)
+        again = self.pssm.distribution(background=self.background)
+        self.assertEqual(again.threshold_fpr(0.01), threshold)
+        self.assertNotEqual(
+            self.pssm.distribution(background=self.background,
+                                   precision=100).n_points,
+            again.n_points)
+
+
+@unittest.skipIf(numpy is None,
+                 "Install NumPy if you want to use Bio.motifs.MotifScanner.")
+class MotifScannerTests(unittest.TestCase):
+    """Tests for scanning with many motifs at once."""
+
+    def setUp(self):
+        with open("motifs/SRF.pfm") as handle:
+            srf = motifs.read(handle, "pfm")
+        motif = motifs.create([Seq("TACAA"), Seq("TACGC"), Seq("TACAC")])
+        self.pssms = [srf.counts.normalize(pseudocounts=0.25).log_odds(),
+                      motif.counts.normalize(pseudocounts=0.5).log_odds()]
+        self.sequence = Seq("AcGTGTGCGTAGTGCGTNCCATATAAGGACGTTACAAGTTGTAA" * 4,
+                            IUPAC.unambiguous_dna)
+
+    def check_hits(self, scanner, hits):
+        motif_indices, positions, strands, scores = hits
+        for index, pssm in enumerate(scanner.pssms):
+            expected = pssm.scan(self.sequence, scanner.thresholds[index],
+                                 both=scanner.both)
+            selected = motif_indices == index
+            self.assertEqual(list(zip(*expected)),
+                             list(zip(positions[selected], strands[selected],
+                                      scores[selected])))
+        self.assertEqual(list(positions), sorted(positions))
+
+    def test_scan(self):
+        """Test scanning with several motifs in one pass."""
+        scanner = motifs.MotifScanner(self.pssms, thresholds=[-30.0, 2.0])
+        chunks = list(scanner.scan(self.sequence))
+        self.assertEqual(len(chunks), 1)
+        self.check_hits(scanner, chunks[0])
+        for processes in (1, 2):
+            chunks = list(scanner.scan(self.sequence, chunksize=7,
+                                       processes=processes))
+            self.assertEqual(len(chunks), 26)
+            self.check_hits(scanner, [numpy.concatenate(arrays)
+                                      for arrays in zip(*chunks)])
+        scanner = motifs.MotifScanner(self.pssms, both=False)
+        self.check_hits(scanner, next(scanner.scan(str(self.sequence))))
+
+    def test_thresholds(self):
+        """Test thresholds calculated from the false positive rate."""
+        scanner = motifs.MotifScanner(self.pssms, fpr=0.01)
+        background = dict.fromkeys("ACGT", 0.25)
+        for pssm, threshold in zip(self.pssms, scanner.thresholds):
+            distribution = pssm.distribution(background=background)
+            self.assertEqual(threshold, distribution.threshold_fpr(0.01))
+        self.assertRaises(ValueError, motifs.MotifScanner, self.pssms, [1.0])
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
@@ -377,6 +377,8 @@ else:
                   ["Bio/PDB/QCPSuperimposer/qcprotmodule.c"]),
         Extension('Bio.motifs._pwm',
                   ["Bio/motifs/_pwm.c"]),
+        Extension('Bio.SeqUtils._checksum',
+                  ["Bio/SeqUtils/_checksum.c"]),
         Extension('Bio.Cluster._cluster',
                   ['Bio/Cluster/cluster.c', 'Bio/Cluster/clustermodule.c']),
         Extension('Bio.PDB.kdtrees',